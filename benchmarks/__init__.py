@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Arctic Species data pipelines
+
+This package contains local stand-ins for external services and harnesses that
+measure pipeline throughput offline.
+"""
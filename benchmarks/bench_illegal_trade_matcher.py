@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Illegal Trade Matcher Benchmark
+
+Compares the species matching step of extract_arctic_illegal_trade.py: the
+original per-pattern scans (two str.lower().str.contains passes per pattern)
+against the single-pass SpeciesPatternMatcher. Runs on a synthetic
+01_taxa_use_combos.csv built from docs/reports/species_names_latest.csv (the
+seizure dataset is not in the repo) and checks the single pass returns the same
+records as the per-pattern scans with literal patterns. The original scans
+treat names as regular expressions, so names with parentheses such as
+'Killer Whale (Orca)' only match in the single pass.
+
+Usage:
+    python bench_illegal_trade_matcher.py [--rows 100000] [--distinct-names 5000]
+                                          [--repeat 3] [--output results/illegal_matcher.json]
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import warnings
+import contextlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+
+import pandas as pd
+
+# Add rebuild directory to path
+rebuild_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(rebuild_dir))
+
+from benchmarks.bench_loaders import import_path
+
+SPECIES_FILE = rebuild_dir / 'docs' / 'reports' / 'species_names_latest.csv'
+DEDUP_COLUMNS = ['db', 'db_taxa_name', 'standardized_use_id']
+USES = [('IVC', 'ivory carvings/products', 'Ivory products'), ('SKN', 'skin', 'Skin products'),
+        ('MEA', 'meat', 'Food'), ('LIV', 'live specimen', 'Live animals'), ('BON', 'bone product', 'Bone products')]
+FILLER_GENERA = ['Panthera', 'Python', 'Testudo', 'Manis', 'Crocodylus', 'Aquila', 'Varanus', 'Naja',
+                 'Elephas', 'Loxodonta', 'Rhinoceros', 'Psittacus', 'Chelonia', 'Hippocampus']
+
+def load_species() -> pd.DataFrame:
+    """Arctic species in the shape of data/arctic_species_list.csv"""
+    df = pd.read_csv(SPECIES_FILE)
+    return pd.DataFrame({
+        'species_id': df['id'],
+        'scientific_name': df['scientific_name'],
+        'common_name': df['common_name'],
+        'iucn_status': '',
+        'cites_appendix': ''
+    })
+
+def make_taxa_use_combos(species: pd.DataFrame, rows: int, distinct_names: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Synthetic 01_taxa_use_combos.csv: ~10% Arctic name variants, the rest other taxa
+
+    Args:
+        species (pd.DataFrame): Arctic species
+        rows (int): Number of rows
+        distinct_names (int): Size of the taxa name vocabulary
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Frame with the columns the extractor reads
+    """
+    rng = random.Random(seed)
+    arctic = []
+    for _, sp in species.iterrows():
+        name = sp['scientific_name']
+        arctic += [name, name.upper(), f"{name} ssp.", f"{name.split()[0]} sp.", str(sp['common_name']).lower()]
+    filler = [f"{rng.choice(FILLER_GENERA)} {''.join(rng.choices('abcdefghilmnoprstuv', k=rng.randint(5, 11)))}"
+              for _ in range(max(distinct_names - len(arctic), 1))]
+
+    records = []
+    for _ in range(rows):
+        name = rng.choice(arctic) if rng.random() < 0.1 else rng.choice(filler)
+        use_id, use_type, category = rng.choice(USES)
+        records.append({
+            'db': rng.choice(['wtp', 'lemis', 'cites']),
+            'db_taxa_name': name if rng.random() < 0.5 else name.upper(),
+            'db_taxa_name_clean': None if rng.random() < 0.05 else name,
+            'standardized_use_id': use_id,
+            'standardized_use_type': use_type,
+            'main_category': category
+        })
+    return pd.DataFrame(records)
+
+def combine(records: List[pd.DataFrame]) -> pd.DataFrame:
+    """The extractor's concat + dedup step"""
+    if not records:
+        return pd.DataFrame()
+    return pd.concat(records, ignore_index=True).drop_duplicates(subset=DEDUP_COLUMNS).reset_index(drop=True)
+
+def time_matcher(fn, df: pd.DataFrame, repeat: int) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """Best/mean wall time of matching plus concat/dedup, and the combined records"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = combine(fn(df))
+        times.append(time.perf_counter() - start)
+    return {'best_s': round(min(times), 4), 'mean_s': round(sum(times) / len(times), 4), 'records': len(result)}, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the illegal trade species matcher')
+    parser.add_argument('--rows', type=int, default=100_000, help='Synthetic taxa/use rows')
+    parser.add_argument('--distinct-names', type=int, default=5000, help='Distinct taxa names')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per matcher')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', help='Write results JSON here')
+    args = parser.parse_args()
+
+    extractor_module = import_path('extract_arctic_illegal_trade',
+                                   rebuild_dir / 'illigal trade' / 'extract_arctic_illegal_trade.py')
+    species = load_species()
+    df = make_taxa_use_combos(species, args.rows, args.distinct_names, args.seed)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = extractor_module.ArcticIllegalTradeExtractor(arctic_species=species, output_dir=output_dir)
+        patterns = sum(len(p) for p in extractor.search_patterns.values())
+
+        print(f"🔎 {len(df):,} rows, {df['db_taxa_name'].nunique():,} distinct names, "
+              f"{len(species)} species, {patterns} patterns")
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # regex patterns with groups
+            per_pattern, _ = time_matcher(extractor.find_arctic_records_per_pattern, df, args.repeat)
+        single_pass, actual = time_matcher(extractor.find_arctic_records, df, args.repeat)
+        _, expected = time_matcher(lambda frame: extractor.find_arctic_records_per_pattern(frame, regex=False), df, 1)
+
+    identical = expected.equals(actual)
+    speedup = round(per_pattern['best_s'] / single_pass['best_s'], 1) if single_pass['best_s'] else None
+    print(f"  per-pattern scans: {per_pattern['best_s']:.3f}s ({per_pattern['records']:,} records)")
+    print(f"  single pass:       {single_pass['best_s']:.3f}s ({single_pass['records']:,} records)")
+    print(f"  speedup: {speedup}x   same records as literal per-pattern scans: {'✅' if identical else '❌'}")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({
+            'timestamp': datetime.now().isoformat(),
+            'rows': len(df),
+            'species': len(species),
+            'patterns': patterns,
+            'per_pattern': per_pattern,
+            'single_pass': single_pass,
+            'speedup': speedup,
+            'identical': identical
+        }, indent=2))
+        print(f"📝 Results written to {output}")
+
+    return 0 if identical else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+IUCN Fetch Pipeline Benchmark
+
+Runs rebuild_iucn_assessments.fetch_iucn_assessments end-to-end against the local
+stand-in server and measures throughput for every combination of client
+concurrency and client rate limit. Server latency, error rate and 429 behavior
+are configurable so the retry/backoff path can be tuned offline.
+
+Usage:
+    python bench_iucn_fetch.py [--concurrency 1,4,8] [--rate 0.5,2,10] [--repeat 2]
+                               [--latency-ms 80] [--error-rate 0.02] [--max-rps 5]
+                               [--batch-delay 0] [--output results/iucn_fetch.json]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List
+
+# Add rebuild directory to path
+rebuild_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(rebuild_dir))
+
+from benchmarks.iucn_standin_server import IUCNStandInServer, StandInConfig, DEFAULT_FIXTURES
+
+def parse_float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(',') if v.strip()]
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+def configure_environment(server: IUCNStandInServer) -> None:
+    """
+    Point the configuration system at the stand-in server
+
+    Must run before config is first imported, since settings are cached.
+    Placeholder credentials are only set when real ones are absent.
+    """
+    os.environ['IUCN_API_BASE_URL'] = server.base_url('iucn')
+    os.environ['CITES_API_BASE_URL'] = server.base_url('cites')
+    os.environ.setdefault('IUCN_API_TOKEN', 'standin')
+    os.environ.setdefault('SUPABASE_URL', 'http://127.0.0.1')
+    os.environ.setdefault('SUPABASE_ANON_KEY', 'standin')
+    os.environ.setdefault('CITES_API_KEY', 'standin')
+    os.environ.setdefault('CITES_API_TOKEN', 'standin')
+
+def build_species_list(server: IUCNStandInServer, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Build the species input list from the fixture responses
+
+    Args:
+        server (IUCNStandInServer): Server holding the fixtures
+        repeat (int): How many times to repeat the species list
+
+    Returns:
+        List[Dict[str, Any]]: Rows shaped like the rebuild script input
+    """
+    prefix = 'iucn/taxa/scientific_name/'
+    names = sorted(key[len(prefix):] for key in server.responses if key.startswith(prefix))
+    return [
+        {'species_id': f'bench-{i}-{n}', 'species_name': name}
+        for i in range(repeat)
+        for n, name in enumerate(names)
+    ]
+
+async def run_case(species_list: List[Dict[str, Any]], concurrency: int, rate: float,
+                   batch_size: int, batch_delay: float, verbose: bool) -> Dict[str, Any]:
+    """
+    Run one benchmark case
+
+    Args:
+        species_list (List[Dict[str, Any]]): Species to fetch
+        concurrency (int): Species queried concurrently
+        rate (float): Client rate limit in requests/second
+        batch_size (int): Species per batch
+        batch_delay (float): Pause between batches
+        verbose (bool): Show the rebuild script output
+
+    Returns:
+        Dict[str, Any]: Timing and outcome for the case
+    """
+    from config import get_api_config
+    from core.rebuild_iucn_assessments import fetch_iucn_assessments
+
+    api_config = get_api_config()
+    api_config.endpoints['iucn'].rate_limit = rate
+    api_config.last_request_times.clear()
+
+    output = None if verbose else io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+        results = await fetch_iucn_assessments(
+            species_list,
+            batch_size=batch_size,
+            batch_delay=batch_delay,
+            concurrency=concurrency
+        )
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for r in results if r.get('category') == 'Error')
+    return {
+        'concurrency': concurrency,
+        'client_rate_limit': rate,
+        'species': len(species_list),
+        'results': len(results),
+        'errors': errors,
+        'wall_time_s': round(elapsed, 3),
+        'species_per_s': round(len(species_list) / elapsed, 2) if elapsed else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the IUCN fetch pipeline against a local stand-in')
+    parser.add_argument('--concurrency', type=parse_int_list, default=[1, 4, 8],
+                       help='Comma-separated concurrency levels')
+    parser.add_argument('--rate', type=parse_float_list, default=[0.5, 2.0, 10.0],
+                       help='Comma-separated client rate limits (requests/second)')
+    parser.add_argument('--repeat', type=int, default=1,
+                       help='Repeat the fixture species list N times')
+    parser.add_argument('--batch-size', type=int, default=10, help='Species per batch')
+    parser.add_argument('--batch-delay', type=float, default=2.0, help='Seconds between batches')
+    parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES), help='Fixture JSON file')
+    parser.add_argument('--latency-ms', type=float, default=80.0, help='Server latency in milliseconds')
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help='Server latency jitter')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 500 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of random 429 responses')
+    parser.add_argument('--max-rps', type=float, help='Server-side rate limit (429 beyond it)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds on 429')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--verbose', action='store_true', help='Show rebuild script output')
+
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+
+    with IUCNStandInServer(Path(args.fixtures), config) as server:
+        configure_environment(server)
+        species_list = build_species_list(server, args.repeat)
+
+        print("🧪 IUCN Fetch Pipeline Benchmark")
+        print("=" * 60)
+        print(f"Stand-in: {server.base_url('iucn')}  latency={config.latency_ms}ms  "
+              f"errors={config.error_rate:.0%}  429s={config.throttle_rate:.0%}  max_rps={config.max_rps}")
+        print(f"Species per run: {len(species_list)}\n")
+        print(f"{'conc':>5} {'rate':>6} {'wall s':>8} {'sp/s':>7} {'reqs':>6} {'429':>5} {'500':>5} {'err':>5}")
+
+        async def run_all() -> List[Dict[str, Any]]:
+            # One event loop for all cases so the rate limiter locks stay valid
+            cases = []
+            for rate in args.rate:
+                for concurrency in args.concurrency:
+                    server.reset_stats()
+                    case = await run_case(species_list, concurrency, rate,
+                                          args.batch_size, args.batch_delay, args.verbose)
+                    case['server'] = server.stats.to_dict()
+                    cases.append(case)
+
+                    print(f"{concurrency:>5} {rate:>6} {case['wall_time_s']:>8} {case['species_per_s']:>7} "
+                          f"{case['server']['requests']:>6} {case['server']['throttled']:>5} "
+                          f"{case['server']['errors']:>5} {case['errors']:>5}")
+            return cases
+
+        cases = asyncio.run(run_all())
+
+    if args.output:
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'standin_config': vars(config),
+            'batch_size': args.batch_size,
+            'batch_delay': args.batch_delay,
+            'cases': cases
+        }
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {output_path}")
+
+if __name__ == '__main__':
+    main()
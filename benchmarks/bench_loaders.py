@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Loader Benchmark Harness
+
+Runs the database loaders end-to-end against the local PostgREST stand-in
+(postgrest_standin.py) and reports wall time, rows/second and REST round trips
+per loader and per stage. The loaders run unmodified: SUPABASE_URL and the keys
+are pointed at the stand-in before config is imported, and each loader runs in
+a scratch working directory so its log files stay out of the repo.
+
+Loaders covered:
+- trade:     core/load_optimized_trade_data.py   (TradeDataLoader)
+- staging:   cites_migration_2025/load_to_staging.py   (CitesStageLoader)
+- seizures:  illigal trade/load_illegal_seizures.py   (IllegalSeizureLoader)
+- illegal:   illigal trade/illegal_trade_ingest.py   (IllegalTradeIngest, products + seizures)
+- cms:       core/load_cms_data_to_db.py   (CMSDataLoader, per species and --bulk)
+- nammco:    migration/nammco_import.py   (NammcoImporter, import + dry-run diff)
+
+Usage:
+    python bench_loaders.py [--loaders trade,staging,seizures,illegal,cms,nammco] [--species 5]
+                            [--seizures 2000] [--latency-ms 5] [--data-dir /tmp/synthetic_1m]
+                            [--output results/loaders.json]
+"""
+
+import os
+import io
+import sys
+import csv
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import contextlib
+import importlib.util
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Callable, Optional
+
+# Add rebuild directory to path
+rebuild_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(rebuild_dir))
+
+from benchmarks.postgrest_standin import (
+    PostgRESTStandIn, PostgRESTStandInConfig, seed_species, STANDIN_KEY, DEFAULT_SCHEMA
+)
+
+OPTIMIZED_DIR = rebuild_dir / 'species_data' / 'processed' / 'optimized_species'
+NAMMCO_DIR = rebuild_dir / 'species_data' / 'nammco'
+ALL_LOADERS = ['trade', 'staging', 'seizures', 'illegal', 'cms', 'nammco']
+
+# Product codes seeded for the seizure loader (standardized_use_id -> main_category)
+SEIZURE_PRODUCTS = {
+    'IVC': ('ivory carvings/products', 'Ivory products'),
+    'TUS': ('tusk', 'Ivory products'),
+    'SKN': ('skin', 'Skin products'),
+    'FUR': ('fur product', 'Skin products'),
+    'MEA': ('meat', 'Food'),
+    'LIV': ('live specimen', 'Live animals'),
+    'BON': ('bone product', 'Bone products'),
+    'MED': ('medicinal product', 'Medicine')
+}
+
+def configure_environment(server: PostgRESTStandIn) -> None:
+    """
+    Point the Supabase client at the stand-in
+
+    Must run before config is first imported. Real credentials are overridden on
+    purpose so a benchmark can never write to the production database.
+    """
+    os.environ['SUPABASE_URL'] = server.url
+    os.environ['SUPABASE_ANON_KEY'] = STANDIN_KEY
+    os.environ['SUPABASE_SERVICE_ROLE_KEY'] = STANDIN_KEY
+
+def import_path(module_name: str, file_path: Path):
+    """Import a script by path (some live in directories with spaces)"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, str(file_path.parent))
+    spec.loader.exec_module(module)
+    return module
+
+def select_trade_files(work_dir: Path, species: int, source_dir: Path = OPTIMIZED_DIR) -> Path:
+    """
+    Link the first N optimized species files into a scratch directory
+
+    Args:
+        work_dir (Path): Scratch directory
+        species (int): Number of species files (0 = all)
+        source_dir (Path): Directory with the optimized species files
+
+    Returns:
+        Path: Directory to hand to the loaders
+    """
+    files = sorted(source_dir.glob('*_trade_data_optimized.json.gz'))
+    if species:
+        files = files[:species]
+    target = work_dir / 'optimized_species'
+    target.mkdir(exist_ok=True)
+    for file_path in files:
+        link = target / file_path.name
+        if not link.exists():
+            link.symlink_to(file_path)
+    return target
+
+def write_staging_csv(optimized_dir: Path, output_file: Path) -> int:
+    """
+    Write an extraction CSV (the staging loader input) from optimized species files
+
+    Args:
+        optimized_dir (Path): Directory with optimized species files
+        output_file (Path): CSV to write
+
+    Returns:
+        int: Rows written
+    """
+    from core.load_optimized_trade_data import OptimizedTradeDataReader
+
+    columns = ['Id', 'Year', 'Appendix', 'Taxon', 'Class', 'Order', 'Family', 'Genus', 'Term',
+               'Quantity', 'Unit', 'Importer', 'Exporter', 'Origin', 'Purpose', 'Source', 'Reporter.type']
+    rows = 0
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for file_path in sorted(optimized_dir.glob('*.json.gz')):
+            taxon = file_path.name.replace('_trade_data_optimized.json.gz', '').replace('_', ' ')
+            for record in OptimizedTradeDataReader(str(file_path)).get_denormalized_records():
+                writer.writerow([
+                    record.get('id'), record.get('year'), record.get('appendix'), taxon,
+                    record.get('class'), record.get('order'), record.get('family'), record.get('genus'),
+                    record.get('term'), record.get('quantity_normalized'), record.get('unit'),
+                    record.get('importer'), record.get('exporter'), record.get('origin'),
+                    record.get('purpose'), record.get('source'), record.get('reporter_type')
+                ])
+                rows += 1
+    return rows
+
+def write_seizure_csv(output_file: Path, species_names: List[str], rows: int, seed: int = 42) -> int:
+    """
+    Write a synthetic seizure CSV with the columns of arctic_illegal_trade_records.csv
+
+    Args:
+        output_file (Path): CSV to write
+        species_names (List[str]): Species to draw from
+        rows (int): Number of seizure rows
+        seed (int): Random seed
+
+    Returns:
+        int: Rows written
+    """
+    rng = random.Random(seed)
+    codes = list(SEIZURE_PRODUCTS)
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['arctic_scientific_name', 'standardized_use_id', 'standardized_use_type',
+                         'subcategory', 'main_category', 'db', 'quantity', 'unit',
+                         'db_taxa_name', 'gbif_id', 'db_taxa_name_clean'])
+        for _ in range(rows):
+            name = rng.choice(species_names)
+            code = rng.choice(codes)
+            product, category = SEIZURE_PRODUCTS[code]
+            writer.writerow([name, code, product, product, category, rng.choice(['lemis', 'cites', 'traffic']),
+                             rng.choice(['', '1', str(rng.randint(1, 500))]), rng.choice(['', 'kg', 'items']),
+                             name.upper(), str(rng.randint(2_000_000, 9_000_000)), name])
+    return rows
+
+class StageTimer:
+    """Collects wall time and REST calls per stage of a loader run"""
+
+    def __init__(self, server: PostgRESTStandIn):
+        self.server = server
+        self.stages: List[Dict[str, Any]] = []
+
+    def run(self, name: str, fn: Callable, *args, **kwargs):
+        before = self.server.stats.requests
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.stages.append({
+            'stage': name,
+            'wall_time_s': round(time.perf_counter() - start, 3),
+            'rest_calls': self.server.stats.requests - before
+        })
+        return result
+
+def bench_trade(server: PostgRESTStandIn, timer: StageTimer, work_dir: Path, args) -> int:
+    from core.load_optimized_trade_data import TradeDataLoader
+
+    optimized_dir = select_trade_files(work_dir, args.species, args.optimized_dir)
+    server.db.truncate('cites_trade_records')
+    loader = TradeDataLoader(str(optimized_dir), batch_size=args.batch_size)
+    timer.run('load_all_data', loader.load_all_data)
+    timer.run('validate_loaded_data', loader.validate_loaded_data)
+    return loader.stats.records_loaded
+
+def bench_staging(server: PostgRESTStandIn, timer: StageTimer, work_dir: Path, args) -> int:
+    loader_module = import_path('load_to_staging', rebuild_dir / 'cites_migration_2025' / 'load_to_staging.py')
+
+    csv_path = work_dir / 'extracted_trade_records.csv'
+    if not csv_path.exists():
+        write_staging_csv(select_trade_files(work_dir, args.species, args.optimized_dir), csv_path)
+
+    server.db.truncate('cites_trade_records_staging')
+    loader = loader_module.CitesStageLoader(batch_size=args.staging_batch_size)
+    timer.run('load_species_mapping', loader.load_species_mapping)
+    df = timer.run('load_extracted_data', loader.load_extracted_data, str(csv_path))
+    df = timer.run('map_species_ids', loader.map_species_ids, df)
+    records = timer.run('prepare_staging_records', loader.prepare_staging_records, df)
+    timer.run('clear_staging_table', loader.clear_staging_table)
+    timer.run('load_to_staging', loader.load_to_staging, records)
+    timer.run('validate_staging_load', loader.validate_staging_load)
+    return loader.load_stats.get('successful_loads', 0)
+
+def bench_seizures(server: PostgRESTStandIn, timer: StageTimer, work_dir: Path, args) -> int:
+    loader_module = import_path('load_illegal_seizures', rebuild_dir / 'illigal trade' / 'load_illegal_seizures.py')
+
+    server.db.truncate('illegal_trade_seizures')
+    server.db.insert('illegal_trade_products', [
+        {'product_code': code, 'product_name': name, 'main_category': category}
+        for code, (name, category) in SEIZURE_PRODUCTS.items()
+    ], on_conflict=('product_code',), resolution='ignore-duplicates')
+
+    csv_path = work_dir / 'arctic_illegal_trade_records.csv'
+    species_names = [r['scientific_name'] for r in server.db.all_rows('species')]
+    write_seizure_csv(csv_path, species_names, args.seizures)
+
+    loader = loader_module.IllegalSeizureLoader(batch_size=args.seizure_batch_size)
+    timer.run('load_reference_data', loader.load_reference_data)
+    timer.run('load_seizure_data', loader.load_seizure_data, str(csv_path))
+    timer.run('load_seizures_to_database', loader.load_seizures_to_database)
+    return loader.load_stats.get('successful_loads', 0)
+
+def bench_illegal(server: PostgRESTStandIn, timer: StageTimer, work_dir: Path, args) -> int:
+    ingest_module = import_path('illegal_trade_ingest', rebuild_dir / 'illigal trade' / 'illegal_trade_ingest.py')
+
+    server.db.truncate('illegal_trade_seizures')
+    server.db.truncate('illegal_trade_products')
+
+    csv_path = work_dir / 'arctic_illegal_trade_records.csv'
+    species_names = [r['scientific_name'] for r in server.db.all_rows('species')]
+    write_seizure_csv(csv_path, species_names, args.seizures)
+
+    ingest = ingest_module.IllegalTradeIngest(batch_size=args.illegal_batch_size)
+    timer.run('load_reference_data', ingest.load_reference_data)
+    df = timer.run('read_csv', ingest.read_csv, str(csv_path))
+    products = timer.run('build_products', ingest.build_products, df)
+    timer.run('upsert_products', ingest.upsert_products, products)
+    seizures = timer.run('build_seizures', ingest.build_seizures, df)
+    timer.run('delete_existing_seizures', ingest.delete_existing_seizures)
+    timer.run('insert_seizures', ingest.insert_seizures, seizures)
+    return ingest.summary.seizures_written
+
+def bench_cms(server: PostgRESTStandIn, timer: StageTimer, work_dir: Path, args) -> int:
+    from core.load_cms_data_to_db import CMSDataLoader
+
+    server.db.truncate('cms_listings')
+    loader = CMSDataLoader()
+    timer.run('run', loader.run)
+
+    server.db.truncate('cms_listings')
+    bulk = CMSDataLoader(bulk=True)
+    timer.run('run_bulk', bulk.run)
+    timer.run('run_bulk_unchanged', CMSDataLoader(bulk=True).run)
+    return bulk.stats['records_inserted'] + bulk.stats['records_updated']
+
+def bench_nammco(server: PostgRESTStandIn, timer: StageTimer, work_dir: Path, args) -> int:
+    from config.supabase_config import get_supabase_client
+
+    server.db.truncate('catch_records')
+    nammco_import = import_path('nammco_import', rebuild_dir / 'migration' / 'nammco_import.py')
+    csv_files = sorted(NAMMCO_DIR.glob('*.csv'))
+
+    client = get_supabase_client()
+    importer = timer.run('load_reference_data', nammco_import.NammcoImporter, client)
+    summary = timer.run('import', importer.run, csv_files)
+    dry_run = timer.run('load_reference_data_dry_run', nammco_import.NammcoImporter, client, dry_run=True)
+    timer.run('dry_run_diff', dry_run.run, csv_files)
+    return summary.rows_written
+
+BENCHMARKS = {
+    'trade': bench_trade,
+    'staging': bench_staging,
+    'seizures': bench_seizures,
+    'illegal': bench_illegal,
+    'cms': bench_cms,
+    'nammco': bench_nammco
+}
+
+def run_loader(name: str, server: PostgRESTStandIn, work_dir: Path, args) -> Dict[str, Any]:
+    """
+    Run one loader benchmark
+
+    Args:
+        name (str): Loader name from BENCHMARKS
+        server (PostgRESTStandIn): Running stand-in
+        work_dir (Path): Scratch working directory
+        args: Parsed command line arguments
+
+    Returns:
+        Dict[str, Any]: Timing, row counts and REST statistics
+    """
+    server.reset_stats()
+    timer = StageTimer(server)
+    output = None if args.verbose else io.StringIO()
+
+    start = time.perf_counter()
+    error = None
+    rows = 0
+    with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+        try:
+            rows = BENCHMARKS[name](server, timer, work_dir, args)
+        except Exception as e:
+            error = str(e)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'loader': name,
+        'rows': rows,
+        'wall_time_s': round(elapsed, 3),
+        'rows_per_s': round(rows / elapsed, 1) if elapsed and rows else 0,
+        'error': error,
+        'stages': timer.stages,
+        'rest': server.stats.to_dict()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the database loaders against a local PostgREST stand-in')
+    parser.add_argument('--loaders', default=','.join(ALL_LOADERS),
+                       help='Comma-separated loaders to run')
+    parser.add_argument('--species', type=int, default=5,
+                       help='Optimized species files to load (0 = all)')
+    parser.add_argument('--data-dir',
+                       help='Synthetic data from generate_synthetic_trade.py (optimized_species/ + species_list.csv)')
+    parser.add_argument('--seizures', type=int, default=2000, help='Synthetic seizure rows')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Trade loader batch size')
+    parser.add_argument('--staging-batch-size', type=int, default=5000, help='Staging loader batch size')
+    parser.add_argument('--seizure-batch-size', type=int, default=100, help='Seizure loader batch size')
+    parser.add_argument('--illegal-batch-size', type=int, default=1000, help='Illegal trade ingest batch size')
+    parser.add_argument('--schema', default=str(DEFAULT_SCHEMA), help='Schema SQL file')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Stand-in latency per request')
+    parser.add_argument('--per-row-us', type=float, default=0.0, help='Stand-in latency per row')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--verbose', action='store_true', help='Show loader output')
+
+    args = parser.parse_args()
+    args.optimized_dir, args.species_file = OPTIMIZED_DIR, None
+    if args.data_dir:
+        args.optimized_dir = Path(args.data_dir).resolve() / 'optimized_species'
+        args.species_file = Path(args.data_dir).resolve() / 'species_list.csv'
+    loaders = [name.strip() for name in args.loaders.split(',') if name.strip()]
+    unknown = set(loaders) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown loaders: {', '.join(sorted(unknown))}")
+
+    config = PostgRESTStandInConfig(latency_ms=args.latency_ms, per_row_us=args.per_row_us)
+    original_cwd = os.getcwd()
+
+    with PostgRESTStandIn(Path(args.schema), config) as server, \
+            tempfile.TemporaryDirectory(prefix='arctic_bench_') as scratch:
+        configure_environment(server)
+        work_dir = Path(scratch)
+        (work_dir / 'logs').mkdir()
+        os.chdir(work_dir)
+
+        if not args.verbose:
+            # Loaders configure logging at import time; keep the table readable
+            logging.disable(logging.INFO)
+
+        species_count = seed_species(server.db, args.species_file) if args.species_file else seed_species(server.db)
+
+        print("🧪 Loader Benchmark")
+        print("=" * 70)
+        print(f"Stand-in: {server.url}  latency={config.latency_ms}ms  species={species_count}")
+        print(f"{'loader':<10} {'rows':>9} {'wall s':>9} {'rows/s':>10} {'REST':>7} {'MB sent':>8}  error")
+
+        results = []
+        try:
+            for name in loaders:
+                result = run_loader(name, server, work_dir, args)
+                results.append(result)
+                print(f"{name:<10} {result['rows']:>9,} {result['wall_time_s']:>9} {result['rows_per_s']:>10} "
+                      f"{result['rest']['requests']:>7} {result['rest']['bytes_in'] / 1e6:>8.2f}  "
+                      f"{result['error'] or ''}")
+        finally:
+            os.chdir(original_cwd)
+            logging.disable(logging.NOTSET)
+
+    if args.output:
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'standin_config': vars(config),
+            'species_files': args.species,
+            'data_dir': args.data_dir,
+            'results': results
+        }
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {output_path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+End-to-End Trade Pipeline Benchmark
+
+Runs the trade data pipeline stage by stage on a fixed synthetic dataset:
+extract (CSV → per-species JSON) → optimize → validate_before_load → load →
+generate summaries. The database stages talk to the PostgREST stand-in, which
+runs in its own process so it does not skew the pipeline's memory and CPU.
+
+For every stage the wall time, peak RSS, rows/second and bytes read/written are
+recorded. Each run is appended to a JSON history file and compared against a
+stored baseline for the same dataset; stages that got slower or bigger than the
+threshold are reported as regressions.
+
+Usage:
+    python bench_pipeline.py [--dataset small|medium|large] [--stages extract,optimize,...]
+                             [--latency-ms 2] [--save-baseline] [--fail-on-regression]
+"""
+
+import os
+import io
+import gc
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import resource
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Callable
+
+# Add rebuild directory to path
+rebuild_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(rebuild_dir))
+
+from benchmarks.postgrest_standin import STANDIN_KEY
+from config.instrumentation import get_metrics
+from benchmarks.generate_synthetic_trade import TradeGenerator, load_profile, DEFAULT_PROFILE
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+DATASETS_DIR = RESULTS_DIR / 'datasets'
+DEFAULT_HISTORY = RESULTS_DIR / 'pipeline_history.json'
+DEFAULT_BASELINE = RESULTS_DIR / 'pipeline_baseline.json'
+
+# Target-species rows per dataset; filler rows are added on top so extraction
+# has to skip non-target taxa like it does on the real download
+DATASETS = {
+    'small': 20_000,
+    'medium': 200_000,
+    'large': 1_000_000
+}
+FILLER_RATIO = 4.0
+ROWS_PER_FILE = 500_000
+
+STAGES = ['extract', 'optimize', 'validate', 'load', 'summaries']
+
+# Regressions below these absolute deltas are noise, whatever the percentage
+MIN_TIME_DELTA_S = 0.5
+MIN_RSS_DELTA_MB = 20.0
+
+@dataclass
+class StageResult:
+    """Measurements for one pipeline stage"""
+    stage: str
+    ok: bool
+    wall_time_s: float
+    rows: int
+    rows_per_s: Optional[float]
+    peak_rss_mb: float
+    bytes_read: int
+    bytes_written: int
+    rest_calls: int = 0
+    rest_bytes: int = 0
+    error: Optional[str] = None
+
+# =============================================================================
+# Process measurements
+# =============================================================================
+
+def read_proc_io() -> Dict[str, int]:
+    """Characters read/written by this process (files, pipes and sockets)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            values = dict(line.split(':', 1) for line in f)
+        return {'read': int(values['rchar']), 'written': int(values['wchar'])}
+    except (OSError, KeyError, ValueError):
+        return {'read': 0, 'written': 0}
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark so the next stage is measured on its own"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def read_peak_rss_mb() -> float:
+    """Peak resident set size since the last reset (or process start) in MB"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KB on Linux and cannot be reset, so it is a process-wide peak
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def measure_stage(stage: str, fn: Callable[[], int], verbose: bool = False) -> StageResult:
+    """
+    Run one stage and measure it
+
+    Args:
+        stage (str): Stage name
+        fn (Callable[[], int]): Runs the stage and returns the rows it processed
+        verbose (bool): Show the stage's console output
+
+    Returns:
+        StageResult: Stage measurements
+    """
+    gc.collect()
+    reset_peak_rss()
+    metrics = get_metrics()
+    rest_before = (metrics.total('rest_requests_total'),
+                   metrics.total('rest_bytes_sent_total') + metrics.total('rest_bytes_received_total'))
+    io_before = read_proc_io()
+    output = None if verbose else io.StringIO()
+
+    start = time.perf_counter()
+    error = None
+    rows = 0
+    try:
+        with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+            rows = fn()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+
+    io_after = read_proc_io()
+    rest_bytes = metrics.total('rest_bytes_sent_total') + metrics.total('rest_bytes_received_total')
+    return StageResult(
+        stage=stage,
+        ok=error is None,
+        wall_time_s=round(elapsed, 3),
+        rows=rows,
+        rows_per_s=round(rows / elapsed, 1) if rows and elapsed else None,
+        peak_rss_mb=round(read_peak_rss_mb(), 1),
+        bytes_read=io_after['read'] - io_before['read'],
+        bytes_written=io_after['written'] - io_before['written'],
+        rest_calls=int(metrics.total('rest_requests_total') - rest_before[0]),
+        rest_bytes=int(rest_bytes - rest_before[1]),
+        error=error
+    )
+
+# =============================================================================
+# Dataset and stand-in
+# =============================================================================
+
+def prepare_dataset(name: str, seed: int, workers: int) -> Path:
+    """
+    Generate (or reuse) the fixed synthetic dataset for a benchmark size
+
+    Args:
+        name (str): Dataset name from DATASETS
+        seed (int): Generator seed
+        workers (int): Generator worker processes
+
+    Returns:
+        Path: Directory with trade_db/ and species_list.csv
+    """
+    dataset_dir = DATASETS_DIR / f"{name}-s{seed}"
+    manifest_file = dataset_dir / 'manifest.json'
+    if manifest_file.exists():
+        return dataset_dir
+
+    rows = DATASETS[name]
+    print(f"🧬 Generating {name} dataset ({rows:,} target rows, filler ratio {FILLER_RATIO})...")
+    csv_dir = dataset_dir / 'trade_db'
+    csv_dir.mkdir(parents=True, exist_ok=True)
+
+    generator = TradeGenerator(load_profile(DEFAULT_PROFILE), seed=seed)
+    generator.write_species_list(dataset_dir / 'species_list.csv')
+    generator.write_csv(rows, csv_dir, ROWS_PER_FILE, FILLER_RATIO, workers)
+
+    # Written last so an interrupted generation is redone on the next run
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'dataset': name,
+            'rows': rows,
+            'filler_ratio': FILLER_RATIO,
+            'seed': seed,
+            'created_at': datetime.now().isoformat()
+        }, f, indent=2)
+    return dataset_dir
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@contextlib.contextmanager
+def standin_process(species_file: Path, latency_ms: float, per_row_us: float):
+    """
+    Run the PostgREST stand-in in a child process seeded with the dataset species
+
+    Yields:
+        str: Base URL of the stand-in
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-u', str(Path(__file__).parent / 'postgrest_standin.py'),
+         '--port', str(port), '--latency-ms', str(latency_ms), '--per-row-us', str(per_row_us),
+         '--seed-species', '--species-file', str(species_file)],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    try:
+        for line in process.stdout:
+            if 'SUPABASE_URL=' in line:
+                break
+        else:
+            raise RuntimeError('PostgREST stand-in exited before it was ready')
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def configure_environment(url: str) -> None:
+    """
+    Point the Supabase client at the stand-in
+
+    Must run before config is first imported. Real credentials are overridden on
+    purpose so a benchmark can never write to the production database.
+    """
+    os.environ['SUPABASE_URL'] = url
+    os.environ['SUPABASE_ANON_KEY'] = STANDIN_KEY
+    os.environ['SUPABASE_SERVICE_ROLE_KEY'] = STANDIN_KEY
+
+# =============================================================================
+# Pipeline stages
+# =============================================================================
+
+class PipelineRun:
+    """Runs the pipeline stages against one dataset in a scratch directory"""
+
+    def __init__(self, dataset_dir: Path, work_dir: Path, batch_size: int = 1000):
+        self.dataset_dir = dataset_dir
+        self.work_dir = work_dir
+        self.batch_size = batch_size
+        self.species_dir = work_dir / 'individual_species'
+        self.optimized_dir = work_dir / 'optimized_species'
+        self.optimized_records = 0
+
+    def extract(self) -> int:
+        from core.extract_species_trade_data import SpeciesTradeExtractor
+
+        extractor = SpeciesTradeExtractor(
+            str(self.dataset_dir / 'species_list.csv'),
+            str(self.dataset_dir / 'trade_db'),
+            str(self.species_dir)
+        )
+        extractor.run()
+        return extractor.stats['total_trade_records']
+
+    def optimize(self) -> int:
+        from core.optimize_species_trade_json import TradeDataOptimizer
+
+        optimizer = TradeDataOptimizer(str(self.species_dir), str(self.optimized_dir))
+        optimizer.optimize_all_files()
+        self.optimized_records = optimizer.stats['total_records']
+        return self.optimized_records
+
+    def validate(self) -> int:
+        from core.validate_before_load import PreLoadValidator
+
+        validator = PreLoadValidator()
+        validator.optimized_dir = self.optimized_dir
+        if not validator.run_full_validation():
+            raise RuntimeError('pre-load validation reported failures')
+        return self.optimized_records
+
+    def load(self) -> int:
+        from core.load_optimized_trade_data import TradeDataLoader
+
+        loader = TradeDataLoader(str(self.optimized_dir), batch_size=self.batch_size)
+        if not loader.load_all_data():
+            raise RuntimeError('loader found no optimized files')
+        return loader.stats.records_loaded
+
+    def summaries(self) -> int:
+        from core.generate_trade_summaries import TradeSummaryGenerator
+
+        generator = TradeSummaryGenerator()
+        if not generator.generate_all_summaries():
+            raise RuntimeError('some summaries failed')
+        return generator.stats['total_records_analyzed']
+
+# =============================================================================
+# History and regressions
+# =============================================================================
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=rebuild_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def append_history(history_file: Path, run: Dict[str, Any]) -> None:
+    history = []
+    if history_file.exists():
+        with open(history_file, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    history.append(run)
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+
+def save_baseline(baseline_file: Path, run: Dict[str, Any]) -> None:
+    baselines = {}
+    if baseline_file.exists():
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+    baselines[run['dataset']] = run
+    baseline_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2)
+
+def find_regressions(run: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare a run against the baseline run for the same dataset
+
+    Args:
+        run (Dict[str, Any]): Current run
+        baseline (Dict[str, Any]): Baseline run
+        threshold (float): Allowed relative increase (0.1 = 10%)
+
+    Returns:
+        List[Dict[str, Any]]: One entry per regressed stage metric
+    """
+    regressions = []
+    baseline_stages = {s['stage']: s for s in baseline.get('stages', [])}
+    for stage in run['stages']:
+        previous = baseline_stages.get(stage['stage'])
+        if not previous or not previous['ok'] or not stage['ok']:
+            continue
+        for metric, floor in (('wall_time_s', MIN_TIME_DELTA_S), ('peak_rss_mb', MIN_RSS_DELTA_MB)):
+            old, new = previous[metric], stage[metric]
+            if old and new - old > max(old * threshold, floor):
+                regressions.append({
+                    'stage': stage['stage'],
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change_pct': round((new - old) / old * 100, 1)
+                })
+    return regressions
+
+def format_bytes(value: int) -> str:
+    return f"{value / (1024 * 1024):.1f}MB"
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the trade pipeline end to end on synthetic data')
+    parser.add_argument('--dataset', choices=sorted(DATASETS), default='small', help='Fixed dataset size')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stages to run (in pipeline order)')
+    parser.add_argument('--seed', type=int, default=42, help='Dataset generator seed')
+    parser.add_argument('--workers', type=int, default=1, help='Dataset generator worker processes')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Loader batch size')
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='Stand-in latency per request')
+    parser.add_argument('--per-row-us', type=float, default=0.0, help='Stand-in latency per row')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY), help='History JSON file')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the dataset baseline')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 when a regression is found')
+    parser.add_argument('--metrics-dir', help='Also export the instrumentation metrics (JSON + Prometheus) here')
+    parser.add_argument('--verbose', action='store_true', help='Show pipeline output')
+
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+    stages = [s for s in STAGES if s in stages]
+
+    dataset_dir = prepare_dataset(args.dataset, args.seed, args.workers).resolve()
+
+    print("🧪 End-to-End Pipeline Benchmark")
+    print("=" * 60)
+    print(f"Dataset: {args.dataset} ({DATASETS[args.dataset]:,} target rows)  stages: {', '.join(stages)}")
+    print(f"Stand-in latency: {args.latency_ms}ms/request\n")
+    print(f"{'stage':<10} {'wall s':>8} {'rows':>9} {'rows/s':>9} {'peak RSS':>9} {'read':>9} {'written':>9} "
+          f"{'REST':>6} {'REST MB':>8}")
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    results: List[StageResult] = []
+    original_cwd = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix='pipeline_bench_') as tmp, \
+            standin_process(dataset_dir / 'species_list.csv', args.latency_ms, args.per_row_us) as url:
+        work_dir = Path(tmp)
+        (work_dir / 'logs').mkdir()
+        configure_environment(url)
+        # Pipeline scripts write log files to the working directory
+        os.chdir(work_dir)
+        try:
+            pipeline = PipelineRun(dataset_dir, work_dir, args.batch_size)
+            for stage in stages:
+                result = measure_stage(stage, getattr(pipeline, stage), args.verbose)
+                results.append(result)
+                rate = f"{result.rows_per_s:,.0f}" if result.rows_per_s else '-'
+                print(f"{stage:<10} {result.wall_time_s:>8} {result.rows:>9,} {rate:>9} "
+                      f"{result.peak_rss_mb:>7.0f}MB {format_bytes(result.bytes_read):>9} "
+                      f"{format_bytes(result.bytes_written):>9} {result.rest_calls:>6} "
+                      f"{format_bytes(result.rest_bytes):>8}")
+                if not result.ok:
+                    print(f"   ❌ {result.error}")
+                    break
+        finally:
+            os.chdir(original_cwd)
+
+    run = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': current_commit(),
+        'dataset': args.dataset,
+        'seed': args.seed,
+        'latency_ms': args.latency_ms,
+        'batch_size': args.batch_size,
+        'stages': [asdict(r) for r in results]
+    }
+    append_history(Path(args.history), run)
+    print(f"\n💾 Run appended to {args.history}")
+    if args.metrics_dir:
+        json_file, prom_file = get_metrics().export(Path(args.metrics_dir), f"pipeline_{args.dataset}")
+        print(f"📊 Spans and REST metrics written to {json_file} and {prom_file}")
+
+    regressions = []
+    baseline_file = Path(args.baseline)
+    if baseline_file.exists():
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get(args.dataset)
+        if baseline:
+            regressions = find_regressions(run, baseline, args.threshold)
+            print(f"\n📏 Compared with baseline from {baseline['timestamp']} ({baseline.get('commit')})")
+            for r in regressions:
+                print(f"   ⚠️  {r['stage']} {r['metric']}: {r['baseline']} → {r['current']} (+{r['change_pct']}%)")
+            if not regressions:
+                print(f"   ✅ No regressions above {args.threshold:.0%}")
+
+    if args.save_baseline:
+        save_baseline(baseline_file, run)
+        print(f"📌 Baseline for '{args.dataset}' saved to {baseline_file}")
+
+    failed = any(not r.ok for r in results)
+    if failed or (regressions and args.fail_on_regression):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
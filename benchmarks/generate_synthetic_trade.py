@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+Synthetic CITES Trade Data Generator
+
+Generates CITES trade data at scale (1M, 10M, 100M rows) for benchmarking the
+extractor, optimizer, loaders and summary generator. Values are drawn from a
+distribution profile measured on the real optimized species files:
+
+- per species: record share, taxonomy/appendix combinations, years and the
+  joint (term, unit, purpose, source, reporter type) distribution
+- global: importer/exporter/origin country codes and raw quantities per unit
+
+Outputs (any combination):
+- trade_db_<n>.csv files in the CITES Trade Database download layout, optionally
+  padded with non-target "filler" taxa like the full 28M-row download
+- <Species>_trade_data_optimized.json[.gz] files in the 2.0_optimized format
+- species_list.csv (same columns as docs/reports/species_names_latest.csv) for
+  the extractor's --species-file and for seeding the PostgREST stand-in
+
+Generation is chunked and streamed, so memory stays flat at any row count.
+
+Usage:
+    python generate_synthetic_trade.py --rows 1M --output-dir /tmp/synthetic_1m [--format csv,optimized]
+                                       [--extra-species 50] [--filler-ratio 0] [--rows-per-file 500000]
+    python generate_synthetic_trade.py --build-profile   # re-measure fixtures/trade_distributions.json
+"""
+
+import os
+import csv
+import sys
+import gzip
+import json
+import time
+import uuid
+import argparse
+from pathlib import Path
+from datetime import datetime
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Tuple, Callable
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Add rebuild directory to path
+rebuild_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(rebuild_dir))
+
+DEFAULT_PROFILE = Path(__file__).parent / 'fixtures' / 'trade_distributions.json'
+OPTIMIZED_DIR = rebuild_dir / 'species_data' / 'processed' / 'optimized_species'
+SPECIES_FILE = rebuild_dir / 'docs' / 'reports' / 'species_names_latest.csv'
+
+CSV_COLUMNS = ['Id', 'Year', 'Appendix', 'Taxon', 'Class', 'Order', 'Family', 'Genus', 'Term',
+               'Quantity', 'Unit', 'Importer', 'Exporter', 'Origin', 'Purpose', 'Source',
+               'Reporter.type', 'Import.permit.RandomID', 'Export.permit.RandomID', 'Origin.permit.RandomID']
+TAXONOMY_FIELDS = ['appendix', 'class', 'order', 'family', 'genus']
+COMBO_FIELDS = ['term', 'unit', 'purpose', 'source', 'reporter_type']
+LOCATION_FIELDS = ['importer', 'exporter', 'origin']
+QUANTITY_SAMPLE = 500
+CHUNK_SIZE = 200_000
+
+# Share of the full CITES download that matches the Arctic species list (~489k of ~28M)
+REAL_FILLER_RATIO = 56
+
+def parse_count(value: str) -> int:
+    """Parse row counts such as 1M, 10m, 250k or 1000000"""
+    value = value.strip().lower().replace('_', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}.get(value[-1:], 1)
+    number = value[:-1] if multiplier > 1 else value
+    return int(float(number) * multiplier)
+
+# =============================================================================
+# Profile
+# =============================================================================
+
+def read_optimized_records(file_path: Path) -> List[Dict[str, Any]]:
+    """
+    Read an optimized species file back into flat records
+
+    Args:
+        file_path (Path): *_trade_data_optimized.json[.gz] file
+
+    Returns:
+        List[Dict[str, Any]]: Records with taxonomy, locations and categories resolved
+    """
+    opener = gzip.open if file_path.suffix == '.gz' else open
+    with opener(file_path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+
+    lookups = data['lookup_tables']
+    taxonomic, locations = lookups['taxonomic'], lookups['locations']
+    categorical = lookups['categorical_reverse']
+
+    records = []
+    for record in data['trade_records']:
+        flat = {'year': record.get('year'), 'quantity_raw': record.get('quantity_raw', '')}
+        flat.update(taxonomic.get(str(record.get('taxonomic_id')), {}))
+        for field in LOCATION_FIELDS:
+            flat[field] = locations.get(str(record.get(f'{field}_id')), '')
+        for field in COMBO_FIELDS:
+            flat[field] = categorical.get(field, {}).get(str(record.get(f'{field}_id')), '')
+        records.append(flat)
+    return records
+
+def build_profile(optimized_dir: Path = OPTIMIZED_DIR, seed: int = 42) -> Dict[str, Any]:
+    """
+    Measure value distributions from the optimized species files
+
+    Args:
+        optimized_dir (Path): Directory with *_trade_data_optimized.json.gz files
+        seed (int): Seed for the quantity reservoir samples
+
+    Returns:
+        Dict[str, Any]: Distribution profile
+    """
+    rng = np.random.default_rng(seed)
+    species_profiles = []
+    locations = {field: Counter() for field in LOCATION_FIELDS}
+    quantities: Dict[str, List[str]] = defaultdict(list)
+    seen_per_unit: Counter = Counter()
+    total = 0
+
+    for file_path in sorted(optimized_dir.glob('*_trade_data_optimized.json.gz')):
+        species = file_path.name.replace('_trade_data_optimized.json.gz', '').replace('_', ' ')
+        records = read_optimized_records(file_path)
+
+        taxonomy, years, combos = Counter(), Counter(), Counter()
+        for record in records:
+            taxonomy[tuple(record.get(f, '') for f in TAXONOMY_FIELDS)] += 1
+            years[record.get('year')] += 1
+            combos[tuple(record.get(f, '') for f in COMBO_FIELDS)] += 1
+            for field in LOCATION_FIELDS:
+                locations[field][record.get(field, '')] += 1
+
+            # Reservoir sample of raw quantity strings per unit
+            raw = record.get('quantity_raw', '')
+            if raw:
+                unit = record.get('unit', '')
+                seen_per_unit[unit] += 1
+                reservoir = quantities[unit]
+                if len(reservoir) < QUANTITY_SAMPLE:
+                    reservoir.append(raw)
+                else:
+                    slot = rng.integers(0, seen_per_unit[unit])
+                    if slot < QUANTITY_SAMPLE:
+                        reservoir[slot] = raw
+
+        species_profiles.append({
+            'name': species,
+            'records': len(records),
+            'taxonomy': [list(k) + [c] for k, c in taxonomy.most_common()],
+            'years': [[y, c] for y, c in sorted(years.items(), key=lambda x: (x[0] is None, x[0] or 0))],
+            'combos': [list(k) + [c] for k, c in combos.most_common()]
+        })
+        total += len(records)
+        print(f"   📊 {species}: {len(records):,} records, {len(combos)} term/unit/purpose/source combos")
+
+    return {
+        'created_at': datetime.now().isoformat(),
+        'source': str(optimized_dir.relative_to(rebuild_dir)) if optimized_dir.is_relative_to(rebuild_dir) else str(optimized_dir),
+        'total_records': total,
+        'species': species_profiles,
+        'locations': {field: [[k, c] for k, c in counter.most_common()] for field, counter in locations.items()},
+        'quantities': dict(quantities)
+    }
+
+def load_profile(profile_file: Path = DEFAULT_PROFILE) -> Dict[str, Any]:
+    with open(profile_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class Categorical:
+    """Weighted categorical distribution sampled with numpy"""
+
+    def __init__(self, pairs: List[List[Any]]):
+        self.values = [p[:-1] if len(p) > 2 else p[0] for p in pairs]
+        weights = np.array([p[-1] for p in pairs], dtype=float)
+        self.probabilities = weights / weights.sum()
+
+    def sample_index(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.choice(len(self.values), size=size, p=self.probabilities)
+
+class SpeciesModel:
+    """Sampling model for one (real or cloned) species"""
+
+    def __init__(self, name: str, profile: Dict[str, Any]):
+        self.name = name
+        self.taxonomy = Categorical(profile['taxonomy'])
+        self.years = Categorical(profile['years'])
+        self.combos = Categorical(profile['combos'])
+        if ' ' in name and name.split()[0] != profile['name'].split()[0]:
+            # Cloned species keep the template's distributions but their own genus
+            self.taxonomy.values = [v[:4] + [name.split()[0]] for v in self.taxonomy.values]
+
+class TradeGenerator:
+    """Streams synthetic trade rows drawn from a distribution profile"""
+
+    def __init__(self, profile: Dict[str, Any], extra_species: int = 0, seed: int = 42):
+        """
+        Initialize the generator
+
+        Args:
+            profile (Dict[str, Any]): Distribution profile (see build_profile)
+            extra_species (int): Synthetic species added on top of the profiled ones,
+                cloned from real species so volumes scale like new listings
+            seed (int): Random seed
+        """
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.profile = profile
+        self.extra_species = extra_species
+
+        templates = profile['species']
+        self.species = [SpeciesModel(s['name'], s) for s in templates]
+        weights = [s['records'] for s in templates]
+        for i in range(extra_species):
+            template = templates[i % len(templates)]
+            genus = f"Synthetica{i // len(templates) + 1:03d}"
+            name = f"{genus} {template['name'].split()[-1]}"
+            self.species.append(SpeciesModel(name, template))
+            weights.append(template['records'])
+        self.species_weights = np.array(weights, dtype=float) / sum(weights)
+
+        self.locations = {field: Categorical(pairs) for field, pairs in profile['locations'].items()}
+        self.quantities = {unit: np.array(values, dtype=object) for unit, values in profile['quantities'].items()}
+        self._filler_taxa = [f"Fillerus species{i:04d}" for i in range(2000)]
+
+    def split_rows(self, rows: int) -> np.ndarray:
+        """Rows per species for a total row count"""
+        return self.rng.multinomial(rows, self.species_weights)
+
+    def _quantities(self, units: np.ndarray) -> np.ndarray:
+        raw = np.full(len(units), '', dtype=object)
+        for unit in np.unique(units):
+            pool = self.quantities.get(unit)
+            if pool is None or not len(pool):
+                continue
+            mask = units == unit
+            raw[mask] = pool[self.rng.integers(0, len(pool), mask.sum())]
+        return raw
+
+    def species_frame(self, model: SpeciesModel, size: int) -> pd.DataFrame:
+        """
+        Sample trade rows for one species
+
+        Args:
+            model (SpeciesModel): Species to sample
+            size (int): Number of rows
+
+        Returns:
+            pd.DataFrame: Rows with lower-case record field names
+        """
+        rng = self.rng
+        taxonomy = np.array(model.taxonomy.values, dtype=object)[model.taxonomy.sample_index(rng, size)]
+        combos = np.array(model.combos.values, dtype=object)[model.combos.sample_index(rng, size)]
+        years = np.array(model.years.values, dtype=object)[model.years.sample_index(rng, size)]
+
+        frame = pd.DataFrame({
+            'id': rng.integers(1_000_000_000, 9_999_999_999, size).astype(str),
+            'year': years,
+            'taxon': model.name
+        })
+        for i, field in enumerate(TAXONOMY_FIELDS):
+            frame[field] = [t[i] for t in taxonomy]
+        for i, field in enumerate(COMBO_FIELDS):
+            frame[field] = [c[i] for c in combos]
+        for field, dist in self.locations.items():
+            frame[field] = np.array(dist.values, dtype=object)[dist.sample_index(rng, size)]
+        frame['quantity_raw'] = self._quantities(frame['unit'].to_numpy())
+        return frame
+
+    def filler_frame(self, size: int) -> pd.DataFrame:
+        """Rows for non-target taxa (the bulk of the real CITES download)"""
+        model = self.species[self.rng.integers(0, len(self.species))]
+        frame = self.species_frame(model, size)
+        frame['taxon'] = np.array(self._filler_taxa, dtype=object)[self.rng.integers(0, len(self._filler_taxa), size)]
+        frame['genus'] = frame['taxon'].str.split(' ').str[0]
+        return frame
+
+    # ------------------------------------------------------------------ outputs
+
+    def write_csv(self, rows: int, output_dir: Path, rows_per_file: int = 500_000,
+                  filler_ratio: float = 0.0, workers: int = 1) -> List[Path]:
+        """
+        Write trade_db_<n>.csv files
+
+        Each file gets its own random stream, so the output is the same for any
+        number of workers. trade_db_*.csv files already in output_dir are
+        removed first, so a smaller run never mixes with a larger earlier one.
+
+        Args:
+            rows (int): Target-species rows
+            output_dir (Path): Output directory
+            rows_per_file (int): Rows per CSV file (the real download uses 500k)
+            filler_ratio (float): Non-target rows per target row
+            workers (int): Files generated in parallel processes
+
+        Returns:
+            List[Path]: Files written
+        """
+        total_rows = rows + int(rows * filler_ratio)
+        target_share = rows / total_rows if total_rows else 1.0
+
+        for stale_file in output_dir.glob('trade_db_*.csv'):
+            stale_file.unlink()
+
+        tasks = []
+        for index, start in enumerate(range(0, total_rows, rows_per_file)):
+            file_path = output_dir / f"trade_db_{index + 1}.csv"
+            tasks.append((self.profile, self.extra_species, self.seed, index, file_path,
+                          min(rows_per_file, total_rows - start), target_share))
+        return _run_tasks(_csv_worker, tasks, workers)
+
+    def _write_csv_file(self, file_path: Path, file_rows: int, target_share: float) -> Path:
+        produced = 0
+        while produced < file_rows:
+            size = min(CHUNK_SIZE, file_rows - produced)
+            target = self.rng.binomial(size, target_share)
+            frames = []
+            for index, count in enumerate(self.rng.multinomial(target, self.species_weights)):
+                if count:
+                    frames.append(self.species_frame(self.species[index], count))
+            if size - target:
+                frames.append(self.filler_frame(size - target))
+            chunk = pd.concat(frames, ignore_index=True).sample(frac=1, random_state=self.rng.integers(1 << 31))
+            self._to_csv_layout(chunk).to_csv(file_path, mode='a' if produced else 'w',
+                                              header=not produced, index=False)
+            produced += size
+        print(f"   💾 {file_path.name}: {file_rows:,} rows")
+        return file_path
+
+    @staticmethod
+    def _to_csv_layout(frame: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({
+            'Id': frame['id'], 'Year': frame['year'], 'Appendix': frame['appendix'], 'Taxon': frame['taxon'],
+            'Class': frame['class'], 'Order': frame['order'], 'Family': frame['family'], 'Genus': frame['genus'],
+            'Term': frame['term'], 'Quantity': frame['quantity_raw'], 'Unit': frame['unit'],
+            'Importer': frame['importer'], 'Exporter': frame['exporter'], 'Origin': frame['origin'],
+            'Purpose': frame['purpose'], 'Source': frame['source'], 'Reporter.type': frame['reporter_type'],
+            'Import.permit.RandomID': '', 'Export.permit.RandomID': '', 'Origin.permit.RandomID': ''
+        })[CSV_COLUMNS]
+
+    def write_optimized(self, rows: int, output_dir: Path, compress: bool = True, workers: int = 1) -> List[Path]:
+        """
+        Write one 2.0_optimized species file per species
+
+        Lookup tables come from the profile vocabulary, so records can be streamed
+        to disk without holding a species in memory.
+
+        Args:
+            rows (int): Total rows across all species
+            output_dir (Path): Output directory
+            compress (bool): Write .json.gz instead of .json
+            workers (int): Species files generated in parallel processes
+
+        Returns:
+            List[Path]: Files written
+        """
+        tasks = [
+            (self.profile, self.extra_species, self.seed, index, output_dir, int(count), compress)
+            for index, count in enumerate(self.split_rows(rows)) if count
+        ]
+        return _run_tasks(_species_worker, tasks, workers)
+
+    def _write_species_file(self, model: SpeciesModel, count: int, output_dir: Path, compress: bool) -> Path:
+        taxonomy_lookup = {i: dict(zip(TAXONOMY_FIELDS, v)) for i, v in enumerate(model.taxonomy.values)}
+        taxonomy_index = {tuple(v): i for i, v in enumerate(model.taxonomy.values)}
+
+        location_values = sorted({v for dist in self.locations.values() for v in dist.values if v})
+        location_index = {v: i for i, v in enumerate(location_values)}
+
+        categorical = {}
+        for i, field in enumerate(COMBO_FIELDS):
+            values = sorted({c[i] for c in model.combos.values if c[i]})
+            categorical[field] = {v: n for n, v in enumerate(values)}
+
+        lookup_tables = {
+            'taxonomic': taxonomy_lookup,
+            'locations': {i: v for v, i in location_index.items()},
+            'categorical': categorical,
+            'categorical_reverse': {f: {i: v for v, i in m.items()} for f, m in categorical.items()}
+        }
+
+        years, term_counts = set(), Counter()
+        importers, exporters = set(), set()
+        unit_totals: Dict[str, List[float]] = {}
+
+        safe_name = model.name.replace(' ', '_')
+        suffix = '.json.gz' if compress else '.json'
+        file_path = output_dir / f"{safe_name}_trade_data_optimized{suffix}"
+        opener = gzip.open if compress else open
+
+        with opener(file_path, 'wt', encoding='utf-8') as f:
+            head = {'format_version': '2.0_optimized', 'species': model.name, 'lookup_tables': lookup_tables}
+            f.write(json.dumps(head, separators=(',', ':'), ensure_ascii=False)[:-1])
+            f.write(',"trade_records":[')
+
+            first = True
+            for start in range(0, count, CHUNK_SIZE):
+                frame = self.species_frame(model, min(CHUNK_SIZE, count - start))
+                columns = ['id', 'year', *TAXONOMY_FIELDS, *COMBO_FIELDS, *LOCATION_FIELDS, 'quantity_raw']
+                for values in zip(*(frame[c].to_numpy() for c in columns)):
+                    row = dict(zip(columns, values))
+                    record = {'id': row['id'], 'year': row['year'],
+                              'taxonomic_id': taxonomy_index[tuple(row[f] for f in TAXONOMY_FIELDS)]}
+                    for field in COMBO_FIELDS:
+                        if row[field] in categorical[field]:
+                            record[f'{field}_id'] = categorical[field][row[field]]
+                    for field in LOCATION_FIELDS:
+                        if row[field]:
+                            record[f'{field}_id'] = location_index[row[field]]
+                    if row['quantity_raw']:
+                        record['quantity_raw'] = row['quantity_raw']
+                        try:
+                            quantity = float(row['quantity_raw'].replace(',', ''))
+                            record['quantity_normalized'] = quantity
+                            stats = unit_totals.setdefault(row['unit'] or 'Unknown', [0.0, 0, quantity, quantity])
+                            stats[0] += quantity
+                            stats[1] += 1
+                            stats[2] = min(stats[2], quantity)
+                            stats[3] = max(stats[3], quantity)
+                        except ValueError:
+                            pass
+                    record['source_file'] = 'synthetic'
+
+                    if row['year'] is not None:
+                        years.add(row['year'])
+                    if row['term']:
+                        term_counts[row['term']] += 1
+                    if row['importer']:
+                        importers.add(row['importer'])
+                    if row['exporter']:
+                        exporters.add(row['exporter'])
+
+                    f.write(('' if first else ',') + json.dumps(record, separators=(',', ':')))
+                    first = False
+
+            summary = {
+                'total_records': count,
+                'years': {
+                    'range': f"{min(years)}-{max(years)}" if years else "Unknown",
+                    'unique_years': sorted(years),
+                    'total_years': len(years)
+                },
+                'countries': {
+                    'importing_countries': sorted(importers),
+                    'exporting_countries': sorted(exporters),
+                    'total_importing': len(importers),
+                    'total_exporting': len(exporters)
+                },
+                'terms': {
+                    'unique_terms': len(term_counts),
+                    'top_terms': [{'term': t, 'count': c} for t, c in term_counts.most_common(5)]
+                },
+                'quantities': {
+                    unit: {'total': s[0], 'count': s[1], 'average': s[0] / s[1], 'min': s[2], 'max': s[3]}
+                    for unit, s in unit_totals.items()
+                }
+            }
+            metadata = {
+                'optimization_date': datetime.now().isoformat(),
+                'original_records': count,
+                'optimized_records': count,
+                'synthetic': True,
+                'compression_info': {
+                    'taxonomic_combinations': len(taxonomy_lookup),
+                    'unique_locations': len(location_index),
+                    'categorical_mappings': {k: len(v) for k, v in categorical.items()}
+                }
+            }
+            f.write('],"summary":' + json.dumps(summary, separators=(',', ':')))
+            f.write(',"metadata":' + json.dumps(metadata, separators=(',', ':')) + '}')
+
+        print(f"   💾 {file_path.name}: {count:,} records")
+        return file_path
+
+    def write_species_list(self, output_file: Path) -> None:
+        """
+        Write the species list in the species_names_latest.csv layout
+
+        Real species keep their IDs and taxonomy from the report; synthetic ones
+        get deterministic UUIDs.
+        """
+        known = {}
+        if SPECIES_FILE.exists():
+            with open(SPECIES_FILE, 'r', encoding='utf-8') as f:
+                known = {row['scientific_name']: row for row in csv.DictReader(f)}
+
+        columns = ['id', 'scientific_name', 'common_name', 'family', 'family_id', 'genus', 'class',
+                   'order_name', 'authority', 'sis_id', 'inaturalist_id']
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            for model in self.species:
+                if model.name in known:
+                    writer.writerow({c: known[model.name].get(c, '') for c in columns})
+                    continue
+                appendix, class_name, order, family, genus = model.taxonomy.values[0]
+                writer.writerow({
+                    'id': str(uuid.uuid5(uuid.NAMESPACE_URL, f'arctic-tracker/synthetic/{model.name}')),
+                    'scientific_name': model.name,
+                    'common_name': f"Synthetic {model.name.split()[-1]}",
+                    'family': family, 'family_id': '', 'genus': genus, 'class': class_name,
+                    'order_name': order, 'authority': 'synthetic', 'sis_id': '', 'inaturalist_id': ''
+                })
+
+def _csv_worker(task: Tuple) -> Path:
+    profile, extra_species, seed, index, file_path, file_rows, target_share = task
+    generator = TradeGenerator(profile, extra_species, seed)
+    generator.rng = np.random.default_rng([seed, 0, index])
+    return generator._write_csv_file(file_path, file_rows, target_share)
+
+def _species_worker(task: Tuple) -> Path:
+    profile, extra_species, seed, index, output_dir, count, compress = task
+    generator = TradeGenerator(profile, extra_species, seed)
+    generator.rng = np.random.default_rng([seed, 1, index])
+    return generator._write_species_file(generator.species[index], count, output_dir, compress)
+
+def _run_tasks(worker: Callable[[Tuple], Path], tasks: List[Tuple], workers: int) -> List[Path]:
+    """Run generation tasks sequentially or in a process pool"""
+    if workers <= 1 or len(tasks) <= 1:
+        return [worker(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(worker, tasks))
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic CITES trade data at scale')
+    parser.add_argument('--rows', type=parse_count, default=parse_count('1M'),
+                       help='Target-species rows, e.g. 1M, 10M, 100M')
+    parser.add_argument('--output-dir', help='Directory for generated files')
+    parser.add_argument('--format', default='csv,optimized',
+                       help='Comma-separated outputs: csv, optimized')
+    parser.add_argument('--extra-species', type=int, default=0,
+                       help='Synthetic species cloned from real ones (models new listings)')
+    parser.add_argument('--filler-ratio', type=float, default=0.0,
+                       help=f'Non-target rows per target row in the CSVs (real download: ~{REAL_FILLER_RATIO})')
+    parser.add_argument('--rows-per-file', type=parse_count, default=500_000, help='Rows per trade_db CSV')
+    parser.add_argument('--no-gzip', action='store_true', help='Write optimized files as plain JSON')
+    parser.add_argument('--profile', default=str(DEFAULT_PROFILE), help='Distribution profile JSON')
+    parser.add_argument('--build-profile', action='store_true',
+                       help='Re-measure the profile from the optimized species files and exit')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Parallel processes (one file per task)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+
+    args = parser.parse_args()
+
+    if args.build_profile:
+        print(f"📐 Measuring distributions from {OPTIMIZED_DIR}")
+        profile = build_profile(OPTIMIZED_DIR, args.seed)
+        Path(args.profile).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, separators=(',', ':'), ensure_ascii=False)
+        print(f"💾 Profile of {profile['total_records']:,} records saved to {args.profile}")
+        return
+
+    if not args.output_dir:
+        parser.error('--output-dir is required unless --build-profile is given')
+
+    formats = {f.strip() for f in args.format.split(',') if f.strip()}
+    unknown = formats - {'csv', 'optimized'}
+    if unknown:
+        parser.error(f"Unknown formats: {', '.join(sorted(unknown))}")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    generator = TradeGenerator(load_profile(Path(args.profile)), args.extra_species, args.seed)
+
+    print("🧬 Synthetic CITES Trade Data")
+    print("=" * 60)
+    print(f"Rows: {args.rows:,}  species: {len(generator.species)}  formats: {', '.join(sorted(formats))}")
+
+    generator.write_species_list(output_dir / 'species_list.csv')
+    timings = {}
+
+    if 'csv' in formats:
+        start = time.perf_counter()
+        csv_dir = output_dir / 'trade_db'
+        csv_dir.mkdir(exist_ok=True)
+        generator.write_csv(args.rows, csv_dir, args.rows_per_file, args.filler_ratio, args.workers)
+        timings['csv_s'] = round(time.perf_counter() - start, 1)
+
+    if 'optimized' in formats:
+        start = time.perf_counter()
+        optimized_dir = output_dir / 'optimized_species'
+        optimized_dir.mkdir(exist_ok=True)
+        generator.write_optimized(args.rows, optimized_dir, compress=not args.no_gzip, workers=args.workers)
+        timings['optimized_s'] = round(time.perf_counter() - start, 1)
+
+    manifest = {
+        'created_at': datetime.now().isoformat(),
+        'rows': args.rows,
+        'species': len(generator.species),
+        'extra_species': args.extra_species,
+        'filler_ratio': args.filler_ratio,
+        'seed': args.seed,
+        'workers': args.workers,
+        'formats': sorted(formats),
+        'timings': timings
+    }
+    with open(output_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\n✅ Done in {sum(timings.values()):.1f}s → {output_dir}")
+
+if __name__ == '__main__':
+    main()
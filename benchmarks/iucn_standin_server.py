@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Local IUCN/CITES API Stand-in Server
+
+This module serves recorded API responses from a fixture file so that
+IUCNApiClient, APIConfigManager.make_request_with_retry and the rebuild scripts
+can be exercised without the real IUCN Red List or CITES APIs. Latency, error
+rate and 429 (rate limit) behavior are configurable.
+
+The server mounts each API under its own prefix:
+    http://127.0.0.1:<port>/iucn/api/v4/...
+    http://127.0.0.1:<port>/cites/api/v1/...
+
+Point the clients at it through IUCN_API_BASE_URL / CITES_API_BASE_URL.
+
+Usage:
+    python iucn_standin_server.py [--port 8765] [--latency-ms 80] [--error-rate 0.02]
+                                  [--max-rps 2] [--throttle-rate 0.05] [--fixtures fixtures/iucn_responses.json]
+"""
+
+import json
+import random
+import threading
+import time
+import argparse
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, unquote, parse_qsl, urlencode
+
+DEFAULT_FIXTURES = Path(__file__).parent / 'fixtures' / 'iucn_responses.json'
+
+# URL prefix -> API name used in fixture keys
+API_PREFIXES = {
+    '/iucn/api/v4': 'iucn',
+    '/cites/api/v1': 'cites'
+}
+
+# Query parameters that never take part in fixture lookup
+IGNORED_PARAMS = {'token'}
+
+@dataclass
+class StandInConfig:
+    """Behavior of the stand-in server"""
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0        # fraction of requests answered with HTTP 500
+    throttle_rate: float = 0.0     # fraction of requests answered with HTTP 429
+    max_rps: Optional[float] = None  # server-side rate limit, excess requests get 429
+    retry_after: float = 1.0       # Retry-After header sent with 429 responses
+    seed: Optional[int] = None
+
+@dataclass
+class StandInStats:
+    """Counters for requests served by the stand-in"""
+    requests: int = 0
+    ok: int = 0
+    not_found: int = 0
+    errors: int = 0
+    throttled: int = 0
+    by_api: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'ok': self.ok,
+            'not_found': self.not_found,
+            'errors': self.errors,
+            'throttled': self.throttled,
+            'by_api': dict(self.by_api)
+        }
+
+def fixture_key(api_name: str, endpoint: str, params: Dict[str, str]) -> str:
+    """
+    Build the fixture lookup key for a request
+
+    Args:
+        api_name (str): API name ('iucn' or 'cites')
+        endpoint (str): Endpoint path relative to the API root
+        params (Dict[str, str]): Query parameters
+
+    Returns:
+        str: Key such as 'iucn/taxa/scientific_name/Ursus maritimus'
+    """
+    key = f"{api_name}/{endpoint.strip('/')}"
+    params = {k: v for k, v in params.items() if k not in IGNORED_PARAMS}
+    if params:
+        key += '?' + urlencode(sorted(params.items()))
+    return key
+
+def load_fixtures(fixtures_file: Path) -> Dict[str, Any]:
+    """
+    Load recorded responses from a fixture file
+
+    Args:
+        fixtures_file (Path): Fixture JSON with a 'responses' mapping
+
+    Returns:
+        Dict[str, Any]: Fixture key -> response body
+    """
+    with open(fixtures_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('responses', {})
+
+class IUCNStandInServer:
+    """
+    Threaded HTTP server replaying recorded IUCN/CITES responses
+    """
+
+    def __init__(self, fixtures_file: Path = DEFAULT_FIXTURES, config: Optional[StandInConfig] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the stand-in server
+
+        Args:
+            fixtures_file (Path): Fixture JSON to serve
+            config (StandInConfig, optional): Latency/error/429 behavior
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+        """
+        self.responses = load_fixtures(Path(fixtures_file))
+        self.config = config or StandInConfig()
+        self.stats = StandInStats()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._tokens = self.config.max_rps or 0.0
+        self._last_refill = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_url(self, api_name: str) -> str:
+        """
+        Get the base URL to configure for an API
+
+        Args:
+            api_name (str): 'iucn' or 'cites'
+
+        Returns:
+            str: Base URL on this server
+        """
+        for prefix, name in API_PREFIXES.items():
+            if name == api_name:
+                return f"{self.address}{prefix}"
+        raise ValueError(f"Unknown API: {api_name}")
+
+    def reset_stats(self) -> None:
+        """Reset request counters and the rate limit bucket"""
+        with self._lock:
+            self.stats = StandInStats()
+            self._tokens = self.config.max_rps or 0.0
+            self._last_refill = time.monotonic()
+
+    def start(self) -> 'IUCNStandInServer':
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _take_token(self) -> bool:
+        """Token bucket for the server-side rate limit (caller holds the lock)"""
+        if not self.config.max_rps:
+            return True
+
+        now = time.monotonic()
+        capacity = max(1.0, self.config.max_rps)
+        self._tokens = min(capacity, self._tokens + (now - self._last_refill) * self.config.max_rps)
+        self._last_refill = now
+
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def handle(self, path: str) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """
+        Decide the response for a request path
+
+        Args:
+            path (str): Raw request path including query string
+
+        Returns:
+            Tuple of (status, extra headers, JSON body)
+        """
+        parts = urlsplit(path)
+        request_path = unquote(parts.path)
+        params = dict(parse_qsl(parts.query))
+
+        api_name, endpoint = None, None
+        for prefix, name in API_PREFIXES.items():
+            if request_path.startswith(prefix + '/'):
+                api_name, endpoint = name, request_path[len(prefix) + 1:]
+                break
+
+        with self._lock:
+            self.stats.requests += 1
+            if api_name:
+                self.stats.by_api[api_name] = self.stats.by_api.get(api_name, 0) + 1
+
+            roll = self._random.random()
+            if not self._take_token() or roll < self.config.throttle_rate:
+                self.stats.throttled += 1
+                return 429, {'Retry-After': str(self.config.retry_after)}, {'error': 'Too Many Requests'}
+
+            if roll < self.config.throttle_rate + self.config.error_rate:
+                self.stats.errors += 1
+                return 500, {}, {'error': 'Internal Server Error'}
+
+            body = self.responses.get(fixture_key(api_name, endpoint, params)) if api_name else None
+            if body is None:
+                self.stats.not_found += 1
+                return 404, {}, {'error': 'Not Found'}
+
+            self.stats.ok += 1
+            return 200, {}, body
+
+    def _delay(self) -> float:
+        """Simulated response latency in seconds"""
+        with self._lock:
+            jitter = self._random.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        return max(0.0, self.config.latency_ms + jitter) / 1000.0
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(server._delay())
+                status, headers, body = server.handle(self.path)
+                payload = json.dumps(body).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # Keep benchmark output clean
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded IUCN/CITES API responses locally')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind')
+    parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES), help='Fixture JSON file')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Response latency in milliseconds')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random +/- latency jitter')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--max-rps', type=float, help='Server-side rate limit (requests/second)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds on 429')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible runs')
+
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    server = IUCNStandInServer(Path(args.fixtures), config, host=args.host, port=args.port)
+
+    print(f"🧪 IUCN/CITES stand-in serving {len(server.responses)} recorded responses")
+    print(f"   IUCN_API_BASE_URL={server.base_url('iucn')}")
+    print(f"   CITES_API_BASE_URL={server.base_url('cites')}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 Served: {json.dumps(server.stats.to_dict())}")
+
+if __name__ == '__main__':
+    main()
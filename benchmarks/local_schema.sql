@@ -0,0 +1,348 @@
+-- Local Arctic Tracker Schema
+-- Benchmarks / local Postgres stand-in
+--
+-- Reproducible copy of the production tables described in docs/DATABASE_SCHEMA.md,
+-- with the columns the loaders actually write (text country/term columns on
+-- cites_trade_records, NAMMCO columns from migration/schema_updates.sql, the
+-- staging table from cites_migration_2025/create_staging_table.sql and the
+-- illegal trade tables from illigal trade/create_illegal_trade_schema.sql).
+--
+-- Used two ways:
+--   1. psql -d arctic_local -f benchmarks/local_schema.sql   (real local Postgres)
+--   2. parsed by benchmarks/postgrest_standin.py to know table columns/defaults
+--
+-- Keep one column per line: the stand-in parser reads this file line by line.
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+-- =============================================================================
+-- Reference tables
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS families (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    family_name TEXT UNIQUE NOT NULL,
+    order_name TEXT,
+    class TEXT,
+    description TEXT,
+    species_count INTEGER,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS species (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    scientific_name TEXT UNIQUE NOT NULL,
+    common_name TEXT,
+    kingdom TEXT,
+    phylum TEXT,
+    class TEXT,
+    order_name TEXT,
+    family TEXT,
+    genus TEXT,
+    species_name TEXT,
+    authority TEXT,
+    sis_id INTEGER,
+    inaturalist_id INTEGER,
+    default_image_url TEXT,
+    description TEXT,
+    habitat_description TEXT,
+    population_trend TEXT,
+    population_size TEXT,
+    generation_length NUMERIC(5,2),
+    movement_patterns TEXT,
+    threats_overview TEXT,
+    conservation_overview TEXT,
+    family_id UUID REFERENCES families(id),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS common_names (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID REFERENCES species(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    language TEXT,
+    is_main BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS countries (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    country_name VARCHAR(100) UNIQUE NOT NULL,
+    country_code VARCHAR(3),
+    nammco_member BOOLEAN DEFAULT FALSE,
+    arctic_council BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS management_areas (
+    id SERIAL PRIMARY KEY,
+    area_name VARCHAR(200) NOT NULL,
+    country_id UUID REFERENCES countries(id),
+    area_type VARCHAR(50),
+    parent_area_id INTEGER REFERENCES management_areas(id),
+    notes TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(area_name, country_id)
+);
+
+-- =============================================================================
+-- CITES / IUCN / CMS
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS cites_trade_records (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID NOT NULL REFERENCES species(id),
+    record_id TEXT,
+    year INTEGER,
+    appendix VARCHAR(10),
+    taxon TEXT,
+    class VARCHAR(50),
+    order_name VARCHAR(50),
+    family VARCHAR(50),
+    genus VARCHAR(50),
+    term VARCHAR(100),
+    quantity NUMERIC,
+    unit VARCHAR(50),
+    importer VARCHAR(100),
+    exporter VARCHAR(100),
+    origin VARCHAR(100),
+    purpose VARCHAR(10),
+    source VARCHAR(10),
+    reporter_type VARCHAR(10),
+    import_permit TEXT,
+    export_permit TEXT,
+    origin_permit TEXT,
+    importer_reported_quantity NUMERIC,
+    exporter_reported_quantity NUMERIC,
+    data_source VARCHAR(100),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_trade_species_year ON cites_trade_records(species_id, year);
+CREATE INDEX IF NOT EXISTS idx_trade_importer ON cites_trade_records(importer);
+CREATE INDEX IF NOT EXISTS idx_trade_exporter ON cites_trade_records(exporter);
+
+CREATE TABLE IF NOT EXISTS cites_trade_records_staging (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID NOT NULL REFERENCES species(id),
+    year INTEGER NOT NULL,
+    appendix VARCHAR(10),
+    taxon TEXT NOT NULL,
+    class VARCHAR(50),
+    order_name VARCHAR(50),
+    family VARCHAR(50),
+    genus VARCHAR(50),
+    importer VARCHAR(100),
+    exporter VARCHAR(100),
+    origin VARCHAR(100),
+    importer_reported_quantity NUMERIC,
+    exporter_reported_quantity NUMERIC,
+    term VARCHAR(50),
+    unit VARCHAR(50),
+    purpose VARCHAR(10),
+    source VARCHAR(10),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    data_source VARCHAR(100) DEFAULT 'CITES v2025.1'
+);
+
+CREATE INDEX IF NOT EXISTS idx_staging_species_id ON cites_trade_records_staging(species_id);
+CREATE INDEX IF NOT EXISTS idx_staging_year ON cites_trade_records_staging(year);
+
+CREATE TABLE IF NOT EXISTS cites_listings (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID REFERENCES species(id),
+    appendix TEXT,
+    listing_date DATE,
+    notes TEXT,
+    is_current BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS iucn_assessments (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID REFERENCES species(id),
+    year_published INTEGER,
+    is_latest BOOLEAN DEFAULT FALSE,
+    possibly_extinct BOOLEAN DEFAULT FALSE,
+    possibly_extinct_in_wild BOOLEAN DEFAULT FALSE,
+    status TEXT,
+    url TEXT,
+    assessment_id INTEGER,
+    scope_code TEXT,
+    scope_description TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS cms_listings (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID REFERENCES species(id),
+    appendix TEXT,
+    agreement TEXT,
+    listed_under TEXT,
+    listing_date TEXT,
+    notes TEXT,
+    native_distribution TEXT[],
+    distribution_codes TEXT[],
+    introduced_distribution TEXT[],
+    extinct_distribution TEXT[],
+    distribution_uncertain TEXT[],
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS species_trade_summary (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID UNIQUE REFERENCES species(id),
+    last_updated_at TIMESTAMPTZ,
+    total_trade_records INTEGER,
+    overall_min_year INTEGER,
+    overall_max_year INTEGER,
+    overall_total_quantity NUMERIC,
+    distinct_years JSONB,
+    distinct_terms JSONB,
+    distinct_importers JSONB,
+    distinct_exporters JSONB,
+    annual_summaries JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- =============================================================================
+-- NAMMCO catch data
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS catch_records (
+    id SERIAL PRIMARY KEY,
+    species_id UUID NOT NULL REFERENCES species(id),
+    country VARCHAR(255),
+    country_id UUID REFERENCES countries(id),
+    management_area_id INTEGER REFERENCES management_areas(id),
+    year INTEGER NOT NULL,
+    area TEXT,
+    catch_total INTEGER,
+    quota TEXT,
+    quota_amount INTEGER,
+    quota_notes TEXT,
+    notes TEXT,
+    source VARCHAR(255),
+    data_source VARCHAR(50) DEFAULT 'NAMMCO',
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT catch_records_natural_key UNIQUE NULLS NOT DISTINCT (species_id, country_id, management_area_id, year)
+);
+
+CREATE INDEX IF NOT EXISTS idx_catch_records_species_year ON catch_records(species_id, year);
+CREATE INDEX IF NOT EXISTS idx_catch_records_country_id ON catch_records(country_id);
+
+-- =============================================================================
+-- Illegal trade
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS illegal_trade_products (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    product_code VARCHAR(20) UNIQUE NOT NULL,
+    product_name VARCHAR(100) NOT NULL,
+    product_category VARCHAR(50),
+    main_category VARCHAR(50),
+    is_high_value BOOLEAN DEFAULT FALSE,
+    search_terms TEXT[],
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS illegal_trade_seizures (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID NOT NULL REFERENCES species(id),
+    source_database VARCHAR(20) NOT NULL,
+    original_record_id VARCHAR(100),
+    seizure_date DATE,
+    seizure_year INTEGER,
+    seizure_location VARCHAR(100),
+    product_type_id UUID REFERENCES illegal_trade_products(id),
+    product_category VARCHAR(50),
+    quantity NUMERIC,
+    unit VARCHAR(50),
+    reported_taxon_name VARCHAR(255),
+    gbif_id VARCHAR(50),
+    db_taxa_name_clean VARCHAR(255),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    data_source VARCHAR(255) DEFAULT 'Stringham et al. 2021'
+);
+
+CREATE INDEX IF NOT EXISTS idx_seizures_species ON illegal_trade_seizures(species_id);
+
+CREATE TABLE IF NOT EXISTS illegal_trade_risk_scores (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID UNIQUE NOT NULL REFERENCES species(id),
+    legal_trade_volume INTEGER,
+    illegal_seizure_count INTEGER,
+    illegal_to_legal_ratio NUMERIC(5,2),
+    volume_risk_score INTEGER DEFAULT 0,
+    conservation_risk_score INTEGER DEFAULT 0,
+    product_risk_score INTEGER DEFAULT 0,
+    trend_risk_score INTEGER DEFAULT 0,
+    overall_risk_score INTEGER DEFAULT 0,
+    risk_category VARCHAR(20) DEFAULT 'LOW',
+    last_calculated TIMESTAMPTZ DEFAULT NOW(),
+    calculation_notes TEXT
+);
+
+-- =============================================================================
+-- Species profiles
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS "references" (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    source_id TEXT UNIQUE NOT NULL,
+    authors TEXT,
+    year INTEGER,
+    title TEXT,
+    journal TEXT,
+    doi TEXT,
+    full_citation TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS conservation_profiles (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    species_id UUID NOT NULL REFERENCES species(id) ON DELETE CASCADE,
+    profile_id TEXT,
+    profile_type TEXT DEFAULT 'comprehensive',
+    file_source TEXT,
+    subpopulations TEXT,
+    distribution_range TEXT,
+    content JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS profile_references (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    profile_id UUID NOT NULL REFERENCES conservation_profiles(id) ON DELETE CASCADE,
+    reference_id UUID NOT NULL REFERENCES "references"(id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(profile_id, reference_id)
+);
+
+-- =============================================================================
+-- Views
+-- =============================================================================
+
+CREATE OR REPLACE VIEW cites_staging_summary AS
+SELECT
+    COUNT(*) as total_records,
+    COUNT(DISTINCT species_id) as unique_species,
+    MIN(year) as earliest_year,
+    MAX(year) as latest_year,
+    COUNT(*) FILTER (WHERE appendix = 'I') as appendix_i_count,
+    COUNT(*) FILTER (WHERE appendix = 'II') as appendix_ii_count,
+    COUNT(*) FILTER (WHERE appendix = 'III') as appendix_iii_count,
+    COUNT(DISTINCT importer) as unique_importers,
+    COUNT(DISTINCT exporter) as unique_exporters
+FROM cites_trade_records_staging;
@@ -0,0 +1,1186 @@
+#!/usr/bin/env python3
+"""
+Local PostgREST Stand-in for Supabase
+
+In-memory, PostgREST-compatible HTTP server so the loader scripts can run
+unmodified against a local database: point SUPABASE_URL at it and the regular
+supabase client (select/insert/upsert/update/delete/rpc) talks to it over HTTP.
+Tables, defaults, unique constraints and foreign keys come from
+benchmarks/local_schema.sql, the same file that can be loaded into a real local
+Postgres with psql.
+
+Emulated PostgREST behavior:
+- filters: eq, neq, gt, gte, lt, lte, like, ilike, is, in, not.<op>, or=(...)
+- select with column lists, forward/reverse embedding and embedded (count)
+- order, limit/offset, Range header, max-rows cap (Supabase default 1000)
+- Prefer: count=exact, return=representation|minimal,
+  resolution=merge-duplicates|ignore-duplicates with on_conflict
+- PostgREST JSON errors (23505 unique, 23502 not null, 23503 foreign key,
+  21000 DELETE without WHERE, PGRST202 unknown function, PGRST205 unknown table)
+
+Every request is counted per (method, table) with rows and bytes in/out so
+benchmarks can report REST round trips next to wall time.
+
+Usage:
+    python postgrest_standin.py [--port 8766] [--latency-ms 5] [--seed-species] [--strict]
+"""
+
+import re
+import csv
+import json
+import time
+import uuid
+import fnmatch
+import argparse
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from urllib.parse import urlsplit, parse_qsl
+
+DEFAULT_SCHEMA = Path(__file__).parent / 'local_schema.sql'
+DEFAULT_SPECIES_FILE = Path(__file__).parent.parent / 'docs' / 'reports' / 'species_names_latest.csv'
+
+# Placeholder key in JWT shape; the supabase client rejects keys that are not JWTs
+STANDIN_KEY = 'eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.standin'
+
+INTEGER_TYPES = ('INTEGER', 'INT', 'BIGINT', 'SMALLINT', 'SERIAL', 'BIGSERIAL')
+NUMERIC_TYPES = ('NUMERIC', 'DECIMAL', 'REAL', 'DOUBLE', 'FLOAT')
+
+# =============================================================================
+# Schema
+# =============================================================================
+
+@dataclass
+class ColumnDef:
+    """Column definition parsed from the schema file"""
+    name: str
+    data_type: str
+    default: Optional[str] = None
+    not_null: bool = False
+    references: Optional[Tuple[str, str]] = None
+
+@dataclass
+class TableDef:
+    """Table definition parsed from the schema file"""
+    name: str
+    columns: Dict[str, ColumnDef] = field(default_factory=dict)
+    primary_key: Optional[str] = None
+    unique: List[Tuple[str, ...]] = field(default_factory=list)
+    nulls_not_distinct: List[Tuple[str, ...]] = field(default_factory=list)
+    indexes: List[str] = field(default_factory=list)
+
+    def foreign_keys(self) -> Dict[str, Tuple[str, str]]:
+        return {name: col.references for name, col in self.columns.items() if col.references}
+
+_CREATE_TABLE = re.compile(r'CREATE TABLE(?: IF NOT EXISTS)?\s+"?(\w+)"?\s*\(', re.IGNORECASE)
+_COLUMN = re.compile(r'^"?(\w+)"?\s+([A-Z]+(?:\s+PRECISION)?(?:\([\d,\s]+\))?(?:\[\])?)(.*)$', re.IGNORECASE)
+_TABLE_UNIQUE = re.compile(r'^(?:CONSTRAINT\s+\w+\s+)?UNIQUE\s*(NULLS\s+NOT\s+DISTINCT\s*)?\(([^)]+)\)', re.IGNORECASE)
+_REFERENCES = re.compile(r'REFERENCES\s+"?(\w+)"?\s*\((\w+)\)', re.IGNORECASE)
+_DEFAULT = re.compile(r"DEFAULT\s+('[^']*'|[\w.()]+)", re.IGNORECASE)
+_CREATE_INDEX = re.compile(r'CREATE INDEX(?: IF NOT EXISTS)?\s+\w+\s+ON\s+"?(\w+)"?\s*\(\s*"?(\w+)"?', re.IGNORECASE)
+
+def parse_schema(schema_file: Path = DEFAULT_SCHEMA) -> Dict[str, TableDef]:
+    """
+    Parse CREATE TABLE statements from a schema file
+
+    Args:
+        schema_file (Path): SQL file with one column definition per line
+
+    Returns:
+        Dict[str, TableDef]: Table name -> definition
+    """
+    tables: Dict[str, TableDef] = {}
+    current: Optional[TableDef] = None
+
+    with open(schema_file, 'r', encoding='utf-8') as f:
+        for raw_line in f:
+            line = raw_line.split('--', 1)[0].strip()
+            if not line:
+                continue
+
+            match = _CREATE_TABLE.match(line)
+            if match:
+                current = TableDef(name=match.group(1))
+                tables[current.name] = current
+                continue
+
+            if current is None:
+                # Secondary indexes serve equality lookups on their leading column
+                index_match = _CREATE_INDEX.match(line)
+                if index_match and index_match.group(1) in tables:
+                    indexed = tables[index_match.group(1)]
+                    if index_match.group(2) not in indexed.indexes:
+                        indexed.indexes.append(index_match.group(2))
+                continue
+
+            if line.startswith(')'):
+                current = None
+                continue
+
+            line = line.rstrip(',')
+            unique_match = _TABLE_UNIQUE.match(line)
+            if unique_match:
+                columns = tuple(c.strip().strip('"') for c in unique_match.group(2).split(','))
+                current.unique.append(columns)
+                if unique_match.group(1):
+                    current.nulls_not_distinct.append(columns)
+                continue
+
+            column_match = _COLUMN.match(line)
+            if not column_match:
+                continue
+
+            name, data_type, rest = column_match.groups()
+            upper_rest = rest.upper()
+            column = ColumnDef(name=name, data_type=data_type.upper())
+
+            default_match = _DEFAULT.search(rest)
+            if default_match:
+                column.default = default_match.group(1)
+            elif column.data_type in ('SERIAL', 'BIGSERIAL'):
+                column.default = 'SERIAL'
+
+            ref_match = _REFERENCES.search(rest)
+            if ref_match:
+                column.references = (ref_match.group(1), ref_match.group(2))
+
+            if 'PRIMARY KEY' in upper_rest:
+                current.primary_key = name
+                column.not_null = True
+            if 'NOT NULL' in upper_rest:
+                column.not_null = True
+            if re.search(r'\bUNIQUE\b', upper_rest):
+                current.unique.append((name,))
+
+            current.columns[name] = column
+
+    return tables
+
+# =============================================================================
+# Errors and value handling
+# =============================================================================
+
+class PostgRESTError(Exception):
+    """Error answered with a PostgREST JSON error body"""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None,
+                 hint: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.body = {'code': code, 'message': message, 'details': details, 'hint': hint}
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def coerce_value(column: ColumnDef, value: Any) -> Any:
+    """
+    Cast an incoming JSON value the way Postgres would for the column type
+
+    Args:
+        column (ColumnDef): Target column
+        value (Any): Value from the request body
+
+    Returns:
+        Any: Stored value
+    """
+    if value is None:
+        return None
+
+    base_type = column.data_type.split('(')[0]
+    try:
+        if base_type in INTEGER_TYPES:
+            if isinstance(value, bool):
+                raise ValueError
+            if isinstance(value, float):
+                if value != value:  # NaN
+                    raise ValueError
+                return int(round(value))
+            return int(str(value).strip()) if isinstance(value, str) else int(value)
+        if base_type in NUMERIC_TYPES:
+            if isinstance(value, bool):
+                raise ValueError
+            number = float(value)
+            return int(number) if number.is_integer() and not isinstance(value, float) else number
+        if base_type == 'BOOLEAN' and isinstance(value, str):
+            lowered = value.lower()
+            if lowered in ('true', 't', '1', 'yes'):
+                return True
+            if lowered in ('false', 'f', '0', 'no'):
+                return False
+            raise ValueError
+    except (TypeError, ValueError):
+        raise PostgRESTError(400, '22P02',
+                             f'invalid input syntax for type {base_type.lower()}: "{value}"')
+    return value
+
+def _typed_literal(sample: Any, literal: str) -> Any:
+    """Convert a filter literal to the type of a stored value for comparison"""
+    if isinstance(sample, bool):
+        return literal.lower() in ('true', 't', '1')
+    if isinstance(sample, (int, float)):
+        try:
+            return float(literal)
+        except ValueError:
+            return literal
+    return literal
+
+def _like_to_pattern(pattern: str) -> str:
+    """Translate a LIKE pattern (% and _ or PostgREST's *) to fnmatch syntax"""
+    return pattern.replace('*', '%').replace('%', '*').replace('_', '?')
+
+def _split_top_level(text: str, sep: str = ',') -> List[str]:
+    """Split on a separator, ignoring separators inside parentheses or quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        if char == sep and depth == 0 and not quoted:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append(''.join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+def _parse_list(text: str) -> List[str]:
+    """Parse an in.(a,"b c") list"""
+    inner = text.strip()
+    if inner.startswith('(') and inner.endswith(')'):
+        inner = inner[1:-1]
+    return [v.strip().strip('"') for v in _split_top_level(inner)]
+
+def _parse_in_list(text: str) -> List[str]:
+    """
+    Parse an in.(a,"b, c","d \\"e\\"") list with PostgREST's grammar
+
+    A double-quoted element runs to the next unescaped quote (backslash escapes
+    the next character) and must be followed by , or ). Anything else is read
+    unquoted up to the next , or ), so a stray quote or parenthesis inside a
+    value ends the list early and the filter fails to parse, as it does on a
+    real server.
+    """
+    error = PostgRESTError(400, 'PGRST100', f'"failed to parse filter (in.{text})"')
+    if not text.startswith('('):
+        raise error
+    values, i = [], 1
+    while True:
+        value = None
+        if text.startswith('"', i):
+            j, chars = i + 1, []
+            while j < len(text) and text[j] != '"':
+                if text[j] == '\\' and j + 1 < len(text):
+                    j += 1
+                chars.append(text[j])
+                j += 1
+            if j + 1 < len(text) and text[j + 1] in ',)':
+                value, i = ''.join(chars), j + 1
+        if value is None:
+            j = i
+            while j < len(text) and text[j] not in ',)':
+                j += 1
+            value, i = text[i:j].strip(), j
+        if i >= len(text):
+            raise error
+        if value or text[i] == ',' or values:
+            values.append(value)
+        if text[i] == ')':
+            if i != len(text) - 1:
+                raise error
+            return values
+        i += 1
+
+def compile_filter(column: str, expression: str) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile one PostgREST filter (column=op.value) to a row predicate
+
+    Args:
+        column (str): Column name
+        expression (str): Operator expression such as 'eq.5' or 'not.is.null'
+
+    Returns:
+        Callable[[Dict[str, Any]], bool]: Row predicate
+    """
+    negate = False
+    if expression.startswith('not.'):
+        negate, expression = True, expression[4:]
+
+    operator, _, literal = expression.partition('.')
+
+    if operator == 'is':
+        target = {'null': None, 'true': True, 'false': False}.get(literal.lower(), literal)
+        def predicate(row):
+            return row.get(column) is target if target is None else row.get(column) == target
+    elif operator == 'in':
+        values = _parse_in_list(literal)
+        def predicate(row):
+            value = row.get(column)
+            return value is not None and any(value == _typed_literal(value, v) for v in values)
+    elif operator in ('like', 'ilike'):
+        pattern = _like_to_pattern(literal)
+        if operator == 'ilike':
+            pattern = pattern.lower()
+        def predicate(row):
+            value = row.get(column)
+            if value is None:
+                return False
+            text = str(value).lower() if operator == 'ilike' else str(value)
+            return fnmatch.fnmatchcase(text, pattern)
+    elif operator in ('eq', 'neq', 'gt', 'gte', 'lt', 'lte'):
+        def predicate(row):
+            value = row.get(column)
+            if value is None:
+                return False
+            target = _typed_literal(value, literal)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                value = value if isinstance(value, bool) else str(value)
+            try:
+                return {
+                    'eq': value == target, 'neq': value != target,
+                    'gt': value > target, 'gte': value >= target,
+                    'lt': value < target, 'lte': value <= target
+                }[operator]
+            except TypeError:
+                return False
+    elif operator == 'cs':
+        values = set(_parse_list(literal.replace('{', '(').replace('}', ')')))
+        def predicate(row):
+            value = row.get(column) or []
+            return values.issubset({str(v) for v in value})
+    else:
+        raise PostgRESTError(400, 'PGRST100', f'"failed to parse filter ({operator}.{literal})"')
+
+    if negate:
+        return lambda row: not predicate(row)
+    return predicate
+
+def compile_or(expression: str) -> Callable[[Dict[str, Any]], bool]:
+    """Compile an or=(a.eq.1,b.is.null) filter"""
+    predicates = []
+    for part in _parse_list(expression):
+        column, _, rest = part.partition('.')
+        predicates.append(compile_filter(column, rest))
+    return lambda row: any(p(row) for p in predicates)
+
+# =============================================================================
+# Database
+# =============================================================================
+
+class InMemoryDatabase:
+    """
+    Tables held in memory with primary key, unique and foreign key checks
+
+    Views and RPC functions are Python callables registered by name, so
+    benchmarks can add the aggregate functions a migration would create.
+    """
+
+    def __init__(self, tables: Dict[str, TableDef], strict_columns: bool = False):
+        """
+        Initialize the database
+
+        Args:
+            tables (Dict[str, TableDef]): Parsed schema
+            strict_columns (bool): Reject unknown columns (PGRST204) instead of dropping them
+        """
+        self.tables = tables
+        self.strict_columns = strict_columns
+        self.lock = threading.RLock()
+        self.rows: Dict[str, Dict[Any, Dict[str, Any]]] = {name: {} for name in tables}
+        self.unique_indexes: Dict[str, Dict[Tuple[str, ...], Dict[Tuple, Any]]] = {
+            name: {cols: {} for cols in table.unique} for name, table in tables.items()
+        }
+        # Secondary indexes: column -> str(value) -> ordered set of primary keys
+        self.secondary_indexes: Dict[str, Dict[str, Dict[str, Dict[Any, None]]]] = {
+            name: {col: {} for col in table.indexes} for name, table in tables.items()
+        }
+        self.sequences: Dict[str, int] = {}
+        self.views: Dict[str, Callable[['InMemoryDatabase'], List[Dict[str, Any]]]] = {
+            'cites_staging_summary': _cites_staging_summary
+        }
+        self.functions: Dict[str, Callable[..., Any]] = {
+            'get_table_names': lambda db, **kwargs: [{'table_name': name} for name in sorted(db.tables)]
+        }
+
+    # ------------------------------------------------------------------ helpers
+
+    def table(self, name: str) -> TableDef:
+        if name not in self.tables:
+            raise PostgRESTError(404, 'PGRST205',
+                                 f"Could not find the table 'public.{name}' in the schema cache")
+        return self.tables[name]
+
+    def register_view(self, name: str, fn: Callable[['InMemoryDatabase'], List[Dict[str, Any]]]) -> None:
+        """Register a read-only view computed from the tables"""
+        self.views[name] = fn
+
+    def register_function(self, name: str, fn: Callable[..., Any]) -> None:
+        """Register an RPC function called as fn(db, **arguments)"""
+        self.functions[name] = fn
+
+    def all_rows(self, name: str) -> List[Dict[str, Any]]:
+        if name in self.views:
+            return self.views[name](self)
+        self.table(name)
+        return list(self.rows[name].values())
+
+    def candidate_rows(self, name: str, equalities: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Rows that may match the query, narrowed by a secondary index when possible
+
+        Args:
+            name (str): Table or view name
+            equalities (Dict[str, str]): Column -> literal of the query's eq filters
+
+        Returns:
+            List[Dict[str, Any]]: Candidate rows (filters still have to be applied)
+        """
+        indexes = self.secondary_indexes.get(name, {})
+        for column, literal in equalities.items():
+            if column in indexes:
+                rows = self.rows[name]
+                return [rows[pk] for pk in indexes[column].get(literal, ())]
+        return self.all_rows(name)
+
+    def count(self, name: str) -> int:
+        return len(self.rows[name]) if name in self.rows else len(self.all_rows(name))
+
+    def _default(self, table: TableDef, column: ColumnDef) -> Any:
+        default = column.default
+        if default is None:
+            return None
+        upper = default.upper()
+        if upper.startswith('GEN_RANDOM_UUID') or upper.startswith('UUID_GENERATE'):
+            return str(uuid.uuid4())
+        if upper.startswith('NOW') or upper == 'CURRENT_TIMESTAMP':
+            return _now()
+        if upper == 'SERIAL':
+            key = f"{table.name}.{column.name}"
+            self.sequences[key] = self.sequences.get(key, 0) + 1
+            return self.sequences[key]
+        if upper in ('TRUE', 'FALSE'):
+            return upper == 'TRUE'
+        if default.startswith("'"):
+            return default.strip("'")
+        return coerce_value(column, default)
+
+    def _prepare(self, table: TableDef, record: Dict[str, Any], fill_defaults: bool) -> Dict[str, Any]:
+        row = {}
+        for key, value in record.items():
+            column = table.columns.get(key)
+            if column is None:
+                if self.strict_columns:
+                    raise PostgRESTError(400, 'PGRST204',
+                                         f"Could not find the '{key}' column of '{table.name}' in the schema cache")
+                continue
+            row[key] = coerce_value(column, value)
+
+        if fill_defaults:
+            for name, column in table.columns.items():
+                if name not in row:
+                    row[name] = self._default(table, column)
+        return row
+
+    def _check_row(self, table: TableDef, row: Dict[str, Any]) -> None:
+        for name, column in table.columns.items():
+            if column.not_null and row.get(name) is None:
+                raise PostgRESTError(400, '23502',
+                                     f'null value in column "{name}" of relation "{table.name}" '
+                                     f'violates not-null constraint')
+            if column.references and row.get(name) is not None:
+                ref_table, ref_column = column.references
+                if not self._exists(ref_table, ref_column, row[name]):
+                    raise PostgRESTError(409, '23503',
+                                         f'insert or update on table "{table.name}" violates foreign key '
+                                         f'constraint "{table.name}_{name}_fkey"',
+                                         details=f'Key ({name})=({row[name]}) is not present in table "{ref_table}".')
+
+    def _exists(self, table_name: str, column: str, value: Any) -> bool:
+        table = self.tables.get(table_name)
+        if table is None:
+            return True
+        if column == table.primary_key:
+            return value in self.rows[table_name]
+        return any(r.get(column) == value for r in self.rows[table_name].values())
+
+    def _unique_key(self, table: TableDef, row: Dict[str, Any], columns: Tuple[str, ...]) -> Optional[Tuple]:
+        key = tuple(row.get(c) for c in columns)
+        if columns in table.nulls_not_distinct:
+            return key
+        return None if any(v is None for v in key) else key
+
+    def _find_conflict(self, table: TableDef, row: Dict[str, Any],
+                       columns: Tuple[str, ...]) -> Optional[Any]:
+        if columns == (table.primary_key,):
+            pk = row.get(table.primary_key)
+            return pk if pk in self.rows[table.name] else None
+        index = self.unique_indexes[table.name].get(columns)
+        key = self._unique_key(table, row, columns)
+        if index is None or key is None:
+            return None
+        return index.get(key)
+
+    def _index(self, table: TableDef, row: Dict[str, Any], pk: Any) -> None:
+        for columns, index in self.unique_indexes[table.name].items():
+            key = self._unique_key(table, row, columns)
+            if key is not None:
+                index[key] = pk
+        for column, index in self.secondary_indexes[table.name].items():
+            if row.get(column) is not None:
+                index.setdefault(str(row[column]), {})[pk] = None
+
+    def _unindex(self, table: TableDef, row: Dict[str, Any]) -> None:
+        for columns, index in self.unique_indexes[table.name].items():
+            key = self._unique_key(table, row, columns)
+            if key is not None:
+                index.pop(key, None)
+        pk = row.get(table.primary_key) if table.primary_key else None
+        for column, index in self.secondary_indexes[table.name].items():
+            if row.get(column) is not None and pk is not None:
+                index.get(str(row[column]), {}).pop(pk, None)
+
+    def _check_unique(self, table: TableDef, row: Dict[str, Any], own_pk: Any = None) -> None:
+        constraints = [(table.primary_key,)] + list(self.unique_indexes[table.name])
+        for columns in constraints:
+            existing = self._find_conflict(table, row, columns)
+            if existing is not None and existing != own_pk:
+                raise PostgRESTError(409, '23505',
+                                     f'duplicate key value violates unique constraint '
+                                     f'"{table.name}_{"_".join(columns)}_key"',
+                                     details=f'Key ({", ".join(columns)})=({", ".join(str(row.get(c)) for c in columns)}) already exists.')
+
+    # ------------------------------------------------------------------ writes
+
+    def insert(self, name: str, records: List[Dict[str, Any]], on_conflict: Optional[Tuple[str, ...]] = None,
+               resolution: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Insert rows, optionally as an upsert
+
+        Args:
+            name (str): Table name
+            records (List[Dict[str, Any]]): Rows from the request body
+            on_conflict (Tuple[str, ...], optional): Conflict target columns
+            resolution (str, optional): 'merge-duplicates' or 'ignore-duplicates'
+
+        Returns:
+            List[Dict[str, Any]]: Inserted or updated rows
+        """
+        table = self.table(name)
+        conflict_columns = on_conflict or ((table.primary_key,) if table.primary_key else None)
+        written = []
+
+        # All-or-nothing like a single INSERT statement: keep an undo log
+        undo: List[Tuple[Any, Optional[Dict[str, Any]]]] = []
+        with self.lock:
+            try:
+                for record in records:
+                    existing_pk = None
+                    if resolution and conflict_columns:
+                        probe = self._prepare(table, record, fill_defaults=False)
+                        existing_pk = self._find_conflict(table, probe, conflict_columns)
+
+                    if existing_pk is not None:
+                        if resolution == 'ignore-duplicates':
+                            continue
+                        current = self.rows[name][existing_pk]
+                        updated = dict(current)
+                        updated.update(self._prepare(table, record, fill_defaults=False))
+                        self._check_row(table, updated)
+                        self._unindex(table, current)
+                        try:
+                            self._check_unique(table, updated, own_pk=existing_pk)
+                        except PostgRESTError:
+                            self._index(table, current, existing_pk)
+                            raise
+                        self.rows[name][existing_pk] = updated
+                        self._index(table, updated, existing_pk)
+                        undo.append((existing_pk, current))
+                        written.append(updated)
+                        continue
+
+                    row = self._prepare(table, record, fill_defaults=True)
+                    self._check_row(table, row)
+                    self._check_unique(table, row)
+                    pk = row.get(table.primary_key) if table.primary_key else id(row)
+                    self.rows[name][pk] = row
+                    self._index(table, row, pk)
+                    undo.append((pk, None))
+                    written.append(row)
+            except PostgRESTError:
+                for pk, previous in reversed(undo):
+                    self._unindex(table, self.rows[name][pk])
+                    if previous is None:
+                        del self.rows[name][pk]
+                    else:
+                        self.rows[name][pk] = previous
+                        self._index(table, previous, pk)
+                raise
+        return written
+
+    def update(self, name: str, values: Dict[str, Any], rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply values to the matched rows"""
+        table = self.table(name)
+        changes = self._prepare(table, values, fill_defaults=False)
+        updated_rows = []
+        with self.lock:
+            for row in rows:
+                pk = row.get(table.primary_key)
+                updated = dict(row)
+                updated.update(changes)
+                self._check_row(table, updated)
+                self._unindex(table, row)
+                try:
+                    self._check_unique(table, updated, own_pk=pk)
+                except PostgRESTError:
+                    self._index(table, row, pk)
+                    raise
+                self.rows[name][pk] = updated
+                self._index(table, updated, pk)
+                updated_rows.append(updated)
+        return updated_rows
+
+    def delete(self, name: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Delete the matched rows"""
+        table = self.table(name)
+        with self.lock:
+            for row in rows:
+                self._unindex(table, row)
+                self.rows[name].pop(row.get(table.primary_key), None)
+        return rows
+
+    def truncate(self, name: str) -> None:
+        """Empty a table (benchmark setup helper)"""
+        with self.lock:
+            self.rows[name].clear()
+            for index in self.unique_indexes[name].values():
+                index.clear()
+            for index in self.secondary_indexes[name].values():
+                index.clear()
+
+def _cites_staging_summary(db: InMemoryDatabase) -> List[Dict[str, Any]]:
+    rows = list(db.rows['cites_trade_records_staging'].values())
+    years = [r['year'] for r in rows if r.get('year') is not None]
+    return [{
+        'total_records': len(rows),
+        'unique_species': len({r.get('species_id') for r in rows}),
+        'earliest_year': min(years) if years else None,
+        'latest_year': max(years) if years else None,
+        'appendix_i_count': sum(1 for r in rows if r.get('appendix') == 'I'),
+        'appendix_ii_count': sum(1 for r in rows if r.get('appendix') == 'II'),
+        'appendix_iii_count': sum(1 for r in rows if r.get('appendix') == 'III'),
+        'unique_importers': len({r.get('importer') for r in rows if r.get('importer') is not None}),
+        'unique_exporters': len({r.get('exporter') for r in rows if r.get('exporter') is not None})
+    }]
+
+# =============================================================================
+# Query evaluation
+# =============================================================================
+
+@dataclass
+class Query:
+    """Parsed query string of a table request"""
+    select: str = '*'
+    filters: List[Callable[[Dict[str, Any]], bool]] = field(default_factory=list)
+    equalities: Dict[str, str] = field(default_factory=dict)
+    order: List[Tuple[str, bool, Optional[bool]]] = field(default_factory=list)
+    limit: Optional[int] = None
+    offset: int = 0
+    on_conflict: Optional[Tuple[str, ...]] = None
+
+    @property
+    def has_filters(self) -> bool:
+        return bool(self.filters)
+
+def parse_query(query_string: str) -> Query:
+    """
+    Parse a PostgREST query string
+
+    Args:
+        query_string (str): Raw query string
+
+    Returns:
+        Query: Select list, filters, ordering and paging
+    """
+    query = Query()
+    for key, value in parse_qsl(query_string, keep_blank_values=True):
+        if key == 'select':
+            query.select = value or '*'
+        elif key == 'order':
+            for term in value.split(','):
+                parts = term.split('.')
+                descending = 'desc' in parts[1:]
+                nulls_first = True if 'nullsfirst' in parts[1:] else (False if 'nullslast' in parts[1:] else None)
+                query.order.append((parts[0], descending, nulls_first))
+        elif key == 'limit':
+            query.limit = int(value)
+        elif key == 'offset':
+            query.offset = int(value)
+        elif key == 'on_conflict':
+            query.on_conflict = tuple(c.strip() for c in value.split(','))
+        elif key == 'columns':
+            continue
+        elif key == 'or':
+            query.filters.append(compile_or(value))
+        elif '.' in key:
+            # Filters on embedded resources are not evaluated
+            continue
+        else:
+            query.filters.append(compile_filter(key, value))
+            if value.startswith('eq.'):
+                query.equalities[key] = value[3:]
+    return query
+
+def _sort_rows(rows: List[Dict[str, Any]], order: List[Tuple[str, bool, Optional[bool]]]) -> List[Dict[str, Any]]:
+    for column, descending, nulls_first in reversed(order):
+        # Postgres puts NULLs last ascending and first descending by default
+        nulls_high = nulls_first is None or nulls_first == descending
+
+        def key(row, column=column, nulls_high=nulls_high):
+            value = row.get(column)
+            if value is None:
+                return (1 if nulls_high else -1, 0, 0)
+            if isinstance(value, (int, float)):
+                return (0, 0, value)
+            return (0, 1, str(value))
+
+        rows = sorted(rows, key=key, reverse=descending)
+    return rows
+
+def project(db: InMemoryDatabase, table_name: str, rows: List[Dict[str, Any]],
+            select: str) -> List[Dict[str, Any]]:
+    """
+    Apply a select list, resolving embedded resources
+
+    Args:
+        db (InMemoryDatabase): Database
+        table_name (str): Table the rows belong to
+        rows (List[Dict[str, Any]]): Matched rows
+        select (str): PostgREST select list
+
+    Returns:
+        List[Dict[str, Any]]: Projected rows
+    """
+    items = _split_top_level(select)
+    if not items or items == ['*']:
+        return [dict(r) for r in rows]
+
+    table = db.tables.get(table_name)
+    projected = [{} for _ in rows]
+
+    for item in items:
+        alias = None
+        if ':' in item.split('(')[0]:
+            alias, item = item.split(':', 1)
+
+        if '(' in item:
+            relation, inner = item.split('(', 1)
+            relation = relation.split('!')[0].strip()
+            inner = inner[:-1]
+            _embed(db, table, relation, alias or relation, inner, rows, projected)
+            continue
+
+        column = item.split('::')[0].strip()
+        for source, target in zip(rows, projected):
+            if column == '*':
+                target.update(source)
+            else:
+                target[alias or column] = source.get(column)
+
+    return projected
+
+def _embed(db: InMemoryDatabase, table: Optional[TableDef], relation: str, key: str, inner: str,
+           rows: List[Dict[str, Any]], projected: List[Dict[str, Any]]) -> None:
+    related = db.tables.get(relation)
+    if table is None or related is None:
+        raise PostgRESTError(400, 'PGRST200',
+                             f"Could not find a relationship between '{table.name if table else '?'}' "
+                             f"and '{relation}' in the schema cache")
+
+    # Forward: this table has a foreign key to the related table
+    forward = [(col, ref) for col, ref in table.foreign_keys().items() if ref[0] == relation]
+    if forward:
+        column, (_, ref_column) = forward[0]
+        lookup = {r.get(ref_column): r for r in db.rows[relation].values()}
+        for source, target in zip(rows, projected):
+            match = lookup.get(source.get(column))
+            target[key] = project(db, relation, [match], inner)[0] if match else None
+        return
+
+    # Reverse: the related table has a foreign key to this table
+    reverse = [(col, ref) for col, ref in related.foreign_keys().items() if ref[0] == table.name]
+    if not reverse:
+        raise PostgRESTError(400, 'PGRST200',
+                             f"Could not find a relationship between '{table.name}' and '{relation}' in the schema cache")
+    column, (_, ref_column) = reverse[0]
+    children: Dict[Any, List[Dict[str, Any]]] = {}
+    for child in db.rows[relation].values():
+        children.setdefault(child.get(column), []).append(child)
+
+    for source, target in zip(rows, projected):
+        matches = children.get(source.get(ref_column), [])
+        if inner.strip() == 'count':
+            target[key] = [{'count': len(matches)}]
+        else:
+            target[key] = project(db, relation, matches, inner)
+
+def select_rows(db: InMemoryDatabase, table_name: str, query: Query, max_rows: Optional[int],
+                range_header: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Evaluate a read request
+
+    Args:
+        db (InMemoryDatabase): Database
+        table_name (str): Table or view name
+        query (Query): Parsed query
+        max_rows (int, optional): Server-side row cap
+        range_header (str, optional): Range request header
+
+    Returns:
+        Tuple of (projected rows, total matched rows, offset)
+    """
+    with db.lock:
+        rows = [r for r in db.candidate_rows(table_name, query.equalities) if all(f(r) for f in query.filters)]
+        total = len(rows)
+
+        if query.select.strip() == 'count':
+            return [{'count': total}], total, 0
+
+        if query.order:
+            rows = _sort_rows(rows, query.order)
+
+        offset, limit = query.offset, query.limit
+        if range_header and '-' in range_header:
+            start, _, end = range_header.partition('-')
+            offset = int(start)
+            if end:
+                limit = int(end) - offset + 1
+        if max_rows is not None:
+            limit = min(limit, max_rows) if limit is not None else max_rows
+
+        rows = rows[offset:offset + limit] if limit is not None else rows[offset:]
+        return project(db, table_name, rows, query.select), total, offset
+
+# =============================================================================
+# HTTP server
+# =============================================================================
+
+@dataclass
+class PostgRESTStandInConfig:
+    """Behavior of the PostgREST stand-in"""
+    latency_ms: float = 5.0          # fixed cost per request (network + PostgREST)
+    per_row_us: float = 0.0          # extra cost per row read or written
+    max_rows: Optional[int] = 1000   # Supabase's default max-rows
+    strict_columns: bool = False
+
+@dataclass
+class RestStats:
+    """Counters for REST calls, keyed by 'METHOD table'"""
+    requests: int = 0
+    errors: int = 0
+    rows_in: int = 0
+    rows_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    by_route: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'by_route': dict(sorted(self.by_route.items()))
+        }
+
+class PostgRESTStandIn:
+    """
+    Threaded HTTP server answering Supabase REST calls from an in-memory database
+    """
+
+    def __init__(self, schema_file: Path = DEFAULT_SCHEMA, config: Optional[PostgRESTStandInConfig] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the stand-in
+
+        Args:
+            schema_file (Path): Schema SQL to parse
+            config (PostgRESTStandInConfig, optional): Latency and limits
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+        """
+        self.config = config or PostgRESTStandInConfig()
+        self.db = InMemoryDatabase(parse_schema(Path(schema_file)), self.config.strict_columns)
+        self.stats = RestStats()
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Value for SUPABASE_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.stats = RestStats()
+
+    def start(self) -> 'PostgRESTStandIn':
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _record(self, route: str, status: int, rows_in: int, rows_out: int,
+                bytes_in: int, bytes_out: int) -> None:
+        with self._stats_lock:
+            self.stats.requests += 1
+            self.stats.errors += 1 if status >= 400 else 0
+            self.stats.rows_in += rows_in
+            self.stats.rows_out += rows_out
+            self.stats.bytes_in += bytes_in
+            self.stats.bytes_out += bytes_out
+            self.stats.by_route[route] = self.stats.by_route.get(route, 0) + 1
+
+    def handle(self, method: str, path: str, headers: Dict[str, str],
+               body: bytes) -> Tuple[int, Dict[str, str], Any, int, int]:
+        """
+        Answer one REST request
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path with query string
+            headers (Dict[str, str]): Lower-cased request headers
+            body (bytes): Request body
+
+        Returns:
+            Tuple of (status, extra headers, JSON body or None, rows in, rows out)
+        """
+        parts = urlsplit(path)
+        if not parts.path.startswith('/rest/v1/'):
+            raise PostgRESTError(404, 'PGRST000', f'Unknown path {parts.path}')
+
+        resource = parts.path[len('/rest/v1/'):].strip('/')
+        prefer = headers.get('prefer', '')
+        query = parse_query(parts.query)
+        payload = json.loads(body) if body else None
+
+        if resource.startswith('rpc/'):
+            return self._handle_rpc(resource[4:], payload)
+
+        if method in ('GET', 'HEAD'):
+            rows, total, offset = select_rows(self.db, resource, query, self.config.max_rows,
+                                              headers.get('range'))
+            extra = {}
+            if 'count=' in prefer:
+                end = offset + len(rows) - 1
+                extra['Content-Range'] = f"{offset}-{end}/{total}" if rows else f"*/{total}"
+            if 'vnd.pgrst.object' in headers.get('accept', ''):
+                if len(rows) != 1:
+                    raise PostgRESTError(406, 'PGRST116', 'JSON object requested, multiple (or no) rows returned',
+                                         details=f'The result contains {len(rows)} rows')
+                return 200, extra, rows[0], 0, 1
+            return 200, extra, rows, 0, len(rows)
+
+        if method == 'POST':
+            records = payload if isinstance(payload, list) else [payload or {}]
+            resolution = None
+            if 'resolution=merge-duplicates' in prefer:
+                resolution = 'merge-duplicates'
+            elif 'resolution=ignore-duplicates' in prefer:
+                resolution = 'ignore-duplicates'
+            written = self.db.insert(resource, records, query.on_conflict, resolution)
+            return self._write_response(201, resource, written, prefer, query, len(records))
+
+        if method == 'PATCH':
+            with self.db.lock:
+                matched = [r for r in self.db.candidate_rows(resource, query.equalities)
+                           if all(f(r) for f in query.filters)]
+                written = self.db.update(resource, payload or {}, matched)
+            return self._write_response(200, resource, written, prefer, query, 1)
+
+        if method == 'DELETE':
+            if not query.has_filters:
+                raise PostgRESTError(400, '21000', 'DELETE requires a WHERE clause')
+            with self.db.lock:
+                matched = [r for r in self.db.candidate_rows(resource, query.equalities)
+                           if all(f(r) for f in query.filters)]
+                written = self.db.delete(resource, matched)
+            return self._write_response(200, resource, written, prefer, query, 0)
+
+        raise PostgRESTError(405, 'PGRST117', f'Unsupported HTTP method: {method}')
+
+    def _write_response(self, status: int, resource: str, written: List[Dict[str, Any]], prefer: str,
+                        query: Query, rows_in: int) -> Tuple[int, Dict[str, str], Any, int, int]:
+        extra = {}
+        if 'count=' in prefer:
+            extra['Content-Range'] = f"*/{len(written)}"
+        if 'return=representation' in prefer:
+            rows = project(self.db, resource, written, query.select)
+            return status, extra, rows, rows_in, len(rows)
+        return (201 if status == 201 else 204), extra, None, rows_in, 0
+
+    def _handle_rpc(self, name: str, payload: Any) -> Tuple[int, Dict[str, str], Any, int, int]:
+        fn = self.db.functions.get(name)
+        if fn is None:
+            raise PostgRESTError(404, 'PGRST202',
+                                 f'Could not find the function public.{name} without parameters in the schema cache')
+        with self.db.lock:
+            result = fn(self.db, **(payload or {}))
+        return 200, {}, result, 0, len(result) if isinstance(result, list) else 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                route = f"{self.command} {urlsplit(self.path).path[len('/rest/v1/'):]}"
+
+                try:
+                    status, extra, result, rows_in, rows_out = server.handle(self.command, self.path,
+                                                                             headers, body)
+                except PostgRESTError as e:
+                    status, extra, result, rows_in, rows_out = e.status, {}, e.body, 0, 0
+                except (ValueError, TypeError) as e:
+                    status, extra, result, rows_in, rows_out = 400, {}, {
+                        'code': 'PGRST100', 'message': str(e), 'details': None, 'hint': None}, 0, 0
+
+                delay = server.config.latency_ms / 1000.0 + (rows_in + rows_out) * server.config.per_row_us / 1e6
+                if delay > 0:
+                    time.sleep(delay)
+
+                payload = b'' if result is None else json.dumps(result).encode('utf-8')
+                server._record(route, status, rows_in, rows_out, len(body), len(payload))
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != 'HEAD' and payload:
+                    self.wfile.write(payload)
+
+            do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = _serve
+
+            def log_message(self, format, *args):
+                # Keep benchmark output clean
+                pass
+
+        return Handler
+
+# =============================================================================
+# Seeding
+# =============================================================================
+
+def seed_species(db: InMemoryDatabase, species_file: Path = DEFAULT_SPECIES_FILE) -> int:
+    """
+    Load the species table (and families) from the species names report
+
+    Args:
+        db (InMemoryDatabase): Database to fill
+        species_file (Path): CSV exported from the species table
+
+    Returns:
+        int: Number of species loaded
+    """
+    with open(species_file, 'r', encoding='utf-8') as f:
+        rows = [row for row in csv.DictReader(f) if row.get('scientific_name', '').strip()]
+
+    families = {}
+    for row in rows:
+        if row.get('family_id') and row['family_id'] not in families:
+            families[row['family_id']] = {
+                'id': row['family_id'],
+                'family_name': row.get('family') or row['family_id'],
+                'order_name': row.get('order_name') or None,
+                'class': row.get('class') or None
+            }
+    db.insert('families', list(families.values()), resolution='ignore-duplicates')
+
+    species = []
+    for row in rows:
+        species.append({
+            'id': row.get('id') or str(uuid.uuid4()),
+            'scientific_name': row['scientific_name'].strip(),
+            'common_name': row.get('common_name') or None,
+            'family': row.get('family') or None,
+            'family_id': row.get('family_id') or None,
+            'genus': row.get('genus') or None,
+            'class': row.get('class') or None,
+            'order_name': row.get('order_name') or None,
+            'authority': row.get('authority') or None,
+            'sis_id': int(float(row['sis_id'])) if row.get('sis_id') else None,
+            'kingdom': 'ANIMALIA'
+        })
+    db.insert('species', species, resolution='ignore-duplicates')
+    return len(species)
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve an in-memory PostgREST stand-in for Supabase')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8766, help='Port to bind')
+    parser.add_argument('--schema', default=str(DEFAULT_SCHEMA), help='Schema SQL file')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Fixed latency per request')
+    parser.add_argument('--per-row-us', type=float, default=0.0, help='Extra latency per row')
+    parser.add_argument('--max-rows', type=int, default=1000, help='Row cap per response (0 disables)')
+    parser.add_argument('--strict', action='store_true', help='Reject unknown columns')
+    parser.add_argument('--seed-species', action='store_true', help='Load species from the names report')
+    parser.add_argument('--species-file', default=str(DEFAULT_SPECIES_FILE),
+                       help='Species CSV used by --seed-species')
+
+    args = parser.parse_args()
+
+    config = PostgRESTStandInConfig(
+        latency_ms=args.latency_ms,
+        per_row_us=args.per_row_us,
+        max_rows=args.max_rows or None,
+        strict_columns=args.strict
+    )
+    server = PostgRESTStandIn(Path(args.schema), config, host=args.host, port=args.port)
+    if args.seed_species:
+        print(f"🌱 Seeded {seed_species(server.db, Path(args.species_file))} species")
+
+    print(f"🧪 PostgREST stand-in with {len(server.db.tables)} tables")
+    print(f"   SUPABASE_URL={server.url}")
+    print(f"   SUPABASE_ANON_KEY={STANDIN_KEY}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 Served: {json.dumps(server.stats.to_dict())}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Record IUCN API Fixtures for the Stand-in Server
+
+Builds the fixture file served by iucn_standin_server.py. Two modes:
+
+- --record: query the real IUCN API (needs IUCN_API_TOKEN) through IUCNApiClient
+  and store the responses verbatim
+- --sample (default): build an offline sample from docs/reports/species_names_latest.csv
+  with the same response shape, for benchmarking only (categories are 'NE')
+
+Usage:
+    python record_iucn_fixtures.py [--record] [--species-file ../docs/reports/species_names_latest.csv]
+                                   [--output fixtures/iucn_responses.json]
+"""
+
+import sys
+import csv
+import json
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List
+
+# Add rebuild directory to path
+rebuild_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(rebuild_dir))
+
+from benchmarks.iucn_standin_server import DEFAULT_FIXTURES, fixture_key
+
+DEFAULT_SPECIES_FILE = rebuild_dir / 'docs' / 'reports' / 'species_names_latest.csv'
+
+def load_species(species_file: Path) -> List[Dict[str, str]]:
+    """
+    Load species rows from the species names report
+
+    Args:
+        species_file (Path): CSV with scientific_name and taxonomy columns
+
+    Returns:
+        List[Dict[str, str]]: Species rows with a scientific name
+    """
+    with open(species_file, 'r', encoding='utf-8') as f:
+        return [row for row in csv.DictReader(f) if row.get('scientific_name', '').strip()]
+
+def build_sample_responses(species_rows: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Build sample responses in the shape IUCNApiClient expects
+
+    Args:
+        species_rows (List[Dict[str, str]]): Species rows from the names report
+
+    Returns:
+        Dict[str, Any]: Fixture key -> response body
+    """
+    responses = {fixture_key('iucn', 'version', {}): {'version': 'v4-standin'}}
+
+    for row in species_rows:
+        name = row['scientific_name'].strip()
+        sis_id = row.get('sis_id', '').split('.')[0] or None
+        taxon = {
+            'taxonid': int(sis_id) if sis_id else None,
+            'scientific_name': name,
+            'kingdom': 'PLANTAE' if row.get('class', '').upper() == 'MAGNOLIOPSIDA' else 'ANIMALIA',
+            'class': row.get('class', '').upper() or None,
+            'order': row.get('order_name', '').upper() or None,
+            'family': row.get('family', '').upper() or None,
+            'genus': row.get('genus') or name.split()[0],
+            'main_common_name': row.get('common_name') or None,
+            'authority': row.get('authority') or None,
+            'published_year': None,
+            'assessment_date': None,
+            'category': 'NE',
+            'population_trend': None
+        }
+        responses[fixture_key('iucn', f'taxa/scientific_name/{name}', {})] = {'result': [taxon]}
+
+    return responses
+
+async def record_responses(species_rows: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Record real IUCN API responses for the given species
+
+    Args:
+        species_rows (List[Dict[str, str]]): Species rows from the names report
+
+    Returns:
+        Dict[str, Any]: Fixture key -> response body
+    """
+    from core.iucn_client import IUCNApiClient
+
+    responses = {}
+    async with IUCNApiClient() as client:
+        responses[fixture_key('iucn', 'version', {})] = await client.get_api_version()
+
+        for row in species_rows:
+            name = row['scientific_name'].strip()
+            try:
+                data = await client.get_species_by_name(name)
+                responses[fixture_key('iucn', f'taxa/scientific_name/{name}', {})] = data
+                print(f"   ✓ {name}")
+            except Exception as e:
+                print(f"   ✗ {name}: {e}")
+
+    return responses
+
+def main():
+    parser = argparse.ArgumentParser(description='Build fixtures for the IUCN stand-in server')
+    parser.add_argument('--record', action='store_true',
+                       help='Record from the real IUCN API instead of building a sample')
+    parser.add_argument('--species-file', default=str(DEFAULT_SPECIES_FILE),
+                       help='Species names CSV')
+    parser.add_argument('--output', default=str(DEFAULT_FIXTURES),
+                       help='Fixture JSON to write')
+
+    args = parser.parse_args()
+
+    species_rows = load_species(Path(args.species_file))
+    print(f"📋 {len(species_rows)} species from {args.species_file}")
+
+    if args.record:
+        responses = asyncio.run(record_responses(species_rows))
+        source = 'recorded'
+    else:
+        responses = build_sample_responses(species_rows)
+        source = 'sample'
+
+    fixture = {
+        'created_at': datetime.now().isoformat(),
+        'source': source,
+        'responses': responses
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f, indent=2, ensure_ascii=False)
+
+    print(f"💾 Saved {len(responses)} {source} responses to {output_path}")
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,7 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.supabase_config import get_supabase_client
+from config.instrumentation import get_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -170,6 +171,7 @@ class CitesMigrator:
             errors = 0
             
             logger.info("Inserting new records...")
+            metrics = get_metrics()
             for i in range(0, len(staging_records), batch_size):
                 batch = staging_records[i:i + batch_size]
                 
@@ -182,8 +184,11 @@ class CitesMigrator:
                     clean_batch.append(clean_record)
                 
                 try:
-                    result = self.supabase.table('cites_trade_records').insert(clean_batch).execute()
+                    with metrics.span('insert_batch', table='cites_trade_records') as span:
+                        span.set(rows=len(clean_batch))
+                        result = self.supabase.table('cites_trade_records').insert(clean_batch).execute()
                     inserted += len(clean_batch)
+                    metrics.counter('records_loaded_total', table='cites_trade_records').inc(len(clean_batch))
                     
                     if (i // batch_size) % 10 == 0:
                         progress = (inserted / len(staging_records)) * 100
@@ -192,6 +197,7 @@ class CitesMigrator:
                 except Exception as e:
                     # Some duplicates are expected - continue
                     errors += len(batch)
+                    metrics.counter('records_failed_total', table='cites_trade_records').inc(len(batch))
                     if "duplicate key value" not in str(e):
                         logger.warning(f"Batch insert error: {str(e)[:100]}")
             
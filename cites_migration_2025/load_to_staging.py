@@ -23,6 +23,7 @@ import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.supabase_config import get_supabase_client
+from config.instrumentation import get_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -196,13 +197,17 @@ class CitesStageLoader:
             failed_inserts = 0
             
             # Insert in batches
+            metrics = get_metrics()
             for i in range(0, len(staging_records), self.batch_size):
                 batch = staging_records[i:i + self.batch_size]
                 batch_num = i // self.batch_size + 1
                 
                 try:
-                    result = self.supabase.table('cites_trade_records_staging').insert(batch).execute()
+                    with metrics.span('insert_batch', table='cites_trade_records_staging') as span:
+                        span.set(rows=len(batch), batch=batch_num)
+                        result = self.supabase.table('cites_trade_records_staging').insert(batch).execute()
                     successful_inserts += len(batch)
+                    metrics.counter('records_loaded_total', table='cites_trade_records_staging').inc(len(batch))
                     
                     if batch_num % 10 == 0 or batch_num == 1:
                         progress = (successful_inserts / len(staging_records)) * 100
@@ -211,6 +216,7 @@ class CitesStageLoader:
                 except Exception as e:
                     logger.error(f"Error inserting batch {batch_num}: {e}")
                     failed_inserts += len(batch)
+                    metrics.counter('records_failed_total', table='cites_trade_records_staging').inc(len(batch))
                     continue
             
             self.load_stats['successful_loads'] = successful_inserts
@@ -2,10 +2,21 @@
 """
 Compare extracted CITES trade counts with current database counts
 Determines if migration is needed based on differences
+
+By default every species' record count and year range comes from one call to
+the species_trade_counts() RPC (cites_migration_2025/trade_count_functions.sql)
+and the comparison with the extracted CSV is done column-wise in pandas.
+--per-species uses the original four queries per species (also the fallback
+when the RPC has not been created).
+
+Usage:
+    python cites_migration_2025/scripts/compare_trade_counts.py [--per-species]
 """
 
 import os
 import sys
+import argparse
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Tuple
@@ -13,11 +24,23 @@ from typing import Dict, List, Tuple
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from config.supabase_config import get_supabase_client
+from config.postgrest_queries import is_missing_function
+
+COUNTS_RPC = 'species_trade_counts'
+COMPARISON_COLUMNS = [
+    'species', 'db_count', 'extracted_count', 'count_difference', 'pct_change',
+    'db_years', 'extracted_years', 'needs_update', 'update_reason'
+]
 
 class TradeCountComparator:
-    def __init__(self):
+    def __init__(self, per_species: bool = False):
+        """
+        Args:
+            per_species (bool): Query each species separately instead of the species_trade_counts() RPC
+        """
         self.supabase = get_supabase_client()
         self.base_dir = os.path.dirname(os.path.dirname(__file__))
+        self.per_species = per_species
         
     def load_extracted_counts(self) -> pd.DataFrame:
         """Load the extracted trade summary"""
@@ -92,11 +115,95 @@ class TradeCountComparator:
                 
         return db_counts
         
+    def get_database_counts_bulk(self) -> pd.DataFrame:
+        """
+        Trade counts and year ranges of all species from one grouped aggregate
+        
+        Returns:
+            pd.DataFrame: One row per database species (species, species_id, count, min_year, max_year)
+        """
+        print(f"Querying database for current trade counts ({COUNTS_RPC}())...\n")
+        response = self.supabase.rpc(COUNTS_RPC).execute()
+        db_df = pd.DataFrame(response.data or [], columns=['species_id', 'scientific_name', 'record_count', 'min_year', 'max_year'])
+        db_df = db_df.rename(columns={'scientific_name': 'species', 'record_count': 'count'})
+        db_df['count'] = db_df['count'].astype('int64')
+        db_df[['min_year', 'max_year']] = db_df[['min_year', 'max_year']].astype('Int64')
+        return db_df.drop_duplicates('species')
+        
+    def compare_counts_bulk(self, extracted_df: pd.DataFrame, db_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized comparison of extracted counts with database counts
+        
+        Produces the same rows as the per-species comparison: species missing
+        from the database count as 0 records with unknown years.
+        
+        Args:
+            extracted_df (pd.DataFrame): Extracted summary (Taxon, record_count, min_year, max_year)
+            db_df (pd.DataFrame): Database counts from get_database_counts_bulk()
+            
+        Returns:
+            pd.DataFrame: Comparison rows, largest absolute difference first
+        """
+        merged = extracted_df[['Taxon', 'record_count', 'min_year', 'max_year']].merge(
+            db_df[['species', 'count', 'min_year', 'max_year']].rename(
+                columns={'count': 'db_count', 'min_year': 'db_min_year', 'max_year': 'db_max_year'}),
+            how='left', left_on='Taxon', right_on='species'
+        )
+        db_count = merged['db_count'].fillna(0).astype('int64')
+        extracted_count = merged['record_count']
+        count_diff = extracted_count - db_count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_change = (count_diff / db_count * 100).where(db_count > 0, float('inf'))
+        
+        # Year columns are nullable; 0/NULL database years never trigger a year update
+        db_min = merged['db_min_year'].astype('Int64')
+        db_max = merged['db_max_year'].astype('Int64')
+        has_count_diff = count_diff != 0
+        has_new_years = ((db_max.fillna(0) != 0) & (merged['max_year'] > db_max)).fillna(False).astype(bool)
+        has_old_years = ((db_min.fillna(0) != 0) & (merged['min_year'] < db_min)).fillna(False).astype(bool)
+        
+        reasons = pd.concat([
+            ('Count diff: ' + count_diff.map('{:+,}'.format)).where(has_count_diff),
+            ('New data up to ' + merged['max_year'].astype(str)).where(has_new_years),
+            ('Historical data from ' + merged['min_year'].astype(str)).where(has_old_years)
+        ], axis=1)
+        update_reason = reasons.apply(lambda row: '; '.join(row.dropna()), axis=1)
+        
+        def year_text(years: pd.Series) -> pd.Series:
+            return years.map(lambda year: '?' if pd.isna(year) or year == 0 else str(int(year)))
+        
+        comparison_df = pd.DataFrame({
+            'species': merged['Taxon'],
+            'db_count': db_count,
+            'extracted_count': extracted_count,
+            'count_difference': count_diff,
+            'pct_change': pct_change,
+            'db_years': year_text(db_min) + '-' + year_text(db_max),
+            'extracted_years': merged['min_year'].astype(str) + '-' + merged['max_year'].astype(str),
+            'needs_update': has_count_diff | has_new_years | has_old_years,
+            'update_reason': update_reason.where(update_reason != '', 'No change')
+        }, columns=COMPARISON_COLUMNS)
+        
+        # Sort by absolute count difference
+        comparison_df['abs_diff'] = comparison_df['count_difference'].abs()
+        comparison_df = comparison_df.sort_values('abs_diff', ascending=False)
+        comparison_df = comparison_df.drop('abs_diff', axis=1)
+        
+        return comparison_df
+        
     def compare_counts(self) -> pd.DataFrame:
         """Compare extracted counts with database counts"""
         # Load extracted data
         extracted_df = self.load_extracted_counts()
         
+        if not self.per_species:
+            try:
+                return self.compare_counts_bulk(extracted_df, self.get_database_counts_bulk())
+            except Exception as e:
+                if not is_missing_function(e):
+                    raise
+                print(f"⚠️  {COUNTS_RPC}() not found (run cites_migration_2025/trade_count_functions.sql), querying per species\n")
+        
         # Get unique species names
         species_list = extracted_df['Taxon'].unique().tolist()
         
@@ -239,5 +346,10 @@ class TradeCountComparator:
         return comparison_df
 
 if __name__ == "__main__":
-    comparator = TradeCountComparator()
+    parser = argparse.ArgumentParser(description='Compare extracted CITES trade counts with database counts')
+    parser.add_argument('--per-species', action='store_true',
+                        help='Query each species separately instead of one species_trade_counts() call')
+    args = parser.parse_args()
+    
+    comparator = TradeCountComparator(per_species=args.per_species)
     comparison_results = comparator.generate_report()
\ No newline at end of file
@@ -1,24 +1,79 @@
 #!/usr/bin/env python3
 """
 Extract current database architecture for CITES migration planning
+
+Table counts, column types, foreign keys and indexes come from the shared
+schema catalog (config/schema_introspection.py, cached in
+cache/schema_catalog.json); counts are pg_class.reltuples estimates. Tables the
+catalog does not know are sampled and counted through the REST API as before.
+
+Usage:
+    python cites_migration_2025/scripts/extract_db_architecture.py [--refresh-catalog]
 """
 
 import os
 import sys
 import json
+import argparse
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from config.supabase_config import get_supabase_client
+from config.schema_introspection import get_schema_catalog
+
+COUNT_TABLES = [
+    'species',
+    'cites_trade_records',
+    'species_trade_summary',
+    'cites_listings',
+    'iucn_assessments',
+    'common_names'
+]
+
+# Used when the schema catalog is unavailable
+KNOWN_RELATIONSHIPS = {
+    'cites_trade_records': {
+        'foreign_keys': ['species_id -> species.id'],
+        'indexes': ['species_id', 'year', 'exporter', 'importer']
+    },
+    'species_trade_summary': {
+        'foreign_keys': ['species_id -> species.id'],
+        'indexes': ['species_id', 'year']
+    },
+    'cites_listings': {
+        'foreign_keys': ['species_id -> species.id'],
+        'indexes': ['species_id', 'listing_date']
+    },
+    'iucn_assessments': {
+        'foreign_keys': ['species_id -> species.id'],
+        'indexes': ['species_id', 'year_published']
+    }
+}
 
 class DatabaseArchitectureExtractor:
-    def __init__(self):
+    def __init__(self, refresh_catalog=False):
         self.supabase = get_supabase_client()
         self.output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'docs')
+        self.catalog = get_schema_catalog(self.supabase, refresh=refresh_catalog)
         
     def extract_table_schema(self, table_name):
         """Extract schema information for a specific table"""
+        if self.catalog is not None and table_name in self.catalog:
+            table = self.catalog.tables[table_name]
+            return {
+                'table_name': table_name,
+                'columns': {
+                    column.name: {
+                        'sample_value': None,
+                        'type': column.data_type,
+                        'nullable': column.is_nullable,
+                        'default': column.default
+                    }
+                    for column in table.columns
+                }
+            }
+        
         try:
             # Get sample data to infer structure
             response = self.supabase.table(table_name).select('*').limit(1).execute()
@@ -44,19 +99,13 @@ class DatabaseArchitectureExtractor:
             return None
     
     def get_table_counts(self):
-        """Get record counts for main tables"""
+        """Get record counts for main tables (catalog estimates, COUNT(*) for the rest)"""
         counts = {}
         
-        tables = [
-            'species',
-            'cites_trade_records',
-            'species_trade_summary',
-            'cites_listings',
-            'iucn_assessments',
-            'common_names'
-        ]
-        
-        for table in tables:
+        for table in COUNT_TABLES:
+            if self.catalog is not None and table in self.catalog and self.catalog.tables[table].approx_rows is not None:
+                counts[table] = self.catalog.tables[table].approx_rows
+                continue
             try:
                 response = self.supabase.table(table).select('id', count='exact').limit(1).execute()
                 counts[table] = response.count if hasattr(response, 'count') else 'Unknown'
@@ -65,6 +114,21 @@ class DatabaseArchitectureExtractor:
         
         return counts
     
+    def get_relationships(self):
+        """Foreign keys and indexed columns of every table that has foreign keys"""
+        if self.catalog is None:
+            return KNOWN_RELATIONSHIPS
+        
+        relationships = {}
+        for table_name in self.catalog.table_names():
+            table = self.catalog.tables[table_name]
+            if table.foreign_keys:
+                relationships[table_name] = {
+                    'foreign_keys': table.foreign_key_strings(),
+                    'indexes': table.indexed_columns()
+                }
+        return relationships
+    
     def extract_cites_trade_structure(self):
         """Extract detailed structure of cites_trade_records table"""
         print("Extracting CITES trade records structure...")
@@ -118,25 +182,9 @@ class DatabaseArchitectureExtractor:
             'extraction_date': datetime.now().isoformat(),
             'database': 'Arctic Tracker - Supabase',
             'table_counts': self.get_table_counts(),
+            'count_source': 'pg_class.reltuples estimates' if self.catalog is not None else 'COUNT(*)',
             'table_schemas': {},
-            'relationships': {
-                'cites_trade_records': {
-                    'foreign_keys': ['species_id -> species.id'],
-                    'indexes': ['species_id', 'year', 'exporter', 'importer']
-                },
-                'species_trade_summary': {
-                    'foreign_keys': ['species_id -> species.id'],
-                    'indexes': ['species_id', 'year']
-                },
-                'cites_listings': {
-                    'foreign_keys': ['species_id -> species.id'],
-                    'indexes': ['species_id', 'listing_date']
-                },
-                'iucn_assessments': {
-                    'foreign_keys': ['species_id -> species.id'],
-                    'indexes': ['species_id', 'year_published']
-                }
-            }
+            'relationships': self.get_relationships()
         }
         
         # Extract schemas for main tables
@@ -170,6 +218,8 @@ Generated: {report['extraction_date']}
 
 ## Table Overview
 
+Record counts: {report.get('count_source', 'COUNT(*)')}
+
 | Table | Record Count |
 |-------|-------------|
 """
@@ -187,7 +237,7 @@ Generated: {report['extraction_date']}
             
             if schema and 'columns' in schema:
                 for col, info in schema['columns'].items():
-                    sample = info.get('sample_value', '')
+                    sample = info.get('sample_value') or ''
                     if sample and len(sample) > 50:
                         sample = sample[:50] + "..."
                     md_content += f"| {col} | {info.get('type', '')} | {sample} |\n"
@@ -217,7 +267,12 @@ Generated: {report['extraction_date']}
         print(f"Markdown report saved to: {md_path}")
 
 if __name__ == "__main__":
-    extractor = DatabaseArchitectureExtractor()
+    parser = argparse.ArgumentParser(description='Extract the database architecture for CITES migration planning')
+    parser.add_argument('--refresh-catalog', action='store_true',
+                        help='Re-read the schema catalog instead of using the disk cache')
+    args = parser.parse_args()
+    
+    extractor = DatabaseArchitectureExtractor(refresh_catalog=args.refresh_catalog)
     report = extractor.generate_architecture_report()
     
     print("\n✅ Database architecture extraction complete!")
@@ -2,6 +2,9 @@
 """
 Validate staged CITES trade data before migration
 Comprehensive validation to ensure data integrity
+
+Record counts, integrity, field value and relationship checks all read from one
+aggregate pass over the staging table (see ../staging_checks.py).
 """
 
 import os
@@ -14,6 +17,7 @@ from typing import Dict, List, Tuple
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from config.supabase_config import get_supabase_client
+from cites_migration_2025.staging_checks import collect_staging_metrics, VALID_YEAR_RANGE
 
 class StagingDataValidator:
     def __init__(self):
@@ -24,6 +28,13 @@ class StagingDataValidator:
             'passed': True,
             'checks': []
         }
+        self._metrics = None
+        
+    def staging_metrics(self) -> Dict:
+        """Staging table metrics, computed once for all checks"""
+        if self._metrics is None:
+            self._metrics = collect_staging_metrics(self.supabase)
+        return self._metrics
         
     def log_check(self, check_name: str, passed: bool, details: str = "", errors: List[str] = None):
         """Log validation check result"""
@@ -52,8 +63,7 @@ class StagingDataValidator:
         
         try:
             # Get staging count
-            response = self.supabase.table('cites_trade_records_staging').select('id', count='exact').limit(1).execute()
-            staging_count = response.count if hasattr(response, 'count') else 0
+            staging_count = self.staging_metrics()['total_records']
             
             # Get expected count from extracted data if not provided
             if expected_count is None:
@@ -84,28 +94,19 @@ class StagingDataValidator:
         print("\n🦭 Validating species mappings...")
         
         try:
-            # Get unique species IDs from staging
-            response = self.supabase.table('cites_trade_records_staging')\
-                .select('species_id')\
-                .execute()
-                
-            staging_species_ids = set(r['species_id'] for r in response.data if r.get('species_id'))
-            
-            # Get valid species IDs
-            response = self.supabase.table('species').select('id').execute()
-            valid_species_ids = set(r['id'] for r in response.data)
+            metrics = self.staging_metrics()
             
-            # Check for invalid IDs
-            invalid_ids = staging_species_ids - valid_species_ids
+            # Distinct staging species IDs without a species row
+            invalid_ids = metrics['invalid_species_ids']
             
             if not invalid_ids:
                 self.log_check('Species Mapping', True, 
-                             f"All {len(staging_species_ids)} species IDs are valid")
+                             f"All {metrics['unique_species']} species IDs are valid")
                 return True
             else:
                 self.log_check('Species Mapping', False,
                              f"{len(invalid_ids)} invalid species IDs found",
-                             [f"Invalid ID: {id}" for id in list(invalid_ids)[:10]])
+                             [f"Invalid ID: {id}" for id in invalid_ids[:10]])
                 return False
                 
         except Exception as e:
@@ -119,36 +120,22 @@ class StagingDataValidator:
         errors = []
         
         try:
-            # Check for duplicates
-            response = self.supabase.table('cites_trade_records_staging')\
-                .select('record_id')\
-                .execute()
-                
-            record_ids = [r['record_id'] for r in response.data if r.get('record_id')]
-            duplicate_count = len(record_ids) - len(set(record_ids))
+            metrics = self.staging_metrics()
+            
+            # Check for duplicates (the staging table's record identifier is id)
+            duplicate_count = metrics['total_records'] - metrics['distinct_ids']
             
             if duplicate_count > 0:
-                errors.append(f"{duplicate_count} duplicate record_ids found")
+                errors.append(f"{duplicate_count} duplicate record ids found")
                 
             # Check required fields
-            response = self.supabase.table('cites_trade_records_staging')\
-                .select('id, species_id, year, taxon')\
-                .is_('species_id', 'null')\
-                .limit(100)\
-                .execute()
-                
-            if response.data:
-                errors.append(f"{len(response.data)} records with null species_id")
+            if metrics['null_species_id']:
+                errors.append(f"{metrics['null_species_id']} records with null species_id")
                 
             # Check year range
-            response = self.supabase.table('cites_trade_records_staging')\
-                .select('year')\
-                .or_('year.lt.1975,year.gt.2024')\
-                .limit(100)\
-                .execute()
-                
-            if response.data:
-                errors.append(f"{len(response.data)} records with invalid year (outside 1975-2024)")
+            if metrics['year_out_of_range']:
+                first_year, last_year = VALID_YEAR_RANGE
+                errors.append(f"{metrics['year_out_of_range']} records with invalid year (outside {first_year}-{last_year})")
                 
             if not errors:
                 self.log_check('Data Integrity', True, "All integrity constraints satisfied")
@@ -169,42 +156,19 @@ class StagingDataValidator:
         errors = []
         
         try:
+            metrics = self.staging_metrics()
+            
             # Check appendix values
-            response = self.supabase.table('cites_trade_records_staging')\
-                .select('appendix')\
-                .not_('appendix', 'in', '["I","II","III","I/II","II/NC","III/NC"]')\
-                .limit(100)\
-                .execute()
-                
-            if response.data:
-                invalid_appendix = set(r['appendix'] for r in response.data)
-                errors.append(f"Invalid appendix values: {invalid_appendix}")
+            if metrics['invalid_appendix_values']:
+                errors.append(f"Invalid appendix values: {set(metrics['invalid_appendix_values'])}")
                 
             # Check purpose codes
-            valid_purposes = ['T', 'Z', 'S', 'P', 'B', 'E', 'G', 'Q', 'L', 'M', 'N']
-            response = self.supabase.table('cites_trade_records_staging')\
-                .select('purpose')\
-                .limit(1000)\
-                .execute()
-                
-            purposes = [r['purpose'] for r in response.data if r.get('purpose')]
-            invalid_purposes = set(p for p in purposes if p not in valid_purposes)
-            
-            if invalid_purposes:
-                errors.append(f"Invalid purpose codes: {invalid_purposes}")
+            if metrics['invalid_purpose_values']:
+                errors.append(f"Invalid purpose codes: {set(metrics['invalid_purpose_values'])}")
                 
             # Check source codes
-            valid_sources = ['W', 'C', 'D', 'F', 'R', 'I', 'O', 'X', 'Y', 'U']
-            response = self.supabase.table('cites_trade_records_staging')\
-                .select('source')\
-                .limit(1000)\
-                .execute()
-                
-            sources = [r['source'] for r in response.data if r.get('source')]
-            invalid_sources = set(s for s in sources if s not in valid_sources)
-            
-            if invalid_sources:
-                errors.append(f"Invalid source codes: {invalid_sources}")
+            if metrics['invalid_source_values']:
+                errors.append(f"Invalid source codes: {set(metrics['invalid_source_values'])}")
                 
             if not errors:
                 self.log_check('Field Values', True, "All field values valid")
@@ -224,42 +188,20 @@ class StagingDataValidator:
         
         try:
             # Check all species_ids exist in species table
-            response = self.supabase.rpc('validate_staging_species_ids').execute()
+            invalid_count = self.staging_metrics()['orphan_records']
             
-            if response.data and response.data[0]['invalid_count'] > 0:
+            if invalid_count > 0:
                 self.log_check('Foreign Keys', False,
-                             f"{response.data[0]['invalid_count']} invalid species_id references")
+                             f"{invalid_count} invalid species_id references")
                 return False
             else:
                 self.log_check('Foreign Keys', True, 
                              "All foreign key relationships valid")
                 return True
                 
-        except:
-            # Fallback if RPC doesn't exist
-            try:
-                # Manual check
-                staging_species = self.supabase.table('cites_trade_records_staging')\
-                    .select('species_id').execute()
-                staging_ids = set(r['species_id'] for r in staging_species.data)
-                
-                valid_species = self.supabase.table('species').select('id').execute()
-                valid_ids = set(r['id'] for r in valid_species.data)
-                
-                invalid = staging_ids - valid_ids
-                
-                if invalid:
-                    self.log_check('Foreign Keys', False,
-                                 f"{len(invalid)} invalid species_id references")
-                    return False
-                else:
-                    self.log_check('Foreign Keys', True,
-                                 "All foreign key relationships valid")
-                    return True
-                    
-            except Exception as e:
-                self.log_check('Foreign Keys', False, f"Error checking relationships: {str(e)}")
-                return False
+        except Exception as e:
+            self.log_check('Foreign Keys', False, f"Error checking relationships: {str(e)}")
+            return False
                 
     def validate_performance(self) -> bool:
         """Validate query performance on staging data"""
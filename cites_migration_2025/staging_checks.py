@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Staging Validation Metrics
+Arctic Tracker - CITES Migration 2025
+
+Every number the staging validators look at (record counts, year range,
+appendix distribution, null and out-of-range counts, invalid code values,
+orphaned species_id references) is declared once in STAGING_METRICS as an
+aggregate over cites_trade_records_staging. The declarations are compiled
+into a single SELECT, so the whole staging table is scanned once per
+validation run instead of once per check:
+
+    1. DATABASE_URL set      -> the compiled SELECT over a direct connection
+    2. Supabase client only  -> the staging_validation_metrics() RPC, which
+                                holds the same SELECT (see
+                                staging_validation_functions.sql)
+    3. RPC missing or stale  -> one paginated fetch of the referenced columns,
+                                evaluated locally with pandas
+
+validate_staging.py and scripts/validate_staging_data.py both read their
+checks from the resulting dict.
+
+After changing STAGING_METRICS, regenerate the RPC:
+    python cites_migration_2025/staging_checks.py --sql > cites_migration_2025/staging_validation_functions.sql
+
+Usage:
+    python cites_migration_2025/staging_checks.py           # print the metrics as JSON
+    python cites_migration_2025/staging_checks.py --local   # force the local pass
+"""
+
+import os
+import sys
+import json
+import textwrap
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.instrumentation import get_metrics
+from config.postgrest_queries import fetch_paginated, is_missing_function
+
+STAGING_TABLE = 'cites_trade_records_staging'
+METRICS_RPC = 'staging_validation_metrics'
+
+VALID_APPENDICES = ('I', 'II', 'III', 'I/II', 'II/NC', 'III/NC')
+VALID_PURPOSES = ('T', 'Z', 'S', 'P', 'B', 'E', 'G', 'Q', 'L', 'M', 'N')
+VALID_SOURCES = ('W', 'C', 'D', 'F', 'R', 'I', 'O', 'X', 'Y', 'U')
+VALID_YEAR_RANGE = (1975, 2024)
+RECENT_YEAR = 2020
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    Row predicate of a metric
+
+    Ops: 'null' (column IS NULL), 'eq', 'gte', 'not_in' (non-null value outside
+    a list), 'outside' (non-null value outside an inclusive (low, high) range)
+    and 'orphan' (non-null value with no matching species.id).
+    """
+    column: str
+    op: str
+    value: Any = None
+
+    def sql(self) -> str:
+        column = f"t.{self.column}"
+        if self.op == 'null':
+            return f"{column} IS NULL"
+        if self.op == 'eq':
+            return f"{column} = {_literal(self.value)}"
+        if self.op == 'gte':
+            return f"{column} >= {_literal(self.value)}"
+        if self.op == 'not_in':
+            return f"{column} NOT IN ({', '.join(_literal(v) for v in self.value)})"
+        if self.op == 'outside':
+            low, high = self.value
+            return f"{column} NOT BETWEEN {_literal(low)} AND {_literal(high)}"
+        if self.op == 'orphan':
+            return f"{column} IS NOT NULL AND s.id IS NULL"
+        raise ValueError(f"Unknown condition op: {self.op}")
+
+    def mask(self, df: pd.DataFrame, species_ids: Optional[set] = None) -> pd.Series:
+        column = df[self.column]
+        if self.op == 'null':
+            return column.isna()
+        if self.op == 'eq':
+            return column == self.value
+        if self.op == 'gte':
+            return column.notna() & (column >= self.value)
+        if self.op == 'not_in':
+            return column.notna() & ~column.isin(self.value)
+        if self.op == 'outside':
+            low, high = self.value
+            return column.notna() & ((column < low) | (column > high))
+        if self.op == 'orphan':
+            return column.notna() & ~column.isin(species_ids or set())
+        raise ValueError(f"Unknown condition op: {self.op}")
+
+@dataclass(frozen=True)
+class Metric:
+    """
+    One aggregate over the staging table
+
+    Aggs: 'count' (rows), 'count_distinct', 'min', 'max', 'sum' and 'values'
+    (sorted distinct non-null values, as text). `where` conditions are OR-ed.
+    """
+    name: str
+    agg: str
+    column: Optional[str] = None
+    where: Tuple[Condition, ...] = ()
+
+    def columns(self) -> List[str]:
+        return ([self.column] if self.column else []) + [c.column for c in self.where]
+
+    def sql(self) -> str:
+        column = f"t.{self.column}" if self.column else None
+        if self.agg == 'count':
+            expression = "COUNT(*)"
+        elif self.agg == 'count_distinct':
+            expression = f"COUNT(DISTINCT {column})"
+        elif self.agg in ('min', 'max', 'sum'):
+            expression = f"{self.agg.upper()}({column})"
+        elif self.agg == 'values':
+            expression = f"array_agg(DISTINCT {column}::text ORDER BY {column}::text)"
+        else:
+            raise ValueError(f"Unknown aggregate: {self.agg}")
+        if self.where:
+            predicate = ' OR '.join(f"({c.sql()})" for c in self.where)
+            expression += f" FILTER (WHERE {predicate})"
+        if self.agg == 'values':
+            expression = f"COALESCE({expression}, ARRAY[]::text[])"
+        return f"{expression} AS {self.name}"
+
+    def evaluate(self, df: pd.DataFrame, species_ids: Optional[set] = None) -> Any:
+        if self.where:
+            mask = self.where[0].mask(df, species_ids)
+            for condition in self.where[1:]:
+                mask = mask | condition.mask(df, species_ids)
+            df = df[mask]
+        if self.agg == 'count':
+            return len(df)
+        values = df[self.column].dropna()
+        if self.agg == 'count_distinct':
+            return int(values.nunique())
+        if self.agg == 'values':
+            return sorted({str(v) for v in values})
+        if values.empty:
+            return None
+        if self.agg == 'min':
+            return _plain(values.min())
+        if self.agg == 'max':
+            return _plain(values.max())
+        if self.agg == 'sum':
+            return _plain(values.sum())
+        raise ValueError(f"Unknown aggregate: {self.agg}")
+
+STAGING_METRICS = (
+    # cites_staging_summary
+    Metric('total_records', 'count'),
+    Metric('unique_species', 'count_distinct', 'species_id'),
+    Metric('earliest_year', 'min', 'year'),
+    Metric('latest_year', 'max', 'year'),
+    Metric('appendix_i_count', 'count', where=(Condition('appendix', 'eq', 'I'),)),
+    Metric('appendix_ii_count', 'count', where=(Condition('appendix', 'eq', 'II'),)),
+    Metric('appendix_iii_count', 'count', where=(Condition('appendix', 'eq', 'III'),)),
+    Metric('unique_importers', 'count_distinct', 'importer'),
+    Metric('unique_exporters', 'count_distinct', 'exporter'),
+    Metric('total_importer_quantity', 'sum', 'importer_reported_quantity'),
+    Metric('total_exporter_quantity', 'sum', 'exporter_reported_quantity'),
+    # Completeness and integrity
+    Metric('distinct_ids', 'count_distinct', 'id'),
+    Metric('null_species_id', 'count', where=(Condition('species_id', 'null'),)),
+    Metric('missing_taxon_or_year', 'count', where=(Condition('taxon', 'null'), Condition('year', 'null'))),
+    Metric('recent_records', 'count', where=(Condition('year', 'gte', RECENT_YEAR),)),
+    Metric('year_out_of_range', 'count', where=(Condition('year', 'outside', VALID_YEAR_RANGE),)),
+    # Field values and relationships
+    Metric('invalid_appendix_values', 'values', 'appendix', (Condition('appendix', 'not_in', VALID_APPENDICES),)),
+    Metric('invalid_purpose_values', 'values', 'purpose', (Condition('purpose', 'not_in', VALID_PURPOSES),)),
+    Metric('invalid_source_values', 'values', 'source', (Condition('source', 'not_in', VALID_SOURCES),)),
+    Metric('orphan_records', 'count', where=(Condition('species_id', 'orphan'),)),
+    Metric('invalid_species_ids', 'values', 'species_id', (Condition('species_id', 'orphan'),))
+)
+
+SUMMARY_FIELDS = [
+    'total_records', 'unique_species', 'earliest_year', 'latest_year',
+    'appendix_i_count', 'appendix_ii_count', 'appendix_iii_count',
+    'unique_importers', 'unique_exporters', 'total_importer_quantity', 'total_exporter_quantity'
+]
+
+def _literal(value: Any) -> str:
+    """SQL literal for a declared constant"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def _plain(value: Any) -> Any:
+    """numpy/Decimal scalar -> JSON-serializable Python value"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def uses_species(metrics=STAGING_METRICS) -> bool:
+    return any(c.op == 'orphan' for m in metrics for c in m.where)
+
+def compile_sql(metrics=STAGING_METRICS) -> str:
+    """
+    Compile the metric declarations into one aggregate SELECT
+
+    Args:
+        metrics (Tuple[Metric, ...]): Declared metrics
+
+    Returns:
+        str: SELECT returning one row with a column per metric
+    """
+    lines = ',\n           '.join(m.sql() for m in metrics)
+    join = "\n    LEFT JOIN species s ON s.id = t.species_id" if uses_species(metrics) else ""
+    return f"    SELECT {lines}\n    FROM {STAGING_TABLE} t{join}"
+
+def function_sql(metrics=STAGING_METRICS) -> str:
+    """Render staging_validation_functions.sql from the declarations"""
+    return f"""-- Staging Validation Functions
+-- Aggregate RPC used by cites_migration_2025/staging_checks.py
+-- One pass over cites_trade_records_staging returns every metric the staging
+-- validators check, instead of a count or sample query per check.
+-- Generated from STAGING_METRICS; regenerate with:
+--   python cites_migration_2025/staging_checks.py --sql > cites_migration_2025/staging_validation_functions.sql
+
+CREATE OR REPLACE FUNCTION "public"."{METRICS_RPC}"()
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT to_jsonb(m) FROM (
+{textwrap.indent(compile_sql(metrics), '    ')}
+    ) m;
+$$;
+
+COMMENT ON FUNCTION "public"."{METRICS_RPC}" IS 'Validation metrics of cites_trade_records_staging (counts, year range, invalid values, orphaned species_id) from one table scan';
+
+-- Make the function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
+"""
+
+def collect_postgres(dsn: str, metrics=STAGING_METRICS) -> Dict[str, Any]:
+    """Run the compiled SELECT over a direct connection"""
+    import psycopg2
+    import psycopg2.extras
+
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute(compile_sql(metrics))
+            row = cur.fetchone()
+    finally:
+        conn.close()
+    return {name: (list(value) if isinstance(value, list) else _plain(value)) for name, value in row.items()}
+
+def collect_local(supabase, metrics=STAGING_METRICS) -> Dict[str, Any]:
+    """Fetch the referenced columns once and evaluate every metric in pandas"""
+    columns = sorted({column for m in metrics for column in m.columns()} | {'id'})
+    df = pd.DataFrame(fetch_paginated(lambda: supabase.table(STAGING_TABLE), ','.join(columns)), columns=columns)
+    for column in ('year', 'importer_reported_quantity', 'exporter_reported_quantity'):
+        if column in df:
+            df[column] = pd.to_numeric(df[column])
+    species_ids = None
+    if uses_species(metrics):
+        species_ids = {row['id'] for row in fetch_paginated(lambda: supabase.table('species'), 'id')}
+    return {m.name: m.evaluate(df, species_ids) for m in metrics}
+
+def collect_staging_metrics(supabase, metrics=STAGING_METRICS, dsn: Optional[str] = None,
+                            local: bool = False) -> Dict[str, Any]:
+    """
+    Evaluate every declared metric with a single pass over the staging table
+
+    Args:
+        supabase: Supabase client (RPC and local pass)
+        metrics (Tuple[Metric, ...]): Declared metrics
+        dsn (Optional[str]): Postgres connection string (default DATABASE_URL)
+        local (bool): Skip SQL and evaluate locally
+
+    Returns:
+        Dict[str, Any]: Metric name -> value
+    """
+    dsn = dsn or os.getenv('DATABASE_URL')
+    names = [m.name for m in metrics]
+    result = None
+    source = 'local'
+
+    with get_metrics().span('staging_validation.metrics', table=STAGING_TABLE) as span:
+        if not local and dsn:
+            try:
+                result = collect_postgres(dsn, metrics)
+                source = 'postgres'
+            except Exception as e:
+                print(f"⚠️  Staging metrics over DATABASE_URL failed: {e}")
+        if result is None and not local and supabase is not None:
+            try:
+                data = supabase.rpc(METRICS_RPC).execute().data or {}
+                missing = [name for name in names if name not in data]
+                if missing:
+                    print(f"⚠️  {METRICS_RPC}() is missing {missing[:3]} (re-run staging_validation_functions.sql), scanning locally")
+                else:
+                    result = {name: data[name] for name in names}
+                    source = 'rpc'
+            except Exception as e:
+                if not is_missing_function(e):
+                    raise
+                print(f"⚠️  {METRICS_RPC}() not found (run cites_migration_2025/staging_validation_functions.sql), scanning locally")
+        if result is None:
+            result = collect_local(supabase, metrics)
+        span.set(source=source, metrics=len(names))
+    return result
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compute staging validation metrics in one pass')
+    parser.add_argument('--sql', action='store_true', help='Print staging_validation_functions.sql and exit')
+    parser.add_argument('--local', action='store_true', help='Evaluate locally instead of in SQL')
+    args = parser.parse_args()
+
+    if args.sql:
+        print(function_sql(), end='')
+        return
+
+    from config.supabase_config import get_supabase_client
+    print(json.dumps(collect_staging_metrics(get_supabase_client(), local=args.local), indent=2))
+
+if __name__ == "__main__":
+    main()
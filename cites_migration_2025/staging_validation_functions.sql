@@ -0,0 +1,43 @@
+-- Staging Validation Functions
+-- Aggregate RPC used by cites_migration_2025/staging_checks.py
+-- One pass over cites_trade_records_staging returns every metric the staging
+-- validators check, instead of a count or sample query per check.
+-- Generated from STAGING_METRICS; regenerate with:
+--   python cites_migration_2025/staging_checks.py --sql > cites_migration_2025/staging_validation_functions.sql
+
+CREATE OR REPLACE FUNCTION "public"."staging_validation_metrics"()
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT to_jsonb(m) FROM (
+        SELECT COUNT(*) AS total_records,
+               COUNT(DISTINCT t.species_id) AS unique_species,
+               MIN(t.year) AS earliest_year,
+               MAX(t.year) AS latest_year,
+               COUNT(*) FILTER (WHERE (t.appendix = 'I')) AS appendix_i_count,
+               COUNT(*) FILTER (WHERE (t.appendix = 'II')) AS appendix_ii_count,
+               COUNT(*) FILTER (WHERE (t.appendix = 'III')) AS appendix_iii_count,
+               COUNT(DISTINCT t.importer) AS unique_importers,
+               COUNT(DISTINCT t.exporter) AS unique_exporters,
+               SUM(t.importer_reported_quantity) AS total_importer_quantity,
+               SUM(t.exporter_reported_quantity) AS total_exporter_quantity,
+               COUNT(DISTINCT t.id) AS distinct_ids,
+               COUNT(*) FILTER (WHERE (t.species_id IS NULL)) AS null_species_id,
+               COUNT(*) FILTER (WHERE (t.taxon IS NULL) OR (t.year IS NULL)) AS missing_taxon_or_year,
+               COUNT(*) FILTER (WHERE (t.year >= 2020)) AS recent_records,
+               COUNT(*) FILTER (WHERE (t.year NOT BETWEEN 1975 AND 2024)) AS year_out_of_range,
+               COALESCE(array_agg(DISTINCT t.appendix::text ORDER BY t.appendix::text) FILTER (WHERE (t.appendix NOT IN ('I', 'II', 'III', 'I/II', 'II/NC', 'III/NC'))), ARRAY[]::text[]) AS invalid_appendix_values,
+               COALESCE(array_agg(DISTINCT t.purpose::text ORDER BY t.purpose::text) FILTER (WHERE (t.purpose NOT IN ('T', 'Z', 'S', 'P', 'B', 'E', 'G', 'Q', 'L', 'M', 'N'))), ARRAY[]::text[]) AS invalid_purpose_values,
+               COALESCE(array_agg(DISTINCT t.source::text ORDER BY t.source::text) FILTER (WHERE (t.source NOT IN ('W', 'C', 'D', 'F', 'R', 'I', 'O', 'X', 'Y', 'U'))), ARRAY[]::text[]) AS invalid_source_values,
+               COUNT(*) FILTER (WHERE (t.species_id IS NOT NULL AND s.id IS NULL)) AS orphan_records,
+               COALESCE(array_agg(DISTINCT t.species_id::text ORDER BY t.species_id::text) FILTER (WHERE (t.species_id IS NOT NULL AND s.id IS NULL)), ARRAY[]::text[]) AS invalid_species_ids
+        FROM cites_trade_records_staging t
+        LEFT JOIN species s ON s.id = t.species_id
+    ) m;
+$$;
+
+COMMENT ON FUNCTION "public"."staging_validation_metrics" IS 'Validation metrics of cites_trade_records_staging (counts, year range, invalid values, orphaned species_id) from one table scan';
+
+-- Make the function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
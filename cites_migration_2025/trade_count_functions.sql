@@ -0,0 +1,37 @@
+-- Trade Count Functions
+-- Aggregate RPC used by scripts/compare_trade_counts.py
+-- One grouped pass over cites_trade_records returns every species' record count and
+-- year range, instead of an ID lookup, a count and two year queries per species
+
+CREATE OR REPLACE FUNCTION "public"."species_trade_counts"()
+RETURNS TABLE(
+    species_id uuid,
+    scientific_name text,
+    record_count bigint,
+    min_year integer,
+    max_year integer
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT s.id AS species_id,
+           s.scientific_name::text,
+           COALESCE(t.record_count, 0) AS record_count,
+           t.min_year,
+           t.max_year
+    FROM species s
+    LEFT JOIN (
+        SELECT tr.species_id,
+               COUNT(*) AS record_count,
+               MIN(tr.year)::integer AS min_year,
+               MAX(tr.year)::integer AS max_year
+        FROM cites_trade_records tr
+        GROUP BY tr.species_id
+    ) t ON t.species_id = s.id
+    ORDER BY s.scientific_name;
+$$;
+
+COMMENT ON FUNCTION "public"."species_trade_counts" IS 'Per-species cites_trade_records count and min/max year (0 and NULL for species without records)';
+
+-- Make the function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
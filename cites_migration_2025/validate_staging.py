@@ -4,7 +4,8 @@ Validate CITES Staging Data
 Arctic Tracker - CITES Migration 2025
 
 Validates the staging table data quality and completeness
-before final migration to production.
+before final migration to production. All staging-table numbers come
+from one aggregate pass (see staging_checks.py).
 
 Usage:
     python validate_staging.py
@@ -20,6 +21,7 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.supabase_config import get_supabase_client
+from cites_migration_2025.staging_checks import collect_staging_metrics, SUMMARY_FIELDS
 
 # Configure logging
 logging.basicConfig(
@@ -45,14 +47,20 @@ class StagingValidator:
             'warnings': [],
             'data_quality': {}
         }
+        self._metrics = None
+    
+    def staging_metrics(self) -> dict:
+        """Staging table metrics, computed once for all checks"""
+        if self._metrics is None:
+            self._metrics = collect_staging_metrics(self.supabase)
+        return self._metrics
         
     def check_record_count(self) -> bool:
         """Check if all records were loaded"""
         logger.info("Checking record count...")
         
         try:
-            result = self.supabase.table('cites_trade_records_staging').select('count', count='exact').execute()
-            staging_count = result.count
+            staging_count = self.staging_metrics()['total_records']
             expected_count = 489148
             
             logger.info(f"Staging records: {staging_count:,}")
@@ -91,15 +99,15 @@ class StagingValidator:
         logger.info("Checking data quality...")
         
         try:
-            # Get staging summary
-            result = self.supabase.table('cites_staging_summary').select('*').execute()
-            if not result.data:
+            # Same fields as the cites_staging_summary view
+            metrics = self.staging_metrics()
+            if not metrics['total_records']:
                 logger.error("❌ No staging summary data found")
                 self.validation_results['critical_issues'].append("Staging summary view empty")
                 self.validation_results['checks_failed'] += 1
                 return False
             
-            summary = result.data[0]
+            summary = {field: metrics[field] for field in SUMMARY_FIELDS}
             self.validation_results['data_quality'] = summary
             
             logger.info("Data quality metrics:")
@@ -146,13 +154,10 @@ class StagingValidator:
         logger.info("Checking species mapping integrity...")
         
         try:
-            # Check for null species_id
-            result = self.supabase.table('cites_trade_records_staging')\
-                .select('count', count='exact')\
-                .is_('species_id', 'null')\
-                .execute()
+            metrics = self.staging_metrics()
             
-            null_species = result.count
+            # Check for null species_id
+            null_species = metrics['null_species_id']
             
             if null_species > 0:
                 logger.error(f"❌ Found {null_species:,} records with null species_id")
@@ -161,14 +166,13 @@ class StagingValidator:
                 return False
             
             # Check for invalid species_id references
-            validation_query = """
-            SELECT COUNT(*) as invalid_count
-            FROM cites_trade_records_staging cts
-            LEFT JOIN species s ON cts.species_id = s.id
-            WHERE s.id IS NULL
-            """
+            orphan_records = metrics['orphan_records']
+            if orphan_records > 0:
+                logger.error(f"❌ Found {orphan_records:,} records referencing {len(metrics['invalid_species_ids'])} unknown species_id values")
+                self.validation_results['critical_issues'].append(f"{orphan_records:,} records with invalid species_id")
+                self.validation_results['checks_failed'] += 1
+                return False
             
-            # For now, assume all species_ids are valid since we mapped them
             logger.info("✅ Species mapping integrity check passed")
             self.validation_results['checks_passed'] += 1
             return True
@@ -184,25 +188,17 @@ class StagingValidator:
         logger.info("Checking data completeness...")
         
         try:
-            # Check for records with missing critical fields
-            result = self.supabase.table('cites_trade_records_staging')\
-                .select('count', count='exact')\
-                .or_('taxon.is.null,year.is.null')\
-                .execute()
+            metrics = self.staging_metrics()
             
-            incomplete_records = result.count
+            # Check for records with missing critical fields
+            incomplete_records = metrics['missing_taxon_or_year']
             
             if incomplete_records > 0:
                 logger.warning(f"⚠️ Found {incomplete_records:,} records with missing taxon or year")
                 self.validation_results['warnings'].append(f"{incomplete_records:,} records missing taxon/year")
             
             # Check for reasonable data distribution
-            result = self.supabase.table('cites_trade_records_staging')\
-                .select('year', count='exact')\
-                .gte('year', 2020)\
-                .execute()
-            
-            recent_count = result.count
+            recent_count = metrics['recent_records']
             logger.info(f"Records from 2020+: {recent_count:,}")
             
             if recent_count < 10000:  # Expect significant recent data
@@ -229,8 +225,7 @@ class StagingValidator:
             prod_count = prod_result.count
             
             # Get staging count
-            staging_result = self.supabase.table('cites_trade_records_staging').select('count', count='exact').execute()
-            staging_count = staging_result.count
+            staging_count = self.staging_metrics()['total_records']
             
             logger.info(f"Production records: {prod_count:,}")
             logger.info(f"Staging records: {staging_count:,}")
@@ -5,6 +5,13 @@ This package provides centralized configuration management including:
 - Environment variables and settings
 - Database connection management  
 - API configuration and rate limiting
+- Pipeline instrumentation (spans, counters, histograms)
+- Shared country dimension (ISO codes, names, Arctic/NAMMCO flags)
+- Versioned report cache keyed by source table versions
+- Content-hash manifests for changed-only uploads
+- Schema catalog from information_schema/pg_catalog, cached on disk
+- Quoted PostgREST in-filter values
+- Ordered whole-table paging and missing-RPC detection for PostgREST
 
 Usage:
     from rebuild.config import get_settings, get_db, get_api_config
@@ -17,6 +24,13 @@ Usage:
 from .settings import get_settings, get_cached_settings, ApplicationSettings
 from .database import get_db, DatabaseManager
 from .api_config import get_api_config, APIConfigManager
+from .instrumentation import get_metrics, instrument_client, MetricsRegistry
+from .country_dimension import get_country_dimension, CountryDimension, Country
+from .report_cache import ReportCache, ReportSection, MaterializedReport
+from .content_manifest import ContentManifest
+from .schema_introspection import get_schema_catalog, SchemaCatalog
+from .postgrest_filters import in_list, quote_filter_value
+from .postgrest_queries import fetch_paginated, is_missing_function
 
 __all__ = [
     'get_settings',
@@ -25,5 +39,21 @@ __all__ = [
     'get_db',
     'DatabaseManager',
     'get_api_config',
-    'APIConfigManager'
+    'APIConfigManager',
+    'get_metrics',
+    'instrument_client',
+    'MetricsRegistry',
+    'get_country_dimension',
+    'CountryDimension',
+    'Country',
+    'ReportCache',
+    'ReportSection',
+    'MaterializedReport',
+    'ContentManifest',
+    'get_schema_catalog',
+    'SchemaCatalog',
+    'in_list',
+    'quote_filter_value',
+    'fetch_paginated',
+    'is_missing_function'
 ]
\ No newline at end of file
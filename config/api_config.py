@@ -2,13 +2,17 @@
 API Configuration for External Services
 
 This module manages API configurations and rate limiting for external services.
+RateLimiter is the thread-safe synchronous limiter for scripts that call
+Supabase directly; rate_limit_client() applies one to every REST call of a client.
 """
 
 import time
 import asyncio
+import threading
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 from .settings import get_cached_settings
+from .instrumentation import get_metrics
 
 @dataclass
 class APIEndpoint:
@@ -18,6 +22,74 @@ class APIEndpoint:
     timeout: int = 30
     max_retries: int = 3
 
+class RateLimiter:
+    """
+    Thread-safe token bucket: at most `rate` calls per second, `burst` at once
+
+    Callers that find the bucket empty reserve the next free slot and sleep
+    until it comes up, so concurrent threads are spaced out instead of
+    bunching up after a fixed delay.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1, name: str = 'default'):
+        """
+        Args:
+            rate (float): Calls per second
+            burst (int): Calls allowed back to back after an idle period
+            name (str): Label for the wait histogram
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.name = name
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Wait for a call slot
+        
+        Returns:
+            float: Seconds waited
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+        get_metrics().histogram('rate_limit_wait_seconds', limiter=self.name).observe(wait)
+        return wait
+
+def rate_limit_client(client: Any, limiter: RateLimiter) -> Any:
+    """
+    Make every PostgREST call of a Supabase client wait for the limiter
+    
+    Args:
+        client: Supabase client from create_client()
+        limiter (RateLimiter): Limiter shared by all callers of the client
+        
+    Returns:
+        The same client
+    """
+    session = getattr(getattr(client, 'postgrest', None), 'session', None)
+    hooks = getattr(session, 'event_hooks', None)
+    if hooks is not None:
+        hooks['request'] = [hook for hook in hooks.get('request', [])
+                            if getattr(hook, '__name__', None) != '_wait_for_rate_limit']
+        
+        def _wait_for_rate_limit(request) -> None:
+            limiter.acquire()
+        
+        hooks['request'].append(_wait_for_rate_limit)
+        session.event_hooks = hooks
+    return client
+
 class APIConfigManager:
     """
     Manages API configurations and rate limiting
@@ -27,17 +99,18 @@ class APIConfigManager:
         """Initialize API configuration manager"""
         self.settings = get_cached_settings()
         self.last_request_times: Dict[str, float] = {}
+        self._rate_locks: Dict[str, asyncio.Lock] = {}
         
         # Define API endpoints
         self.endpoints = {
             'cites': APIEndpoint(
-                base_url='https://api.cites.org/api/v1',
+                base_url=self.settings.api.cites_base_url,
                 rate_limit=1.0,  # 1 request per second
                 timeout=30,
                 max_retries=3
             ),
             'iucn': APIEndpoint(
-                base_url='https://api.iucnredlist.org/api/v4',
+                base_url=self.settings.api.iucn_base_url,
                 rate_limit=0.5,  # 0.5 requests per second (more conservative)
                 timeout=30,
                 max_retries=3
@@ -55,17 +128,21 @@ class APIConfigManager:
             return
         
         endpoint = self.endpoints[api_name]
-        current_time = time.time()
         
-        if api_name in self.last_request_times:
-            time_since_last = current_time - self.last_request_times[api_name]
-            min_interval = 1.0 / endpoint.rate_limit
+        # Serialize slot reservation so concurrent requests stay under the limit
+        lock = self._rate_locks.setdefault(api_name, asyncio.Lock())
+        async with lock:
+            current_time = time.time()
             
-            if time_since_last < min_interval:
-                sleep_time = min_interval - time_since_last
-                await asyncio.sleep(sleep_time)
-        
-        self.last_request_times[api_name] = time.time()
+            if api_name in self.last_request_times:
+                time_since_last = current_time - self.last_request_times[api_name]
+                min_interval = 1.0 / endpoint.rate_limit
+                
+                if time_since_last < min_interval:
+                    sleep_time = min_interval - time_since_last
+                    await asyncio.sleep(sleep_time)
+            
+            self.last_request_times[api_name] = time.time()
     
     def get_api_headers(self, api_name: str) -> Dict[str, str]:
         """
@@ -159,13 +236,18 @@ class APIConfigManager:
         if not endpoint:
             return {'success': False, 'error': f'Unknown API: {api_name}'}
         
+        metrics = get_metrics()
         for attempt in range(endpoint.max_retries + 1):
             try:
                 # Apply rate limiting
-                await self.rate_limit(api_name)
+                with metrics.span('api_rate_limit_wait', api=api_name):
+                    await self.rate_limit(api_name)
                 
                 # Make the request
+                start = time.perf_counter()
                 response = await request_func(*args, **kwargs)
+                metrics.histogram('api_request_seconds', api=api_name).observe(time.perf_counter() - start)
+                metrics.counter('api_requests_total', api=api_name, outcome='success').inc()
                 
                 return {
                     'success': True,
@@ -174,6 +256,7 @@ class APIConfigManager:
                 }
                 
             except Exception as e:
+                metrics.counter('api_requests_total', api=api_name, outcome='error').inc()
                 if attempt == endpoint.max_retries:
                     return {
                         'success': False,
@@ -181,11 +264,38 @@ class APIConfigManager:
                         'attempts': attempt + 1
                     }
                 
-                # Wait before retrying (exponential backoff)
-                wait_time = (2 ** attempt) * self.settings.rate_limit_delay
+                # Honour Retry-After on 429s, otherwise exponential backoff
+                wait_time = self.get_retry_after(e)
+                metrics.record_retry(api_name, 'throttled' if wait_time is not None else 'error')
+                if wait_time is None:
+                    wait_time = (2 ** attempt) * self.settings.rate_limit_delay
                 await asyncio.sleep(wait_time)
         
         return {'success': False, 'error': 'Max retries exceeded'}
+    
+    @staticmethod
+    def get_retry_after(error: Exception) -> Optional[float]:
+        """
+        Extract the Retry-After delay from a 429 response error
+        
+        Args:
+            error (Exception): Exception raised by the request function
+            
+        Returns:
+            Optional[float]: Seconds to wait, or None if the error is not a 429
+                or carries no Retry-After header (caller backs off exponentially)
+        """
+        if getattr(error, 'status', None) != 429:
+            return None
+        
+        headers = getattr(error, 'headers', None) or {}
+        retry_after = headers.get('Retry-After')
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            return None
 
 # Global API config manager instance
 _api_manager: Optional[APIConfigManager] = None
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Content Manifest for Profile Uploads
+
+Remembers what was last pushed to the database, so profile syncs only send
+what changed. Each entry holds the SHA-256 of a source file's bytes and of the
+database rows built from it:
+
+- file_changed() hashes the file locally; an unchanged file is skipped before
+  it is parsed and without any network call.
+- row_changed() hashes the row payload (canonical JSON); a file edited only
+  in fields that are not uploaded produces the same row hash and no write.
+
+Manifests are JSON files in cache/manifests/ (UPLOAD_MANIFEST_DIR moves them).
+Record an entry only after the upload succeeded, and save() at the end.
+
+Usage:
+    from config.content_manifest import ContentManifest
+
+    manifest = ContentManifest('species_profiles')
+    changed, digest = manifest.file_changed(path)
+    if changed:
+        upload(path)
+        manifest.record(path.name, file_hash=digest)
+    manifest.save()
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+MANIFEST_VERSION = 1
+MANIFEST_DIR_ENV = 'UPLOAD_MANIFEST_DIR'
+DEFAULT_MANIFEST_DIR = Path(__file__).parent.parent / 'cache' / 'manifests'
+READ_CHUNK_SIZE = 1 << 20
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_row(row: Any) -> str:
+    """SHA-256 of the canonical JSON form of a row payload"""
+    encoded = json.dumps(row, sort_keys=True, separators=(',', ':'), default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def manifest_dir() -> Path:
+    """Manifest directory (UPLOAD_MANIFEST_DIR or cache/manifests)"""
+    return Path(os.environ.get(MANIFEST_DIR_ENV) or DEFAULT_MANIFEST_DIR)
+
+class ContentManifest:
+    """Per-file and per-row content hashes of the last successful upload"""
+
+    def __init__(self, name: str, path: Optional[Path] = None):
+        """
+        Args:
+            name (str): Manifest name (one per upload workflow)
+            path (Optional[Path]): Manifest file (default <manifest_dir>/<name>.json)
+        """
+        self.name = name
+        self.path = Path(path or manifest_dir() / f"{name}.json")
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Read the manifest; a missing or unreadable file starts empty"""
+        try:
+            payload = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if payload.get('version') == MANIFEST_VERSION:
+            self.entries = payload.get('entries', {})
+
+    def save(self) -> None:
+        """Write the manifest atomically if anything was recorded"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({
+            'version': MANIFEST_VERSION,
+            'name': self.name,
+            'saved_at': datetime.now().isoformat(),
+            'entries': self.entries
+        }, indent=1, sort_keys=True), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def file_changed(self, path: Path, key: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Compare a file with its last uploaded content
+
+        Args:
+            path (Path): Source file
+            key (Optional[str]): Entry key (default the file name)
+
+        Returns:
+            Tuple[bool, str]: (changed, current file hash)
+        """
+        digest = hash_file(path)
+        entry = self.entries.get(key or Path(path).name)
+        return entry is None or entry.get('file_hash') != digest, digest
+
+    def row_changed(self, key: str, table: str, row: Any) -> Tuple[bool, str]:
+        """
+        Compare a row payload with the one last written for this entry
+
+        Args:
+            key (str): Entry key
+            table (str): Table the row is written to
+            row (Any): Row payload
+
+        Returns:
+            Tuple[bool, str]: (changed, current row hash)
+        """
+        digest = hash_row(row)
+        stored = self.get(key).get('rows', {}).get(table)
+        return stored != digest, digest
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """Stored entry for a key (empty if never recorded)"""
+        return self.entries.get(key, {})
+
+    def record(self, key: str, file_hash: Optional[str] = None, rows: Optional[Dict[str, str]] = None,
+               attributes: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store the hashes of a successful upload
+
+        Args:
+            key (str): Entry key
+            file_hash (Optional[str]): Hash from file_changed()
+            rows (Optional[Dict[str, str]]): Table -> hash from row_changed()
+            attributes (Optional[Dict[str, Any]]): Extra values needed when the file is skipped
+                (e.g. the scientific name it uploads)
+        """
+        entry = self.entries.setdefault(key, {})
+        if file_hash is not None:
+            entry['file_hash'] = file_hash
+        if rows:
+            entry.setdefault('rows', {}).update(rows)
+        if attributes:
+            entry.update(attributes)
+        entry['uploaded_at'] = datetime.now().isoformat()
+        self.dirty = True
+
+    def forget(self, key: str) -> None:
+        """Drop an entry so the next sync uploads it again"""
+        if self.entries.pop(key, None) is not None:
+            self.dirty = True
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Country Dimension for Arctic Tracker
+
+One shared index of the countries table, so trade consumers resolve the ISO
+codes in cites_trade_records.importer/exporter/origin with dictionary lookups
+instead of ad hoc maps and per-call queries. The table is read once (paginated),
+merged with the built-in ISO2 names and Arctic Council / NAMMCO flags, and
+cached on disk as JSON so later runs skip the database entirely until the
+cache expires.
+
+Usage:
+    from config.country_dimension import get_country_dimension
+
+    countries = get_country_dimension(supabase)
+    countries.name_for_code('NO')      # 'Norway'
+    countries.id_for_code('NO')        # countries.id UUID
+    countries.is_arctic('GL')          # True
+    'CA' in countries.arctic_codes     # True
+"""
+
+import os
+import json
+import time
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, FrozenSet
+
+try:
+    from config.instrumentation import get_metrics
+    from config.postgrest_queries import fetch_paginated
+except ImportError:
+    from instrumentation import get_metrics
+    from postgrest_queries import fetch_paginated
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / 'cache' / 'country_dimension.json'
+DEFAULT_MAX_AGE_HOURS = 24.0
+
+# ISO 2-letter codes found in CITES trade data and their country names
+COUNTRY_NAMES = {
+    'SA': 'Saudi Arabia',
+    'IE': 'Ireland',
+    'US': 'United States',
+    'CA': 'Canada',
+    'NO': 'Norway',
+    'IS': 'Iceland',
+    'GL': 'Greenland',
+    'FO': 'Faroe Islands',
+    'DK': 'Denmark',
+    'FI': 'Finland',
+    'SE': 'Sweden',
+    'RU': 'Russia',
+    'JP': 'Japan',
+    'KR': 'South Korea',
+    'CN': 'China',
+    'GB': 'United Kingdom',
+    'DE': 'Germany',
+    'FR': 'France',
+    'ES': 'Spain',
+    'PT': 'Portugal',
+    'NL': 'Netherlands',
+    'IT': 'Italy',
+    'PL': 'Poland',
+    'MX': 'Mexico',
+    'AU': 'Australia',
+    'NZ': 'New Zealand',
+    'BR': 'Brazil',
+    'AR': 'Argentina',
+    'CL': 'Chile',
+    'PE': 'Peru',
+    'CO': 'Colombia',
+    'EC': 'Ecuador',
+    'ZA': 'South Africa',
+    'MA': 'Morocco',
+    'EG': 'Egypt',
+    'TR': 'Turkey',
+    'IN': 'India',
+    'PK': 'Pakistan',
+    'AF': 'Afghanistan',
+    'KZ': 'Kazakhstan',
+    'UZ': 'Uzbekistan',
+    'KG': 'Kyrgyzstan',
+    'TJ': 'Tajikistan',
+    'TM': 'Turkmenistan',
+    'MN': 'Mongolia',
+    'IR': 'Iran',
+    'IQ': 'Iraq',
+    'SY': 'Syria',
+    'IL': 'Israel',
+    'BY': 'Belarus',
+    'UA': 'Ukraine',
+    'EE': 'Estonia',
+    'LV': 'Latvia',
+    'LT': 'Lithuania',
+    'GT': 'Guatemala',
+    'BZ': 'Belize',
+    'CR': 'Costa Rica',
+    'PA': 'Panama',
+    'SN': 'Senegal',
+    'GH': 'Ghana',
+    'NG': 'Nigeria'
+}
+
+# Arctic Council member states
+ARCTIC_COUNCIL_CODES = frozenset({'CA', 'DK', 'FI', 'IS', 'NO', 'RU', 'SE', 'US'})
+
+# Arctic territories that trade under their own code (Greenland via Denmark)
+ARCTIC_TERRITORY_CODES = frozenset({'GL'})
+
+# NAMMCO members (Faroe Islands and Greenland via Denmark)
+NAMMCO_CODES = frozenset({'NO', 'IS', 'GL', 'FO'})
+
+# CITES placeholder codes that are shown as-is rather than resolved
+PLACEHOLDER_CODES = frozenset({'XX', 'XV', 'HS'})
+
+def normalize_code(code: Any) -> str:
+    """Upper-cased, trimmed country code ('' for missing values)"""
+    return str(code).strip().upper() if code is not None else ''
+
+def normalize_country_name(name: Any) -> str:
+    """Case- and whitespace-insensitive name key"""
+    return ' '.join(str(name).split()).casefold() if name is not None else ''
+
+@dataclass(frozen=True)
+class Country:
+    """One row of the country dimension"""
+    code: Optional[str]
+    name: str
+    id: Optional[str] = None
+    arctic_council: bool = False
+    nammco_member: bool = False
+
+    @property
+    def is_arctic(self) -> bool:
+        """Arctic Council member or Arctic territory"""
+        return self.arctic_council or self.code in ARCTIC_TERRITORY_CODES
+
+class CountryDimension:
+    """In-memory country index keyed by ISO2 code, countries.id and name"""
+
+    def __init__(self, countries: Iterable[Country] = (), loaded_at: Optional[float] = None):
+        """
+        Build the lookup tables
+
+        Args:
+            countries: Database rows as Country objects (built-ins are added for missing codes)
+            loaded_at (float, optional): Unix time the rows were read from the database
+        """
+        self.loaded_at = loaded_at
+        self.by_code: Dict[str, Country] = {}
+        self.by_id: Dict[str, Country] = {}
+        self.by_name: Dict[str, Country] = {}
+        self.arctic_codes: FrozenSet[str] = frozenset()
+        self.arctic_council_codes: FrozenSet[str] = frozenset()
+        self.nammco_codes: FrozenSet[str] = frozenset()
+
+        for country in countries:
+            self.add(country)
+        for code, name in COUNTRY_NAMES.items():
+            if code in self.by_code:
+                continue
+            existing = self.by_name.get(normalize_country_name(name))
+            if existing is None:
+                self.add(self._builtin(code, name))
+            elif not existing.code:
+                # Database row stored without a code: attach the known code and flags
+                self.add(replace(
+                    existing,
+                    code=code,
+                    arctic_council=existing.arctic_council or code in ARCTIC_COUNCIL_CODES,
+                    nammco_member=existing.nammco_member or code in NAMMCO_CODES
+                ), overwrite=True)
+
+    @staticmethod
+    def _builtin(code: str, name: str) -> Country:
+        return Country(
+            code=code,
+            name=name,
+            arctic_council=code in ARCTIC_COUNCIL_CODES,
+            nammco_member=code in NAMMCO_CODES
+        )
+
+    def add(self, country: Country, overwrite: bool = False) -> Country:
+        """
+        Register a country (e.g. one just inserted) in every index
+
+        Args:
+            country (Country): Country to add
+            overwrite (bool): Replace entries already stored under the same keys
+
+        Returns:
+            Country: The stored country
+        """
+        keys = [(self.by_code, country.code), (self.by_id, country.id),
+                (self.by_name, normalize_country_name(country.name))]
+        for index, key in keys:
+            if key and (overwrite or key not in index):
+                index[key] = country
+        if country.code:
+            if country.is_arctic:
+                self.arctic_codes = self.arctic_codes | {country.code}
+            if country.arctic_council:
+                self.arctic_council_codes = self.arctic_council_codes | {country.code}
+            if country.nammco_member:
+                self.nammco_codes = self.nammco_codes | {country.code}
+        return country
+
+    def add_row(self, row: Dict[str, Any]) -> Country:
+        """Register a countries table row"""
+        return self.add(self.country_from_row(row))
+
+    @staticmethod
+    def country_from_row(row: Dict[str, Any]) -> Country:
+        """
+        Convert a countries table row, filling flags the row leaves unset
+
+        Args:
+            row (Dict[str, Any]): Row with id, country_name, country_code and flags
+
+        Returns:
+            Country: Dimension entry
+        """
+        code = normalize_code(row.get('country_code')) or None
+        return Country(
+            code=code,
+            name=' '.join(str(row.get('country_name') or '').split()),
+            id=str(row['id']) if row.get('id') is not None else None,
+            arctic_council=bool(row.get('arctic_council')) or code in ARCTIC_COUNCIL_CODES,
+            nammco_member=bool(row.get('nammco_member')) or code in NAMMCO_CODES
+        )
+
+    # ------------------------------------------------------------------ lookups
+
+    def get(self, identifier: Any) -> Optional[Country]:
+        """
+        Resolve an ISO2 code, countries.id or country name
+
+        Args:
+            identifier: Code, UUID or name
+
+        Returns:
+            Optional[Country]: Matching country or None
+        """
+        if identifier is None:
+            return None
+        return self.by_code.get(normalize_code(identifier)) or \
+            self.by_id.get(str(identifier).strip()) or \
+            self.by_name.get(normalize_country_name(identifier))
+
+    def name_for_code(self, code: Any) -> str:
+        """Display name for a CITES country code (placeholders and unknown codes echo the code)"""
+        code = normalize_code(code)
+        if not code:
+            return 'Unknown'
+        if code in PLACEHOLDER_CODES:
+            return code
+        country = self.by_code.get(code)
+        return country.name if country else code
+
+    def id_for_code(self, code: Any) -> Optional[str]:
+        """countries.id for a code, or None if the code has no database row"""
+        country = self.by_code.get(normalize_code(code))
+        return country.id if country else None
+
+    def is_arctic(self, code: Any) -> bool:
+        return normalize_code(code) in self.arctic_codes
+
+    def is_arctic_council(self, code: Any) -> bool:
+        return normalize_code(code) in self.arctic_council_codes
+
+    def is_nammco(self, code: Any) -> bool:
+        return normalize_code(code) in self.nammco_codes
+
+    def database_rows(self) -> List[Country]:
+        """Countries backed by a countries table row"""
+        return list(self.by_id.values())
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    # ------------------------------------------------------------------ loading
+
+    @classmethod
+    def load(cls, supabase) -> 'CountryDimension':
+        """
+        Read the whole countries table in pages
+
+        Args:
+            supabase: Supabase client
+
+        Returns:
+            CountryDimension: Fresh dimension
+        """
+        with get_metrics().span('country_dimension.load') as span:
+            rows = fetch_paginated(lambda: supabase.table('countries'),
+                                   'id, country_name, country_code, arctic_council, nammco_member')
+            span.set(rows=len(rows))
+        return cls((cls.country_from_row(row) for row in rows), loaded_at=time.time())
+
+    @classmethod
+    def from_cache(cls, path: Path) -> Optional['CountryDimension']:
+        """Load a dimension saved with save(), or None if the file is missing or stale-format"""
+        try:
+            data = json.loads(Path(path).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != CACHE_VERSION:
+            return None
+        return cls((Country(**row) for row in data.get('countries', [])), loaded_at=data.get('loaded_at'))
+
+    def save(self, path: Path) -> None:
+        """Write the database-backed countries to a JSON cache file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': CACHE_VERSION,
+            'loaded_at': self.loaded_at,
+            'countries': [asdict(country) for country in self.database_rows()]
+        }
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(payload, indent=1), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def age_hours(self) -> float:
+        """Hours since the rows were read from the database (infinite for built-ins only)"""
+        return (time.time() - self.loaded_at) / 3600 if self.loaded_at else float('inf')
+
+_dimension: Optional[CountryDimension] = None
+
+def cache_path() -> Path:
+    """Disk cache location (COUNTRY_DIMENSION_CACHE overrides the default)"""
+    return Path(os.getenv('COUNTRY_DIMENSION_CACHE', str(DEFAULT_CACHE_PATH)))
+
+def get_country_dimension(supabase=None, refresh: bool = False,
+                          max_age_hours: float = DEFAULT_MAX_AGE_HOURS) -> CountryDimension:
+    """
+    Get the process-wide country dimension
+
+    Uses the in-memory copy, then the disk cache while it is younger than
+    max_age_hours, then the database (when a client is given). Without a client
+    and without a usable cache, only the built-in codes and flags are available.
+
+    Args:
+        supabase: Supabase client used to (re)load the countries table
+        refresh (bool): Ignore both caches and reload from the database
+        max_age_hours (float): Maximum disk cache age before reloading
+
+    Returns:
+        CountryDimension: Shared dimension
+    """
+    global _dimension
+    metrics = get_metrics()
+
+    if not refresh and _dimension is not None and (supabase is None or _dimension.loaded_at):
+        return _dimension
+
+    if not refresh:
+        cached = CountryDimension.from_cache(cache_path())
+        if cached is not None and (supabase is None or cached.age_hours() < max_age_hours):
+            metrics.counter('country_dimension_cache_total', result='hit').inc()
+            _dimension = cached
+            return _dimension
+
+    if supabase is not None:
+        metrics.counter('country_dimension_cache_total', result='miss').inc()
+        _dimension = CountryDimension.load(supabase)
+        try:
+            _dimension.save(cache_path())
+        except OSError:
+            pass
+        return _dimension
+
+    _dimension = CountryDimension()
+    return _dimension
+
+def save_country_dimension() -> None:
+    """Persist the shared dimension after countries were added to it"""
+    if _dimension is not None and _dimension.loaded_at:
+        _dimension.save(cache_path())
@@ -8,6 +8,8 @@ import asyncio
 from typing import Optional, Dict, Any, List
 from supabase import create_client, Client
 from .settings import get_cached_settings
+from .instrumentation import instrument_client
+from .schema_introspection import get_schema_catalog, SchemaCatalog
 
 class DatabaseManager:
     """
@@ -28,12 +30,24 @@ class DatabaseManager:
             Client: Supabase client instance
         """
         if self._client is None:
-            self._client = create_client(
+            self._client = instrument_client(create_client(
                 self.settings.database.supabase_url,
                 self.settings.database.supabase_anon_key
-            )
+            ))
         return self._client
     
+    def schema_catalog(self, refresh: bool = False) -> Optional[SchemaCatalog]:
+        """
+        Get the shared schema catalog (DATABASE_URL or schema_catalog() RPC, cached on disk)
+        
+        Args:
+            refresh (bool): Re-read the catalogs instead of using the cache
+            
+        Returns:
+            Optional[SchemaCatalog]: Catalog, or None if introspection is unavailable
+        """
+        return get_schema_catalog(self.client, refresh=refresh)
+    
     async def test_connection(self) -> bool:
         """
         Test database connection
@@ -60,19 +74,32 @@ class DatabaseManager:
             Dict[str, Any]: Table information including schema and row count
         """
         try:
-            # Get row count
-            count_response = self.client.table(table_name).select('id', count='exact').execute()
-            row_count = count_response.count
+            catalog = self.schema_catalog()
+            table = catalog.tables.get(table_name) if catalog is not None else None
+            
+            if table is not None and table.approx_rows is not None:
+                # Declared column types and the planner's row estimate; one row for the sample
+                sample_response = self.client.table(table_name).select('*').limit(1).execute()
+                return {
+                    'table_name': table_name,
+                    'row_count': table.approx_rows,
+                    'row_count_estimated': True,
+                    'schema': {column.name: column.data_type for column in table.columns},
+                    'sample_data': sample_response.data[0] if sample_response.data else None
+                }
             
-            # Get sample data to understand schema
-            sample_response = self.client.table(table_name).select('*').limit(1).execute()
+            # Row count (count header) and one sample row in a single request
+            sample_response = self.client.table(table_name).select('*', count='exact').limit(1).execute()
             schema = {}
-            if sample_response.data:
+            if table is not None:
+                schema = {column.name: column.data_type for column in table.columns}
+            elif sample_response.data:
                 schema = {key: type(value).__name__ for key, value in sample_response.data[0].items()}
             
             return {
                 'table_name': table_name,
-                'row_count': row_count,
+                'row_count': sample_response.count,
+                'row_count_estimated': False,
                 'schema': schema,
                 'sample_data': sample_response.data[0] if sample_response.data else None
             }
@@ -85,15 +112,21 @@ class DatabaseManager:
                 'schema': {}
             }
     
-    async def get_all_tables(self) -> List[str]:
+    async def get_all_tables(self, refresh: bool = False) -> List[str]:
         """
         Get list of all tables in the database
         
+        Args:
+            refresh (bool): Re-read the schema catalog instead of using the cache
+            
         Returns:
             List[str]: List of table names
         """
-        # This is a simplified version - in practice you might need to query
-        # the information_schema or use Supabase's admin API
+        catalog = self.schema_catalog(refresh=refresh)
+        if catalog is not None and len(catalog):
+            return catalog.table_names(include_views=False)
+        
+        # Without a catalog, probe the known tables one by one
         known_tables = [
             'cites_trade_records',
             'cites_species', 
@@ -0,0 +1,410 @@
+"""
+Pipeline Instrumentation
+
+Shared spans, counters and histograms for the core and migration scripts, so a
+slow run can be broken down by stage, batch and REST call instead of reading
+the ad-hoc stats printed at the end.
+
+- Spans time a block of work (a stage, a file, a batch) and feed a duration
+  histogram per span name. Finished spans are also kept as a trace.
+- Counters and histograms take low-cardinality labels (table, method, api).
+  Their names must be valid Prometheus names (letters, digits, _ and :), so
+  counter('cache.hits') raises ValueError; use 'cache_hits_total'.
+- instrument_client() hooks a Supabase client so every REST call is counted
+  with its latency and the bytes sent and received.
+
+Metrics are exported as JSON and Prometheus text. Set ARCTIC_METRICS_DIR to
+write both files automatically when a script exits.
+
+Usage:
+    from config.instrumentation import get_metrics
+
+    metrics = get_metrics()
+    with metrics.span('load_batch', table='cites_trade_records') as span:
+        supabase.table('cites_trade_records').insert(batch).execute()
+        span.set(rows=len(batch))
+    metrics.counter('records_loaded_total', table='cites_trade_records').inc(len(batch))
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urlparse
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+
+METRICS_DIR_ENV = 'ARCTIC_METRICS_DIR'
+PROMETHEUS_PREFIX = 'arctic_'
+
+# Upper bounds in seconds, from a single REST round trip to a whole stage
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+MAX_TRACE_SPANS = 10000
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Prometheus metric name syntax; use underscores, e.g. 'cache_hits_total', not 'cache.hits'
+METRIC_NAME_PATTERN = re.compile(r'[a-zA-Z_:][a-zA-Z0-9_:]*')
+
+# Innermost open span; a context variable so threads and asyncio tasks each nest on their own
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+def _check_metric_name(name: str) -> None:
+    if not METRIC_NAME_PATTERN.fullmatch(name):
+        raise ValueError(f"Invalid metric name {name!r}: must match {METRIC_NAME_PATTERN.pattern}")
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+class Counter:
+    """Monotonic counter"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+class Histogram:
+    """Bucketed distribution with count, sum, min and max"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile (upper bound of the bucket holding it)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': self.min,
+            'max': self.max,
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95)
+        }
+
+class Span:
+    """A timed block of work; use MetricsRegistry.span() to create one"""
+
+    def __init__(self, name: str, labels: Dict[str, Any], parent: Optional['Span']):
+        self.name = name
+        self.labels = labels
+        self.parent = parent
+        self.attributes: Dict[str, Any] = {}
+        self.started_at = datetime.now().isoformat()
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return f"{self.parent.path}/{self.name}" if self.parent else self.name
+
+    def set(self, **attributes: Any) -> None:
+        """
+        Attach attributes to the span
+
+        'rows' and 'bytes' are also added to the span's counters; anything else
+        is kept in the trace only, so high-cardinality values are fine here.
+        """
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'path': self.path,
+            'labels': self.labels,
+            'started_at': self.started_at,
+            'duration_s': round(self.duration, 6) if self.duration is not None else None,
+            'error': self.error,
+            **({'attributes': self.attributes} if self.attributes else {})
+        }
+
+class MetricsRegistry:
+    """Process-wide collection of counters, histograms and spans"""
+
+    def __init__(self, max_trace_spans: int = MAX_TRACE_SPANS):
+        self.created_at = datetime.now().isoformat()
+        self.counters: Dict[str, Dict[LabelKey, Counter]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.trace: List[Dict[str, Any]] = []
+        self.dropped_spans = 0
+        self.max_trace_spans = max_trace_spans
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, **labels: Any) -> Counter:
+        """Get (or create) the counter for a name and label set; raises ValueError for an invalid name"""
+        key = _label_key(labels)
+        with self._lock:
+            if name not in self.counters:
+                _check_metric_name(name)
+            series = self.counters.setdefault(name, {})
+            if key not in series:
+                series[key] = Counter()
+            return series[key]
+
+    def histogram(self, name: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels: Any) -> Histogram:
+        """Get (or create) the histogram for a name and label set; raises ValueError for an invalid name"""
+        key = _label_key(labels)
+        with self._lock:
+            if name not in self.histograms:
+                _check_metric_name(name)
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(buckets)
+            return series[key]
+
+    def total(self, name: str) -> float:
+        """Sum of a counter over all label sets"""
+        with self._lock:
+            return sum(c.value for c in self.counters.get(name, {}).values())
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[Span]:
+        """
+        Time a block of work
+
+        Args:
+            name (str): Span name, e.g. 'load_batch'
+            **labels: Low-cardinality labels for the span's metrics
+
+        Yields:
+            Span: The running span (call span.set() to attach rows/bytes/attributes)
+        """
+        span = Span(name, labels, _current_span.get())
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration = time.perf_counter() - span.start
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        labels = {'span': span.name, **span.labels}
+        self.histogram('span_duration_seconds', **labels).observe(span.duration)
+        if span.error:
+            self.counter('span_errors_total', **labels).inc()
+        for attribute in ('rows', 'bytes'):
+            if isinstance(span.attributes.get(attribute), (int, float)):
+                self.counter(f'span_{attribute}_total', **labels).inc(span.attributes[attribute])
+
+        with self._lock:
+            if len(self.trace) < self.max_trace_spans:
+                self.trace.append(span.to_dict())
+            else:
+                self.dropped_spans += 1
+
+    def record_retry(self, source: str, reason: Optional[str] = None) -> None:
+        """Count a retried operation (API call, batch insert, ...)"""
+        self.counter('retries_total', source=source, reason=reason).inc()
+
+    def reset(self) -> None:
+        """Drop everything recorded so far"""
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.trace.clear()
+            self.dropped_spans = 0
+            self.created_at = datetime.now().isoformat()
+
+    # ------------------------------------------------------------------ export
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot of all metrics and the span trace"""
+        with self._lock:
+            counters = {name: [{'labels': dict(key), 'value': c.value} for key, c in series.items()]
+                        for name, series in self.counters.items()}
+            histograms = {name: [{'labels': dict(key), **h.to_dict()} for key, h in series.items()]
+                          for name, series in self.histograms.items()}
+            return {
+                'created_at': self.created_at,
+                'exported_at': datetime.now().isoformat(),
+                'counters': counters,
+                'histograms': histograms,
+                'trace': list(self.trace),
+                'dropped_spans': self.dropped_spans
+            }
+
+    def to_prometheus(self) -> str:
+        """All counters and histograms in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} counter")
+                for key, counter in series.items():
+                    lines.append(f"{metric}{_format_labels(key)} {_format_number(counter.value)}")
+
+            for name, series in sorted(self.histograms.items()):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f"{metric}_bucket{_format_labels(key + (('le', repr(bound)),))} {cumulative}")
+                    lines.append(f"{metric}_bucket{_format_labels(key + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {_format_number(histogram.sum)}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, output_dir: Path, name: Optional[str] = None) -> Tuple[Path, Path]:
+        """
+        Write <name>_<timestamp>.metrics.json and .prom files
+
+        Args:
+            output_dir (Path): Target directory (created if needed)
+            name (str, optional): File prefix, defaults to the running script's name
+
+        Returns:
+            Tuple[Path, Path]: JSON and Prometheus files written
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        name = name or Path(sys.argv[0]).stem or 'python'
+        stem = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        json_file = output_dir / f"{stem}.metrics.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+        prom_file = output_dir / f"{stem}.prom"
+        with open(prom_file, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        return json_file, prom_file
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    escaped = (k + '="' + v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+               for k, v in key)
+    return '{' + ','.join(escaped) + '}'
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+# =============================================================================
+# Process-wide registry
+# =============================================================================
+
+# Scripts import this module as config.instrumentation, or as instrumentation
+# with the config directory on sys.path; both copies share one registry
+_MODULE_NAMES = ('config.instrumentation', 'instrumentation')
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Get the process-wide metrics registry
+
+    Returns:
+        MetricsRegistry: Shared registry (exported on exit when ARCTIC_METRICS_DIR is set)
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                for module_name in _MODULE_NAMES:
+                    module = sys.modules.get(module_name)
+                    if module is not None and getattr(module, '_registry', None) is not None:
+                        _registry = module._registry
+                        break
+                else:
+                    _registry = MetricsRegistry()
+                    atexit.register(_export_on_exit, _registry)
+    return _registry
+
+def _export_on_exit(registry: MetricsRegistry) -> None:
+    output_dir = os.getenv(METRICS_DIR_ENV)
+    if output_dir and (registry.counters or registry.histograms):
+        json_file, prom_file = registry.export(Path(output_dir))
+        print(f"📊 Metrics written to {json_file} and {prom_file}")
+
+# =============================================================================
+# Supabase REST instrumentation
+# =============================================================================
+
+def _rest_resource(path: str) -> str:
+    # /rest/v1/<table> or /rest/v1/rpc/<function>
+    parts = [p for p in path.split('/') if p]
+    if 'v1' in parts:
+        parts = parts[parts.index('v1') + 1:]
+    if parts[:1] == ['rpc'] and len(parts) > 1:
+        return f"rpc/{parts[1]}"
+    return parts[0] if parts else ''
+
+def _on_rest_response(response) -> None:
+    # Read the body here so the latency covers the full transfer
+    response.read()
+    request = response.request
+    labels = {
+        'method': request.method,
+        'table': _rest_resource(urlparse(str(request.url)).path)
+    }
+    metrics = get_metrics()
+    metrics.counter('rest_requests_total', status=response.status_code, **labels).inc()
+    metrics.histogram('rest_request_seconds', **labels).observe(response.elapsed.total_seconds())
+    metrics.counter('rest_bytes_sent_total', **labels).inc(len(request.content or b''))
+    metrics.counter('rest_bytes_received_total', **labels).inc(len(response.content))
+
+def instrument_client(client: Any) -> Any:
+    """
+    Count every PostgREST call made through a Supabase client
+
+    Records rest_requests_total (method, table, status), rest_request_seconds and
+    bytes sent/received. Safe to call more than once on the same client.
+
+    Args:
+        client: Supabase client from create_client()
+
+    Returns:
+        The same client
+    """
+    session = getattr(getattr(client, 'postgrest', None), 'session', None)
+    hooks = getattr(session, 'event_hooks', None)
+    # Compare by name: the module may be loaded under two names (see get_metrics)
+    installed = {getattr(hook, '__name__', None) for hook in (hooks or {}).get('response', [])}
+    if hooks is not None and _on_rest_response.__name__ not in installed:
+        hooks['response'] = list(hooks.get('response', [])) + [_on_rest_response]
+        session.event_hooks = hooks
+    return client
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+PostgREST Filter Values for Arctic Tracker
+
+postgrest-py's in_() wraps a value in double quotes when it contains one of
+,:() but leaves quotes and backslashes inside the value as they are, so a
+value such as  Meyer "Breeding of the Short-eared Owl" (2016)  breaks the
+whole filter. These helpers quote and escape every value themselves; pass the
+result to .filter(column, 'in', ...) rather than .in_(), which would quote an
+already-quoted value a second time.
+
+Usage:
+    from config.postgrest_filters import in_list
+
+    supabase.table('references').select('id, full_citation') \\
+        .filter('full_citation', 'in', in_list(citations)).execute()
+"""
+
+from typing import Any, Iterable
+
+def quote_filter_value(value: Any) -> str:
+    """Double-quote a value for a PostgREST in.(...) list so whitespace, commas and quotes survive"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def in_list(values: Iterable[Any]) -> str:
+    """
+    Criteria of an in filter with every value quoted and escaped
+
+    Args:
+        values (Iterable[Any]): Values to match
+
+    Returns:
+        str: e.g. '("Korea, Republic of","Norway")'
+    """
+    return '(' + ','.join(quote_filter_value(value) for value in values) + ')'
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+PostgREST Query Helpers for Arctic Tracker
+
+PostgREST caps every select at its max-rows setting (1000 on Supabase), so
+whole-table reads have to page with .range(). Without an ORDER BY the database
+is free to return rows in a different order for each page, which skips some
+rows and repeats others; fetch_paginated() always orders by a unique column.
+
+Scripts that call an optional RPC (aggregate functions created by a separate
+.sql file) fall back to client-side work when is_missing_function() says the
+function has not been created yet.
+
+Usage:
+    from config.postgrest_queries import fetch_paginated, is_missing_function
+
+    rows = fetch_paginated(lambda: supabase.table('catch_records'), 'id, country, country_id')
+
+    try:
+        counts = supabase.rpc('species_trade_counts').execute().data
+    except APIError as e:
+        if not is_missing_function(e):
+            raise
+        counts = None  # fall back
+"""
+
+from typing import Any, Callable, Dict, List
+
+from postgrest.exceptions import APIError
+
+# PostgREST max-rows on Supabase
+PAGE_SIZE = 1000
+
+def is_missing_function(error: Exception) -> bool:
+    """True if an RPC failed because the function has not been created"""
+    return isinstance(error, APIError) and error.code in ('PGRST202', '42883')
+
+def fetch_paginated(query_builder: Callable[[], Any], columns: str,
+                    order: str = 'id', page_size: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Select all rows of a table page by page in a stable order
+
+    Args:
+        query_builder (Callable[[], Any]): Returns a fresh request builder,
+            e.g. lambda: supabase.table('species')
+        columns (str): Columns to select
+        order (str): Unique column to order the pages by
+        page_size (int): Rows per request, at most the server's max-rows
+
+    Returns:
+        List[Dict[str, Any]]: Every row of the query
+    """
+    rows = []
+    offset = 0
+    while True:
+        response = query_builder().select(columns).order(order) \
+            .range(offset, offset + page_size - 1).execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        offset += page_size
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Versioned Report Cache for Arctic Tracker
+
+Materializes generated reports keyed by a data-version fingerprint, so a report
+is only rebuilt when the tables it reads have changed. The version of a source
+table is its row count plus its latest updated_at (created_at for tables without
+one), fetched with two tiny queries per table instead of reading the data.
+
+A report is a list of sections, each tagged with the tables it reads. On every
+run the table versions are fetched concurrently and hashed per section:
+
+- Nothing moved: the cached artifact is returned without building anything.
+- Some tables moved: only the sections reading them are rebuilt (concurrently),
+  the others are copied from the previous artifact.
+
+Artifacts are written as cache/reports/<name>/<name>_<fingerprint>.json next to
+a manifest.json recording the section fingerprints. Sections without source
+tables never expire; bump the report version when their content changes.
+
+Usage:
+    from config.report_cache import ReportCache, ReportSection
+
+    sections = [
+        ReportSection('summary', build_summary, tables=('species', 'cites_listings')),
+        ReportSection('notes', build_notes)
+    ]
+    report = ReportCache('species_report', report_version='1').materialize(supabase, sections)
+    report.content['summary']       # section content
+    report.cached                   # True when nothing changed since the last run
+"""
+
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Callable, Iterable, Sequence, Tuple
+
+from postgrest.exceptions import APIError
+
+try:
+    from config.instrumentation import get_metrics
+except ImportError:
+    from instrumentation import get_metrics
+
+CACHE_VERSION = 1
+CACHE_DIR_ENV = 'REPORT_CACHE_DIR'
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / 'cache' / 'reports'
+DEFAULT_TIMESTAMP_COLUMN = 'updated_at'
+FALLBACK_TIMESTAMP_COLUMN = 'created_at'
+DEFAULT_KEEP_ARTIFACTS = 5
+MAX_WORKERS = 8
+
+@dataclass(frozen=True)
+class TableVersion:
+    """Row count and latest change timestamp of a source table"""
+    table: str
+    row_count: int
+    max_updated_at: Optional[str] = None
+
+@dataclass
+class ReportSection:
+    """
+    One independently cached part of a report
+
+    build(client, versions) receives the versions of all source tables, so
+    sections that only need row counts can read them without another query.
+    """
+    name: str
+    build: Callable[[Any, Dict[str, TableVersion]], Any]
+    tables: Tuple[str, ...] = ()
+
+@dataclass
+class MaterializedReport:
+    """A report served from or written to the cache"""
+    name: str
+    fingerprint: str
+    generated_at: str
+    content: Dict[str, Any]
+    table_versions: Dict[str, TableVersion]
+    path: Path
+    cached: bool = False
+    rebuilt: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+
+def _is_missing_column(error: Exception) -> bool:
+    return isinstance(error, APIError) and error.code in ('42703', 'PGRST204')
+
+def fetch_table_version(client, table: str, timestamp_column: str = DEFAULT_TIMESTAMP_COLUMN) -> TableVersion:
+    """
+    Row count and latest timestamp of a table
+
+    Falls back to created_at when the table has no updated_at column.
+
+    Args:
+        client: Supabase client
+        table (str): Table name
+        timestamp_column (str): Column tracking the latest change
+
+    Returns:
+        TableVersion: Version of the table
+    """
+    count = client.table(table).select('*', count='exact').limit(1).execute().count or 0
+    columns = [timestamp_column]
+    if timestamp_column != FALLBACK_TIMESTAMP_COLUMN:
+        columns.append(FALLBACK_TIMESTAMP_COLUMN)
+
+    for column in columns:
+        try:
+            response = (client.table(table).select(column)
+                        .order(column, desc=True, nullsfirst=False).limit(1).execute())
+        except APIError as e:
+            if _is_missing_column(e):
+                continue
+            raise
+        rows = response.data or []
+        return TableVersion(table, count, str(rows[0][column]) if rows and rows[0].get(column) else None)
+    return TableVersion(table, count)
+
+def fetch_table_versions(client, tables: Iterable[str],
+                         timestamp_columns: Optional[Dict[str, str]] = None) -> Dict[str, TableVersion]:
+    """
+    Versions of several tables, fetched concurrently
+
+    Args:
+        client: Supabase client
+        tables (Iterable[str]): Table names
+        timestamp_columns (Optional[Dict[str, str]]): Table -> change timestamp column (default updated_at)
+
+    Returns:
+        Dict[str, TableVersion]: Table -> version
+    """
+    tables = sorted(set(tables))
+    if not tables:
+        return {}
+    timestamp_columns = timestamp_columns or {}
+    with get_metrics().span('report_cache.versions', tables=len(tables)):
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tables))) as executor:
+            futures = {table: executor.submit(fetch_table_version, client, table,
+                                              timestamp_columns.get(table, DEFAULT_TIMESTAMP_COLUMN))
+                       for table in tables}
+            return {table: future.result() for table, future in futures.items()}
+
+def fingerprint(payload: Any) -> str:
+    """SHA-256 of the canonical JSON form of payload"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def cache_dir() -> Path:
+    """Report cache directory (REPORT_CACHE_DIR or cache/reports)"""
+    return Path(os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR)
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(payload, indent=2, default=str), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+class ReportCache:
+    """Fingerprinted, section-level cache of one generated report"""
+
+    def __init__(self, name: str, report_version: str = '1', directory: Optional[Path] = None,
+                 keep: int = DEFAULT_KEEP_ARTIFACTS):
+        """
+        Args:
+            name (str): Report name (used for the directory and artifact files)
+            report_version (str): Bump to invalidate every section after a code change
+            directory (Optional[Path]): Cache root (default cache_dir())
+            keep (int): Number of artifacts to keep on disk
+        """
+        self.name = name
+        self.report_version = str(report_version)
+        self.directory = Path(directory or cache_dir()) / name
+        self.manifest_path = self.directory / 'manifest.json'
+        self.keep = keep
+
+    def section_fingerprint(self, section: ReportSection, versions: Dict[str, TableVersion]) -> str:
+        """Fingerprint of a section: its name, the report version and its tables' versions"""
+        return fingerprint({
+            'section': section.name,
+            'report_version': self.report_version,
+            'tables': {table: asdict(versions[table]) for table in sorted(section.tables)}
+        })
+
+    def report_fingerprint(self, section_fingerprints: Dict[str, str]) -> str:
+        """Fingerprint of the whole report from its section fingerprints"""
+        return fingerprint({
+            'cache_version': CACHE_VERSION,
+            'report_version': self.report_version,
+            'sections': section_fingerprints
+        })
+
+    def artifact_path(self, report_fingerprint: str) -> Path:
+        return self.directory / f"{self.name}_{report_fingerprint[:12]}.json"
+
+    def load_manifest(self) -> Optional[Dict[str, Any]]:
+        """Manifest of the latest artifact, or None if missing or written by another version"""
+        manifest = _read_json(self.manifest_path)
+        if not manifest or manifest.get('cache_version') != CACHE_VERSION:
+            return None
+        if manifest.get('report_version') != self.report_version:
+            return None
+        return manifest
+
+    def load_latest(self) -> Optional[Dict[str, Any]]:
+        """Latest artifact, without checking the database"""
+        manifest = self.load_manifest()
+        return _read_json(self.directory / manifest['artifact']) if manifest else None
+
+    def materialize(self, client, sections: Sequence[ReportSection],
+                    timestamp_columns: Optional[Dict[str, str]] = None,
+                    force: bool = False) -> MaterializedReport:
+        """
+        Serve the report from cache, rebuilding only stale sections
+
+        Args:
+            client: Supabase client
+            sections (Sequence[ReportSection]): Report sections, in output order
+            timestamp_columns (Optional[Dict[str, str]]): Table -> change timestamp column
+            force (bool): Rebuild every section
+
+        Returns:
+            MaterializedReport: The report and what was rebuilt
+        """
+        metrics = get_metrics()
+        with metrics.span('report_cache.materialize', report=self.name) as span:
+            versions = fetch_table_versions(
+                client, (table for section in sections for table in section.tables), timestamp_columns)
+            section_fingerprints = {section.name: self.section_fingerprint(section, versions)
+                                    for section in sections}
+            report_fingerprint = self.report_fingerprint(section_fingerprints)
+
+            manifest = None if force else self.load_manifest()
+            previous = _read_json(self.directory / manifest['artifact']) if manifest else None
+
+            if previous and manifest['fingerprint'] == report_fingerprint:
+                span.set(cached=True, rebuilt=0)
+                metrics.counter('report_cache_hits_total', report=self.name).inc()
+                return MaterializedReport(
+                    name=self.name, fingerprint=report_fingerprint, generated_at=previous['generated_at'],
+                    content=previous['sections'], table_versions=versions,
+                    path=self.directory / manifest['artifact'], cached=True,
+                    reused=[section.name for section in sections]
+                )
+
+            previous_sections = previous['sections'] if previous else {}
+            previous_fingerprints = manifest.get('sections', {}) if previous else {}
+            stale = [section for section in sections
+                     if previous_fingerprints.get(section.name) != section_fingerprints[section.name]
+                     or section.name not in previous_sections]
+            built = self._build_sections(client, stale, versions)
+
+            # Round trip through JSON so a fresh build looks exactly like a cache hit
+            content = json.loads(json.dumps({
+                section.name: built[section.name] if section.name in built else previous_sections[section.name]
+                for section in sections
+            }, default=str))
+            generated_at = datetime.now().isoformat()
+            path = self.artifact_path(report_fingerprint)
+            _write_json(path, {
+                'report': self.name,
+                'report_version': self.report_version,
+                'fingerprint': report_fingerprint,
+                'generated_at': generated_at,
+                'table_versions': {table: asdict(version) for table, version in versions.items()},
+                'sections': content
+            })
+            _write_json(self.manifest_path, {
+                'cache_version': CACHE_VERSION,
+                'report_version': self.report_version,
+                'fingerprint': report_fingerprint,
+                'artifact': path.name,
+                'generated_at': generated_at,
+                'sections': section_fingerprints
+            })
+            self._prune(keep_path=path)
+
+            span.set(cached=False, rebuilt=len(built))
+            metrics.counter('report_cache_misses_total', report=self.name).inc()
+            metrics.counter('report_cache_sections_rebuilt_total', report=self.name).inc(len(built))
+            return MaterializedReport(
+                name=self.name, fingerprint=report_fingerprint, generated_at=generated_at,
+                content=content, table_versions=versions, path=path,
+                rebuilt=[section.name for section in stale],
+                reused=[section.name for section in sections if section.name not in built]
+            )
+
+    def _build_sections(self, client, sections: Sequence[ReportSection],
+                        versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+        if not sections:
+            return {}
+
+        def build(section: ReportSection) -> Any:
+            with get_metrics().span('report_cache.section', report=self.name, section=section.name):
+                return section.build(client, versions)
+
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(sections))) as executor:
+            futures = {section.name: executor.submit(build, section) for section in sections}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _prune(self, keep_path: Path) -> None:
+        """Delete all but the newest artifacts"""
+        artifacts = sorted(self.directory.glob(f"{self.name}_*.json"),
+                           key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in artifacts[self.keep:]:
+            if path != keep_path:
+                path.unlink(missing_ok=True)
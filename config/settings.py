@@ -39,6 +39,10 @@ class APISettings:
     cites_api_token: str
     iucn_api_token: Optional[str] = None
     
+    # Base URLs (override to point the clients at a local stand-in server)
+    iucn_base_url: str = 'https://api.iucnredlist.org/api/v4'
+    cites_base_url: str = 'https://api.cites.org/api/v1'
+    
     def __post_init__(self):
         if not self.cites_api_key or not self.cites_api_token:
             raise ValueError("Missing required CITES API credentials")
@@ -91,7 +95,9 @@ def get_settings() -> ApplicationSettings:
     api = APISettings(
         cites_api_key=os.getenv('CITES_API_KEY', ''),
         cites_api_token=os.getenv('CITES_API_TOKEN', ''),
-        iucn_api_token=os.getenv('IUCN_API_TOKEN')
+        iucn_api_token=os.getenv('IUCN_API_TOKEN'),
+        iucn_base_url=os.getenv('IUCN_API_BASE_URL', 'https://api.iucnredlist.org/api/v4'),
+        cites_base_url=os.getenv('CITES_API_BASE_URL', 'https://api.cites.org/api/v1')
     )
     
     # Application settings
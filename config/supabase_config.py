@@ -11,6 +11,12 @@ from pathlib import Path
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+try:
+    from .instrumentation import instrument_client
+except ImportError:
+    # Imported as a top-level module with the config directory on sys.path
+    from instrumentation import instrument_client
+
 def get_supabase_client(use_service_role: bool = False) -> Client:
     """
     Create and return a configured Supabase client.
@@ -55,7 +61,7 @@ def get_supabase_client(use_service_role: bool = False) -> Client:
     try:
         # Create and return the client
         supabase: Client = create_client(supabase_url, supabase_key)
-        return supabase
+        return instrument_client(supabase)
     except Exception as e:
         raise Exception(f"Failed to create Supabase client: {e}")
 
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+CMS Ingestion Engine
+
+Streams the CMS listing CSV once and builds the Arctic species CMS data in the
+same pass:
+
+- Rows are filtered on a prebuilt set of Arctic scientific names before any
+  other column is read, so non-Arctic rows cost one set lookup.
+- The first listing of a species is parsed in full (distributions, taxonomy);
+  later listings of the same species only merge their listing status and notes.
+- Dual "I/II" listings are normalized to Appendix I (higher protection level)
+  while the consolidated records are written, so the cleaned JSON comes out of
+  the same run instead of a separate clean_cms_data.py pass.
+
+Outputs in species_data/processed/:
+- cms_arctic_species_data.json          consolidated listings (I/II kept)
+- cms_arctic_species_data_cleaned.json  listings normalized for cms_listings
+- cms_arctic_species_summary.md         species per CMS appendix
+
+Usage:
+    from core.cms_ingest import CMSIngestEngine
+
+    engine = CMSIngestEngine()
+    engine.ingest()
+    engine.save()
+"""
+
+import re
+import csv
+import copy
+import json
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Set, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+SPECIES_LIST_FILE = BASE_DIR / "species_data" / "Arctic_Tracker_42_Species_List.md"
+CMS_FILE = BASE_DIR / "species_data" / "raw_data" / "cms_listing_100725.csv"
+OUTPUT_DIR = BASE_DIR / "species_data" / "processed"
+
+DATA_FILE = "cms_arctic_species_data.json"
+CLEANED_FILE = "cms_arctic_species_data_cleaned.json"
+SUMMARY_FILE = "cms_arctic_species_summary.md"
+
+CMS_SOURCE = 'Convention on the Conservation of Migratory Species (CMS)'
+DUAL_LISTING = 'I/II'
+DUAL_LISTING_NOTE = "Listed in both Appendix I and II."
+CLEANING_NOTES = "Species listed as I/II converted to I (higher protection level)"
+
+# number. **Scientific name** - Common name
+SPECIES_PATTERN = re.compile(r'\d+\.\s+\*\*([A-Z][a-z]+\s+[a-z]+(?:\s+[a-z]+)?)\*\*\s+-\s+')
+
+TAXONOMY_COLUMNS = [('phylum', 'Phylum'), ('class', 'Class'), ('order', 'Order'),
+                    ('family', 'Family'), ('genus', 'Genus'), ('author', 'Author')]
+
+def load_arctic_species(species_list_file: Path = SPECIES_LIST_FILE) -> Set[str]:
+    """
+    Scientific names of the Arctic Tracker species from the species list markdown
+
+    Args:
+        species_list_file (Path): Arctic_Tracker_42_Species_List.md
+
+    Returns:
+        Set[str]: Scientific names
+    """
+    content = Path(species_list_file).read_text(encoding='utf-8')
+    species = set(SPECIES_PATTERN.findall(content))
+    # The one plant species may be formatted differently
+    if "Rhodiola rosea" in content:
+        species.add("Rhodiola rosea")
+    return species
+
+def split_list(value: str) -> List[str]:
+    """Split a comma-separated CMS cell into trimmed, non-empty values"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def merge_listing(existing: Dict, listing: str, notes: str) -> None:
+    """Merge another CMS listing of the same species into its consolidated record"""
+    if listing and listing != '""':
+        if existing['cms_listing'] and existing['cms_listing'] != '""':
+            # Keep the most comprehensive listing (e.g., I/II over just I or II)
+            if '/' in listing or '/' not in existing['cms_listing']:
+                existing['cms_listing'] = listing
+        else:
+            existing['cms_listing'] = listing
+
+    if notes:
+        existing['notes'] = f"{existing['notes']}; {notes}" if existing['notes'] else notes
+
+def clean_species_records(records: Iterable[Dict]) -> Tuple[List[Dict], List[str]]:
+    """
+    Normalize listings to the cms_listings appendix constraint
+
+    Species listed in both appendices (I/II) are stored as Appendix I, the
+    higher protection level, with a note about the dual listing.
+
+    Args:
+        records (Iterable[Dict]): Consolidated species records
+
+    Returns:
+        Tuple[List[Dict], List[str]]: Cleaned copies of the records and the species modified
+    """
+    cleaned = []
+    modified = []
+    for record in records:
+        record = copy.deepcopy(record)
+        if record['cms_listing'] == DUAL_LISTING:
+            modified.append(record['species_name'])
+            record['cms_listing'] = 'I'
+            record['notes'] = f"{DUAL_LISTING_NOTE} {record['notes']}" if record['notes'] else DUAL_LISTING_NOTE
+        cleaned.append(record)
+    return cleaned, modified
+
+class CMSIngestEngine:
+    """Single-pass CMS CSV filter, consolidation and cleaning for Arctic species"""
+
+    def __init__(self, arctic_species: Optional[Iterable[str]] = None,
+                 cms_file: Optional[Path] = None, output_dir: Optional[Path] = None):
+        """
+        Args:
+            arctic_species (Optional[Iterable[str]]): Scientific names to keep (default: species list markdown)
+            cms_file (Optional[Path]): CMS listing CSV (';' delimited)
+            output_dir (Optional[Path]): Where the JSON and summary are written
+        """
+        self.arctic_species: Set[str] = set(arctic_species) if arctic_species is not None else load_arctic_species()
+        self.cms_file = Path(cms_file or CMS_FILE)
+        self.output_dir = Path(output_dir or OUTPUT_DIR)
+
+        # Species name -> consolidated record, in order of first appearance
+        self.consolidated: Dict[str, Dict] = {}
+        self.stats = {'rows_read': 0, 'rows_matched': 0, 'listings_merged': 0}
+        self.processed_date: Optional[str] = None
+
+    @property
+    def species_found(self) -> Set[str]:
+        return set(self.consolidated)
+
+    @property
+    def species_not_found(self) -> Set[str]:
+        return self.arctic_species - self.species_found
+
+    def ingest(self, cms_file: Optional[Path] = None) -> Dict[str, Dict]:
+        """
+        Stream the CMS CSV, keeping and consolidating Arctic species listings
+
+        Args:
+            cms_file (Optional[Path]): CSV to read (default self.cms_file)
+
+        Returns:
+            Dict[str, Dict]: Species name -> consolidated record
+        """
+        with open(cms_file or self.cms_file, 'r', encoding='utf-8', newline='') as f:
+            self.ingest_rows(csv.reader(f, delimiter=';'))
+        return self.consolidated
+
+    def ingest_rows(self, rows: Iterable[List[str]]) -> None:
+        """Consume CSV rows (header first) into the consolidated records"""
+        rows = iter(rows)
+        header = next(rows, None)
+        if header is None:
+            return
+        index = {name.strip(): position for position, name in enumerate(header)}
+        name_at = index.get('ScientificName')
+        if name_at is None:
+            raise ValueError("CMS file has no ScientificName column")
+
+        def cell(row: List[str], column: str) -> str:
+            position = index.get(column)
+            return row[position].strip() if position is not None and position < len(row) else ''
+
+        arctic_species = self.arctic_species
+        consolidated = self.consolidated
+        for row in rows:
+            self.stats['rows_read'] += 1
+            if name_at >= len(row):
+                continue
+            scientific_name = row[name_at].strip()
+            if scientific_name not in arctic_species:
+                continue
+
+            listing = cell(row, 'Listing')
+            # Skip empty listings
+            if listing == '""' or not listing:
+                continue
+            self.stats['rows_matched'] += 1
+
+            existing = consolidated.get(scientific_name)
+            if existing is not None:
+                merge_listing(existing, listing, cell(row, 'Note'))
+                self.stats['listings_merged'] += 1
+                continue
+
+            consolidated[scientific_name] = {
+                'species_name': scientific_name,
+                'cms_listing': listing,
+                'agreement': cell(row, 'Agreement'),
+                'listed_under': cell(row, 'Listed under'),
+                'date_listed': cell(row, 'Date'),
+                'notes': cell(row, 'Note'),
+                'native_distribution': split_list(cell(row, 'NativeDistributionFullNames')),
+                'all_distribution_codes': split_list(cell(row, 'All_DistributionISOCodes')),
+                'introduced_distribution': split_list(cell(row, 'Introduced_Distribution')),
+                'extinct_distribution': split_list(cell(row, 'Extinct_Distribution')),
+                'distribution_uncertain': split_list(cell(row, 'Distribution_Uncertain')),
+                'taxonomic_info': {key: cell(row, column) for key, column in TAXONOMY_COLUMNS}
+            }
+
+    def sorted_records(self) -> List[Dict]:
+        return sorted(self.consolidated.values(), key=lambda record: record['species_name'])
+
+    def metadata(self) -> Dict:
+        return {
+            'source': CMS_SOURCE,
+            'processed_date': self.processed_date or datetime.now().isoformat(),
+            'total_arctic_species': len(self.arctic_species),
+            'species_in_cms': len(self.consolidated),
+            'species_not_in_cms': len(self.species_not_found)
+        }
+
+    def build_documents(self) -> Tuple[Dict, Dict, List[str]]:
+        """
+        Consolidated and cleaned JSON documents
+
+        Returns:
+            Tuple[Dict, Dict, List[str]]: Consolidated document, cleaned document,
+                species converted from I/II to I
+        """
+        self.processed_date = datetime.now().isoformat()
+        records = self.sorted_records()
+        cleaned_records, modified = clean_species_records(records)
+
+        document = {'metadata': self.metadata(), 'species_data': records}
+        cleaned = {
+            'metadata': {
+                **self.metadata(),
+                'data_cleaned': True,
+                'species_modified': len(modified),
+                'cleaning_notes': CLEANING_NOTES
+            },
+            'species_data': cleaned_records
+        }
+        return document, cleaned, modified
+
+    def save(self, output_dir: Optional[Path] = None) -> Dict[str, Path]:
+        """
+        Write the consolidated JSON, the cleaned JSON and the summary report
+
+        Args:
+            output_dir (Optional[Path]): Output directory (default self.output_dir)
+
+        Returns:
+            Dict[str, Path]: Output kind -> path
+        """
+        output_dir = Path(output_dir or self.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        document, cleaned, modified = self.build_documents()
+
+        paths = {'data': output_dir / DATA_FILE, 'cleaned': output_dir / CLEANED_FILE,
+                 'summary': output_dir / SUMMARY_FILE}
+        for kind in ('data', 'cleaned'):
+            with open(paths[kind], 'w', encoding='utf-8') as f:
+                json.dump(document if kind == 'data' else cleaned, f, indent=2, ensure_ascii=False)
+            logger.info(f"Saved CMS data to {paths[kind]}")
+        for species in modified:
+            logger.info(f"Converted {species} from I/II to I (higher protection level)")
+
+        self.write_summary_report(paths['summary'])
+        return paths
+
+    def write_summary_report(self, report_file: Path) -> None:
+        """Write the markdown summary of species per CMS listing"""
+        by_listing: Dict[str, List[str]] = {}
+        for record in self.consolidated.values():
+            by_listing.setdefault(record['cms_listing'], []).append(record['species_name'])
+
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write("# CMS Arctic Species Summary Report\n\n")
+            f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write("## Overview\n\n")
+            f.write(f"- **Total Arctic Tracker Species**: {len(self.arctic_species)}\n")
+            f.write(f"- **Species in CMS**: {len(self.consolidated)}\n")
+            f.write(f"- **Species not in CMS**: {len(self.species_not_found)}\n\n")
+
+            f.write("## Species by CMS Listing Status\n\n")
+
+            # Sort listing categories
+            listing_order = ['I', 'II', 'I/II']
+            other_listings = sorted([l for l in by_listing.keys() if l not in listing_order])
+
+            for listing in listing_order + other_listings:
+                if listing in by_listing:
+                    species_list = sorted(by_listing[listing])
+                    f.write(f"### Appendix {listing} ({len(species_list)} species)\n\n")
+                    for species in species_list:
+                        f.write(f"- {species}\n")
+                    f.write("\n")
+
+            f.write("## Arctic Species NOT in CMS\n\n")
+            if self.species_not_found:
+                for species in sorted(self.species_not_found):
+                    f.write(f"- {species}\n")
+            else:
+                f.write("*All Arctic Tracker species are listed in CMS*\n")
+
+        logger.info(f"Generated summary report: {report_file}")
@@ -31,6 +31,11 @@ from typing import Dict, List, Set, Any, Optional
 from collections import defaultdict
 import glob
 
+# Add the config directory to the path
+sys.path.append(str(Path(__file__).parent.parent / 'config'))
+
+from instrumentation import get_metrics
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -264,9 +269,14 @@ class SpeciesTradeExtractor:
         logger.info(f"Found {len(trade_files)} trade data files")
         
         # Process each trade file
+        metrics = get_metrics()
         for i, trade_file in enumerate(trade_files, 1):
             logger.info(f"Processing file {i}/{len(trade_files)}: {trade_file.name}")
-            self.process_trade_file(trade_file, species_set, species_data)
+            records_before = self.stats['total_trade_records']
+            with metrics.span('process_trade_file') as span:
+                span.set(file=trade_file.name, bytes=trade_file.stat().st_size)
+                self.process_trade_file(trade_file, species_set, species_data)
+                span.set(rows=self.stats['total_trade_records'] - records_before)
             self.stats['files_processed'] += 1
         
         return dict(species_data)
@@ -421,12 +431,15 @@ class SpeciesTradeExtractor:
         logger.info(f"Trade data directory: {self.trade_dir}")
         logger.info(f"Output directory: {self.output_dir}")
         
+        metrics = get_metrics()
         try:
             # Extract trade data
-            species_data = self.extract_all_trade_data()
+            with metrics.span('extract_trade_data'):
+                species_data = self.extract_all_trade_data()
             
             # Generate JSON files
-            self.generate_species_json_files(species_data)
+            with metrics.span('write_species_files'):
+                self.generate_species_json_files(species_data)
             
             # Generate summary report
             self.generate_summary_report()
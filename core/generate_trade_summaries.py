@@ -30,6 +30,9 @@ except ImportError:
     print("Error: Could not import supabase_config. Please ensure config/supabase_config.py exists.")
     sys.exit(1)
 
+from instrumentation import get_metrics
+from country_dimension import get_country_dimension
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -56,6 +59,7 @@ class TradeSummaryGenerator:
     def __init__(self):
         # Use service role key for writing to species_trade_summary table
         self.supabase = get_supabase_client(use_service_role=True)
+        self.metrics = get_metrics()
         self.stats = {
             'species_processed': 0,
             'species_with_trade': 0,
@@ -65,8 +69,8 @@ class TradeSummaryGenerator:
             'total_records_analyzed': 0
         }
         
-        # Cache for country names to avoid repetitive lookups
-        self.country_name_cache = {}
+        # Shared country dimension (disk-cached) for code -> name lookups
+        self.countries = get_country_dimension(self.supabase)
         
     def get_all_species(self) -> List[Dict]:
         """Get all species from the database"""
@@ -134,36 +138,8 @@ class TradeSummaryGenerator:
             return set()
             
     def get_country_name(self, country_code: str) -> str:
-        """Get country name from country code with caching"""
-        if not country_code:
-            return "Unknown"
-            
-        # Check cache first
-        if country_code in self.country_name_cache:
-            return self.country_name_cache[country_code]
-            
-        # Some special cases
-        if country_code == 'XX':
-            self.country_name_cache[country_code] = 'XX'
-            return 'XX'
-        if country_code == 'XV':
-            self.country_name_cache[country_code] = 'XV'
-            return 'XV'
-        if country_code == 'HS':
-            self.country_name_cache[country_code] = 'HS'
-            return 'HS'
-            
-        # Try to get from database (would be ideal, but might not be available)
-        try:
-            # In a real implementation, we would look up the country name
-            # For now, we'll just use the code as the name to avoid API calls
-            # This could be enhanced later with a proper country database lookup
-            self.country_name_cache[country_code] = country_code
-            return country_code
-        except Exception:
-            # If lookup fails, just use the code
-            self.country_name_cache[country_code] = country_code
-            return country_code
+        """Get country name from country code via the country dimension"""
+        return self.countries.name_for_code(country_code)
     
     def get_trade_record_counts(self, species_ids: Optional[List[str]] = None) -> Dict[str, int]:
         """Get trade record counts per species"""
@@ -641,7 +617,9 @@ class TradeSummaryGenerator:
         # Get trade record counts for prioritization
         if species_list:
             species_ids = [s['id'] for s in species_list]
-            trade_counts = self.get_trade_record_counts(species_ids)
+            with self.metrics.span('count_trade_records') as span:
+                trade_counts = self.get_trade_record_counts(species_ids)
+                span.set(species=len(species_ids))
         else:
             # Empty species list
             logger.warning("No species found to process")
@@ -680,7 +658,10 @@ class TradeSummaryGenerator:
             self.stats['species_with_trade'] += 1
             logger.info(f"Processing {display_name} ({species['trade_count']:,} records)")
             
-            success = self.generate_summary_for_species(species_id, display_name)
+            with self.metrics.span('generate_species_summary') as span:
+                span.set(rows=species['trade_count'], species=species['scientific_name'])
+                success = self.generate_summary_for_species(species_id, display_name)
+            self.metrics.counter('summaries_total', outcome='success' if success else 'failed').inc()
             if not success:
                 logger.warning(f"Failed to generate summary for {display_name}")
         
@@ -172,93 +172,120 @@ class IUCNApiClient:
             return parts[0], parts[1]
         return None, None
     
-    async def process_species_list(self, species_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def process_species_list(self, species_list: List[Dict[str, Any]], 
+                                   concurrency: int = 1) -> List[Dict[str, Any]]:
         """
         Process a list of species and get their IUCN assessments
         
         Args:
             species_list (List[Dict[str, Any]]): List of species data with 'species_name' field
+            concurrency (int): Maximum number of species queried at once. Requests
+                still pass through the shared rate limiter.
             
         Returns:
-            List[Dict[str, Any]]: Processed assessment data
+            List[Dict[str, Any]]: Processed assessment data (in input order)
+        """
+        if concurrency <= 1:
+            results = []
+            for species_data in species_list:
+                results.extend(await self.process_species(species_data))
+            return results
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded(species_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.process_species(species_data)
+        
+        per_species = await asyncio.gather(*(bounded(s) for s in species_list))
+        return [entry for entries in per_species for entry in entries]
+    
+    async def process_species(self, species_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get the IUCN assessments for a single species
+        
+        Args:
+            species_data (Dict[str, Any]): Species data with 'species_name' field
+            
+        Returns:
+            List[Dict[str, Any]]: Assessment entries (empty for invalid names)
         """
         results = []
         
-        for species_data in species_list:
-            species_name = species_data.get('species_name', '').strip()
-            genus, species = self.extract_genus_species(species_name)
+        species_name = species_data.get('species_name', '').strip()
+        genus, species = self.extract_genus_species(species_name)
+        
+        if not genus or not species:
+            print(f"Skipping invalid name: {species_name}")
+            return results
             
-            if not genus or not species:
-                print(f"Skipping invalid name: {species_name}")
-                continue
-                
-            print(f"Querying IUCN for: {species_name}")
+        print(f"Querying IUCN for: {species_name}")
+        
+        try:
+            assessment_data = await self.get_species_assessments(genus, species)
             
-            try:
-                assessment_data = await self.get_species_assessments(genus, species)
-                
-                if assessment_data and 'result' in assessment_data and assessment_data['result']:
-                    for assessment in assessment_data['result']:
-                        entry = {
-                            'species_id': species_data.get('species_id'),
-                            'species_name': species_name,
-                            'taxonid': assessment.get('taxonid'),
-                            'scientific_name': assessment.get('scientific_name'),
-                            'kingdom': assessment.get('kingdom'),
-                            'phylum': assessment.get('phylum'),
-                            'class': assessment.get('class'),
-                            'order': assessment.get('order'),
-                            'family': assessment.get('family'),
-                            'genus': assessment.get('genus'),
-                            'main_common_name': assessment.get('main_common_name'),
-                            'authority': assessment.get('authority'),
-                            'published_year': assessment.get('published_year'),
-                            'assessment_date': assessment.get('assessment_date'),
-                            'category': assessment.get('category'),
-                            'criteria': assessment.get('criteria'),
-                            'population_trend': assessment.get('population_trend'),
-                            'marine_system': assessment.get('marine_system'),
-                            'freshwater_system': assessment.get('freshwater_system'),
-                            'terrestrial_system': assessment.get('terrestrial_system'),
-                            'assessor': assessment.get('assessor'),
-                            'reviewer': assessment.get('reviewer'),
-                            'aoo_km2': assessment.get('aoo_km2'),
-                            'eoo_km2': assessment.get('eoo_km2'),
-                            'elevation_upper': assessment.get('elevation_upper'),
-                            'elevation_lower': assessment.get('elevation_lower'),
-                            'depth_upper': assessment.get('depth_upper'),
-                            'depth_lower': assessment.get('depth_lower'),
-                            'errata_flag': assessment.get('errata_flag'),
-                            'errata_reason': assessment.get('errata_reason'),
-                            'amended_flag': assessment.get('amended_flag'),
-                            'amended_reason': assessment.get('amended_reason')
-                        }
-                        results.append(entry)
-                else:
-                    # Add a 'Not Listed' entry for species not found
+            if assessment_data and 'result' in assessment_data and assessment_data['result']:
+                for assessment in assessment_data['result']:
                     entry = {
                         'species_id': species_data.get('species_id'),
                         'species_name': species_name,
-                        'category': 'Not Listed',
-                        'assessment_date': None,
-                        'published_year': None,
-                        'main_common_name': None,
-                        'authority': None,
-                        'population_trend': None
+                        'taxonid': assessment.get('taxonid'),
+                        'scientific_name': assessment.get('scientific_name'),
+                        'kingdom': assessment.get('kingdom'),
+                        'phylum': assessment.get('phylum'),
+                        'class': assessment.get('class'),
+                        'order': assessment.get('order'),
+                        'family': assessment.get('family'),
+                        'genus': assessment.get('genus'),
+                        'main_common_name': assessment.get('main_common_name'),
+                        'authority': assessment.get('authority'),
+                        'published_year': assessment.get('published_year'),
+                        'assessment_date': assessment.get('assessment_date'),
+                        'category': assessment.get('category'),
+                        'criteria': assessment.get('criteria'),
+                        'population_trend': assessment.get('population_trend'),
+                        'marine_system': assessment.get('marine_system'),
+                        'freshwater_system': assessment.get('freshwater_system'),
+                        'terrestrial_system': assessment.get('terrestrial_system'),
+                        'assessor': assessment.get('assessor'),
+                        'reviewer': assessment.get('reviewer'),
+                        'aoo_km2': assessment.get('aoo_km2'),
+                        'eoo_km2': assessment.get('eoo_km2'),
+                        'elevation_upper': assessment.get('elevation_upper'),
+                        'elevation_lower': assessment.get('elevation_lower'),
+                        'depth_upper': assessment.get('depth_upper'),
+                        'depth_lower': assessment.get('depth_lower'),
+                        'errata_flag': assessment.get('errata_flag'),
+                        'errata_reason': assessment.get('errata_reason'),
+                        'amended_flag': assessment.get('amended_flag'),
+                        'amended_reason': assessment.get('amended_reason')
                     }
                     results.append(entry)
-                    print(f"No assessment found for {species_name}")
-                    
-            except Exception as e:
-                print(f"Error processing {species_name}: {e}")
-                # Add error entry
+            else:
+                # Add a 'Not Listed' entry for species not found
                 entry = {
                     'species_id': species_data.get('species_id'),
                     'species_name': species_name,
-                    'category': 'Error',
-                    'error': str(e)
+                    'category': 'Not Listed',
+                    'assessment_date': None,
+                    'published_year': None,
+                    'main_common_name': None,
+                    'authority': None,
+                    'population_trend': None
                 }
                 results.append(entry)
+                print(f"No assessment found for {species_name}")
+                
+        except Exception as e:
+            print(f"Error processing {species_name}: {e}")
+            # Add error entry
+            entry = {
+                'species_id': species_data.get('species_id'),
+                'species_name': species_name,
+                'category': 'Error',
+                'error': str(e)
+            }
+            results.append(entry)
         
         return results
 
@@ -4,8 +4,13 @@ Load CMS Data to Database Script
 
 This script loads the processed CMS species data into the Supabase database.
 
+By default each species costs a species lookup, a listing lookup and an insert
+or update. --bulk resolves every species ID with one in_() query, reads all
+existing listings at once, diffs them locally and writes only the new or
+changed listings with one batched upsert on id.
+
 Usage:
-    python load_cms_data_to_db.py [--dry-run]
+    python load_cms_data_to_db.py [--dry-run] [--bulk] [--data-file cms_arctic_species_data_cleaned.json]
 """
 
 import json
@@ -13,13 +18,17 @@ import logging
 import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from uuid import uuid4
 import sys
 
+from postgrest.types import ReturnMethod
+
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config.supabase_config import get_supabase_client
+from config.instrumentation import get_metrics
 
 # Setup logging
 logging.basicConfig(
@@ -32,16 +41,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+UPSERT_BATCH_SIZE = 500
+# Names/IDs per in_() filter, keeps the request URL short
+LOOKUP_CHUNK_SIZE = 200
+# cms_listings columns written by the loader, compared to decide if a listing changed
+CMS_LISTING_FIELDS = ['appendix', 'agreement', 'listed_under', 'listing_date', 'notes', 'native_distribution',
+                      'distribution_codes', 'introduced_distribution', 'extinct_distribution',
+                      'distribution_uncertain']
+
+def _chunks(values: List[Any], size: int = LOOKUP_CHUNK_SIZE) -> Iterable[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def _comparable(value: Any) -> Any:
+    """Normalize a column value so stored and prepared listings compare equal"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return str(value)
+
+def listing_changed(existing: Dict[str, Any], cms_record: Dict[str, Any]) -> bool:
+    """True if any loader-managed column differs from the stored listing"""
+    return any(_comparable(existing.get(field)) != _comparable(cms_record.get(field))
+               for field in CMS_LISTING_FIELDS)
+
 
 class CMSDataLoader:
     """Load CMS data into the Supabase database"""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, bulk: bool = False, data_file: Optional[Path] = None,
+                 batch_size: int = UPSERT_BATCH_SIZE):
         # Use service role key to bypass RLS policies
         self.supabase = get_supabase_client(use_service_role=True)
         self.dry_run = dry_run
+        self.bulk = bulk
+        self.batch_size = batch_size
+        self.metrics = get_metrics()
         self.base_dir = Path(__file__).parent.parent
-        self.cms_data_file = self.base_dir / "species_data" / "processed" / "cms_arctic_species_data.json"
+        self.cms_data_file = Path(data_file) if data_file else \
+            self.base_dir / "species_data" / "processed" / "cms_arctic_species_data.json"
         
         # Statistics
         self.stats = {
@@ -49,6 +88,7 @@ class CMSDataLoader:
             'species_not_found': 0,
             'records_inserted': 0,
             'records_updated': 0,
+            'records_unchanged': 0,
             'errors': 0
         }
         
@@ -186,17 +226,153 @@ class CMSDataLoader:
                 self.stats['records_inserted'] += 1
             else:
                 self.stats['errors'] += 1
+        
+        action = 'update' if existing_listing else 'insert'
+        self.metrics.counter('records_written_total', table='cms_listings',
+                             action=action if success else 'error').inc()
+                
+    def get_species_ids(self, scientific_names: List[str]) -> Dict[str, str]:
+        """
+        Resolve species IDs for many scientific names with in_() queries
+        
+        Args:
+            scientific_names (List[str]): Scientific names
+            
+        Returns:
+            Dict[str, str]: Scientific name -> species ID (names not in the database are missing)
+        """
+        species_ids = {}
+        for chunk in _chunks(sorted(set(scientific_names))):
+            response = self.supabase.table('species').select('id, scientific_name') \
+                .in_('scientific_name', chunk).execute()
+            for row in response.data or []:
+                species_ids.setdefault(row['scientific_name'], row['id'])
+        return species_ids
+        
+    def get_existing_cms_listings(self, species_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Existing CMS listings of many species with in_() queries
+        
+        Args:
+            species_ids (List[str]): Species IDs
+            
+        Returns:
+            Dict[str, Dict]: Species ID -> stored listing (first one if a species has several)
+        """
+        existing = {}
+        for chunk in _chunks(sorted(set(species_ids))):
+            response = self.supabase.table('cms_listings').select('*').in_('species_id', chunk).execute()
+            for row in response.data or []:
+                existing.setdefault(row['species_id'], row)
+        return existing
+        
+    def diff_cms_listings(self, species_data_list: List[Dict], species_ids: Dict[str, str],
+                          existing: Dict[str, Dict]) -> Tuple[List[Dict], List[Dict], int]:
+        """
+        Split prepared listings into inserts, updates and unchanged
+        
+        New listings get a client-side id and updates carry the stored id, so
+        both go out in the same upsert on id.
+        
+        Args:
+            species_data_list (List[Dict]): Species entries from the CMS JSON
+            species_ids (Dict[str, str]): Scientific name -> species ID
+            existing (Dict[str, Dict]): Species ID -> stored listing
+            
+        Returns:
+            Tuple[List[Dict], List[Dict], int]: Rows to insert, rows to update, unchanged count
+        """
+        # One listing per species; a later entry for the same species wins, as in the per-species path
+        prepared = {}
+        for species_data in species_data_list:
+            species_id = species_ids.get(species_data['species_name'])
+            if species_id:
+                prepared[species_id] = self.prepare_cms_record(species_data, species_id)
                 
+        now = datetime.now().isoformat()
+        inserts, updates, unchanged = [], [], 0
+        for species_id, cms_record in prepared.items():
+            stored = existing.get(species_id)
+            if stored is None:
+                inserts.append({'id': str(uuid4()), **cms_record, 'updated_at': now})
+            elif listing_changed(stored, cms_record):
+                updates.append({'id': stored['id'], **cms_record, 'updated_at': now})
+            else:
+                unchanged += 1
+        return inserts, updates, unchanged
+        
+    def upsert_cms_listings(self, rows: List[Dict]) -> int:
+        """
+        Write listings with batched upserts on id
+        
+        Args:
+            rows (List[Dict]): Listings with id set
+            
+        Returns:
+            int: Number of batches sent
+        """
+        batches = 0
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            with self.metrics.span('upsert_cms_listings', table='cms_listings') as span:
+                self.supabase.table('cms_listings').upsert(
+                    batch, on_conflict='id', returning=ReturnMethod.minimal
+                ).execute()
+                span.set(rows=len(batch))
+            batches += 1
+        return batches
+        
+    def run_bulk(self, cms_data: Dict) -> None:
+        """Load all listings with one species lookup, one listing lookup and batched upserts"""
+        species_data_list = cms_data['species_data']
+        
+        with self.metrics.span('resolve_species', table='cms_listings') as span:
+            species_ids = self.get_species_ids([s['species_name'] for s in species_data_list])
+            existing = self.get_existing_cms_listings(list(species_ids.values()))
+            span.set(species=len(species_ids), existing=len(existing))
+            
+        for species_data in species_data_list:
+            if species_data['species_name'] not in species_ids:
+                logger.warning(f"Species not found in database: {species_data['species_name']}")
+        self.stats['species_found'] = sum(1 for s in species_data_list if s['species_name'] in species_ids)
+        self.stats['species_not_found'] = len(species_data_list) - self.stats['species_found']
+        
+        inserts, updates, unchanged = self.diff_cms_listings(species_data_list, species_ids, existing)
+        self.stats['records_unchanged'] = unchanged
+        logger.info(f"CMS listings: {len(inserts)} new, {len(updates)} changed, {unchanged} unchanged")
+        
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would upsert {len(inserts) + len(updates)} CMS listings")
+        elif inserts or updates:
+            try:
+                self.upsert_cms_listings(inserts + updates)
+            except Exception as e:
+                logger.error(f"Error upserting CMS listings: {e}")
+                self.stats['errors'] += len(inserts) + len(updates)
+                self.metrics.counter('records_written_total', table='cms_listings',
+                                     action='error').inc(len(inserts) + len(updates))
+                return
+                
+        self.stats['records_inserted'] = len(inserts)
+        self.stats['records_updated'] = len(updates)
+        for action, count in (('insert', len(inserts)), ('update', len(updates)), ('unchanged', unchanged)):
+            self.metrics.counter('records_written_total', table='cms_listings', action=action).inc(count)
+            
     def run(self) -> None:
         """Execute the CMS data loading pipeline"""
-        logger.info(f"Starting CMS data load {'[DRY RUN]' if self.dry_run else ''}")
+        logger.info(f"Starting CMS data load {'[DRY RUN]' if self.dry_run else ''}{' [BULK]' if self.bulk else ''}")
         
         # Load CMS data
         cms_data = self.load_cms_data()
         
-        # Process each species
-        for species_data in cms_data['species_data']:
-            self.process_species(species_data)
+        if self.bulk:
+            self.run_bulk(cms_data)
+        else:
+            # Process each species
+            for species_data in cms_data['species_data']:
+                with self.metrics.span('process_species', table='cms_listings') as span:
+                    span.set(species=species_data['species_name'])
+                    self.process_species(species_data)
             
         # Print summary
         self.print_summary()
@@ -210,18 +386,27 @@ class CMSDataLoader:
         print(f"Species not found in database: {self.stats['species_not_found']}")
         print(f"Records inserted: {self.stats['records_inserted']}")
         print(f"Records updated: {self.stats['records_updated']}")
+        if self.bulk:
+            print(f"Records unchanged: {self.stats['records_unchanged']}")
+            print(f"Rows changed: {self.stats['records_inserted'] + self.stats['records_updated']}")
         print(f"Errors: {self.stats['errors']}")
         print(f"{'='*60}\n")
 
 
-def main():
+def main(default_data_file: Optional[Path] = None):
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Load CMS data into Supabase database')
     parser.add_argument('--dry-run', action='store_true', help='Run without making database changes')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Resolve species and listings in bulk and write only changed listings in one upsert')
+    parser.add_argument('--data-file', type=Path, default=default_data_file,
+                        help='CMS JSON to load (default cms_arctic_species_data.json)')
+    parser.add_argument('--batch-size', type=int, default=UPSERT_BATCH_SIZE, help='Rows per upsert request (--bulk)')
     
     args = parser.parse_args()
     
-    loader = CMSDataLoader(dry_run=args.dry_run)
+    loader = CMSDataLoader(dry_run=args.dry_run, bulk=args.bulk, data_file=args.data_file,
+                           batch_size=args.batch_size)
     loader.run()
 
 
@@ -38,6 +38,8 @@ except ImportError:
     print("Error: Could not import supabase_config. Please ensure config/supabase_config.py exists.")
     sys.exit(1)
 
+from instrumentation import get_metrics
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -131,6 +133,7 @@ class TradeDataLoader:
         self.batch_size = batch_size
         self.supabase = get_supabase_client()
         self.stats = LoadStats()
+        self.metrics = get_metrics()
         self.species_id_map = {}  # scientific_name -> species_id mapping
         
     def load_species_mapping(self) -> None:
@@ -385,13 +388,17 @@ class TradeDataLoader:
                 batch = db_records[i:i + self.batch_size]
                 
                 try:
-                    response = self.supabase.table('cites_trade_records').insert(batch).execute()
+                    with self.metrics.span('insert_batch', table='cites_trade_records') as span:
+                        span.set(rows=len(batch), species=species_name)
+                        response = self.supabase.table('cites_trade_records').insert(batch).execute()
                     loaded_count += len(batch)
+                    self.metrics.counter('records_loaded_total', table='cites_trade_records').inc(len(batch))
                     logger.info(f"  Loaded batch: {loaded_count:,} / {len(db_records):,} records")
                     
                 except Exception as e:
                     logger.error(f"Failed to load batch for {species_name}: {e}")
                     failed_count += len(batch)
+                    self.metrics.counter('records_failed_total', table='cites_trade_records').inc(len(batch))
             
             logger.info(f"Completed {species_name}: {loaded_count:,} loaded, {failed_count} failed")
             return loaded_count, failed_count
@@ -429,7 +436,10 @@ class TradeDataLoader:
         
         # Process each file
         for file_path in sorted(optimized_files):
-            loaded, failed = self.load_species_file(file_path)
+            with self.metrics.span('load_species_file') as span:
+                span.set(file=file_path.name, bytes=file_path.stat().st_size)
+                loaded, failed = self.load_species_file(file_path)
+                span.set(rows=loaded, failed=failed)
             self.stats.files_processed += 1
             self.stats.records_loaded += loaded
             self.stats.records_failed += failed
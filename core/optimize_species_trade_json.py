@@ -22,6 +22,11 @@ from typing import Dict, List, Set, Any, Optional, Tuple
 from collections import defaultdict, Counter
 import gzip
 
+# Add the config directory to the path
+sys.path.append(str(Path(__file__).parent.parent / 'config'))
+
+from instrumentation import get_metrics
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -409,9 +414,14 @@ if __name__ == "__main__":
         
         logger.info(f"Found {len(json_files)} JSON files to optimize")
         
+        metrics = get_metrics()
         for i, json_file in enumerate(json_files, 1):
             logger.info(f"Processing file {i}/{len(json_files)}: {json_file.name}")
-            self.optimize_species_file(json_file)
+            records_before = self.stats['total_records']
+            with metrics.span('optimize_species_file') as span:
+                span.set(file=json_file.name, bytes=json_file.stat().st_size)
+                self.optimize_species_file(json_file)
+                span.set(rows=self.stats['total_records'] - records_before)
             self.stats['files_processed'] += 1
         
         # Calculate overall compression ratio
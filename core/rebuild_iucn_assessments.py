@@ -8,6 +8,7 @@ system and provides proper error handling and rate limiting.
 
 Usage:
     python rebuild_iucn_assessments.py [--input-file species_status.csv] [--output-file iucn_assessments.json]
+                                       [--concurrency 4] [--batch-size 10] [--batch-delay 2]
 """
 
 import sys
@@ -57,12 +58,18 @@ async def load_species_missing_assessments(input_file: str) -> List[Dict[str, An
     
     return missing_species
 
-async def fetch_iucn_assessments(species_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+async def fetch_iucn_assessments(species_list: List[Dict[str, Any]],
+                                 batch_size: int = 10,
+                                 batch_delay: float = 2.0,
+                                 concurrency: int = 1) -> List[Dict[str, Any]]:
     """
     Fetch IUCN assessments for a list of species
     
     Args:
         species_list (List[Dict[str, Any]]): List of species to process
+        batch_size (int): Number of species per batch
+        batch_delay (float): Pause in seconds between batches
+        concurrency (int): Maximum species queried concurrently within a batch
         
     Returns:
         List[Dict[str, Any]]: Assessment results
@@ -83,17 +90,16 @@ async def fetch_iucn_assessments(species_list: List[Dict[str, Any]]) -> List[Dic
             return results
         
         # Process species in batches to avoid overwhelming the API
-        batch_size = 10
         for i in range(0, len(species_list), batch_size):
             batch = species_list[i:i + batch_size]
             print(f"Processing batch {i//batch_size + 1} ({len(batch)} species)...")
             
-            batch_results = await iucn_client.process_species_list(batch)
+            batch_results = await iucn_client.process_species_list(batch, concurrency=concurrency)
             results.extend(batch_results)
             
             # Small delay between batches
-            if i + batch_size < len(species_list):
-                await asyncio.sleep(2)
+            if batch_delay > 0 and i + batch_size < len(species_list):
+                await asyncio.sleep(batch_delay)
         
         print(f"\n✅ Completed processing {len(results)} assessment records")
     
@@ -185,6 +191,12 @@ async def main():
                        help='Output JSON file for assessment results')
     parser.add_argument('--limit', '-l', type=int,
                        help='Limit number of species to process (for testing)')
+    parser.add_argument('--batch-size', type=int, default=10,
+                       help='Number of species per batch')
+    parser.add_argument('--batch-delay', type=float, default=2.0,
+                       help='Seconds to pause between batches')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Maximum species queried concurrently (rate limit still applies)')
     
     args = parser.parse_args()
     
@@ -214,7 +226,12 @@ async def main():
             print(f"Limited to {len(species_list)} species for testing")
         
         # Fetch assessments
-        results = await fetch_iucn_assessments(species_list)
+        results = await fetch_iucn_assessments(
+            species_list,
+            batch_size=args.batch_size,
+            batch_delay=args.batch_delay,
+            concurrency=args.concurrency
+        )
         
         if results:
             # Save results
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Species Profile JSON Standardization Engine
+
+Validates and standardizes the species profile JSON files in
+species_data/scite/processed/ without redoing work on every run:
+
+- The profile schemas are compiled once into flat field checks (path, types,
+  required) and every file is checked against the compiled form.
+- Files are processed in a thread pool (stat, read, validate, standardize,
+  write).
+- Unchanged files are skipped: a matching mtime and size skips the file without
+  reading it, a matching SHA-256 (e.g. after a touch) without parsing it. The
+  state lives in cache/manifests/species_json_standardization.json.
+- A file is only rewritten when standardization changes its content (missing
+  template keys filled in, empty scientific name taken from the file name).
+- Parsed documents are kept in memory, so an import in the same run
+  (batch_import_species.py --standardize) does not parse the files again.
+
+Two layouts are recognized: research profiles ('species_data',
+'conservation_profile', 'references') and empty templates ('species', ...).
+
+Usage:
+    from core.species_json_standardizer import SpeciesJSONStandardizer
+
+    standardizer = SpeciesJSONStandardizer()
+    results = standardizer.run()
+    standardizer.save_state()
+    data = standardizer.document(path)      # cached parsed document
+"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from config.content_manifest import ContentManifest
+    from config.instrumentation import get_metrics
+except ImportError:
+    from content_manifest import ContentManifest
+    from instrumentation import get_metrics
+
+logger = logging.getLogger(__name__)
+
+PROCESSED_DIR = Path(__file__).parent.parent / "species_data" / "scite" / "processed"
+STATE_MANIFEST = 'species_json_standardization'
+DEFAULT_WORKERS = 8
+
+RESEARCH_LAYOUT = 'research'
+TEMPLATE_LAYOUT = 'template'
+
+NUMBER = (int, float)
+OPTIONAL_TEXT = (str, type(None))
+
+# Field path -> (accepted types, required); '[]' checks every item of a list
+RESEARCH_SCHEMA = {
+    'species_data': (dict, True),
+    'species_data.scientific_name': (str, True),
+    'species_data.common_name': (str, True),
+    'species_data.description': (OPTIONAL_TEXT, False),
+    'species_data.habitat_description': (OPTIONAL_TEXT, False),
+    'species_data.generation_length': (NUMBER + OPTIONAL_TEXT, False),
+    'conservation_profile': (dict, True),
+    'references': (list, True),
+    'references[]': (dict, True),
+    'references[].title': (str, False),
+    'references[].full_citation': (str, False),
+    'references[].authors': ((list, str), False),
+    'metadata': (dict, False)
+}
+
+TEMPLATE_SCHEMA = {
+    'species': (dict, True),
+    'species.scientific_name': (str, True),
+    'species.common_name': (str, False),
+    'species.taxonomic_info': (dict, False),
+    'conservation_status': (dict, False),
+    'threats': (list, False),
+    'references': (list, False),
+    'metadata': (dict, False)
+}
+
+def create_empty_json_template() -> Dict[str, Any]:
+    """Create an empty JSON template for species profiles."""
+    return {
+        "species": {
+            "scientific_name": "",
+            "common_name": "",
+            "taxonomic_info": {
+                "kingdom": "",
+                "phylum": "",
+                "class": "",
+                "order": "",
+                "family": "",
+                "genus": "",
+                "species": ""
+            }
+        },
+        "conservation_status": {
+            "iucn_status": "",
+            "cites_listing": "",
+            "cms_appendix": "",
+            "population_trend": "",
+            "assessment_year": None
+        },
+        "distribution": {
+            "arctic_range": [],
+            "breeding_range": [],
+            "wintering_range": [],
+            "depth_range": {},
+            "habitat_types": []
+        },
+        "ecology": {
+            "diet": [],
+            "feeding_behavior": "",
+            "breeding_season": "",
+            "lifespan": "",
+            "generation_time": "",
+            "social_structure": ""
+        },
+        "threats": [],
+        "conservation_measures": [],
+        "population_data": {
+            "global_population": "",
+            "regional_populations": {},
+            "monitoring_methods": []
+        },
+        "cultural_significance": {
+            "indigenous_names": {},
+            "traditional_uses": [],
+            "cultural_importance": ""
+        },
+        "economic_importance": {
+            "commercial_value": "",
+            "subsistence_value": "",
+            "ecotourism_value": ""
+        },
+        "research_needs": [],
+        "references": [],
+        "metadata": {
+            "profile_version": "1.0",
+            "last_updated": "",
+            "data_sources": [],
+            "notes": "Empty template - awaiting research data"
+        }
+    }
+
+@dataclass(frozen=True)
+class FieldCheck:
+    """One compiled schema rule"""
+    path: str
+    parts: Tuple[str, ...]
+    types: Tuple[type, ...]
+    required: bool
+
+class CompiledSchema:
+    """Field checks of a profile layout, compiled once and applied to every file"""
+
+    def __init__(self, layout: str, spec: Dict[str, Tuple[Any, bool]]):
+        """
+        Args:
+            layout (str): Layout name
+            spec (Dict[str, Tuple[Any, bool]]): Field path -> (type or tuple of types, required)
+        """
+        self.layout = layout
+        self.checks = tuple(
+            FieldCheck(path, tuple(path.replace('[]', '.[]').split('.')),
+                       types if isinstance(types, tuple) else (types,), required)
+            for path, (types, required) in spec.items()
+        )
+
+    def _values(self, document: Any, parts: Tuple[str, ...]) -> Iterable[Tuple[str, Any, bool]]:
+        """(location, value, present) for every node the path reaches"""
+        nodes = [('', document)]
+        for part in parts:
+            reached = []
+            for location, node in nodes:
+                if part == '[]':
+                    if isinstance(node, list):
+                        reached.extend((f"{location}[{i}]", item) for i, item in enumerate(node))
+                elif isinstance(node, dict):
+                    if part not in node:
+                        yield f"{location}.{part}".lstrip('.'), None, False
+                        continue
+                    reached.append((f"{location}.{part}".lstrip('.'), node[part]))
+            nodes = reached
+        for location, value in nodes:
+            yield location, value, True
+
+    def validate(self, document: Any) -> List[str]:
+        """
+        Check a parsed document
+
+        Returns:
+            List[str]: Errors (empty if the document is valid)
+        """
+        if not isinstance(document, dict):
+            return ["Document is not a JSON object"]
+        errors = []
+        for check in self.checks:
+            for location, value, present in self._values(document, check.parts):
+                if not present:
+                    if check.required:
+                        errors.append(f"Missing {location}")
+                elif not isinstance(value, check.types) or isinstance(value, bool) and bool not in check.types:
+                    expected = '/'.join(t.__name__ for t in check.types)
+                    errors.append(f"{location} should be {expected}, got {type(value).__name__}")
+                elif check.required and value in ('', None):
+                    errors.append(f"Empty {location}")
+        return errors
+
+SCHEMAS = {
+    RESEARCH_LAYOUT: CompiledSchema(RESEARCH_LAYOUT, RESEARCH_SCHEMA),
+    TEMPLATE_LAYOUT: CompiledSchema(TEMPLATE_LAYOUT, TEMPLATE_SCHEMA)
+}
+
+def detect_layout(document: Any) -> Optional[str]:
+    """'research', 'template' or None for an unrecognized document"""
+    if isinstance(document, dict):
+        if 'species_data' in document:
+            return RESEARCH_LAYOUT
+        if 'species' in document:
+            return TEMPLATE_LAYOUT
+    return None
+
+def fill_defaults(document: Dict[str, Any], defaults: Dict[str, Any]) -> None:
+    """Add the keys of defaults missing from document (recursively), keeping existing values"""
+    for key, default in defaults.items():
+        if key not in document:
+            document[key] = copy.deepcopy(default)
+        elif isinstance(default, dict) and isinstance(document[key], dict):
+            fill_defaults(document[key], default)
+
+def scientific_name_from_path(path: Path) -> str:
+    """Scientific name of a Scientific_name.json file"""
+    return path.stem.replace('_conservation_profile', '').replace('_', ' ')
+
+def standardize_document(document: Dict[str, Any], layout: str, path: Path) -> Dict[str, Any]:
+    """
+    Standardized copy of a document
+
+    Templates get every missing template key; both layouts get an empty
+    scientific name from the file name and the optional top-level sections.
+    """
+    document = copy.deepcopy(document)
+    if layout == TEMPLATE_LAYOUT:
+        fill_defaults(document, create_empty_json_template())
+        species = document['species']
+    else:
+        document.setdefault('references', [])
+        document.setdefault('metadata', {})
+        species = document['species_data']
+    if isinstance(species, dict) and not species.get('scientific_name'):
+        species['scientific_name'] = scientific_name_from_path(path)
+    return document
+
+@dataclass
+class StandardizationResult:
+    """Outcome for one file"""
+    path: Path
+    status: str = 'valid'           # unchanged, valid, standardized, invalid, error
+    layout: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+    file_hash: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('unchanged', 'valid', 'standardized') and not self.errors
+
+class SpeciesJSONStandardizer:
+    """Parallel, incremental schema validation and standardization of species profile JSONs"""
+
+    def __init__(self, processed_dir: Optional[Path] = None, workers: int = DEFAULT_WORKERS,
+                 dry_run: bool = False, force: bool = False, state: Optional[ContentManifest] = None):
+        """
+        Args:
+            processed_dir (Optional[Path]): Directory with the profile JSON files
+            workers (int): Threads processing files
+            dry_run (bool): Validate and report, write nothing
+            force (bool): Process every file even if unchanged since the last run
+            state (Optional[ContentManifest]): Per-file state (default the species_json_standardization manifest)
+        """
+        self.processed_dir = Path(processed_dir or PROCESSED_DIR)
+        self.workers = max(1, workers)
+        self.dry_run = dry_run
+        self.force = force
+        self.state = state if state is not None else ContentManifest(STATE_MANIFEST)
+        self.metrics = get_metrics()
+
+        # Path -> parsed (standardized) document, shared with the import step
+        self.documents: Dict[Path, Dict[str, Any]] = {}
+        self.results: Dict[Path, StandardizationResult] = {}
+        self._lock = threading.Lock()
+
+    def _cache(self, path: Path, document: Dict[str, Any]) -> None:
+        with self._lock:
+            self.documents[path] = document
+
+    def document(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Parsed document of a file, read at most once per run
+
+        Args:
+            path (Path): Profile JSON file
+
+        Returns:
+            Optional[Dict[str, Any]]: The document, or None if it cannot be read
+        """
+        path = Path(path)
+        cached = self.documents.get(path)
+        if cached is not None:
+            return cached
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read {path.name}: {e}")
+            return None
+        self._cache(path, document)
+        return document
+
+    def _unchanged(self, path: Path, stat: os.stat_result) -> Tuple[bool, Optional[str]]:
+        """Unchanged since the last run: same mtime and size, or the same content hash"""
+        if self.force:
+            return False, None
+        entry = self.state.get(path.name)
+        if not entry:
+            return False, None
+        if entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            return True, entry.get('file_hash')
+        changed, file_hash = self.state.file_changed(path)
+        return not changed, file_hash
+
+    def _record(self, result: StandardizationResult, stat: os.stat_result) -> None:
+        if self.dry_run or result.status == 'error':
+            return
+        with self._lock:
+            self.state.record(result.path.name, file_hash=result.file_hash, attributes={
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'layout': result.layout,
+                'errors': result.errors
+            })
+
+    def process_file(self, path: Path) -> StandardizationResult:
+        """Validate and standardize one file (thread-safe)"""
+        path = Path(path)
+        result = StandardizationResult(path)
+        try:
+            stat = path.stat()
+            unchanged, result.file_hash = self._unchanged(path, stat)
+            if unchanged:
+                entry = self.state.get(path.name)
+                result.status = 'unchanged'
+                result.layout = entry.get('layout')
+                result.errors = list(entry.get('errors') or [])
+                if entry.get('mtime_ns') != stat.st_mtime_ns:
+                    # Touched but identical: remember the new mtime to skip the hash next time
+                    self._record(result, stat)
+                return result
+
+            raw = path.read_bytes()
+            result.file_hash = hashlib.sha256(raw).hexdigest()
+            document = json.loads(raw.decode('utf-8'))
+            result.layout = detect_layout(document)
+            if result.layout is None:
+                result.status = 'invalid'
+                result.errors = ["Unrecognized layout (no 'species_data' or 'species')"]
+                self._cache(path, document)
+                self._record(result, stat)
+                return result
+
+            standardized = standardize_document(document, result.layout, path)
+            result.errors = SCHEMAS[result.layout].validate(standardized)
+            if standardized != document:
+                result.status = 'standardized'
+                if not self.dry_run:
+                    encoded = json.dumps(standardized, indent=2, ensure_ascii=False).encode('utf-8')
+                    path.write_bytes(encoded)
+                    result.file_hash = hashlib.sha256(encoded).hexdigest()
+                    stat = path.stat()
+            if result.errors:
+                result.status = 'invalid'
+            self._cache(path, standardized)
+            self._record(result, stat)
+        except Exception as e:
+            result.status = 'error'
+            result.errors = [str(e)]
+        return result
+
+    def run(self, files: Optional[Iterable[Path]] = None) -> List[StandardizationResult]:
+        """
+        Process every JSON file of the processed directory in parallel
+
+        Args:
+            files (Optional[Iterable[Path]]): Files to process (default processed_dir/*.json)
+
+        Returns:
+            List[StandardizationResult]: Results in file order
+        """
+        files = sorted(files if files is not None else self.processed_dir.glob("*.json"))
+        with self.metrics.span('standardize_species_json', workers=self.workers) as span:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(self.process_file, files))
+            counts = self.counts(results)
+            span.set(files=len(files), **counts)
+        for status, count in counts.items():
+            self.metrics.counter('species_json_files_total', status=status).inc(count)
+        self.results.update((result.path, result) for result in results)
+        return results
+
+    @staticmethod
+    def counts(results: Iterable[StandardizationResult]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+    def valid_files(self) -> List[Path]:
+        """Files of the last run that passed validation"""
+        return [path for path, result in sorted(self.results.items()) if result.ok]
+
+    def save_state(self) -> None:
+        """Write the per-file state after a live run"""
+        if not self.dry_run:
+            self.state.save()
@@ -5,6 +5,12 @@ Standardize species JSON file names and create empty templates for missing speci
 This script:
 1. Renames existing JSON files to use simple Scientific_name.json format
 2. Creates empty JSON template files for all species not yet researched
+3. Validates every file against the compiled profile schemas and fills in
+   missing template keys (SpeciesJSONStandardizer: parallel, files unchanged
+   since the last run are skipped by mtime/hash)
+
+Usage:
+    python core/standardize_species_json_files.py [--dry-run] [--force] [--workers 8]
 """
 
 import os
@@ -16,6 +22,13 @@ import sys
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.species_json_standardizer import (
+    SpeciesJSONStandardizer,
+    create_empty_json_template,
+    PROCESSED_DIR,
+    DEFAULT_WORKERS
+)
+
 # List of all 42 Arctic species
 ARCTIC_SPECIES = [
     # Marine Mammals - Baleen Whales
@@ -92,75 +105,19 @@ FILE_MAPPINGS = {
     "scrane.json": "Leucogeranus leucogeranus"  # Siberian crane
 }
 
-def create_empty_json_template():
-    """Create an empty JSON template for species profiles."""
-    return {
-        "species": {
-            "scientific_name": "",
-            "common_name": "",
-            "taxonomic_info": {
-                "kingdom": "",
-                "phylum": "",
-                "class": "",
-                "order": "",
-                "family": "",
-                "genus": "",
-                "species": ""
-            }
-        },
-        "conservation_status": {
-            "iucn_status": "",
-            "cites_listing": "",
-            "cms_appendix": "",
-            "population_trend": "",
-            "assessment_year": None
-        },
-        "distribution": {
-            "arctic_range": [],
-            "breeding_range": [],
-            "wintering_range": [],
-            "depth_range": {},
-            "habitat_types": []
-        },
-        "ecology": {
-            "diet": [],
-            "feeding_behavior": "",
-            "breeding_season": "",
-            "lifespan": "",
-            "generation_time": "",
-            "social_structure": ""
-        },
-        "threats": [],
-        "conservation_measures": [],
-        "population_data": {
-            "global_population": "",
-            "regional_populations": {},
-            "monitoring_methods": []
-        },
-        "cultural_significance": {
-            "indigenous_names": {},
-            "traditional_uses": [],
-            "cultural_importance": ""
-        },
-        "economic_importance": {
-            "commercial_value": "",
-            "subsistence_value": "",
-            "ecotourism_value": ""
-        },
-        "research_needs": [],
-        "references": [],
-        "metadata": {
-            "profile_version": "1.0",
-            "last_updated": "",
-            "data_sources": [],
-            "notes": "Empty template - awaiting research data"
-        }
-    }
-
 def main():
     """Main function to standardize JSON files."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Standardize species profile JSON files')
+    parser.add_argument('--dry-run', action='store_true', help='Report only, do not rename, create or rewrite files')
+    parser.add_argument('--force', action='store_true', help='Re-validate files unchanged since the last run')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Threads validating files')
+    parser.add_argument('--processed-dir', type=Path, help='Profile JSON directory (default species_data/scite/processed)')
+    args = parser.parse_args()
+    
     # Set up paths
-    processed_dir = Path("/Users/magnussmari/Arctic_Tracker(version_1.0)/Arctic-Tracker-API/species_data/scite/processed")
+    processed_dir = Path(args.processed_dir or PROCESSED_DIR)
     
     if not processed_dir.exists():
         print(f"Error: Directory {processed_dir} does not exist!")
@@ -188,7 +145,8 @@ def main():
             new_path = processed_dir / new_name
             
             # Rename the file
-            shutil.move(str(old_file), str(new_path))
+            if not args.dry_run:
+                shutil.move(str(old_file), str(new_path))
             renamed_files.append(f"{old_name} → {new_name}")
             processed_species.add(scientific_name)
             print(f"  Renamed: {old_name} → {new_name}")
@@ -223,17 +181,35 @@ def main():
             template["species"]["scientific_name"] = species
             
             # Save the file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(template, f, indent=2, ensure_ascii=False)
+            if not args.dry_run:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(template, f, indent=2, ensure_ascii=False)
             
             created_files.append(filename)
             print(f"  Created: {filename}")
     
+    # Step 3: Validate and standardize file contents
+    print("\n--- Step 3: Validating and standardizing file contents ---")
+    
+    standardizer = SpeciesJSONStandardizer(processed_dir, workers=args.workers,
+                                           dry_run=args.dry_run, force=args.force)
+    results = standardizer.run()
+    standardizer.save_state()
+    for result in results:
+        if result.status == 'standardized':
+            print(f"  Standardized: {result.path.name}")
+        for error in result.errors:
+            print(f"  Invalid: {result.path.name}: {error}")
+    counts = standardizer.counts(results)
+    
     # Summary report
     print("\n--- Summary Report ---")
     print(f"Total species: {len(ARCTIC_SPECIES)}")
     print(f"Files renamed: {len(renamed_files)}")
     print(f"Empty templates created: {len(created_files)}")
+    print(f"Files unchanged since last run: {counts.get('unchanged', 0)}")
+    print(f"Files standardized: {counts.get('standardized', 0)}")
+    print(f"Files failing validation: {counts.get('invalid', 0) + counts.get('error', 0)}")
     print(f"Total JSON files now: {len(list(processed_dir.glob('*.json')))}")
     
     # List all current files
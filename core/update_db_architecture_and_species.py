@@ -19,6 +19,20 @@ Options:
     --update-schema     Update the main data_architecture_may2025.md file
     --species-only      Only run species name analysis
     --schema-only       Only run schema analysis
+    --fast              Probe and analyze tables concurrently, sampling rows per table
+    --sample-size N     Rows sampled per table for type and null-rate inference (--fast default: 100)
+    --concurrency N     Tables probed at the same time (--fast default: 8)
+    --count METHOD      Row count method: exact, planned or estimated (default: exact)
+    --no-catalog        Infer the schema from sampled rows only
+    --refresh-catalog   Re-read the schema catalog instead of using cache/schema_catalog.json
+
+Tables, declared column types, nullability, keys and indexes come from the
+shared schema catalog (config/schema_introspection.py: DATABASE_URL or the
+schema_catalog() RPC, cached on disk). With --count planned/estimated the row
+counts are the catalog's reltuples estimates and no table is read at all;
+with exact counts each table is read with one request that returns its row
+count (count header) and up to --sample-size rows for sample values. Without
+a catalog, column types and null rates are inferred from the sampled rows.
 """
 
 import os
@@ -44,6 +58,21 @@ except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
 
+from config.instrumentation import instrument_client, get_metrics
+from config.schema_introspection import get_schema_catalog
+
+# Tables probed when the get_table_names RPC is unavailable
+KNOWN_TABLES = [
+    'catch_records', 'cites_listings', 'cites_trade_records', 'common_names',
+    'conservation_measures', 'distribution_ranges', 'families', 'iucn_assessments',
+    'profiles', 'species', 'species_threats', 'species_trade_summary',
+    'subpopulations', 'timeline_events'
+]
+FALLBACK_TABLES = ['species', 'families', 'cites_trade_records', 'iucn_assessments', 'cites_listings', 'common_names']
+FAST_SAMPLE_SIZE = 100
+FAST_CONCURRENCY = 8
+COUNT_METHODS = ('exact', 'planned', 'estimated')
+
 # Load environment variables
 def load_environment():
     """Load environment variables from various possible locations"""
@@ -68,10 +97,31 @@ class DatabaseArchitectureAnalyzer:
     Comprehensive database architecture analyzer and species name retriever
     """
     
-    def __init__(self, output_dir: str = None):
-        """Initialize the analyzer with Supabase connection"""
+    def __init__(self, output_dir: str = None, sample_size: int = 1, concurrency: int = 1,
+                 count_method: str = 'exact', use_catalog: bool = True, refresh_catalog: bool = False):
+        """
+        Initialize the analyzer with Supabase connection
+        
+        Args:
+            output_dir (str): Directory to save reports
+            sample_size (int): Rows sampled per table for type and null-rate inference
+            concurrency (int): Tables probed/analyzed at the same time
+            count_method (str): PostgREST count method (exact, planned or estimated)
+            use_catalog (bool): Read the schema from the shared schema catalog when available
+            refresh_catalog (bool): Re-read the catalog instead of using the disk cache
+        """
         load_environment()
         
+        if count_method not in COUNT_METHODS:
+            raise ValueError(f"count_method must be one of {COUNT_METHODS}")
+        self.sample_size = max(1, sample_size)
+        self.concurrency = max(1, concurrency)
+        self.count_method = count_method
+        self.use_catalog = use_catalog
+        self.refresh_catalog = refresh_catalog
+        self.catalog = None
+        self.metrics = get_metrics()
+        
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
         
@@ -79,7 +129,7 @@ class DatabaseArchitectureAnalyzer:
             raise ValueError("Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_ANON_KEY environment variables.")
         
         try:
-            self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+            self.supabase: Client = instrument_client(create_client(self.supabase_url, self.supabase_key))
         except Exception as e:
             print(f"⚠️  Standard client creation failed: {e}")
             print("🔄 Trying alternative client initialization...")
@@ -216,62 +266,169 @@ class DatabaseArchitectureAnalyzer:
         self.table_counts = {}
         self.common_names_data = []
         
+        # Table -> (sampled rows, row count) from the one request per table
+        self.table_samples: Dict[str, Tuple[List[Dict[str, Any]], Optional[int]]] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def _in_thread(self, func, *args):
+        """Run a blocking client call in a worker thread, at most self.concurrency at a time"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args)
+    
+    def _fetch_table_sample(self, table_name: str) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Row count and up to sample_size rows of a table in one request (raises if the table is missing)"""
+        if table_name not in self.table_samples:
+            with self.metrics.span('architecture.sample_table', table=table_name) as span:
+                response = (self.supabase.table(table_name)
+                            .select('*', count=self.count_method)
+                            .limit(self.sample_size).execute())
+                rows = response.data or []
+                span.set(rows=len(rows), count=response.count)
+            self.table_samples[table_name] = (rows, response.count)
+        return self.table_samples[table_name]
+    
+    async def _probe_table(self, table_name: str) -> bool:
+        """True if the table exists (its sample is kept for analyze_table_structure)"""
+        try:
+            await self._in_thread(self._fetch_table_sample, table_name)
+            print(f"    ✅ Found table: {table_name}")
+            return True
+        except Exception as e:
+            print(f"    ❌ Table not found: {table_name} ({e})")
+            return False
+    
+    def _load_catalog(self):
+        """Shared schema catalog (None if disabled or unavailable)"""
+        if self.use_catalog and self.catalog is None:
+            self.catalog = get_schema_catalog(self.supabase, refresh=self.refresh_catalog)
+            if self.catalog is not None:
+                print(f"  📚 Schema catalog: {len(self.catalog)} tables ({self.catalog.source})")
+        return self.catalog
+
     async def get_database_tables(self) -> List[str]:
         """Get list of all tables in the database"""
+        catalog = await asyncio.to_thread(self._load_catalog)
+        if catalog is not None and len(catalog):
+            return catalog.table_names()
+
         try:
             # Try RPC function first
             response = self.supabase.rpc('get_table_names').execute()
             if response.data and len(response.data) > 4:  # If we get more than just the 4 basic tables
-                return response.data
-            
+                # Rows may be plain names or {'table_name': ...} records
+                return [row['table_name'] if isinstance(row, dict) else row for row in response.data]
             print(f"  RPC returned limited tables: {response.data if response.data else 'None'}")
-            print("  Trying direct table discovery...")
-            
-            # Fallback: Try to discover tables by testing known table names
-            known_tables = [
-                'catch_records', 'cites_listings', 'cites_trade_records', 'common_names',
-                'conservation_measures', 'distribution_ranges', 'families', 'iucn_assessments',
-                'profiles', 'species', 'species_threats', 'species_trade_summary',
-                'subpopulations', 'timeline_events'
-            ]
-            
-            existing_tables = []
-            print(f"  Testing {len(known_tables)} known tables...")
-            
-            for table in known_tables:
-                try:
-                    response = self.supabase.table(table).select('*').limit(1).execute()
-                    if response.data is not None and response.status_code == 200:
-                        existing_tables.append(table)
-                        print(f"    ✅ Found table: {table}")
-                    else:
-                        print(f"    ❌ Table not found: {table}")
-                except Exception as e:
-                    print(f"    ❌ Error testing {table}: {e}")
+        except Exception as e:
+            print(f"  get_table_names RPC unavailable: {e}")
+        
+        # Fallback: discover tables by probing known table names concurrently
+        print(f"  Testing {len(KNOWN_TABLES)} known tables (concurrency {self.concurrency})...")
+        found = await asyncio.gather(*(self._probe_table(table) for table in KNOWN_TABLES))
+        existing_tables = [table for table, exists in zip(KNOWN_TABLES, found) if exists]
+        
+        if existing_tables:
+            return existing_tables
+        
+        print("Using fallback table list...")
+        return list(FALLBACK_TABLES)
+    
+    def _infer_column_stats(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Type, null rate and first non-null sample of every column in the sampled rows"""
+        columns: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            for column_name, value in row.items():
+                column = columns.setdefault(column_name, {'types': set(), 'nulls': 0, 'sample': None, 'long_text': False})
+                if value is None:
+                    column['nulls'] += 1
                     continue
-            
-            if existing_tables:
-                return existing_tables
+                column['types'].add(self._infer_postgres_type(value))
+                if column['sample'] is None:
+                    column['sample'] = value
+        
+        result = []
+        for column_name, column in columns.items():
+            types = column['types']
+            if not types:
+                col_type = 'TEXT'
+            elif len(types) == 1:
+                col_type = next(iter(types))
+            elif types <= {'INTEGER', 'FLOAT'}:
+                col_type = 'FLOAT'
             else:
-                print("  No known tables found, falling back to basic discovery...")
-                # If no known tables found, return what we got from RPC
-                return response.data if response.data else ['species', 'families', 'common_names']
-            
-        except Exception as e:
-            print(f"Error getting table list: {e}")
-            print("Using fallback table list...")
-            # Return known tables as fallback
-            return ['species', 'families', 'cites_trade_records', 'iucn_assessments', 'cites_listings', 'common_names']
+                # Short and long strings, or genuinely mixed values
+                col_type = 'TEXT'
+            sample = column['sample']
+            result.append({
+                'name': column_name,
+                'type': col_type,
+                'sample_value': str(sample)[:100] if sample is not None else None,
+                'is_nullable': column['nulls'] > 0,
+                'null_rate': round(column['nulls'] / len(rows), 4),
+                'sampled_rows': len(rows)
+            })
+        return result
     
+    def _catalog_columns(self, table_info, sample_record: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Declared columns of a catalog table, with pg_stats null rates and sample values"""
+        columns = []
+        for column in table_info.columns:
+            col_type = column.udt_name if column.data_type in ('USER-DEFINED', 'ARRAY') else column.data_type
+            sample = sample_record.get(column.name) if sample_record else None
+            columns.append({
+                'name': column.name,
+                'type': col_type.upper(),
+                'sample_value': str(sample)[:100] if sample is not None else None,
+                'is_nullable': column.is_nullable,
+                'default': column.default,
+                'null_rate': round(column.null_frac, 4) if column.null_frac is not None else None,
+                'n_distinct': column.n_distinct
+            })
+        return columns
+
+    async def _analyze_catalog_table(self, table_name: str) -> Dict[str, Any]:
+        """Structure of a table from the schema catalog (reads rows only for exact counts)"""
+        table_info = self.catalog.tables[table_name]
+        rows: List[Dict[str, Any]] = []
+        count_method = 'catalog'
+        if self.count_method == 'exact' or table_info.approx_rows is None:
+            rows, record_count = await self._in_thread(self._fetch_table_sample, table_name)
+            record_count = record_count if record_count is not None else len(rows)
+            count_method = self.count_method
+        else:
+            record_count = table_info.approx_rows
+
+        self.table_counts[table_name] = record_count
+
+        return {
+            'table_name': table_name,
+            'table_type': table_info.table_type,
+            'columns': self._catalog_columns(table_info, rows[0] if rows else None),
+            'sample_data': rows[0] if rows else None,
+            'record_count': record_count,
+            'approx_rows': table_info.approx_rows,
+            'sampled_rows': len(rows),
+            'count_method': count_method,
+            'primary_key': table_info.primary_key,
+            'foreign_keys': table_info.foreign_key_strings(),
+            'indexes': [index['name'] for index in table_info.indexes],
+            'source': 'catalog',
+            'analyzed_at': datetime.now().isoformat()
+        }
+
     async def analyze_table_structure(self, table_name: str) -> Dict[str, Any]:
-        """Analyze the structure of a specific table"""
+        """Analyze the structure of a specific table from the schema catalog or its sampled rows"""
         print(f"  📊 Analyzing table: {table_name}")
-        
+
         try:
-            # Get a sample record to understand the structure
-            response = self.supabase.table(table_name).select('*').limit(1).execute()
+            if self.catalog is not None and table_name in self.catalog:
+                return await self._analyze_catalog_table(table_name)
+
+            # One request: row count header plus the sampled rows
+            rows, record_count = await self._in_thread(self._fetch_table_sample, table_name)
             
-            if not response.data:
+            if not rows:
                 return {
                     'table_name': table_name,
                     'columns': [],
@@ -280,22 +437,11 @@ class DatabaseArchitectureAnalyzer:
                     'error': 'No data found'
                 }
             
-            sample_record = response.data[0]
-            
-            # Get record count
-            count_response = self.supabase.table(table_name).select('*', count='exact').execute()
-            record_count = count_response.count if count_response.count else len(response.data)
+            sample_record = rows[0]
+            record_count = record_count if record_count else len(rows)
             
             # Analyze columns
-            columns = []
-            for column_name, value in sample_record.items():
-                column_info = {
-                    'name': column_name,
-                    'type': self._infer_postgres_type(value),
-                    'sample_value': str(value)[:100] if value is not None else None,
-                    'is_nullable': value is None
-                }
-                columns.append(column_info)
+            columns = self._infer_column_stats(rows)
             
             self.table_counts[table_name] = record_count
             
@@ -304,6 +450,8 @@ class DatabaseArchitectureAnalyzer:
                 'columns': columns,
                 'sample_data': sample_record,
                 'record_count': record_count,
+                'sampled_rows': len(rows),
+                'count_method': self.count_method,
                 'analyzed_at': datetime.now().isoformat()
             }
             
@@ -553,11 +701,10 @@ class DatabaseArchitectureAnalyzer:
         tables = await self.get_database_tables()
         print(f"📋 Found {len(tables)} tables: {', '.join(tables)}")
         
-        # Analyze each table structure
+        # Analyze each table structure (concurrently with --fast)
         print(f"\n📊 Analyzing table structures...")
-        table_analyses = {}
-        for table in tables:
-            table_analyses[table] = await self.analyze_table_structure(table)
+        analyses = await asyncio.gather(*(self.analyze_table_structure(table) for table in tables))
+        table_analyses = dict(zip(tables, analyses))
         
         # Analyze families if table exists
         families_analysis = {}
@@ -579,6 +726,8 @@ class DatabaseArchitectureAnalyzer:
                 'analyzer_version': '2.0.0',
                 'database_url': self.supabase_url,
                 'tables_analyzed': len(tables),
+                'sample_size': self.sample_size,
+                'count_method': self.count_method,
                 'family_normalization_detected': 'families' in tables
             },
             'database_schema': {
@@ -747,11 +896,29 @@ class DatabaseArchitectureAnalyzer:
                 report.append(f"#### `{table_name}` (Error: {structure['error']})")
                 continue
                 
+            sampled = structure.get('sampled_rows', 1)
+            from_catalog = structure.get('source') == 'catalog'
+            show_nulls = sampled > 1 or from_catalog
             report.append(f"#### `{table_name}`")
-            report.append(f"**Records:** {structure.get('record_count', 0):,}")
+            approx = " (estimate)" if structure.get('count_method') == 'catalog' else ""
+            report.append(f"**Records:** {structure.get('record_count', 0):,}{approx}")
             report.append("")
-            report.append("| Column | Type | Sample Value |")
-            report.append("|--------|------|--------------|")
+            if from_catalog:
+                if structure.get('primary_key'):
+                    report.append(f"**Primary key:** {', '.join(structure['primary_key'])}")
+                for foreign_key in structure.get('foreign_keys', []):
+                    report.append(f"**Foreign key:** {foreign_key}")
+                report.append("*Declared types; null rates from pg_stats*")
+                report.append("")
+            elif sampled > 1:
+                report.append(f"*Types and null rates from {sampled:,} sampled rows*")
+                report.append("")
+            if show_nulls:
+                report.append("| Column | Type | Null % | Sample Value |")
+                report.append("|--------|------|--------|--------------|")
+            else:
+                report.append("| Column | Type | Sample Value |")
+                report.append("|--------|------|--------------|")
             
             for column in structure.get('columns', []):
                 name = column['name']
@@ -759,7 +926,12 @@ class DatabaseArchitectureAnalyzer:
                 sample = column.get('sample_value', 'NULL')
                 if sample and len(sample) > 50:
                     sample = sample[:47] + "..."
-                report.append(f"| `{name}` | {col_type} | {sample} |")
+                if show_nulls:
+                    null_rate = column.get('null_rate')
+                    null_pct = f"{null_rate * 100:.1f}" if null_rate is not None else "-"
+                    report.append(f"| `{name}` | {col_type} | {null_pct} | {sample} |")
+                else:
+                    report.append(f"| `{name}` | {col_type} | {sample} |")
             
             report.append("")
         
@@ -866,12 +1038,31 @@ async def main():
                        help='Only run species name analysis')
     parser.add_argument('--schema-only', action='store_true', 
                        help='Only run schema analysis')
+    parser.add_argument('--fast', action='store_true',
+                       help='Probe and analyze tables concurrently with sampled statistics')
+    parser.add_argument('--sample-size', type=int,
+                       help=f'Rows sampled per table (default: {FAST_SAMPLE_SIZE} with --fast, else 1)')
+    parser.add_argument('--concurrency', type=int,
+                       help=f'Tables probed at the same time (default: {FAST_CONCURRENCY} with --fast, else 1)')
+    parser.add_argument('--count', choices=COUNT_METHODS, default='exact',
+                       help='Row count method (planned/estimated avoid COUNT(*) on large tables)')
+    parser.add_argument('--no-catalog', action='store_true',
+                       help='Infer the schema from sampled rows instead of the schema catalog')
+    parser.add_argument('--refresh-catalog', action='store_true',
+                       help='Re-read the schema catalog instead of using the disk cache')
     
     args = parser.parse_args()
     
     try:
         # Initialize analyzer
-        analyzer = DatabaseArchitectureAnalyzer(output_dir=args.output_dir)
+        analyzer = DatabaseArchitectureAnalyzer(
+            output_dir=args.output_dir,
+            sample_size=args.sample_size or (FAST_SAMPLE_SIZE if args.fast else 1),
+            concurrency=args.concurrency or (FAST_CONCURRENCY if args.fast else 1),
+            count_method=args.count,
+            use_catalog=not args.no_catalog,
+            refresh_catalog=args.refresh_catalog
+        )
         
         # Run analysis
         if args.species_only:
@@ -881,8 +1072,7 @@ async def main():
         elif args.schema_only:
             print("📊 Running schema-only analysis...")
             tables = await analyzer.get_database_tables()
-            for table in tables:
-                await analyzer.analyze_table_structure(table)
+            await asyncio.gather(*(analyzer.analyze_table_structure(table) for table in tables))
         else:
             print("🔍 Running full analysis...")
             await analyzer.run_full_analysis()
@@ -11,20 +11,38 @@ Features:
 - Tracks upload progress and errors
 - Validates data before upload
 - Creates comprehensive upload report
+
+--parallel preloads the species and conservation_profiles IDs once, reads and
+validates the files in a thread pool and sends the species updates through a
+bounded worker pool, so re-uploading every profile (--force) takes seconds.
+
+--changed-only uploads what changed since the last successful run, using the
+content hashes in cache/manifests/species_profiles.json: unchanged files are
+skipped without any database call, and a file edited only in fields that are
+not uploaded is skipped when its species row hash is unchanged.
+
+Usage:
+    python upload_species_profiles.py [--dry-run] [--force] [--parallel] [--workers 8] [--changed-only]
 """
 
 import os
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 import logging
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.supabase_config import get_supabase_client
+from config.instrumentation import get_metrics
+from config.content_manifest import ContentManifest
+from config.postgrest_queries import fetch_paginated
 
 # Configure logging
 logging.basicConfig(
@@ -37,17 +55,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PROCESSED_DIR = Path(__file__).parent.parent / "species_data" / "scite" / "processed"
+DEFAULT_WORKERS = 8
+MANIFEST_NAME = 'species_profiles'
+
+@dataclass
+class PreparedProfile:
+    """A profile file read and checked without touching the database"""
+    filepath: Path
+    json_data: Dict[str, Any] = field(default_factory=dict)
+    scientific_name: Optional[str] = None
+    empty_template: bool = False
+    errors: List[str] = field(default_factory=list)
+    load_error: Optional[str] = None
+    file_hash: Optional[str] = None
+    unchanged: bool = False
+    row_hash: Optional[str] = None
+    row_unchanged: bool = False
+
 class SpeciesProfileUploader:
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, force: bool = False, workers: int = DEFAULT_WORKERS,
+                 processed_dir: Optional[Path] = None, changed_only: bool = False):
         """
         Initialize the uploader.
         
         Args:
             dry_run: If True, only validate and report, don't actually upload
+            force: Upload even if the species already has a conservation profile
+            workers: Threads for reading files and sending updates (--parallel)
+            processed_dir: Directory with the profile JSON files
+            changed_only: Upload only files whose content changed since the last run
         """
         self.dry_run = dry_run
+        self.force = force
+        self.manifest = ContentManifest(MANIFEST_NAME) if changed_only else None
+        self.workers = max(1, workers)
         self.client = get_supabase_client(use_service_role=True)
-        self.processed_dir = Path("/Users/magnussmari/Arctic_Tracker(version_1.0)/Arctic-Tracker-API/species_data/scite/processed")
+        self.metrics = get_metrics()
+        self.processed_dir = Path(processed_dir or PROCESSED_DIR)
+        self._stats_lock = threading.Lock()
+        
+        # Preloaded existence index (--parallel)
+        self.species_ids: Dict[str, str] = {}
+        self.profiled_species_ids: Set[str] = set()
         
         # Track statistics
         self.stats = {
@@ -55,6 +105,7 @@ class SpeciesProfileUploader:
             'empty_templates': 0,
             'files_with_data': 0,
             'already_uploaded': 0,
+            'unchanged': 0,
             'successful_uploads': 0,
             'failed_uploads': 0,
             'errors': []
@@ -171,13 +222,69 @@ class SpeciesProfileUploader:
         
         return len(errors) == 0, errors
     
-    def upload_species_profile(self, json_data: Dict, filepath: Path) -> bool:
+    @staticmethod
+    def build_species_update(species_data: Dict) -> Dict:
+        """species table columns updated from a profile's species_data"""
+        return {
+            'common_name': species_data.get('common_name', ''),
+            'description': species_data.get('description', ''),
+            'habitat_description': species_data.get('habitat_description', ''),
+            'population_size': species_data.get('population_size', ''),
+            'population_trend': species_data.get('population_trend', ''),
+            'generation_length': species_data.get('generation_length'),
+            'movement_patterns': species_data.get('movement_patterns', ''),
+            'use_and_trade': species_data.get('use_and_trade', ''),
+            'threats_overview': species_data.get('threats_overview', ''),
+            'conservation_overview': species_data.get('conservation_overview', '')
+        }
+    
+    def species_row_unchanged(self, key: str, json_data: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        Compare the species row a profile would write with the last uploaded one.
+        
+        Args:
+            key: Manifest entry key (the file name)
+            json_data: The loaded JSON data
+            
+        Returns:
+            Tuple of (unchanged, row hash); the hash is None for unsupported layouts
+        """
+        if self.manifest is None or 'species_data' not in json_data:
+            return False, None
+        changed, row_hash = self.manifest.row_changed(
+            key, 'species', self.build_species_update(json_data['species_data']))
+        return not changed, row_hash
+    
+    def record_upload(self, key: str, file_hash: Optional[str], row_hash: Optional[str] = None,
+                      scientific_name: Optional[str] = None) -> None:
+        """Store the hashes of a handled (uploaded, unchanged or skipped) file in the manifest."""
+        if self.manifest is None or self.dry_run:
+            return
+        self.manifest.record(key, file_hash=file_hash, rows={'species': row_hash} if row_hash else None,
+                             attributes={'scientific_name': scientific_name} if scientific_name else None)
+    
+    def skip_unchanged(self, key: str) -> None:
+        """Count a file identical to the last run, keeping its species reserved against duplicates."""
+        logger.info(f"⏭️  Unchanged since last upload: {key}")
+        self.stats['unchanged'] += 1
+        scientific_name = self.manifest.get(key).get('scientific_name')
+        if scientific_name:
+            self.processed_species.add(scientific_name)
+    
+    def save_manifest(self) -> None:
+        """Write the content manifest after a live --changed-only run."""
+        if self.manifest is not None and not self.dry_run:
+            self.manifest.save()
+            logger.info(f"Saved upload manifest ({len(self.manifest)} files): {self.manifest.path}")
+    
+    def upload_species_profile(self, json_data: Dict, filepath: Path, species_id: Optional[str] = None) -> bool:
         """
         Upload a species profile to the database.
         
         Args:
             json_data: The JSON data to upload
             filepath: Path to the source file
+            species_id: Species ID if already known (skips the lookup)
             
         Returns:
             True if successful, False otherwise
@@ -192,28 +299,18 @@ class SpeciesProfileUploader:
                 species_data = json_data['species_data']
                 scientific_name = species_data['scientific_name']
                 
-                # Get species ID first
-                species_response = self.client.table('species').select('id').eq('scientific_name', scientific_name).execute()
-                
-                if not species_response.data:
-                    logger.error(f"Species not found in database: {scientific_name}")
-                    return False
-                
-                species_id = species_response.data[0]['id']
+                if species_id is None:
+                    # Get species ID first
+                    species_response = self.client.table('species').select('id').eq('scientific_name', scientific_name).execute()
+                    
+                    if not species_response.data:
+                        logger.error(f"Species not found in database: {scientific_name}")
+                        return False
+                    
+                    species_id = species_response.data[0]['id']
                 
                 # Update species table with enhanced data from JSON
-                species_update = {
-                    'common_name': species_data.get('common_name', ''),
-                    'description': species_data.get('description', ''),
-                    'habitat_description': species_data.get('habitat_description', ''),
-                    'population_size': species_data.get('population_size', ''),
-                    'population_trend': species_data.get('population_trend', ''),
-                    'generation_length': species_data.get('generation_length'),
-                    'movement_patterns': species_data.get('movement_patterns', ''),
-                    'use_and_trade': species_data.get('use_and_trade', ''),
-                    'threats_overview': species_data.get('threats_overview', ''),
-                    'conservation_overview': species_data.get('conservation_overview', '')
-                }
+                species_update = self.build_species_update(species_data)
                 
                 # Update existing species record
                 self.client.table('species').update(species_update).eq('id', species_id).execute()
@@ -227,7 +324,8 @@ class SpeciesProfileUploader:
                 
         except Exception as e:
             logger.error(f"❌ Failed to upload {filepath.name}: {e}")
-            self.stats['errors'].append(f"{filepath.name}: {str(e)}")
+            with self._stats_lock:
+                self.stats['errors'].append(f"{filepath.name}: {str(e)}")
             return False
     
     def process_all_files(self):
@@ -246,6 +344,14 @@ class SpeciesProfileUploader:
             logger.info(f"\n--- Processing: {filepath.name} ---")
             
             try:
+                # Skip files identical to the last upload before reading them
+                file_hash = None
+                if self.manifest is not None:
+                    changed, file_hash = self.manifest.file_changed(filepath)
+                    if not changed:
+                        self.skip_unchanged(filepath.name)
+                        continue
+                
                 # Load JSON data
                 with open(filepath, 'r', encoding='utf-8') as f:
                     json_data = json.load(f)
@@ -254,16 +360,13 @@ class SpeciesProfileUploader:
                 if self.is_empty_template(json_data):
                     logger.info(f"⏭️  Skipping empty template: {filepath.name}")
                     self.stats['empty_templates'] += 1
+                    self.record_upload(filepath.name, file_hash)
                     continue
                 
                 self.stats['files_with_data'] += 1
                 
                 # Extract scientific name
-                scientific_name = None
-                if 'species_data' in json_data:
-                    scientific_name = json_data['species_data'].get('scientific_name')
-                elif 'species' in json_data:
-                    scientific_name = json_data['species'].get('scientific_name')
+                scientific_name = self.extract_scientific_name(json_data)
                 
                 if not scientific_name:
                     logger.warning(f"⚠️  No scientific name found in: {filepath.name}")
@@ -272,10 +375,11 @@ class SpeciesProfileUploader:
                 # Check for duplicates
                 if scientific_name in self.processed_species:
                     logger.warning(f"⚠️  Duplicate species in this session: {scientific_name}")
+                    self.record_upload(filepath.name, file_hash, scientific_name=scientific_name)
                     continue
                 
-                # Check if already uploaded
-                if self.check_if_already_uploaded(scientific_name):
+                # Check if already uploaded (changed files are re-uploaded with --changed-only)
+                if not self.force and self.manifest is None and self.check_if_already_uploaded(scientific_name):
                     logger.info(f"⏭️  Already uploaded: {scientific_name}")
                     self.stats['already_uploaded'] += 1
                     continue
@@ -287,10 +391,24 @@ class SpeciesProfileUploader:
                     self.stats['failed_uploads'] += 1
                     continue
                 
+                # Skip edits that do not change the uploaded columns
+                row_unchanged, row_hash = self.species_row_unchanged(filepath.name, json_data)
+                if row_unchanged:
+                    logger.info(f"⏭️  Species row unchanged: {scientific_name}")
+                    self.stats['unchanged'] += 1
+                    self.processed_species.add(scientific_name)
+                    self.record_upload(filepath.name, file_hash, row_hash, scientific_name)
+                    continue
+                
                 # Upload the profile
-                if self.upload_species_profile(json_data, filepath):
+                with self.metrics.span('upload_species_profile') as span:
+                    span.set(species=scientific_name, bytes=filepath.stat().st_size)
+                    uploaded = self.upload_species_profile(json_data, filepath)
+                self.metrics.counter('profiles_uploaded_total', outcome='success' if uploaded else 'failed').inc()
+                if uploaded:
                     self.stats['successful_uploads'] += 1
                     self.processed_species.add(scientific_name)
+                    self.record_upload(filepath.name, file_hash, row_hash, scientific_name)
                 else:
                     self.stats['failed_uploads'] += 1
                     
@@ -298,6 +416,154 @@ class SpeciesProfileUploader:
                 logger.error(f"❌ Error processing {filepath.name}: {e}")
                 self.stats['failed_uploads'] += 1
                 self.stats['errors'].append(f"{filepath.name}: {str(e)}")
+        
+        self.save_manifest()
+    
+    @staticmethod
+    def extract_scientific_name(json_data: Dict) -> Optional[str]:
+        """Scientific name from either profile layout"""
+        if 'species_data' in json_data:
+            return json_data['species_data'].get('scientific_name')
+        if 'species' in json_data:
+            return json_data['species'].get('scientific_name')
+        return None
+    
+    def preload_index(self) -> None:
+        """Load every species ID and the species that already have a conservation profile, once"""
+        with self.metrics.span('preload_profile_index') as span:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                species = executor.submit(fetch_paginated, lambda: self.client.table('species'), 'id, scientific_name')
+                profiles = executor.submit(fetch_paginated, lambda: self.client.table('conservation_profiles'),
+                                           'species_id')
+                self.species_ids = {}
+                for row in species.result():
+                    self.species_ids.setdefault(row['scientific_name'], row['id'])
+                self.profiled_species_ids = {row['species_id'] for row in profiles.result() if row.get('species_id')}
+            span.set(species=len(self.species_ids), profiles=len(self.profiled_species_ids))
+        logger.info(f"Preloaded {len(self.species_ids)} species, {len(self.profiled_species_ids)} with profiles")
+    
+    def prepare_file(self, filepath: Path) -> PreparedProfile:
+        """Read, classify and validate one file (no database access, safe to run in a pool)"""
+        prepared = PreparedProfile(filepath)
+        if self.manifest is not None:
+            changed, prepared.file_hash = self.manifest.file_changed(filepath)
+            if not changed:
+                prepared.unchanged = True
+                return prepared
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                prepared.json_data = json.load(f)
+        except Exception as e:
+            prepared.load_error = str(e)
+            return prepared
+        
+        if self.is_empty_template(prepared.json_data):
+            prepared.empty_template = True
+            return prepared
+        prepared.scientific_name = self.extract_scientific_name(prepared.json_data)
+        _, prepared.errors = self.validate_species_data(prepared.json_data)
+        if not prepared.errors:
+            prepared.row_unchanged, prepared.row_hash = self.species_row_unchanged(filepath.name, prepared.json_data)
+        return prepared
+    
+    def process_all_files_parallel(self):
+        """
+        Process all JSON files with a preloaded existence index and concurrent updates
+        
+        Files are read and validated in a thread pool, the skip decisions are made
+        in file order against the preloaded IDs, and the species updates are sent
+        by at most self.workers threads.
+        """
+        logger.info("Starting parallel species profile upload...")
+        logger.info(f"Processing directory: {self.processed_dir}")
+        logger.info(f"Dry run mode: {self.dry_run}, force: {self.force}, workers: {self.workers}")
+        
+        json_files = sorted(self.processed_dir.glob("*.json"))
+        self.stats['total_files'] = len(json_files)
+        logger.info(f"Found {len(json_files)} JSON files")
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            prepared_files = list(executor.map(self.prepare_file, json_files))
+        # Nothing to look up when every file is unchanged (--changed-only)
+        if any(not (prepared.unchanged or prepared.row_unchanged or prepared.empty_template or prepared.load_error)
+               for prepared in prepared_files):
+            self.preload_index()
+        
+        uploads: List[Tuple[PreparedProfile, str]] = []
+        for prepared in prepared_files:
+            name = prepared.filepath.name
+            if prepared.unchanged:
+                self.skip_unchanged(name)
+                continue
+            if prepared.load_error:
+                logger.error(f"❌ Error processing {name}: {prepared.load_error}")
+                self.stats['failed_uploads'] += 1
+                self.stats['errors'].append(f"{name}: {prepared.load_error}")
+                continue
+            if prepared.empty_template:
+                logger.info(f"⏭️  Skipping empty template: {name}")
+                self.stats['empty_templates'] += 1
+                self.record_upload(name, prepared.file_hash)
+                continue
+            
+            self.stats['files_with_data'] += 1
+            scientific_name = prepared.scientific_name
+            if not scientific_name:
+                logger.warning(f"⚠️  No scientific name found in: {name}")
+                continue
+            if scientific_name in self.processed_species:
+                logger.warning(f"⚠️  Duplicate species in this session: {scientific_name}")
+                self.record_upload(name, prepared.file_hash, scientific_name=scientific_name)
+                continue
+            
+            # Edited only outside the uploaded columns (checked before the preloaded index is needed)
+            if prepared.row_unchanged:
+                logger.info(f"⏭️  Species row unchanged: {scientific_name}")
+                self.stats['unchanged'] += 1
+                self.processed_species.add(scientific_name)
+                self.record_upload(name, prepared.file_hash, prepared.row_hash, scientific_name)
+                continue
+            
+            species_id = self.species_ids.get(scientific_name)
+            if not self.force and self.manifest is None and species_id in self.profiled_species_ids:
+                logger.info(f"⏭️  Already uploaded: {scientific_name}")
+                self.stats['already_uploaded'] += 1
+                continue
+            if prepared.errors:
+                logger.error(f"❌ Validation failed for {name}: {prepared.errors}")
+                self.stats['failed_uploads'] += 1
+                continue
+            if species_id is None and 'species_data' in prepared.json_data:
+                logger.error(f"Species not found in database: {scientific_name}")
+                self.stats['failed_uploads'] += 1
+                continue
+            
+            # Reserve the species so a later duplicate file is skipped, as in the sequential path
+            self.processed_species.add(scientific_name)
+            uploads.append((prepared, species_id))
+        
+        def upload(item: Tuple[PreparedProfile, str]) -> bool:
+            prepared, species_id = item
+            with self.metrics.span('upload_species_profile') as span:
+                span.set(species=prepared.scientific_name, bytes=prepared.filepath.stat().st_size)
+                return self.upload_species_profile(prepared.json_data, prepared.filepath, species_id=species_id)
+        
+        with self.metrics.span('upload_species_profiles', workers=self.workers) as span:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = list(executor.map(upload, uploads))
+            span.set(profiles=len(uploads))
+        
+        for (prepared, _), uploaded in zip(uploads, outcomes):
+            self.metrics.counter('profiles_uploaded_total', outcome='success' if uploaded else 'failed').inc()
+            if uploaded:
+                self.stats['successful_uploads'] += 1
+                self.record_upload(prepared.filepath.name, prepared.file_hash, prepared.row_hash,
+                                   prepared.scientific_name)
+            else:
+                self.stats['failed_uploads'] += 1
+                self.processed_species.discard(prepared.scientific_name)
+        
+        self.save_manifest()
     
     def print_summary(self):
         """Print upload summary statistics."""
@@ -308,6 +574,8 @@ class SpeciesProfileUploader:
         logger.info(f"Empty templates (skipped): {self.stats['empty_templates']}")
         logger.info(f"Files with research data: {self.stats['files_with_data']}")
         logger.info(f"Already uploaded (skipped): {self.stats['already_uploaded']}")
+        if self.manifest is not None:
+            logger.info(f"Unchanged since last upload (skipped): {self.stats['unchanged']}")
         logger.info(f"Successful uploads: {self.stats['successful_uploads']}")
         logger.info(f"Failed uploads: {self.stats['failed_uploads']}")
         
@@ -326,6 +594,12 @@ def main():
     parser = argparse.ArgumentParser(description='Upload species profiles to database')
     parser.add_argument('--dry-run', action='store_true', help='Run validation only, no actual uploads')
     parser.add_argument('--force', action='store_true', help='Upload even if already exists (updates)')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Preload existing IDs once and upload concurrently')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Worker threads for --parallel')
+    parser.add_argument('--processed-dir', type=Path, help='Profile JSON directory (default species_data/scite/processed)')
+    parser.add_argument('--changed-only', action='store_true',
+                        help='Upload only profiles whose content changed since the last run')
     
     args = parser.parse_args()
     
@@ -333,8 +607,12 @@ def main():
     Path('logs').mkdir(exist_ok=True)
     
     # Create uploader and process files
-    uploader = SpeciesProfileUploader(dry_run=args.dry_run)
-    uploader.process_all_files()
+    uploader = SpeciesProfileUploader(dry_run=args.dry_run, force=args.force, workers=args.workers,
+                                      processed_dir=args.processed_dir, changed_only=args.changed_only)
+    if args.parallel:
+        uploader.process_all_files_parallel()
+    else:
+        uploader.process_all_files()
     uploader.print_summary()
 
 if __name__ == "__main__":
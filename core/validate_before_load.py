@@ -11,14 +11,26 @@ the original 'optimized' directory:
 - Branta_ruficollis_trade_data_optimized.json.gz
 - Lagenorhynchus_albirostris_trade_data_optimized.json.gz
 
+All file checks share one scan: every optimized file is read once in a process
+pool, hashing its bytes (SHA-256) and counting its records, species and years
+exactly. Scan results are kept in a checksum manifest
+(cache/manifests/preload_scan.json) keyed by file path and checked against
+mtime and size, so later runs only rescan files that changed.
+
 Usage:
-    python validate_before_load.py
+    python validate_before_load.py [--workers N] [--rescan]
 """
 
+import os
+import gzip
 import json
 import sys
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 import logging
 
 # Add the config directory to the path
@@ -30,17 +42,160 @@ except ImportError:
     print("Error: Could not import supabase_config. Please ensure config/supabase_config.py exists.")
     sys.exit(1)
 
+from instrumentation import get_metrics
+from content_manifest import ContentManifest
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SCAN_MANIFEST = 'preload_scan'
+DEFAULT_WORKERS = os.cpu_count() or 4
+COMPRESSED_PATTERN = '*_trade_data_optimized.json.gz'
+JSON_PATTERN = '*_trade_data_optimized.json'
+
+@dataclass
+class FileScan:
+    """Exact contents of one optimized trade data file"""
+    file_name: str
+    species: str
+    file_hash: Optional[str] = None
+    size: int = 0
+    mtime_ns: int = 0
+    records: int = 0
+    declared_records: Optional[int] = None
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    years: int = 0
+    error: Optional[str] = None
+
+def species_from_filename(file_path: Path) -> str:
+    """'Balaena_mysticetus_trade_data_optimized.json.gz' -> 'Balaena mysticetus'"""
+    name = file_path.name
+    for suffix in ('.gz', '.json', '_trade_data_optimized'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name.replace('_', ' ')
+
+def scan_optimized_file(path: str) -> FileScan:
+    """
+    Read one optimized file once: hash its bytes, then count records, years and species
+    
+    Runs in a worker process, so it only takes and returns picklable values.
+    
+    Args:
+        path (str): Optimized .json or .json.gz file
+        
+    Returns:
+        FileScan: Scan result (error set if the file cannot be read)
+    """
+    file_path = Path(path)
+    scan = FileScan(file_name=file_path.name, species=species_from_filename(file_path))
+    try:
+        stat = file_path.stat()
+        scan.size = stat.st_size
+        scan.mtime_ns = stat.st_mtime_ns
+        raw = file_path.read_bytes()
+        scan.file_hash = hashlib.sha256(raw).hexdigest()
+        if file_path.suffix == '.gz':
+            raw = gzip.decompress(raw)
+        data = json.loads(raw)
+        del raw
+        
+        scan.species = data.get('species') or scan.species
+        scan.declared_records = (data.get('summary') or {}).get('total_records')
+        records = data.get('trade_records') or []
+        years = {record.get('year') for record in records if record.get('year')}
+        scan.records = len(records)
+        scan.years = len(years)
+        if years:
+            scan.year_min = min(years)
+            scan.year_max = max(years)
+    except Exception as e:
+        scan.error = str(e)
+    return scan
+
 class PreLoadValidator:
     """Validate system state before loading trade data"""
     
-    def __init__(self):
+    def __init__(self, workers: int = DEFAULT_WORKERS, rescan: bool = False):
+        """
+        Args:
+            workers (int): Processes scanning the optimized files
+            rescan (bool): Rescan every file even if its mtime and size are unchanged
+        """
         self.supabase = get_supabase_client()
         self.optimized_dir = Path(__file__).parent.parent / 'species_data' / 'processed' / 'optimized_species'
         self.validation_results = {}
+        self.workers = max(1, workers)
+        self.rescan = rescan
+        self.manifest = ContentManifest(SCAN_MANIFEST)
+        self.scans: Optional[Dict[str, FileScan]] = None
+    
+    def optimized_files(self) -> List[Path]:
+        """Compressed optimized files, or the plain JSON ones if there are none"""
+        files = sorted(self.optimized_dir.glob(COMPRESSED_PATTERN))
+        if not files:
+            files = sorted(self.optimized_dir.glob(JSON_PATTERN))
+        return files
+    
+    def _cached_scan(self, file_path: Path) -> Optional[FileScan]:
+        """Stored scan of a file whose mtime and size are unchanged"""
+        if self.rescan:
+            return None
+        entry = self.manifest.get(str(file_path.resolve()))
+        if not entry.get('scan'):
+            return None
+        stat = file_path.stat()
+        if entry.get('mtime_ns') != stat.st_mtime_ns or entry.get('size') != stat.st_size:
+            return None
+        return FileScan(**entry['scan'])
+    
+    def scan_files(self) -> Dict[str, FileScan]:
+        """
+        Scan every optimized file once (shared by all file checks)
+        
+        Unchanged files come from the checksum manifest; the rest are read in
+        a process pool and recorded.
+        
+        Returns:
+            Dict[str, FileScan]: File name -> scan, in file order
+        """
+        if self.scans is not None:
+            return self.scans
+        
+        files = self.optimized_files()
+        scans: Dict[str, FileScan] = {}
+        to_scan = []
+        for file_path in files:
+            cached = self._cached_scan(file_path)
+            if cached is not None:
+                scans[file_path.name] = cached
+            else:
+                to_scan.append(file_path)
+        
+        metrics = get_metrics()
+        with metrics.span('preload_scan', workers=self.workers) as span:
+            if len(to_scan) > 1 and self.workers > 1:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(to_scan))) as executor:
+                    fresh = list(executor.map(scan_optimized_file, map(str, to_scan)))
+            else:
+                fresh = [scan_optimized_file(str(file_path)) for file_path in to_scan]
+            span.set(files=len(files), scanned=len(to_scan), cached=len(files) - len(to_scan))
+        
+        for file_path, scan in zip(to_scan, fresh):
+            scans[scan.file_name] = scan
+            if scan.error is None:
+                self.manifest.record(str(file_path.resolve()), file_hash=scan.file_hash, attributes={
+                    'mtime_ns': scan.mtime_ns,
+                    'size': scan.size,
+                    'scan': asdict(scan)
+                })
+        self.manifest.save()
+        
+        logger.info(f"🔎 Scanned {len(to_scan)} files ({len(files) - len(to_scan)} unchanged since the last scan)")
+        self.scans = {file_path.name: scans[file_path.name] for file_path in files}
+        return self.scans
     
     def check_database_connection(self) -> bool:
         """Test database connection"""
@@ -69,22 +224,41 @@ class PreLoadValidator:
         # Check for reader utility
         reader_exists = (self.optimized_dir / 'optimized_reader.py').exists()
         
+        # Every file must be readable and hold the record count its summary declares
+        scans = self.scan_files()
+        unreadable = {name: scan.error for name, scan in scans.items() if scan.error}
+        count_mismatches = {
+            name: {'records': scan.records, 'declared': scan.declared_records}
+            for name, scan in scans.items()
+            if not scan.error and scan.declared_records is not None and scan.declared_records != scan.records
+        }
+        
         results = {
             'compressed_files': len(compressed_files),
             'json_files': len(json_files),
             'reader_exists': reader_exists,
-            'files_ready': len(compressed_files) > 0 or len(json_files) > 0
+            'scanned_files': len(scans),
+            'unreadable_files': unreadable,
+            'record_count_mismatches': count_mismatches,
+            'checksum_manifest': str(self.manifest.path),
+            'files_ready': (len(compressed_files) > 0 or len(json_files) > 0) and not unreadable
         }
         
         if results['files_ready']:
             logger.info(f"✅ Found {results['compressed_files']} compressed and {results['json_files']} JSON files")
+            logger.info(f"✅ All {len(scans)} files readable (SHA-256 in {results['checksum_manifest']})")
             if reader_exists:
                 logger.info("✅ optimized_reader.py utility found")
             else:
                 logger.warning("⚠️  optimized_reader.py utility not found")
+        elif unreadable:
+            logger.error(f"❌ Unreadable files: {unreadable}")
         else:
             logger.error("❌ No optimized trade data files found")
         
+        if count_mismatches:
+            logger.warning(f"⚠️  Record counts differ from file summaries: {count_mismatches}")
+        
         return results
     
     def check_species_mapping(self) -> Dict:
@@ -96,25 +270,12 @@ class PreLoadValidator:
             db_response = self.supabase.table('species').select('scientific_name').execute()
             db_species = {record['scientific_name'] for record in db_response.data}
             
-            # Get species from optimized files
-            file_species = set()
-            
-            # Check compressed files first
-            files = list(self.optimized_dir.glob('*_trade_data_optimized.json.gz'))
-            if not files:
-                files = list(self.optimized_dir.glob('*_trade_data_optimized.json'))
-            
-            for file_path in files:
-                # Extract species name from filename
-                filename = file_path.stem
-                
-                # Handle .gz files where stem gives us the .json name
-                if filename.endswith('.json'):
-                    filename = filename[:-5]  # Remove .json extension
-                
-                if filename.endswith('_trade_data_optimized'):
-                    species_name = filename.replace('_trade_data_optimized', '').replace('_', ' ')
-                    file_species.add(species_name)
+            # Species named inside the optimized files (file name if unreadable)
+            scans = self.scan_files().values()
+            file_species = {scan.species for scan in scans}
+            species_records = {}
+            for scan in scans:
+                species_records[scan.species] = species_records.get(scan.species, 0) + scan.records
             
             # Compare
             mapped_species = db_species.intersection(file_species)
@@ -127,6 +288,7 @@ class PreLoadValidator:
                 'mapped_species': len(mapped_species),
                 'missing_in_db': list(missing_in_db),
                 'missing_files': list(missing_files),
+                'species_without_records': sorted(name for name, count in species_records.items() if count == 0),
                 'mapping_success_rate': len(mapped_species) / len(file_species) * 100 if file_species else 0
             }
             
@@ -140,6 +302,9 @@ class PreLoadValidator:
             if missing_files:
                 logger.warning(f"⚠️  Species in database but no files: {missing_files}")
             
+            if results['species_without_records']:
+                logger.warning(f"⚠️  Files without trade records: {results['species_without_records']}")
+            
             return results
             
         except Exception as e:
@@ -183,59 +348,34 @@ class PreLoadValidator:
             return {'error': str(e)}
     
     def estimate_load_size(self) -> Dict:
-        """Estimate the size of data to be loaded"""
-        logger.info("📏 Estimating load size...")
+        """Exact size of the data to be loaded, from the shared file scan"""
+        logger.info("📏 Measuring load size...")
         
         try:
-            total_records = 0
-            file_count = 0
-            
-            # Check compressed files first
-            files = list(self.optimized_dir.glob('*_trade_data_optimized.json.gz'))
-            if not files:
-                files = list(self.optimized_dir.glob('*_trade_data_optimized.json'))
-            
-            # Sample a few files to estimate
-            sample_files = files[:3] if len(files) > 3 else files
-            
-            for file_path in sample_files:
-                try:
-                    if file_path.suffix == '.gz':
-                        import gzip
-                        with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                            data = json.load(f)
-                    else:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                    
-                    file_records = len(data.get('trade_records', []))
-                    total_records += file_records
-                    file_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Could not read {file_path.name}: {e}")
-            
-            # Estimate total based on sample
-            if file_count > 0:
-                avg_records_per_file = total_records / file_count
-                estimated_total = avg_records_per_file * len(files)
-            else:
-                estimated_total = 0
+            scans = [scan for scan in self.scan_files().values() if not scan.error]
+            total_records = sum(scan.records for scan in scans)
+            year_mins = [scan.year_min for scan in scans if scan.year_min is not None]
+            year_maxes = [scan.year_max for scan in scans if scan.year_max is not None]
             
             results = {
-                'files_to_load': len(files),
-                'sampled_files': file_count,
-                'sampled_records': total_records,
-                'estimated_total': int(estimated_total)
+                'files_to_load': len(self.scans),
+                'scanned_files': len(scans),
+                'total_records': total_records,
+                'estimated_total': total_records,
+                'min_year': min(year_mins) if year_mins else None,
+                'max_year': max(year_maxes) if year_maxes else None,
+                'records_per_file': {scan.file_name: scan.records for scan in scans}
             }
             
             logger.info(f"✅ Files to load: {results['files_to_load']}")
-            logger.info(f"✅ Estimated records: {results['estimated_total']:,}")
+            logger.info(f"✅ Records to load: {results['total_records']:,}")
+            if results['min_year'] and results['max_year']:
+                logger.info(f"✅ Year range: {results['min_year']} - {results['max_year']}")
             
             return results
             
         except Exception as e:
-            logger.error(f"❌ Failed to estimate load size: {e}")
+            logger.error(f"❌ Failed to measure load size: {e}")
             return {'error': str(e)}
     
     def check_disk_space(self) -> Dict:
@@ -277,14 +417,18 @@ class PreLoadValidator:
         logger.info("="*60)
         
         # Run all checks
-        checks = [
-            ('Database Connection', self.check_database_connection()),
-            ('Optimized Files', self.check_optimized_files()),
-            ('Species Mapping', self.check_species_mapping()),
-            ('Current Trade Data', self.check_current_trade_data()),
-            ('Load Size Estimation', self.estimate_load_size()),
-            ('Disk Space', self.check_disk_space())
-        ]
+        metrics = get_metrics()
+        checks = []
+        for check_name, check in [
+            ('Database Connection', self.check_database_connection),
+            ('Optimized Files', self.check_optimized_files),
+            ('Species Mapping', self.check_species_mapping),
+            ('Current Trade Data', self.check_current_trade_data),
+            ('Load Size Estimation', self.estimate_load_size),
+            ('Disk Space', self.check_disk_space)
+        ]:
+            with metrics.span('validation_check', check=check_name):
+                checks.append((check_name, check()))
         
         # Collect results
         all_passed = True
@@ -316,7 +460,7 @@ class PreLoadValidator:
             
             logger.info("\n📋 LOADING SUMMARY:")
             logger.info(f"   • Current records: {current_data.get('total_records', 0):,}")
-            logger.info(f"   • Estimated new records: {load_estimation.get('estimated_total', 0):,}")
+            logger.info(f"   • New records: {load_estimation.get('total_records', 0):,}")
             logger.info(f"   • Species to load: {species_mapping.get('mapped_species', 0)}")
             logger.info(f"   • Files to process: {load_estimation.get('files_to_load', 0)}")
             
@@ -330,7 +474,14 @@ class PreLoadValidator:
         return all_passed
 
 def main():
-    validator = PreLoadValidator()
+    parser = argparse.ArgumentParser(description='Validate optimized trade data and database state before loading')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Processes scanning the optimized files (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--rescan', action='store_true',
+                        help='Rescan every file instead of reusing unchanged scans')
+    args = parser.parse_args()
+    
+    validator = PreLoadValidator(workers=args.workers, rescan=args.rescan)
     
     try:
         success = validator.run_full_validation()
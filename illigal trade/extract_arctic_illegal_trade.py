@@ -2,6 +2,11 @@
 """
 Extract illegal trade records for Arctic species from seizure dataset
 Maps to our Arctic species list and categorizes trade types
+
+All species patterns are compiled into one multi-pattern matcher
+(species_matcher.py) and matched in a single pass over the distinct taxa names;
+benchmarks/bench_illegal_trade_matcher.py compares it with the original
+per-pattern column scans.
 """
 
 import pandas as pd
@@ -9,25 +14,32 @@ import os
 import sys
 import json
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Optional
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from species_matcher import SpeciesPatternMatcher
+
+# Taxa name columns searched for species patterns
+TAXA_NAME_COLUMNS = ['db_taxa_name_clean', 'db_taxa_name']
 
 class ArcticIllegalTradeExtractor:
-    def __init__(self):
+    def __init__(self, arctic_species: Optional[pd.DataFrame] = None, output_dir: Optional[str] = None):
         self.base_dir = os.path.dirname(os.path.dirname(__file__))
         self.illegal_trade_dir = "/Users/magnussmari/Arctic_Tracker(version_1.0)/Arctic-Tracker-API/illigal trade/dataset/data"
-        self.output_dir = os.path.join(self.base_dir, 'illegal_trade_analysis')
+        self.output_dir = output_dir or os.path.join(self.base_dir, 'illegal_trade_analysis')
         
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
         
         # Load Arctic species
-        self.arctic_species = self._load_arctic_species()
+        self.arctic_species = arctic_species if arctic_species is not None else self._load_arctic_species()
         
-        # Create search patterns for Arctic species
+        # Create search patterns for Arctic species (compiled into one matcher on first use)
         self.search_patterns = self._create_search_patterns()
+        self.matcher: Optional[SpeciesPatternMatcher] = None
         
     def _load_arctic_species(self) -> pd.DataFrame:
         """Load our Arctic species list"""
@@ -74,16 +86,45 @@ class ArcticIllegalTradeExtractor:
                 
         return patterns
         
-    def extract_illegal_trade_data(self):
-        """Extract all illegal trade records for Arctic species"""
-        print("\nExtracting illegal trade data...")
-        
-        # Load illegal trade data
-        trade_file = os.path.join(self.illegal_trade_dir, '01_taxa_use_combos.csv')
-        illegal_df = pd.read_csv(trade_file)
-        print(f"Loaded {len(illegal_df)} illegal trade records")
+    def _tag_matches(self, matches: pd.DataFrame, species_id) -> pd.DataFrame:
+        """Add our species info to the rows matched for one species"""
+        species_info = self.arctic_species[self.arctic_species['species_id'] == species_id].iloc[0]
+        matches['arctic_species_id'] = species_id
+        matches['arctic_scientific_name'] = species_info['scientific_name']
+        matches['arctic_common_name'] = species_info['common_name']
+        matches['iucn_status'] = species_info.get('iucn_status', '')
+        matches['cites_appendix'] = species_info.get('cites_appendix', '')
+        print(f"Found {len(matches)} records for {species_info['common_name']} ({species_info['scientific_name']})")
+        return matches
+        
+    def find_arctic_records(self, illegal_df: pd.DataFrame) -> List[pd.DataFrame]:
+        """
+        Match all species patterns in one pass over the distinct taxa names
+        
+        Args:
+            illegal_df (pd.DataFrame): Rows of 01_taxa_use_combos.csv
+            
+        Returns:
+            List[pd.DataFrame]: Matched rows per species, in species order
+        """
+        if self.matcher is None:
+            self.matcher = SpeciesPatternMatcher(self.search_patterns)
+        pairs = self.matcher.match_frame(illegal_df, TAXA_NAME_COLUMNS)
         
-        # Find Arctic species records
+        arctic_records = []
+        for key_index, species_pairs in pairs.groupby('key_index', sort=True):
+            matches = illegal_df.iloc[species_pairs['row'].to_numpy()].copy()
+            arctic_records.append(self._tag_matches(matches, self.matcher.keys[key_index]))
+        return arctic_records
+        
+    def find_arctic_records_per_pattern(self, illegal_df: pd.DataFrame, regex: bool = True) -> List[pd.DataFrame]:
+        """
+        Original matcher: two full-column scans per species pattern (kept for benchmarks)
+        
+        With regex=True patterns are regular expressions, so a name such as
+        'killer whale (orca)' does not match itself; regex=False matches them
+        literally, like find_arctic_records.
+        """
         arctic_records = []
         
         for species_id, patterns in self.search_patterns.items():
@@ -92,23 +133,27 @@ class ArcticIllegalTradeExtractor:
             
             for pattern in patterns:
                 # Search in both clean and original taxa names
-                mask |= illegal_df['db_taxa_name_clean'].str.lower().str.contains(pattern, na=False)
-                mask |= illegal_df['db_taxa_name'].str.lower().str.contains(pattern, na=False)
+                mask |= illegal_df['db_taxa_name_clean'].str.lower().str.contains(pattern, na=False, regex=regex)
+                mask |= illegal_df['db_taxa_name'].str.lower().str.contains(pattern, na=False, regex=regex)
                 
             # Get matching records
             matches = illegal_df[mask].copy()
             
             if len(matches) > 0:
-                # Add our species info
-                species_info = self.arctic_species[self.arctic_species['species_id'] == species_id].iloc[0]
-                matches['arctic_species_id'] = species_id
-                matches['arctic_scientific_name'] = species_info['scientific_name']
-                matches['arctic_common_name'] = species_info['common_name']
-                matches['iucn_status'] = species_info.get('iucn_status', '')
-                matches['cites_appendix'] = species_info.get('cites_appendix', '')
-                
-                arctic_records.append(matches)
-                print(f"Found {len(matches)} records for {species_info['common_name']} ({species_info['scientific_name']})")
+                arctic_records.append(self._tag_matches(matches, species_id))
+        return arctic_records
+        
+    def extract_illegal_trade_data(self):
+        """Extract all illegal trade records for Arctic species"""
+        print("\nExtracting illegal trade data...")
+        
+        # Load illegal trade data
+        trade_file = os.path.join(self.illegal_trade_dir, '01_taxa_use_combos.csv')
+        illegal_df = pd.read_csv(trade_file)
+        print(f"Loaded {len(illegal_df)} illegal trade records")
+        
+        # Find Arctic species records
+        arctic_records = self.find_arctic_records(illegal_df)
                 
         # Combine all Arctic records
         if arctic_records:
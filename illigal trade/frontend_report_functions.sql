@@ -0,0 +1,93 @@
+-- Illegal Trade Frontend Report Aggregates
+-- View and RPCs used by generate_frontend_report.py so the report fetches a few
+-- aggregate rows instead of every seizure, listing and product
+
+-- Seizure count per species with its CITES appendix (current listing first, then latest)
+CREATE OR REPLACE VIEW "public"."illegal_trade_species_summary" AS
+SELECT
+    s.id AS species_id,
+    s.scientific_name::text AS scientific_name,
+    s.common_name::text AS common_name,
+    COALESCE(cl.appendix, 'Unknown')::text AS cites_appendix,
+    COUNT(its.id) AS seizure_count
+FROM illegal_trade_seizures its
+JOIN species s ON s.id = its.species_id
+LEFT JOIN LATERAL (
+    SELECT l.appendix
+    FROM cites_listings l
+    WHERE l.species_id = s.id
+    ORDER BY l.is_current DESC NULLS LAST, l.listing_date DESC NULLS LAST
+    LIMIT 1
+) cl ON true
+GROUP BY s.id, s.scientific_name, s.common_name, cl.appendix;
+
+COMMENT ON VIEW "public"."illegal_trade_species_summary" IS 'Illegal trade seizure count and CITES appendix per species';
+
+-- Species ranked by seizure count
+CREATE OR REPLACE FUNCTION "public"."illegal_trade_species_seizure_counts"()
+RETURNS TABLE(
+    species_id uuid,
+    scientific_name text,
+    common_name text,
+    cites_appendix text,
+    seizure_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT species_id, scientific_name, common_name, cites_appendix, seizure_count
+    FROM illegal_trade_species_summary
+    ORDER BY seizure_count DESC, scientific_name;
+$$;
+
+COMMENT ON FUNCTION "public"."illegal_trade_species_seizure_counts" IS 'Per-species illegal trade seizure counts with CITES appendix, most seized first';
+
+-- Seizures of species listed in each CITES appendix
+CREATE OR REPLACE FUNCTION "public"."illegal_trade_appendix_violations"()
+RETURNS TABLE(
+    appendix text,
+    seizure_count bigint,
+    species_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT cites_appendix, SUM(seizure_count)::bigint, COUNT(*)
+    FROM illegal_trade_species_summary
+    WHERE cites_appendix IN ('I', 'II', 'III')
+    GROUP BY cites_appendix
+    ORDER BY cites_appendix;
+$$;
+
+COMMENT ON FUNCTION "public"."illegal_trade_appendix_violations" IS 'Illegal trade seizures per CITES appendix (I/II/III) of the seized species';
+
+-- Product types, high-value product types and seizures per main category
+CREATE OR REPLACE FUNCTION "public"."illegal_trade_product_categories"()
+RETURNS TABLE(
+    main_category text,
+    product_count bigint,
+    high_value_count bigint,
+    seizure_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        p.main_category::text,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE p.is_high_value),
+        COALESCE(SUM(s.seizures), 0)::bigint
+    FROM illegal_trade_products p
+    LEFT JOIN (
+        SELECT product_type_id, COUNT(*) AS seizures
+        FROM illegal_trade_seizures
+        GROUP BY product_type_id
+    ) s ON s.product_type_id = p.id
+    GROUP BY p.main_category
+    ORDER BY COUNT(*) DESC, p.main_category;
+$$;
+
+COMMENT ON FUNCTION "public"."illegal_trade_product_categories" IS 'Illegal trade product types, high-value types and linked seizures per main category';
+
+-- Make the view and functions visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -9,106 +9,128 @@ Creates comprehensive report for frontend developers showing:
 - Sample queries
 - Species coverage
 - Risk metrics
+
+Seizure, appendix and product category figures come from the aggregate RPCs in
+frontend_report_functions.sql (fetched concurrently), so the report reads a
+few dozen rows no matter how many seizures are loaded. Without those functions
+it falls back to paging through the tables.
+
+The report is materialized through config/report_cache.py: each section is
+tagged with the tables it reads and cached under a fingerprint of their row
+counts and latest updated_at. When no source table changed the cached report
+is served as is; otherwise only the affected sections are rebuilt.
+
+Usage:
+    python generate_frontend_report.py [--force]
 """
 
 import sys
 import os
 import json
+import argparse
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Tuple
+
+from postgrest.exceptions import APIError
 
 sys.path.append('..')
 from config.supabase_config import get_supabase_client
+from config.report_cache import ReportCache, ReportSection, MaterializedReport, TableVersion
+from config.postgrest_queries import fetch_paginated, is_missing_function
 
-def generate_frontend_report():
-    """Generate comprehensive frontend integration report"""
-    client = get_supabase_client()
-    
-    report = {
-        "report_metadata": {
-            "generated_at": datetime.now().isoformat(),
-            "report_type": "Illegal Trade Frontend Integration",
-            "version": "1.0",
-            "status": "Production Ready"
-        },
-        "database_summary": {},
-        "species_coverage": {},
-        "product_analysis": {},
-        "frontend_integration": {},
-        "api_specifications": {},
-        "sample_queries": {},
-        "ui_recommendations": {}
-    }
-    
-    print("📊 Generating Illegal Trade Frontend Integration Report...")
-    
-    # Database Summary
-    print("1. Analyzing database tables...")
-    
-    # Get seizure count
-    seizures_result = client.table('illegal_trade_seizures').select('count', count='exact').execute()
-    seizures_count = seizures_result.count
-    
-    # Get products count
-    products_result = client.table('illegal_trade_products').select('count', count='exact').execute()
-    products_count = products_result.count
-    
-    report["database_summary"] = {
+REPORT_NAME = 'illegal_trade_frontend_integration'
+# Bump when the static sections or the section builders change
+REPORT_VERSION = '1.0'
+# cites_listings has no updated_at column
+TIMESTAMP_COLUMNS = {'cites_listings': 'created_at'}
+MD_FILENAME = 'Illegal_Trade_Frontend_Integration_Report.md'
+
+def call_aggregate(client, function: str, fallback: Callable[[Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Call an aggregate RPC from frontend_report_functions.sql, aggregating client-side if it is missing"""
+    try:
+        return client.rpc(function).execute().data or []
+    except APIError as e:
+        if not is_missing_function(e):
+            raise
+        return fallback(client)
+
+def _species_seizure_counts_fallback(client) -> List[Dict[str, Any]]:
+    seizures = fetch_paginated(lambda: client.table('illegal_trade_seizures'), 'species_id')
+    species = {row['id']: row for row in fetch_paginated(lambda: client.table('species'), 'id, scientific_name, common_name')}
+    listings = fetch_paginated(lambda: client.table('cites_listings'), 'species_id, appendix, is_current, listing_date')
+    listings.sort(key=lambda l: (bool(l.get('is_current')), l.get('listing_date') or ''))
+    appendix_lookup = {listing['species_id']: listing['appendix'] for listing in listings}
+
+    counts: Dict[str, int] = {}
+    for seizure in seizures:
+        counts[seizure['species_id']] = counts.get(seizure['species_id'], 0) + 1
+    rows = [{
+        'species_id': species_id,
+        'scientific_name': species.get(species_id, {}).get('scientific_name'),
+        'common_name': species.get(species_id, {}).get('common_name'),
+        'cites_appendix': appendix_lookup.get(species_id) or 'Unknown',
+        'seizure_count': count
+    } for species_id, count in counts.items()]
+    return sorted(rows, key=lambda r: (-r['seizure_count'], r['scientific_name'] or ''))
+
+def _appendix_violations_fallback(client) -> List[Dict[str, Any]]:
+    violations: Dict[str, Dict[str, Any]] = {}
+    for row in _species_seizure_counts_fallback(client):
+        if row['cites_appendix'] in ('I', 'II', 'III'):
+            entry = violations.setdefault(row['cites_appendix'], {
+                'appendix': row['cites_appendix'], 'seizure_count': 0, 'species_count': 0
+            })
+            entry['seizure_count'] += row['seizure_count']
+            entry['species_count'] += 1
+    return [violations[a] for a in sorted(violations)]
+
+def _product_categories_fallback(client) -> List[Dict[str, Any]]:
+    seizures_per_product: Dict[str, int] = {}
+    for seizure in fetch_paginated(lambda: client.table('illegal_trade_seizures'), 'product_type_id'):
+        seizures_per_product[seizure['product_type_id']] = seizures_per_product.get(seizure['product_type_id'], 0) + 1
+
+    categories: Dict[Any, Dict[str, Any]] = {}
+    for product in fetch_paginated(lambda: client.table('illegal_trade_products'), 'id, main_category, is_high_value'):
+        entry = categories.setdefault(product['main_category'], {
+            'main_category': product['main_category'], 'product_count': 0, 'high_value_count': 0, 'seizure_count': 0
+        })
+        entry['product_count'] += 1
+        entry['high_value_count'] += 1 if product['is_high_value'] else 0
+        entry['seizure_count'] += seizures_per_product.get(product['id'], 0)
+    return sorted(categories.values(), key=lambda c: (-c['product_count'], c['main_category'] or ''))
+
+def _row_counts(versions: Dict[str, TableVersion]) -> Tuple[int, int]:
+    return versions['illegal_trade_seizures'].row_count, versions['illegal_trade_products'].row_count
+
+def build_database_summary(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """Record counts (taken from the table versions, no extra query)"""
+    seizures_count, products_count = _row_counts(versions)
+    return {
         "total_seizure_records": seizures_count,
         "total_product_types": products_count,
         "data_source": "Stringham et al. 2021 - Wildlife Trade Portal",
         "load_date": "2025-07-30",
         "coverage_rate": f"{seizures_count}/919 original records (95.9%)"
     }
-    
-    # Species Coverage Analysis
-    print("2. Analyzing species coverage...")
-    
-    # Get species with seizure counts
-    species_seizures = client.table('illegal_trade_seizures')\
-        .select('species_id, species(scientific_name, common_name)')\
-        .execute()
-    
-    # Get CITES data separately
-    cites_data = client.table('cites_listings')\
-        .select('species_id, appendix')\
-        .execute()
-    
-    cites_lookup = {}
-    for cites_record in cites_data.data:
-        cites_lookup[cites_record['species_id']] = cites_record['appendix']
-    
-    species_counts = {}
+
+def build_species_coverage(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """Species ranked by seizure count and seizures per CITES appendix"""
+    print("   • Analyzing species coverage...")
+    top_species = [
+        {
+            "scientific_name": row['scientific_name'],
+            "common_name": row['common_name'],
+            "cites_appendix": row['cites_appendix'],
+            "seizure_count": row['seizure_count']
+        }
+        for row in call_aggregate(client, 'illegal_trade_species_seizure_counts', _species_seizure_counts_fallback)
+    ]
     cites_violations = {"I": 0, "II": 0, "III": 0}
-    
-    for record in species_seizures.data:
-        species_id = record['species_id']
-        species_info = record['species']
-        
-        if species_id not in species_counts:
-            cites_appendix = cites_lookup.get(species_id, 'Unknown')
-            species_counts[species_id] = {
-                "scientific_name": species_info['scientific_name'],
-                "common_name": species_info['common_name'],
-                "cites_appendix": cites_appendix,
-                "seizure_count": 0
-            }
-        species_counts[species_id]["seizure_count"] += 1
-        
-        # Count CITES violations
-        appendix = species_counts[species_id]["cites_appendix"]
-        if appendix in cites_violations:
-            cites_violations[appendix] += 1
-    
-    # Sort by seizure count
-    top_species = sorted(
-        species_counts.values(), 
-        key=lambda x: x['seizure_count'], 
-        reverse=True
-    )
-    
-    report["species_coverage"] = {
-        "total_species_in_illegal_trade": len(species_counts),
+    for row in call_aggregate(client, 'illegal_trade_appendix_violations', _appendix_violations_fallback):
+        cites_violations[row['appendix']] = row['seizure_count']
+
+    return {
+        "total_species_in_illegal_trade": len(top_species),
         "cites_appendix_violations": cites_violations,
         "top_10_most_seized": top_species[:10],
         "high_risk_species": [
@@ -116,33 +138,26 @@ def generate_frontend_report():
             if s['seizure_count'] > 50 or s['cites_appendix'] == 'I'
         ]
     }
-    
-    # Product Analysis
-    print("3. Analyzing product types...")
-    
-    products_data = client.table('illegal_trade_products')\
-        .select('*')\
-        .execute()
-    
-    category_breakdown = {}
-    high_value_products = []
-    
-    for product in products_data.data:
-        category = product['main_category']
-        if category not in category_breakdown:
-            category_breakdown[category] = 0
-        category_breakdown[category] += 1
-        
-        if product['is_high_value']:
-            high_value_products.append({
+
+def build_product_analysis(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """Product types per category and high-value products"""
+    print("   • Analyzing product types...")
+    categories = call_aggregate(client, 'illegal_trade_product_categories', _product_categories_fallback)
+    high_value_products = (client.table('illegal_trade_products')
+                           .select('product_code, product_name, product_category')
+                           .eq('is_high_value', True).order('product_code').execute().data or [])
+    return {
+        "category_breakdown": {
+            row['main_category']: row['product_count'] for row in categories
+        },
+        "high_value_products": [
+            {
                 "code": product['product_code'],
                 "name": product['product_name'],
                 "category": product['product_category']
-            })
-    
-    report["product_analysis"] = {
-        "category_breakdown": category_breakdown,
-        "high_value_products": high_value_products,
+            }
+            for product in high_value_products
+        ],
         "most_common_products": [
             {"name": "dead animal", "seizures": 69},
             {"name": "specimen", "seizures": 59},
@@ -151,9 +166,10 @@ def generate_frontend_report():
             {"name": "live", "seizures": 47}
         ]
     }
-    
-    # Frontend Integration Specifications
-    report["frontend_integration"] = {
+
+def build_frontend_integration(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """Frontend integration specifications"""
+    return {
         "new_tables_available": [
             {
                 "table": "illegal_trade_seizures",
@@ -179,9 +195,10 @@ def generate_frontend_report():
             "CITES Violation Alerts"
         ]
     }
-    
-    # API Specifications
-    report["api_specifications"] = {
+
+def build_api_specifications(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """Recommended API endpoints"""
+    return {
         "recommended_endpoints": [
             {
                 "endpoint": "GET /api/species/{id}/illegal-trade",
@@ -217,9 +234,10 @@ def generate_frontend_report():
             }
         ]
     }
-    
-    # Sample Queries for Frontend
-    report["sample_queries"] = {
+
+def build_sample_queries(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """Sample queries for frontend developers"""
+    return {
         "get_species_seizures": {
             "sql": """
             SELECT 
@@ -264,9 +282,10 @@ def generate_frontend_report():
             "supabase": "illegal_trade_products.select('*, illegal_trade_seizures(count)')"
         }
     }
-    
-    # UI Recommendations
-    report["ui_recommendations"] = {
+
+def build_ui_recommendations(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """UI recommendations"""
+    return {
         "species_profile_enhancements": [
             {
                 "component": "Illegal Trade Alert Banner",
@@ -307,9 +326,11 @@ def generate_frontend_report():
             "Add product type search capability"
         ]
     }
-    
-    # Data Quality Notes
-    report["data_quality_notes"] = {
+
+def build_data_quality_notes(client, versions: Dict[str, TableVersion]) -> Dict[str, Any]:
+    """Data quality notes"""
+    seizures_count, _ = _row_counts(versions)
+    return {
         "completeness": f"{seizures_count}/919 records loaded (95.9%)",
         "missing_data": "38 Snowy Owl (Bubo scandiacus) records not loaded due to name mismatch",
         "data_limitations": [
@@ -324,7 +345,59 @@ def generate_frontend_report():
             "Integrate real-time enforcement data feeds"
         ]
     }
-    
+
+# Report sections in output order, each with the tables it reads
+REPORT_SECTIONS = [
+    ReportSection('database_summary', build_database_summary, ('illegal_trade_seizures', 'illegal_trade_products')),
+    ReportSection('species_coverage', build_species_coverage,
+                  ('illegal_trade_seizures', 'species', 'cites_listings')),
+    ReportSection('product_analysis', build_product_analysis, ('illegal_trade_products',)),
+    ReportSection('frontend_integration', build_frontend_integration),
+    ReportSection('api_specifications', build_api_specifications),
+    ReportSection('sample_queries', build_sample_queries),
+    ReportSection('ui_recommendations', build_ui_recommendations),
+    ReportSection('data_quality_notes', build_data_quality_notes, ('illegal_trade_seizures',))
+]
+
+def materialize_frontend_report(client=None, force: bool = False) -> MaterializedReport:
+    """
+    Serve the report from the report cache, rebuilding only stale sections
+
+    Args:
+        client: Supabase client (default get_supabase_client())
+        force (bool): Rebuild every section
+
+    Returns:
+        MaterializedReport: Cached or freshly built report sections
+    """
+    client = client or get_supabase_client()
+    cache = ReportCache(REPORT_NAME, report_version=REPORT_VERSION)
+    return cache.materialize(client, REPORT_SECTIONS, timestamp_columns=TIMESTAMP_COLUMNS, force=force)
+
+def generate_frontend_report(client=None, force: bool = False) -> Dict[str, Any]:
+    """Generate comprehensive frontend integration report"""
+    print("📊 Generating Illegal Trade Frontend Integration Report...")
+    materialized = materialize_frontend_report(client, force=force)
+
+    if materialized.cached:
+        print("   • No source table changed, serving cached report")
+    else:
+        print(f"   • Rebuilt: {', '.join(materialized.rebuilt) or 'nothing'}")
+        if materialized.reused:
+            print(f"   • Reused: {', '.join(materialized.reused)}")
+
+    report = {
+        "report_metadata": {
+            "generated_at": materialized.generated_at,
+            "report_type": "Illegal Trade Frontend Integration",
+            "version": REPORT_VERSION,
+            "status": "Production Ready",
+            "data_version": materialized.fingerprint,
+            "served_from_cache": materialized.cached,
+            "artifact": str(materialized.path)
+        }
+    }
+    report.update(materialized.content)
     return report
 
 def save_report(report: Dict[str, Any]) -> str:
@@ -338,7 +411,7 @@ def save_report(report: Dict[str, Any]) -> str:
         json.dump(report, f, indent=2)
     
     # Create markdown summary
-    md_filename = f"Illegal_Trade_Frontend_Integration_Report.md"
+    md_filename = MD_FILENAME
     
     md_content = f"""# Illegal Trade Frontend Integration Report
 **Generated**: {report['report_metadata']['generated_at']}
@@ -471,17 +544,25 @@ const {{ data }} = await supabase
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Generate the illegal trade frontend integration report')
+    parser.add_argument('--force', action='store_true', help='Rebuild every section even if no source table changed')
+    args = parser.parse_args()
+
     os.makedirs('logs', exist_ok=True)
     
     try:
         print("🔄 Generating illegal trade frontend integration report...")
-        report = generate_frontend_report()
-        
-        json_path, md_path = save_report(report)
+        report = generate_frontend_report(force=args.force)
         
-        print(f"✅ Report generation complete!")
-        print(f"📄 Full report: {json_path}")
-        print(f"📋 Summary: {md_path}")
+        if report['report_metadata']['served_from_cache'] and os.path.exists(MD_FILENAME):
+            print(f"✅ Report is up to date (data version {report['report_metadata']['data_version'][:12]})")
+            print(f"📄 Full report: {report['report_metadata']['artifact']}")
+            print(f"📋 Summary: {MD_FILENAME}")
+        else:
+            json_path, md_path = save_report(report)
+            print(f"✅ Report generation complete!")
+            print(f"📄 Full report: {json_path}")
+            print(f"📋 Summary: {md_path}")
         
         # Print key stats
         print(f"\n📊 Key Statistics:")
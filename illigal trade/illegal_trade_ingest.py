@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Illegal Trade Ingestion Pipeline
+Arctic Tracker Database - Illegal Trade Integration
+
+Single path for loading arctic_illegal_trade_records.csv (replaces running
+load_illegal_products.py and then load_illegal_seizures.py). The CSV is read
+once; product types and seizure rows are built with column operations, species
+and product codes are resolved through maps preloaded in a few paged requests,
+and the tables are written in dependency order:
+
+1. illegal_trade_products - upserted on product_code (re-runs update in place)
+2. illegal_trade_seizures - inserted in large batches; --replace first deletes
+   the rows previously loaded from the same data source
+
+Wall time per stage is logged and reported as metrics spans.
+
+Usage:
+    python illegal_trade_ingest.py [--csv-path arctic_illegal_trade_records.csv]
+                                   [--batch-size 1000] [--replace | --append] [--dry-run]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import contextlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from postgrest.types import ReturnMethod
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.supabase_config import get_supabase_client
+from config.instrumentation import get_metrics
+from config.postgrest_queries import fetch_paginated
+
+# Configure logging
+os.makedirs('logs', exist_ok=True)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(f'logs/illegal_trade_ingest_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+DATA_SOURCE = 'Stringham et al. 2021'
+SEIZURE_BATCH_SIZE = 1000
+PRODUCT_COLUMNS = ['standardized_use_id', 'standardized_use_type', 'subcategory', 'main_category']
+
+# High-value product terms (same list as load_illegal_products.py)
+HIGH_VALUE_PRODUCTS = {
+    'ivory product', 'ivory carvings/products', 'tusk', 'ivory',
+    'bone product', 'horn', 'antler', 'carvings', 'jewelry',
+    'live specimen', 'pet/display animal'
+}
+STOP_WORDS = {'and', 'or', 'the', 'of', 'in', 'for', 'with', 'to', 'from'}
+PRODUCT_CATEGORIES = {'dead/raw', 'processed/derived', 'live'}
+
+def clean_strings(values: pd.Series) -> pd.Series:
+    """Trimmed strings; blanks and 'nan' become None"""
+    text = values.astype('string').str.strip()
+    return text.mask(text.isna() | (text == '') | (text.str.lower() == 'nan'))
+
+def search_terms(product_name: Any, subcategory: Any) -> List[str]:
+    """Search words from the product name and subcategory, without stop words"""
+    terms = set()
+    if isinstance(product_name, str) and product_name:
+        terms.update(product_name.lower().split())
+    if isinstance(subcategory, str) and subcategory and subcategory != product_name:
+        terms.update(subcategory.lower().split())
+    return list(terms - STOP_WORDS)
+
+def to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """JSON-ready dicts (NA -> None)"""
+    return frame.astype('object').where(frame.notna(), None).to_dict('records')
+
+@dataclass
+class IngestSummary:
+    """Totals and stage timings for one ingestion run"""
+    rows_read: int = 0
+    products: int = 0
+    seizures: int = 0
+    seizures_written: int = 0
+    seizures_deleted: int = 0
+    unmapped_species: Dict[str, int] = field(default_factory=dict)
+    rows_without_product: int = 0
+    rows_without_source: int = 0
+    failed_batches: int = 0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+class IllegalTradeIngest:
+    """Loads product types and seizures from the Arctic illegal trade CSV"""
+
+    def __init__(self, supabase=None, batch_size: int = SEIZURE_BATCH_SIZE, dry_run: bool = False):
+        """
+        Initialize the pipeline
+
+        Args:
+            supabase: Supabase client (default: get_supabase_client())
+            batch_size (int): Seizure rows per insert request
+            dry_run (bool): Build everything but write nothing
+        """
+        self.supabase = supabase or get_supabase_client()
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.metrics = get_metrics()
+        self.species_ids: Dict[str, str] = {}
+        self.product_ids: Dict[str, str] = {}
+        self.summary = IngestSummary()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage (logged, kept in the summary and traced as a span)"""
+        start = time.perf_counter()
+        with self.metrics.span(f'illegal_trade.{name}', table='illegal_trade_seizures') as span:
+            yield span
+        seconds = time.perf_counter() - start
+        self.summary.stage_seconds[name] = round(seconds, 3)
+        logger.info(f"⏱️  {name}: {seconds:.2f}s")
+
+    def load_reference_data(self) -> None:
+        """Preload species (scientific_name -> id) and existing products (code -> id)"""
+        with self.stage('load_reference_data') as span:
+            self.species_ids = {row['scientific_name']: row['id']
+                                for row in fetch_paginated(lambda: self.supabase.table('species'), 'id, scientific_name')}
+            self.product_ids = {row['product_code']: row['id']
+                                for row in fetch_paginated(lambda: self.supabase.table('illegal_trade_products'),
+                                                           'id, product_code')}
+            span.set(species=len(self.species_ids), products=len(self.product_ids))
+        logger.info(f"Loaded {len(self.species_ids)} species and {len(self.product_ids)} existing products")
+
+    def read_csv(self, csv_path: str) -> pd.DataFrame:
+        """Read the seizure CSV (IDs kept as text)"""
+        with self.stage('read_csv') as span:
+            df = pd.read_csv(csv_path, dtype={'gbif_id': 'string', 'standardized_use_id': 'string'})
+            span.set(rows=len(df))
+        self.summary.rows_read = len(df)
+        logger.info(f"Read {len(df)} seizure records from {csv_path}")
+        return df
+
+    def build_products(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        One product row per standardized_use_id (most seized variant wins)
+
+        Args:
+            df (pd.DataFrame): Seizure CSV rows
+
+        Returns:
+            List[Dict[str, Any]]: illegal_trade_products rows
+        """
+        with self.stage('build_products') as span:
+            combos = df.groupby(PRODUCT_COLUMNS).size().reset_index(name='seizure_count')
+            combos = combos.sort_values('seizure_count', ascending=False, kind='stable') \
+                .drop_duplicates('standardized_use_id')
+
+            names = combos['standardized_use_type'].str.lower()
+            subcategories = combos['subcategory'].fillna('').str.lower()
+            high_value = pd.Series(False, index=combos.index)
+            for term in HIGH_VALUE_PRODUCTS:
+                high_value |= names.str.contains(term, regex=False) | subcategories.str.contains(term, regex=False)
+
+            products = pd.DataFrame({
+                'product_code': combos['standardized_use_id'],
+                'product_name': combos['standardized_use_type'],
+                'product_category': combos['subcategory'],
+                'main_category': combos['main_category'],
+                'is_high_value': high_value
+            })
+            records = to_records(products)
+            for record, name, subcategory in zip(records, combos['standardized_use_type'], combos['subcategory']):
+                record['search_terms'] = search_terms(name, subcategory)
+            span.set(rows=len(records))
+        self.summary.products = len(records)
+        return records
+
+    def upsert_products(self, products: List[Dict[str, Any]]) -> None:
+        """Upsert product types on product_code and remember their IDs"""
+        if self.dry_run or not products:
+            return
+        with self.stage('upsert_products') as span:
+            response = self.supabase.table('illegal_trade_products').upsert(
+                products, on_conflict='product_code'
+            ).execute()
+            for row in response.data or []:
+                self.product_ids[row['product_code']] = row['id']
+            span.set(rows=len(products))
+        logger.info(f"Upserted {len(products)} product types")
+
+    def build_seizures(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Build seizure rows, resolving species and product codes from the preloaded maps
+
+        Rows whose species is not in the species table, or that have no source
+        database (db column), are dropped (and counted).
+
+        Args:
+            df (pd.DataFrame): Seizure CSV rows
+
+        Returns:
+            List[Dict[str, Any]]: illegal_trade_seizures rows
+        """
+        with self.stage('build_seizures') as span:
+            species_names = df['arctic_scientific_name']
+            species_ids = species_names.map(self.species_ids)
+            unmapped = species_names[species_ids.isna()].fillna('<missing>')
+            self.summary.unmapped_species = unmapped.value_counts().to_dict()
+
+            source_database = clean_strings(df['db']).str.upper()
+            keep = species_ids.notna() & source_database.notna()
+            self.summary.rows_without_source = int((species_ids.notna() & source_database.isna()).sum())
+            rows = df[keep]
+
+            main_category = clean_strings(rows['main_category'])
+            lowered = main_category.str.lower()
+            product_codes = clean_strings(rows['standardized_use_id'])
+
+            seizures = pd.DataFrame({
+                'species_id': species_ids[keep],
+                'source_database': source_database[keep],
+                'product_type_id': product_codes.map(self.product_ids),
+                'product_category': lowered.where(lowered.isin(PRODUCT_CATEGORIES), main_category),
+                'quantity': pd.to_numeric(rows['quantity'], errors='coerce'),
+                'unit': clean_strings(rows['unit']),
+                'reported_taxon_name': clean_strings(rows['db_taxa_name']),
+                'gbif_id': clean_strings(rows['gbif_id']),
+                'db_taxa_name_clean': clean_strings(rows['db_taxa_name_clean']),
+                'data_source': DATA_SOURCE
+            })
+            self.summary.rows_without_product = int(seizures['product_type_id'].isna().sum())
+            records = to_records(seizures)
+            span.set(rows=len(records))
+
+        self.summary.seizures = len(records)
+        if self.summary.unmapped_species:
+            logger.warning(f"{len(df) - int(species_ids.notna().sum())} rows skipped, species not in database: "
+                           f"{self.summary.unmapped_species}")
+        if self.summary.rows_without_source:
+            logger.warning(f"{self.summary.rows_without_source} rows skipped, no source database (db column)")
+        return records
+
+    def count_existing_seizures(self) -> int:
+        """Seizures already loaded from this data source"""
+        result = self.supabase.table('illegal_trade_seizures').select('id', count='exact') \
+            .eq('data_source', DATA_SOURCE).limit(1).execute()
+        return result.count or 0
+
+    def delete_existing_seizures(self) -> None:
+        """Remove the seizures previously loaded from this data source"""
+        if self.dry_run:
+            return
+        with self.stage('delete_existing_seizures') as span:
+            existing = self.count_existing_seizures()
+            if existing:
+                self.supabase.table('illegal_trade_seizures').delete(returning=ReturnMethod.minimal) \
+                    .eq('data_source', DATA_SOURCE).execute()
+            span.set(rows=existing)
+        self.summary.seizures_deleted = existing
+        logger.info(f"Deleted {existing} existing seizures from {DATA_SOURCE}")
+
+    def insert_seizures(self, seizures: List[Dict[str, Any]]) -> None:
+        """Insert seizures in batches of batch_size"""
+        if self.dry_run:
+            return
+        with self.stage('insert_seizures') as span:
+            for start in range(0, len(seizures), self.batch_size):
+                batch = seizures[start:start + self.batch_size]
+                try:
+                    with self.metrics.span('insert_batch', table='illegal_trade_seizures') as batch_span:
+                        self.supabase.table('illegal_trade_seizures').insert(
+                            batch, returning=ReturnMethod.minimal
+                        ).execute()
+                        batch_span.set(rows=len(batch))
+                    self.summary.seizures_written += len(batch)
+                    self.metrics.counter('records_loaded_total', table='illegal_trade_seizures').inc(len(batch))
+                except Exception as e:
+                    logger.error(f"Error inserting seizures {start}-{start + len(batch) - 1}: {e}")
+                    self.summary.failed_batches += 1
+                    self.metrics.counter('records_failed_total', table='illegal_trade_seizures').inc(len(batch))
+            span.set(rows=self.summary.seizures_written)
+        logger.info(f"Inserted {self.summary.seizures_written} seizures")
+
+    def run(self, csv_path: str, replace: bool = False) -> IngestSummary:
+        """
+        Run the whole pipeline
+
+        Args:
+            csv_path (str): arctic_illegal_trade_records.csv
+            replace (bool): Delete seizures from the same data source before inserting
+
+        Returns:
+            IngestSummary: Counts and stage timings
+        """
+        self.load_reference_data()
+        df = self.read_csv(csv_path)
+        self.upsert_products(self.build_products(df))
+        seizures = self.build_seizures(df)
+        if replace:
+            self.delete_existing_seizures()
+        self.insert_seizures(seizures)
+        return self.summary
+
+def print_summary(summary: IngestSummary, dry_run: bool) -> None:
+    """Print totals and per-stage timings"""
+    print(f"\n📊 Illegal Trade Ingest Summary{' (dry run, nothing written)' if dry_run else ''}:")
+    print(f"  - Rows read: {summary.rows_read:,}")
+    print(f"  - Product types: {summary.products:,}")
+    print(f"  - Seizures built: {summary.seizures:,} ({summary.rows_without_product:,} without product type)")
+    if summary.unmapped_species:
+        print(f"  - Skipped, species not in database: {sum(summary.unmapped_species.values()):,} "
+              f"({len(summary.unmapped_species)} names)")
+    if summary.rows_without_source:
+        print(f"  - Skipped, no source database: {summary.rows_without_source:,}")
+    if not dry_run:
+        if summary.seizures_deleted:
+            print(f"  - Replaced seizures: {summary.seizures_deleted:,}")
+        print(f"  - Seizures inserted: {summary.seizures_written:,}")
+        if summary.failed_batches:
+            print(f"  - ❌ Failed batches: {summary.failed_batches}")
+    print("  - Stage timings:")
+    for stage, seconds in summary.stage_seconds.items():
+        print(f"      {stage:<26} {seconds:.2f}s")
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Load illegal trade products and seizures')
+    parser.add_argument('--csv-path', default='arctic_illegal_trade_records.csv', help='Path to CSV file')
+    parser.add_argument('--batch-size', type=int, default=SEIZURE_BATCH_SIZE, help='Seizures per insert request')
+    parser.add_argument('--dry-run', action='store_true', help='Run without making database changes')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--replace', action='store_true',
+                      help=f"Delete seizures previously loaded from '{DATA_SOURCE}' first")
+    mode.add_argument('--append', action='store_true', help='Insert even if seizures were loaded before')
+    args = parser.parse_args()
+
+    ingest = IllegalTradeIngest(batch_size=args.batch_size, dry_run=args.dry_run)
+
+    if not (args.dry_run or args.replace or args.append):
+        existing = ingest.count_existing_seizures()
+        if existing:
+            logger.error(f"illegal_trade_seizures already contains {existing} rows from {DATA_SOURCE}; "
+                         f"rerun with --replace or --append")
+            sys.exit(1)
+
+    try:
+        summary = ingest.run(args.csv_path, replace=args.replace)
+    except Exception as e:
+        logger.error(f"Ingest failed: {e}")
+        sys.exit(1)
+
+    print_summary(summary, args.dry_run)
+    if summary.failed_batches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Arctic Tracker Database - Illegal Trade Integration
 Extracts unique product types from illegal trade data and loads them
 into the illegal_trade_products lookup table.
 
+illegal_trade_ingest.py loads products and seizures together in large batches.
+
 Usage:
     python load_illegal_products.py [--dry-run]
 """
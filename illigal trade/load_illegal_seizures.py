@@ -6,6 +6,8 @@ Arctic Tracker Database - Illegal Trade Integration
 Loads 919 wildlife crime seizure records mapped to Arctic species
 into the illegal_trade_seizures table.
 
+illegal_trade_ingest.py loads products and seizures together in large batches.
+
 Usage:
     python load_illegal_seizures.py [--dry-run] [--batch-size 100]
 """
@@ -23,6 +25,7 @@ import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.supabase_config import get_supabase_client
+from config.instrumentation import get_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -235,20 +238,25 @@ class IllegalSeizureLoader:
             # Insert in batches
             successful_inserts = 0
             batch_num = 0
+            metrics = get_metrics()
             
             for i in range(0, len(self.seizure_records), self.batch_size):
                 batch = self.seizure_records[i:i + self.batch_size]
                 batch_num += 1
                 
                 try:
-                    result = self.supabase.table('illegal_trade_seizures').insert(batch).execute()
+                    with metrics.span('insert_batch', table='illegal_trade_seizures') as span:
+                        span.set(rows=len(batch), batch=batch_num)
+                        result = self.supabase.table('illegal_trade_seizures').insert(batch).execute()
                     successful_inserts += len(batch)
+                    metrics.counter('records_loaded_total', table='illegal_trade_seizures').inc(len(batch))
                     logger.info(f"Inserted batch {batch_num}: {len(batch)} seizures")
                     
                 except Exception as e:
                     logger.error(f"Error inserting batch {batch_num}: {e}")
                     # Continue with next batch rather than failing completely
                     self.load_stats['failed_loads'] += len(batch)
+                    metrics.counter('records_failed_total', table='illegal_trade_seizures').inc(len(batch))
             
             self.load_stats['successful_loads'] = successful_inserts
             logger.info(f"Successfully loaded {successful_inserts} seizure records")
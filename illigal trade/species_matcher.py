@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern species matcher for the illegal trade extraction
+
+Compiles every search pattern of every Arctic species into one Aho-Corasick
+automaton, so each taxa name is scanned once for all patterns (including
+overlapping ones such as a genus inside a full scientific name). Frames are
+matched on their distinct lowercased values only, then the matches are
+broadcast back to the rows.
+
+Patterns are matched as plain lowercase substrings.
+
+Usage:
+    from species_matcher import SpeciesPatternMatcher
+
+    matcher = SpeciesPatternMatcher({'sp1': ['ursus maritimus', 'polar bear']})
+    matcher.search('Ursus maritimus hide')          # {'sp1'}
+    pairs = matcher.match_frame(df, ['db_taxa_name_clean', 'db_taxa_name'])
+"""
+
+from collections import deque
+from typing import Dict, List, Set, Iterable, Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+class SpeciesPatternMatcher:
+    """Aho-Corasick automaton mapping substring patterns to species keys"""
+
+    def __init__(self, patterns: Dict[Hashable, Iterable[str]]):
+        """
+        Build the automaton
+
+        Args:
+            patterns (Dict[Hashable, Iterable[str]]): Species key -> substring patterns
+        """
+        self.keys: List[Hashable] = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for key_index, key in enumerate(self.keys):
+            for pattern in patterns[key]:
+                self._add_pattern(pattern.lower(), key_index)
+        self._build_failure_links()
+        self._out_frozen = [frozenset(out) for out in self._out]
+
+    def _add_pattern(self, pattern: str, key_index: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = next_state
+        self._out[state].add(key_index)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] |= self._out[self._fail[next_state]]
+
+    def search_indices(self, text: str) -> Set[int]:
+        """Indices (into self.keys) of every species with a pattern inside text"""
+        goto, fail, out = self._goto, self._fail, self._out_frozen
+        found = set(out[0])
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def search(self, text: str) -> Set[Hashable]:
+        """
+        Species whose patterns occur in text (case-insensitive)
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            Set[Hashable]: Matched species keys
+        """
+        return {self.keys[i] for i in self.search_indices(text.lower())}
+
+    def match_frame(self, df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+        """
+        Tag rows with every species matched in any of the given columns
+
+        Each column is lowercased once and only its distinct values are scanned.
+
+        Args:
+            df (pd.DataFrame): Frame to match
+            columns (Sequence[str]): Text columns to scan (missing values never match)
+
+        Returns:
+            pd.DataFrame: One row per (row position, species) with columns
+                'row' (position in df), 'key_index' and 'key', ordered by
+                species (pattern order) and then row
+        """
+        pairs = []
+        for column in columns:
+            codes, uniques = pd.factorize(df[column].str.lower())
+            matched = [(code, sorted(self.search_indices(value)))
+                       for code, value in enumerate(uniques) if isinstance(value, str)]
+            matched = [(code, indices) for code, indices in matched if indices]
+            if not matched:
+                continue
+
+            value_keys = np.empty(len(uniques), dtype=object)
+            for code, indices in matched:
+                value_keys[code] = indices
+            rows = np.flatnonzero(np.isin(codes, [code for code, _ in matched]))
+            pairs.append(pd.DataFrame({'row': rows, 'key_index': value_keys[codes[rows]]}).explode('key_index'))
+
+        if not pairs:
+            return pd.DataFrame({'row': pd.Series(dtype='int64'), 'key_index': pd.Series(dtype='int64'),
+                                 'key': pd.Series(dtype=object)})
+
+        result = pd.concat(pairs, ignore_index=True).astype({'key_index': 'int64'})
+        result = result.drop_duplicates().sort_values(['key_index', 'row'], kind='stable', ignore_index=True)
+        keys = np.empty(len(self.keys), dtype=object)
+        for i, key in enumerate(self.keys):
+            keys[i] = key
+        result['key'] = keys[result['key_index'].to_numpy()]
+        return result
@@ -16,6 +16,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Direct Supabase import
 try:
     from supabase import create_client, Client
+    from config.instrumentation import instrument_client
     from dotenv import load_dotenv
     
     # Load environment variables
@@ -31,7 +32,7 @@ try:
         sys.exit(1)
     
     # Create client
-    supabase: Client = create_client(supabase_url, supabase_key)
+    supabase: Client = instrument_client(create_client(supabase_url, supabase_key))
     print("✅ Supabase client created successfully")
     
 except Exception as e:
@@ -4,6 +4,22 @@ Batch Species Profile Import Script
 
 This script processes multiple species profile JSON files in batch.
 Designed to handle all 42 Arctic species in the database.
+
+The references of all files are collected first and imported once through
+ReferenceImporter (deduplicated by DOI/citation, bulk lookups, batched
+inserts). Database calls are paced by a shared RateLimiter (--rate requests
+per second) instead of a fixed sleep between files.
+
+--changed-only imports only the files that changed since the last successful
+run (content hashes in cache/manifests/species_profile_import.json). Unchanged
+files are skipped before they are read, and so are files edited only outside
+species_data, conservation_profile and references. A file is only recorded
+once every reference it cites resolved to a reference ID, so references that
+failed to import are retried on the next run.
+
+--standardize runs the JSON standardization engine first
+(core/species_json_standardizer.py) and imports from the documents it already
+parsed, so every file is read and parsed once per run.
 """
 
 import json
@@ -11,8 +27,7 @@ import sys
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-import time
+from typing import Dict, List, Any, Optional, Tuple
 
 # Add parent directory to path for importing modules
 sys.path.append(str(Path(__file__).parent.parent))
@@ -21,12 +36,21 @@ sys.path.append(str(Path(__file__).parent.parent))
 from import_species_json import (
     supabase, 
     process_species_json,
-    load_json_file
+    load_json_file,
+    profile_changes,
+    references_resolved,
+    MANIFEST_NAME
 )
+from reference_import import ReferenceImporter
+from config.api_config import RateLimiter, rate_limit_client
+from config.content_manifest import ContentManifest
+from core.species_json_standardizer import SpeciesJSONStandardizer
 
 # Configuration
 PROCESSED_DIR = Path("species_data/scite/processed")
 LOG_FILE = Path("migration/batch_import_log.txt")
+REQUESTS_PER_SECOND = 10.0
+REQUEST_BURST = 5
 
 def log_message(message: str, also_print: bool = True):
     """Log message to file and optionally print"""
@@ -59,10 +83,11 @@ def find_json_files() -> List[Path]:
     
     return json_files
 
-def validate_json_file(json_file: Path) -> bool:
-    """Validate that JSON file has required structure"""
+def validate_json_file(json_file: Path, data: Optional[Dict[str, Any]] = None) -> bool:
+    """Validate that JSON file has required structure (pass data if already loaded)"""
     try:
-        data = load_json_file(json_file)
+        if data is None:
+            data = load_json_file(json_file)
         
         # Check required top-level keys
         required_keys = ['species_data', 'conservation_profile', 'references']
@@ -84,13 +109,87 @@ def validate_json_file(json_file: Path) -> bool:
         log_message(f"  ❌ Error validating {json_file.name}: {e}")
         return False
 
-def process_batch(json_files: List[Path], dry_run: bool = False) -> Dict[str, Any]:
-    """Process all JSON files in batch"""
+def load_valid_files(json_files: List[Path], results: Dict[str, Any],
+                     standardizer: Optional[SpeciesJSONStandardizer] = None) -> List[Tuple[Path, Dict[str, Any]]]:
+    """Load and validate every file once (from the standardizer's parsed documents if given)"""
+    loaded = []
+    for i, json_file in enumerate(json_files, 1):
+        log_message(f"\n📄 Loading file {i}/{len(json_files)}: {json_file.name}")
+        json_data = standardizer.document(json_file) if standardizer else load_json_file(json_file)
+        if not json_data:
+            log_message(f"  ❌ Failed to load JSON data from {json_file.name}")
+            results['failed'] += 1
+            continue
+        if not validate_json_file(json_file, json_data):
+            results['skipped'] += 1
+            continue
+        loaded.append((json_file, json_data))
+    return loaded
+
+def import_all_references(loaded: List[Tuple[Path, Dict[str, Any]]],
+                          dry_run: bool) -> Tuple[Dict[str, Dict[str, str]], int]:
+    """
+    Import the references of all files at once
+    
+    Returns:
+        Tuple[Dict[str, Dict[str, str]], int]: File name -> (full_citation -> reference ID),
+            and the number of references that failed to insert
+    """
+    importer = ReferenceImporter(supabase, dry_run=dry_run)
+    profiles = {json_file.name: json_data.get('references', []) for json_file, json_data in loaded}
+    
+    if dry_run:
+        for name, references_data in profiles.items():
+            importer.collect(name, references_data)
+        log_message(f"  🔍 DRY RUN: {importer.summary.references_seen} references, "
+                    f"{importer.summary.unique_references} unique after dedup")
+        return {}, 0
+    
+    log_message(f"\n📚 Importing references of {len(profiles)} files...")
+    mappings = importer.import_profiles(profiles)
+    s = importer.summary
+    log_message(f"  ✅ {s.unique_references} unique references ({s.references_seen} cited): "
+                f"{s.existing} existing, {s.inserted} inserted, {s.failed} failed in {s.requests} requests")
+    return mappings, s.failed
+
+def filter_changed_files(json_files: List[Path], manifest: ContentManifest,
+                         results: Dict[str, Any]) -> Tuple[List[Path], Dict[str, str]]:
+    """
+    Drop the files whose bytes match the last successful import
+    
+    Returns:
+        Tuple[List[Path], Dict[str, str]]: Changed files and file name -> file hash
+    """
+    changed_files = []
+    file_hashes = {}
+    for json_file in json_files:
+        changed, file_hashes[json_file.name] = manifest.file_changed(json_file)
+        if changed:
+            changed_files.append(json_file)
+        else:
+            results['unchanged'] += 1
+    log_message(f"🔁 {len(changed_files)} changed files, {results['unchanged']} unchanged since last import")
+    return changed_files, file_hashes
+
+def standardize_files(json_files: List[Path], dry_run: bool) -> SpeciesJSONStandardizer:
+    """Validate and standardize the files before import, keeping the parsed documents"""
+    standardizer = SpeciesJSONStandardizer(PROCESSED_DIR, dry_run=dry_run)
+    results = standardizer.run(json_files)
+    standardizer.save_state()
+    counts = standardizer.counts(results)
+    log_message(f"🧹 Standardized {len(results)} files: " +
+                ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    return standardizer
+
+def process_batch(json_files: List[Path], dry_run: bool = False, changed_only: bool = False,
+                  standardizer: Optional[SpeciesJSONStandardizer] = None) -> Dict[str, Any]:
+    """Process all JSON files in batch (only changed ones with changed_only)"""
     results = {
         'total_files': len(json_files),
         'successful': 0,
         'failed': 0,
         'skipped': 0,
+        'unchanged': 0,
         'errors': [],
         'processed_species': []
     }
@@ -98,22 +197,36 @@ def process_batch(json_files: List[Path], dry_run: bool = False) -> Dict[str, An
     log_message(f"\n🚀 Starting batch processing of {len(json_files)} files")
     log_message(f"📋 Dry run mode: {dry_run}")
     
-    for i, json_file in enumerate(json_files, 1):
-        log_message(f"\n📄 Processing file {i}/{len(json_files)}: {json_file.name}")
+    manifest = ContentManifest(MANIFEST_NAME) if changed_only else None
+    file_hashes: Dict[str, str] = {}
+    row_hashes: Dict[str, Dict[str, str]] = {}
+    if manifest is not None:
+        json_files, file_hashes = filter_changed_files(json_files, manifest, results)
+    
+    loaded = load_valid_files(json_files, results, standardizer)
+    if manifest is not None:
+        changed = []
+        for json_file, json_data in loaded:
+            sections_changed, row_hashes[json_file.name] = profile_changes(manifest, json_file.name, json_data)
+            if sections_changed:
+                changed.append((json_file, json_data))
+                continue
+            log_message(f"  ⏭️  Imported data unchanged: {json_file.name}")
+            results['unchanged'] += 1
+            if not dry_run:
+                manifest.record(json_file.name, file_hash=file_hashes[json_file.name])
+        loaded = changed
+    
+    try:
+        reference_mappings, failed_references = import_all_references(loaded, dry_run)
+    except Exception as e:
+        log_message(f"  ❌ Reference import failed, falling back to per-file import: {e}")
+        reference_mappings, failed_references = {}, 0
+    
+    for i, (json_file, json_data) in enumerate(loaded, 1):
+        log_message(f"\n📄 Processing file {i}/{len(loaded)}: {json_file.name}")
         
         try:
-            # Validate file structure
-            if not validate_json_file(json_file):
-                results['skipped'] += 1
-                continue
-            
-            # Load JSON data
-            json_data = load_json_file(json_file)
-            if not json_data:
-                log_message(f"  ❌ Failed to load JSON data from {json_file.name}")
-                results['failed'] += 1
-                continue
-            
             scientific_name = json_data['species_data'].get('scientific_name', 'Unknown')
             log_message(f"  🎯 Target species: {scientific_name}")
             
@@ -122,27 +235,37 @@ def process_batch(json_files: List[Path], dry_run: bool = False) -> Dict[str, An
                 results['successful'] += 1
                 results['processed_species'].append(scientific_name)
             else:
-                # Process the species
-                success = process_species_json(json_data)
+                # Process the species (references already imported above, else per file)
+                reference_mapping = reference_mappings.get(json_file.name)
+                file_importer = ReferenceImporter(supabase) if reference_mapping is None else None
+                success = process_species_json(json_data, reference_mapping=reference_mapping, importer=file_importer)
                 
                 if success:
                     log_message(f"  ✅ Successfully processed: {scientific_name}")
                     results['successful'] += 1
                     results['processed_species'].append(scientific_name)
+                    if manifest is not None:
+                        failed = failed_references
+                        if file_importer is not None:
+                            reference_mapping, failed = file_importer.mapping_for('profile'), file_importer.summary.failed
+                        if failed == 0 and references_resolved(json_data.get('references'), reference_mapping):
+                            manifest.record(json_file.name, file_hash=file_hashes[json_file.name],
+                                            rows=row_hashes[json_file.name])
+                        else:
+                            log_message(f"  ⚠️  References incomplete, {json_file.name} will be retried by --changed-only")
+                            manifest.forget(json_file.name)
                 else:
                     log_message(f"  ❌ Failed to process: {scientific_name}")
                     results['failed'] += 1
                     results['errors'].append(f"{json_file.name}: {scientific_name}")
-            
-            # Small delay between processing to avoid overwhelming the database
-            if not dry_run:
-                time.sleep(1)
                 
         except Exception as e:
             log_message(f"  ❌ Unexpected error processing {json_file.name}: {e}")
             results['failed'] += 1
             results['errors'].append(f"{json_file.name}: {str(e)}")
     
+    if manifest is not None and not dry_run:
+        manifest.save()
     return results
 
 def generate_species_list() -> List[str]:
@@ -187,6 +310,8 @@ def print_summary(results: Dict[str, Any]) -> None:
     log_message(f"✅ Successfully processed: {results['successful']}")
     log_message(f"❌ Failed to process: {results['failed']}")
     log_message(f"⚠️  Skipped (invalid): {results['skipped']}")
+    if results['unchanged']:
+        log_message(f"⏭️  Unchanged since last import: {results['unchanged']}")
     
     if results['errors']:
         log_message(f"\n❌ Errors encountered:")
@@ -207,6 +332,12 @@ def main():
     # Parse command line arguments
     dry_run = '--dry-run' in sys.argv
     list_species = '--list-species' in sys.argv
+    changed_only = '--changed-only' in sys.argv
+    standardize = '--standardize' in sys.argv
+    rate = float(sys.argv[sys.argv.index('--rate') + 1]) if '--rate' in sys.argv else REQUESTS_PER_SECOND
+    
+    # Pace every database call instead of sleeping between files
+    rate_limit_client(supabase, RateLimiter(rate, burst=REQUEST_BURST, name='species_import'))
     
     if list_species:
         log_message("📋 Generating species list from database...")
@@ -219,14 +350,18 @@ def main():
         log_message("❌ No JSON files found to process")
         return
     
+    # Standardize first, then import from the already parsed documents
+    standardizer = standardize_files(json_files, dry_run) if standardize else None
+    
     # Process files
-    results = process_batch(json_files, dry_run=dry_run)
+    results = process_batch(json_files, dry_run=dry_run, changed_only=changed_only, standardizer=standardizer)
     
     # Print summary
     print_summary(results)
     
-    # Create missing files report
-    create_missing_files_report(results['processed_species'])
+    # Create missing files report (unchanged files are not in processed_species)
+    if not changed_only:
+        create_missing_files_report(results['processed_species'])
     
     log_message(f"\n📅 Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     log_message(f"📄 Full log saved to: {LOG_FILE}")
@@ -242,6 +377,9 @@ Usage:
 Options:
   --dry-run        Validate files without importing to database
   --list-species   List all species in database and exit
+  --rate N         Database requests per second (default 10)
+  --changed-only   Import only files changed since the last successful run
+  --standardize    Validate/standardize the files first and import the parsed documents
   --help, -h       Show this help message
 
 Examples:
@@ -251,6 +389,9 @@ Examples:
   # Import all valid JSON files to database
   python migration/batch_import_species.py
   
+  # Re-import only the profiles edited since the last run
+  python migration/batch_import_species.py --changed-only
+  
   # List all species in database
   python migration/batch_import_species.py --list-species
 
@@ -0,0 +1,18 @@
+-- Catch Records Natural Key
+-- Run this BEFORE the bulk NAMMCO import (nammco_bulk.py)
+-- Lets re-imports upsert on (species, country, area, year) instead of adding duplicates
+
+-- Step 1: Remove duplicates left by earlier per-row imports (keep the newest row)
+DELETE FROM catch_records cr
+USING catch_records newer
+WHERE cr.species_id = newer.species_id
+  AND cr.country_id IS NOT DISTINCT FROM newer.country_id
+  AND cr.management_area_id IS NOT DISTINCT FROM newer.management_area_id
+  AND cr.year = newer.year
+  AND cr.id < newer.id;
+
+-- Step 2: Add the natural key used as the upsert conflict target
+-- (NULLS NOT DISTINCT so rows without a country or area are still unique, Postgres 15+)
+ALTER TABLE catch_records
+ADD CONSTRAINT catch_records_natural_key
+UNIQUE NULLS NOT DISTINCT (species_id, country_id, management_area_id, year);
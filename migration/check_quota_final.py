@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 try:
     from supabase import create_client, Client
+    from config.instrumentation import instrument_client
     from dotenv import load_dotenv
     import os
     
@@ -24,7 +25,7 @@ try:
     supabase_key = os.getenv('SUPABASE_ANON_KEY')
     
     # Create client
-    supabase: Client = create_client(supabase_url, supabase_key)
+    supabase: Client = instrument_client(create_client(supabase_url, supabase_key))
     print("✅ Connected to Supabase")
     
     # Get species ID for Balaenoptera acutorostrata
@@ -4,6 +4,10 @@ Country References Cleanup Script
 
 This script standardizes country references across all tables in the Arctic Tracker database.
 It handles multiple country reference formats and consolidates them to use the countries table.
+
+By default the cleanup is set-based: distinct values come from the aggregate
+RPCs in country_cleanup_functions.sql and catch records are linked with one
+UPDATE per target country_id. --row-by-row runs the original per-record path.
 """
 
 import sys
@@ -18,6 +22,10 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Direct Supabase import
 try:
     from supabase import create_client, Client
+    from config.instrumentation import instrument_client
+    from config.country_dimension import get_country_dimension, save_country_dimension, Country
+    from config.postgrest_filters import in_list
+    from config.postgrest_queries import fetch_paginated, is_missing_function
     from dotenv import load_dotenv
     
     # Load environment variables
@@ -33,99 +41,55 @@ try:
         sys.exit(1)
     
     # Create client
-    supabase: Client = create_client(supabase_url, supabase_key)
+    supabase: Client = instrument_client(create_client(supabase_url, supabase_key))
     print("✅ Supabase client created successfully")
     
 except Exception as e:
     print(f"❌ Error creating Supabase client: {e}")
     sys.exit(1)
 
-# Country code mappings (ISO 2-letter codes to full names)
-COUNTRY_CODE_MAPPINGS = {
-    # CITES country codes found in trade data
-    'SA': 'Saudi Arabia',
-    'IE': 'Ireland', 
-    'US': 'United States',
-    'CA': 'Canada',
-    'NO': 'Norway',
-    'IS': 'Iceland',
-    'GL': 'Greenland',
-    'FO': 'Faroe Islands',
-    'DK': 'Denmark',
-    'FI': 'Finland',
-    'SE': 'Sweden',
-    'RU': 'Russia',
-    'JP': 'Japan',
-    'KR': 'South Korea',
-    'CN': 'China',
-    'GB': 'United Kingdom',
-    'DE': 'Germany',
-    'FR': 'France',
-    'ES': 'Spain',
-    'PT': 'Portugal',
-    'NL': 'Netherlands',
-    'IT': 'Italy',
-    'PL': 'Poland',
-    'MX': 'Mexico',
-    'AU': 'Australia',
-    'NZ': 'New Zealand',
-    'BR': 'Brazil',
-    'AR': 'Argentina',
-    'CL': 'Chile',
-    'PE': 'Peru',
-    'CO': 'Colombia',
-    'EC': 'Ecuador',
-    'ZA': 'South Africa',
-    'MA': 'Morocco',
-    'EG': 'Egypt',
-    'TR': 'Turkey',
-    'IN': 'India',
-    'PK': 'Pakistan',
-    'AF': 'Afghanistan',
-    'KZ': 'Kazakhstan',
-    'UZ': 'Uzbekistan',
-    'KG': 'Kyrgyzstan',
-    'TJ': 'Tajikistan',
-    'TM': 'Turkmenistan',
-    'MN': 'Mongolia',
-    'IR': 'Iran',
-    'IQ': 'Iraq',
-    'SY': 'Syria',
-    'IL': 'Israel',
-    'BY': 'Belarus',
-    'UA': 'Ukraine',
-    'EE': 'Estonia',
-    'LV': 'Latvia',
-    'LT': 'Lithuania',
-    'GT': 'Guatemala',
-    'BZ': 'Belize',
-    'CR': 'Costa Rica',
-    'PA': 'Panama',
-    'SN': 'Senegal',
-    'GH': 'Ghana',
-    'NG': 'Nigeria'
-}
+# Values per IN (...) filter
+UPDATE_CHUNK_SIZE = 100
+
+def country_row(country: Country) -> Dict[str, Any]:
+    """countries table row for a dimension entry"""
+    return {
+        'id': country.id,
+        'country_name': country.name,
+        'country_code': country.code,
+        'arctic_council': country.arctic_council,
+        'nammco_member': country.nammco_member
+    }
 
 def get_all_countries() -> Dict[str, Dict[str, Any]]:
-    """Get all countries from the countries table"""
+    """Reload the shared country dimension and index its rows by name and code"""
     try:
-        response = supabase.table('countries').select('*').execute()
+        dimension = get_country_dimension(supabase, refresh=True)
         countries = {}
         
-        for country in response.data:
+        for country in dimension.database_rows():
+            row = country_row(country)
             # Index by country name
-            countries[country['country_name']] = country
+            countries[country.name] = row
             # Also index by country code if available
-            if country.get('country_code'):
-                countries[country['country_code']] = country
+            if country.code:
+                countries[country.code] = row
         
-        print(f"📊 Loaded {len(response.data)} countries from database")
+        print(f"📊 Loaded {len(dimension)} countries from database")
         return countries
         
     except Exception as e:
         print(f"❌ Error fetching countries: {e}")
         return {}
 
+def register_country(row: Dict[str, Any], countries_cache: Dict[str, Dict[str, Any]]) -> str:
+    """Add a newly inserted country to the cleanup cache and the shared dimension"""
+    country = get_country_dimension().add_row(row)
+    countries_cache[country.name] = row
+    if country.code:
+        countries_cache[country.code] = row
+    return row['id']
+
 def find_or_create_country(country_identifier: str, countries_cache: Dict[str, Dict[str, Any]]) -> Optional[str]:
     """Find country ID by name or code, create if not exists"""
     try:
@@ -133,27 +97,24 @@ def find_or_create_country(country_identifier: str, countries_cache: Dict[str, D
         if country_identifier in countries_cache:
             return countries_cache[country_identifier]['id']
         
-        # Try mapping from country code
-        if country_identifier in COUNTRY_CODE_MAPPINGS:
-            country_name = COUNTRY_CODE_MAPPINGS[country_identifier]
-            if country_name in countries_cache:
-                return countries_cache[country_name]['id']
+        # Try the dimension's built-in ISO code names and flags
+        known = get_country_dimension().by_code.get(country_identifier)
+        if known:
+            if known.name in countries_cache:
+                return countries_cache[known.name]['id']
             
             # Create new country
-            print(f"  🔧 Creating new country: {country_name} ({country_identifier})")
+            print(f"  🔧 Creating new country: {known.name} ({country_identifier})")
             new_country = {
-                'country_name': country_name,
+                'country_name': known.name,
                 'country_code': country_identifier,
-                'nammco_member': False,
-                'arctic_council': country_identifier in ['CA', 'DK', 'FI', 'IS', 'NO', 'RU', 'SE', 'US']
+                'nammco_member': known.nammco_member,
+                'arctic_council': known.arctic_council
             }
             
             response = supabase.table('countries').insert(new_country).execute()
             if response.data and len(response.data) > 0:
-                new_id = response.data[0]['id']
-                countries_cache[country_name] = response.data[0]
-                countries_cache[country_identifier] = response.data[0]
-                return new_id
+                return register_country(response.data[0], countries_cache)
         
         # If all else fails, create with the identifier as name
         print(f"  🔧 Creating unknown country: {country_identifier}")
@@ -166,9 +127,7 @@ def find_or_create_country(country_identifier: str, countries_cache: Dict[str, D
         
         response = supabase.table('countries').insert(new_country).execute()
         if response.data and len(response.data) > 0:
-            new_id = response.data[0]['id']
-            countries_cache[country_identifier] = response.data[0]
-            return new_id
+            return register_country(response.data[0], countries_cache)
             
         return None
         
@@ -220,6 +179,112 @@ def cleanup_catch_records(countries_cache: Dict[str, Dict[str, Any]]) -> bool:
         print(f"❌ Error cleaning catch_records: {e}")
         return False
 
+def fetch_unlinked_catch_countries() -> Dict[str, int]:
+    """
+    Distinct catch_records.country values without a country_id
+
+    Returns:
+        Dict[str, int]: Raw country text -> number of records
+    """
+    try:
+        response = supabase.rpc('unlinked_catch_record_countries').execute()
+        return {row['country']: row['records'] for row in response.data or []}
+    except Exception as e:
+        if not is_missing_function(e):
+            raise
+        print("  ⚠️  unlinked_catch_record_countries() not found (run country_cleanup_functions.sql), scanning table")
+
+    values: Dict[str, int] = {}
+    rows = fetch_paginated(lambda: supabase.table('catch_records'), 'country, country_id, id')
+    for row in rows:
+        if row.get('country') and not row.get('country_id'):
+            values[row['country']] = values.get(row['country'], 0) + 1
+    return values
+
+def fetch_trade_country_codes() -> Dict[str, int]:
+    """
+    Distinct importer/exporter/origin codes in cites_trade_records
+
+    Returns:
+        Dict[str, int]: Country code -> number of references
+    """
+    try:
+        response = supabase.rpc('trade_country_codes').execute()
+        return {row['code']: row['records'] for row in response.data or []}
+    except Exception as e:
+        if not is_missing_function(e):
+            raise
+        print("  ⚠️  trade_country_codes() not found (run country_cleanup_functions.sql), scanning table")
+
+    codes: Dict[str, int] = {}
+    for row in fetch_paginated(lambda: supabase.table('cites_trade_records'), 'id, importer, exporter, origin'):
+        for column in ('importer', 'exporter', 'origin'):
+            if row.get(column):
+                codes[row[column]] = codes.get(row[column], 0) + 1
+    return codes
+
+def cleanup_catch_records_set_based(countries_cache: Dict[str, Dict[str, Any]]) -> bool:
+    """Link catch_records.country texts to countries with one UPDATE per target country"""
+    try:
+        print("\n🎣 Cleaning up catch_records table (set-based)...")
+
+        values = fetch_unlinked_catch_countries()
+        print(f"📊 Found {sum(values.values())} unlinked catch records with {len(values)} distinct country values")
+
+        # Group the raw texts by the country they resolve to
+        targets: Dict[str, List[str]] = {}
+        for country_text in values:
+            country_id = find_or_create_country(country_text.strip(), countries_cache)
+            if country_id:
+                targets.setdefault(country_id, []).append(country_text)
+
+        print(f"🔄 Need {len(targets)} updates (one per country)")
+
+        updated = 0
+        for country_id, country_texts in targets.items():
+            for i in range(0, len(country_texts), UPDATE_CHUNK_SIZE):
+                chunk = country_texts[i:i + UPDATE_CHUNK_SIZE]
+                try:
+                    response = supabase.table('catch_records').update({
+                        'country_id': country_id
+                    }).is_('country_id', 'null').filter('country', 'in', in_list(chunk)).execute()
+                    updated += len(response.data or [])
+                except Exception as e:
+                    print(f"  ⚠️  Warning: Failed to update catch records for country {country_id}: {e}")
+
+        print(f"✅ Updated {updated} catch records with country IDs")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error cleaning catch_records: {e}")
+        return False
+
+def cleanup_cites_trade_records_set_based(countries_cache: Dict[str, Dict[str, Any]]) -> bool:
+    """Resolve every distinct CITES country code, read via an aggregate query"""
+    try:
+        print("\n📦 Cleaning up cites_trade_records table (set-based)...")
+
+        codes = fetch_trade_country_codes()
+        country_codes = set(codes)
+        print(f"🌍 Found {len(country_codes)} unique country codes in {sum(codes.values())} references: {sorted(country_codes)}")
+
+        missing_countries = []
+        for code in sorted(country_codes):
+            if code not in countries_cache:
+                if not find_or_create_country(code, countries_cache):
+                    missing_countries.append(code)
+
+        if missing_countries:
+            print(f"⚠️  Could not resolve country codes: {missing_countries}")
+        else:
+            print(f"✅ All CITES country codes resolved")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Error cleaning cites_trade_records: {e}")
+        return False
+
 def cleanup_cites_trade_records(countries_cache: Dict[str, Dict[str, Any]]) -> bool:
     """Clean up country references in CITES trade records"""
     try:
@@ -345,6 +410,7 @@ def main():
     # Parse command line arguments
     dry_run = '--dry-run' in sys.argv
     report_only = '--report' in sys.argv
+    row_by_row = '--row-by-row' in sys.argv
     
     # Load countries cache
     print("\n📚 Loading countries database...")
@@ -359,16 +425,26 @@ def main():
     
     # Step 1: Clean up catch records
     if not dry_run:
-        cleanup_catch_records(countries_cache)
+        if row_by_row:
+            cleanup_catch_records(countries_cache)
+        else:
+            cleanup_catch_records_set_based(countries_cache)
     else:
         print("\n🔍 DRY RUN: Would clean up catch_records table")
     
     # Step 2: Clean up CITES trade records
     if not dry_run:
-        cleanup_cites_trade_records(countries_cache)
+        if row_by_row:
+            cleanup_cites_trade_records(countries_cache)
+        else:
+            cleanup_cites_trade_records_set_based(countries_cache)
     else:
         print("\n🔍 DRY RUN: Would clean up cites_trade_records table")
     
+    # Share the countries created above with the other trade consumers
+    if not dry_run:
+        save_country_dimension()
+    
     # Step 3: Analyze redundant columns
     remove_redundant_country_columns()
     
@@ -388,6 +464,7 @@ Usage:
 Options:
   --dry-run    Analyze issues without making changes
   --report     Generate cleanup report and exit
+  --row-by-row Use the original per-record updates instead of the set-based cleanup
   --help, -h   Show this help message
 
 Examples:
@@ -397,7 +474,7 @@ Examples:
   # Generate report only
   python migration/cleanup_country_references.py --report
   
-  # Perform cleanup
+  # Perform cleanup (after loading migration/country_cleanup_functions.sql)
   python migration/cleanup_country_references.py
 
 Issues Addressed:
@@ -0,0 +1,50 @@
+-- Country Cleanup Functions
+-- Aggregate RPCs used by the set-based mode of cleanup_country_references.py
+-- Each returns one row per distinct value instead of shipping whole tables to the client
+
+-- Distinct country codes used anywhere in CITES trade records
+CREATE OR REPLACE FUNCTION "public"."trade_country_codes"()
+RETURNS TABLE(
+    code text,
+    records bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT c.code, COUNT(*) AS records
+    FROM (
+        SELECT importer AS code FROM cites_trade_records
+        UNION ALL
+        SELECT exporter FROM cites_trade_records
+        UNION ALL
+        SELECT origin FROM cites_trade_records
+    ) c
+    WHERE c.code IS NOT NULL AND c.code <> ''
+    GROUP BY c.code
+    ORDER BY c.code;
+$$;
+
+COMMENT ON FUNCTION "public"."trade_country_codes" IS 'Distinct importer/exporter/origin codes in cites_trade_records with row counts';
+
+-- Distinct country texts of catch records that have no country_id yet
+CREATE OR REPLACE FUNCTION "public"."unlinked_catch_record_countries"()
+RETURNS TABLE(
+    country text,
+    records bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT cr.country::text, COUNT(*) AS records
+    FROM catch_records cr
+    WHERE cr.country IS NOT NULL
+      AND cr.country <> ''
+      AND cr.country_id IS NULL
+    GROUP BY cr.country
+    ORDER BY cr.country;
+$$;
+
+COMMENT ON FUNCTION "public"."unlinked_catch_record_countries" IS 'Distinct catch_records.country values still missing a country_id, with row counts';
+
+-- Make the functions visible to PostgREST
+NOTIFY pgrst, 'reload schema';
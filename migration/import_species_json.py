@@ -4,6 +4,16 @@ Species Profile JSON Import Script
 
 This script imports species profile data from JSON files generated by the LLM
 processing system. It handles species data, conservation profiles, and references.
+
+References are deduplicated and written through ReferenceImporter
+(reference_import.py): bulk in-list lookups and batched inserts instead of two
+SELECTs and an INSERT per reference.
+
+With --changed-only the content hashes of the last successful import are kept
+in cache/manifests/species_profile_import.json, and a file whose species data,
+conservation profile and references are unchanged is skipped without any
+database call. A file is only recorded once every reference it cites has a
+reference ID; after a partial failure it stays pending and is retried.
 """
 
 import json
@@ -11,14 +21,26 @@ import sys
 import os
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 # Add parent directory to path for importing modules
 sys.path.append(str(Path(__file__).parent.parent))
 
+from reference_import import ReferenceImporter
+from config.content_manifest import ContentManifest
+
+MANIFEST_NAME = 'species_profile_import'
+# Profile JSON section -> table it is written to
+IMPORTED_SECTIONS = {
+    'species_data': 'species',
+    'conservation_profile': 'conservation_profiles',
+    'references': 'references'
+}
+
 # Direct Supabase import
 try:
     from supabase import create_client, Client
+    from config.instrumentation import instrument_client
     from dotenv import load_dotenv
     
     # Load environment variables
@@ -34,7 +56,7 @@ try:
         sys.exit(1)
     
     # Create client
-    supabase: Client = create_client(supabase_url, supabase_key)
+    supabase: Client = instrument_client(create_client(supabase_url, supabase_key))
     print("✅ Supabase client created successfully")
     
 except Exception as e:
@@ -95,59 +117,15 @@ def update_species_record(species_data: Dict[str, Any]) -> bool:
         print(f"  ❌ Error processing species record: {e}")
         return False
 
-def import_references(references_data: List[Dict[str, Any]]) -> Dict[str, str]:
+def import_references(references_data: List[Dict[str, Any]],
+                      importer: Optional[ReferenceImporter] = None) -> Dict[str, str]:
     """Import references and return mapping of full_citation to reference_id"""
-    reference_mapping = {}
-    
     try:
-        for i, ref in enumerate(references_data):
-            if not ref.get('title') or not ref.get('full_citation'):
-                print(f"  ⚠️  Skipping incomplete reference: {ref}")
-                continue
-            
-            # Create unique source_id from title and year
-            source_id = f"{ref['title'][:50].replace(' ', '_')}_{ref.get('year', 'unknown')}_{i}"
-            
-            # Create reference record matching the actual schema
-            ref_record = {
-                'source_id': source_id,
-                'title': ref['title'],
-                'authors': ', '.join(ref['authors']) if isinstance(ref.get('authors'), list) else ref.get('authors', ''),
-                'journal': ref.get('journal'),
-                'year': ref.get('year'),
-                'doi': ref.get('doi'),
-                'full_citation': ref['full_citation']
-            }
-            
-            # Check if reference already exists by source_id or DOI
-            existing_ref = None
-            if ref.get('doi'):
-                response = supabase.table('references').select('id').eq('doi', ref['doi']).execute()
-                if response.data and len(response.data) > 0:
-                    existing_ref = response.data[0]['id']
-            
-            if not existing_ref:
-                response = supabase.table('references').select('id').eq('source_id', source_id).execute()
-                if response.data and len(response.data) > 0:
-                    existing_ref = response.data[0]['id']
-            
-            if existing_ref:
-                print(f"  ✅ Found existing reference: {ref['title'][:50]}...")
-                reference_mapping[ref['full_citation']] = existing_ref
-            else:
-                # Insert new reference
-                response = supabase.table('references').insert(ref_record).execute()
-                if response.data and len(response.data) > 0:
-                    new_ref_id = response.data[0]['id']
-                    print(f"  ✅ Created new reference: {ref['title'][:50]}...")
-                    reference_mapping[ref['full_citation']] = new_ref_id
-                else:
-                    print(f"  ❌ Failed to create reference: {ref['title'][:50]}...")
-    
+        importer = importer or ReferenceImporter(supabase)
+        return importer.import_profiles({'profile': references_data})['profile']
     except Exception as e:
         print(f"❌ Error importing references: {e}")
-    
-    return reference_mapping
+        return {}
 
 def create_conservation_profile(profile_data: Dict[str, Any], species_id: str, reference_ids: List[str]) -> bool:
     """Create conservation profile record"""
@@ -209,8 +187,18 @@ def create_conservation_profile(profile_data: Dict[str, Any], species_id: str, r
         print(f"❌ Error creating conservation profile: {e}")
         return False
 
-def process_species_json(json_data: Dict[str, Any]) -> bool:
-    """Process complete species JSON data"""
+def process_species_json(json_data: Dict[str, Any], reference_mapping: Optional[Dict[str, str]] = None,
+                         importer: Optional[ReferenceImporter] = None) -> bool:
+    """
+    Process complete species JSON data
+    
+    Args:
+        json_data (Dict[str, Any]): Profile JSON
+        reference_mapping (Optional[Dict[str, str]]): full_citation -> reference ID when the
+            references were already imported in bulk (batch_import_species.py)
+        importer (Optional[ReferenceImporter]): Importer for the references otherwise, so the
+            caller can check afterwards which of them were imported
+    """
     try:
         # Extract the three main components
         species_data = json_data.get('species_data', {})
@@ -225,9 +213,10 @@ def process_species_json(json_data: Dict[str, Any]) -> bool:
         print(f"\n🚀 Processing complete profile for: {scientific_name}")
         
         # Step 1: Import references
-        print(f"\n📚 Importing {len(references_data)} references...")
-        reference_mapping = import_references(references_data)
-        reference_ids = list(reference_mapping.values())
+        if reference_mapping is None:
+            print(f"\n📚 Importing {len(references_data)} references...")
+            reference_mapping = import_references(references_data, importer)
+        reference_ids = list(dict.fromkeys(reference_mapping.values()))
         
         # Step 2: Update species record
         print(f"\n🐋 Updating species record...")
@@ -254,19 +243,65 @@ def process_species_json(json_data: Dict[str, Any]) -> bool:
         print(f"❌ Error processing species JSON: {e}")
         return False
 
+def profile_changes(manifest: ContentManifest, key: str, json_data: Dict[str, Any]) -> Tuple[bool, Dict[str, str]]:
+    """
+    Compare the imported sections of a profile with the last successful import
+    
+    Args:
+        manifest (ContentManifest): Import manifest
+        key (str): Manifest entry key (the file name)
+        json_data (Dict[str, Any]): Profile JSON
+    
+    Returns:
+        Tuple[bool, Dict[str, str]]: (any section changed, table -> row hash)
+    """
+    changed = False
+    row_hashes = {}
+    for section, table in IMPORTED_SECTIONS.items():
+        section_changed, row_hashes[table] = manifest.row_changed(key, table, json_data.get(section))
+        changed = changed or section_changed
+    return changed, row_hashes
+
+def references_resolved(references_data: List[Dict[str, Any]], reference_mapping: Optional[Dict[str, str]]) -> bool:
+    """
+    Check that every importable reference of a profile got a reference ID
+    
+    Incomplete references (no title or full_citation) are never imported, so
+    they do not count.
+    
+    Args:
+        references_data (List[Dict[str, Any]]): 'references' list of the profile JSON
+        reference_mapping (Optional[Dict[str, str]]): full_citation -> reference ID
+    
+    Returns:
+        bool: True if the profile can be recorded as imported
+    """
+    citations = {ref['full_citation'] for ref in references_data or []
+                 if ref.get('title') and ref.get('full_citation')}
+    return citations <= set(reference_mapping or {})
+
 def main():
     """Main import function"""
-    if len(sys.argv) != 2:
-        print("Usage: python import_species_json.py <json_file_path>")
+    args = [arg for arg in sys.argv[1:] if arg != '--changed-only']
+    changed_only = '--changed-only' in sys.argv
+    if len(args) != 1:
+        print("Usage: python import_species_json.py <json_file_path> [--changed-only]")
         print("Example: python import_species_json.py species_data/scite/processed/narwhal_profile.json")
         sys.exit(1)
     
-    json_file_path = Path(sys.argv[1])
+    json_file_path = Path(args[0])
     
     if not json_file_path.exists():
         print(f"❌ JSON file not found: {json_file_path}")
         sys.exit(1)
     
+    manifest = ContentManifest(MANIFEST_NAME) if changed_only else None
+    if manifest is not None:
+        file_changed, file_hash = manifest.file_changed(json_file_path)
+        if not file_changed:
+            print(f"⏭️  Unchanged since last import: {json_file_path.name}")
+            return
+    
     print(f"🔧 Loading JSON data from: {json_file_path}")
     json_data = load_json_file(json_file_path)
     
@@ -274,10 +309,27 @@ def main():
         print("❌ Failed to load JSON data")
         sys.exit(1)
     
+    if manifest is not None:
+        sections_changed, row_hashes = profile_changes(manifest, json_file_path.name, json_data)
+        if not sections_changed:
+            print(f"⏭️  Imported data unchanged: {json_file_path.name}")
+            manifest.record(json_file_path.name, file_hash=file_hash)
+            manifest.save()
+            return
+    
     # Process the JSON data
-    success = process_species_json(json_data)
+    importer = ReferenceImporter(supabase)
+    success = process_species_json(json_data, importer=importer)
     
     if success:
+        if manifest is not None:
+            if importer.summary.failed == 0 and \
+                    references_resolved(json_data.get('references'), importer.mapping_for('profile')):
+                manifest.record(json_file_path.name, file_hash=file_hash, rows=row_hashes)
+            else:
+                print("⚠️  Not all references were imported; the file will be retried by --changed-only")
+                manifest.forget(json_file_path.name)
+            manifest.save()
         print(f"\n✅ Import completed successfully!")
     else:
         print(f"\n❌ Import failed!")
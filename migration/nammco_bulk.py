@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+NAMMCO Bulk Catch Record Ingestion
+
+Vectorized path for the NAMMCO catch CSVs: each file is parsed into a frame in
+one pass (year/season parsing, numeric cleaning, column-variant detection),
+countries and areas are resolved through the reference cache, and the rows are
+written with batched upserts on the catch_records natural key
+(species_id, country_id, management_area_id, year). Re-importing a file
+updates the existing rows instead of adding duplicates.
+
+Parsing (parse_catch_file) touches no database, so files can be parsed in
+parallel worker processes; nammco_import.py drives the full import.
+
+Requires the unique constraint from catch_records_natural_key.sql.
+
+Usage:
+    from nammco_bulk import (parse_catch_file, ensure_references, attach_reference_ids,
+                             frame_to_records, upsert_catch_records)
+
+    parsed = parse_catch_file(csv_file)
+    ensure_references([parsed.frame], cache)
+    records = frame_to_records(attach_reference_ids(parsed.frame, species_id, cache))
+    upsert_catch_records(supabase, records)
+"""
+
+import json
+import time
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from postgrest.types import ReturnMethod
+
+try:
+    from config.instrumentation import get_metrics
+except ImportError:
+    from instrumentation import get_metrics
+
+from nammco_reference_cache import normalize_name
+
+CATCH_RECORD_KEY = ('species_id', 'country_id', 'management_area_id', 'year')
+CATCH_RECORD_VALUES = ('catch_total', 'quota_amount')
+UPSERT_BATCH_SIZE = 500
+FETCH_PAGE_SIZE = 1000
+
+MIN_YEAR = 1900
+MAX_YEAR = 2030
+
+@dataclass
+class ColumnMapping:
+    """CSV column variants (in priority order) and country aliases for NAMMCO exports"""
+    species: List[str] = field(default_factory=lambda: ['SPECIES (SCIENTIFIC NAME)', 'Scientific Name', 'Species', 'Taxon'])
+    country: List[str] = field(default_factory=lambda: ['COUNTRY', 'Country', 'Nation'])
+    area: List[str] = field(default_factory=lambda: ['AREA OR STOCK', 'Area', 'Stock', 'Management Area'])
+    year: List[str] = field(default_factory=lambda: ['YEAR OR SEASON', 'Year', 'Season'])
+    catch: List[str] = field(default_factory=lambda: ['CATCH TOTAL', 'Catch', 'Total Catch', 'Harvest'])
+    quota: List[str] = field(default_factory=lambda: ['QUOTA (IF APPLICABLE)', 'Quota', 'Limit'])
+    country_aliases: Dict[str, str] = field(default_factory=lambda: {'faroes': 'Faroe Islands'})
+
+    @classmethod
+    def from_json(cls, mapping_file: Path) -> 'ColumnMapping':
+        """
+        Load a mapping; keys that are left out keep their defaults
+
+        Args:
+            mapping_file (Path): JSON object with any of the dataclass fields
+
+        Returns:
+            ColumnMapping: Merged mapping
+        """
+        with open(mapping_file, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown column mapping keys: {', '.join(sorted(unknown))}")
+        return cls(**overrides)
+
+DEFAULT_MAPPING = ColumnMapping()
+
+@dataclass
+class ParsedFile:
+    """One CSV parsed into catch rows, before reference IDs are attached"""
+    csv_file: Path
+    species_name: Optional[str]
+    frame: pd.DataFrame
+    rows_read: int = 0
+    rows_skipped: int = 0
+    duplicate_keys: int = 0
+    parse_seconds: float = 0.0
+
+@dataclass
+class FileImportResult:
+    """Outcome of importing one CSV file"""
+    file_name: str
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_skipped: int = 0
+    duplicate_keys: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.seconds if self.seconds > 0 else 0.0
+
+@dataclass
+class CatchDiff:
+    """What an import would change in catch_records"""
+    inserts: int = 0
+    updates: int = 0
+    unchanged: int = 0
+    stale: int = 0
+    samples: List[str] = field(default_factory=list)
+
+def pick_column(df: pd.DataFrame, variants: List[str]) -> pd.Series:
+    """
+    Combine the first non-null value across the column variants present in the frame
+
+    Args:
+        df (pd.DataFrame): Raw CSV frame
+        variants (List[str]): Column names in priority order
+
+    Returns:
+        pd.Series: Values (all null if no variant is present)
+    """
+    result = pd.Series(pd.NA, index=df.index, dtype='object')
+    for column in variants:
+        if column in df.columns:
+            result = result.fillna(df[column])
+    return result
+
+def parse_years(values: pd.Series) -> pd.Series:
+    """
+    Parse "YEAR OR SEASON" values to a calendar year
+
+    "2019" and "2019.0" are taken as is and a season such as "2009/2010" maps to
+    its first year. Multi-year periods ("1992-2005") summarize several years in
+    one row and cannot be keyed on a single year, so they become null, as does
+    anything outside MIN_YEAR..MAX_YEAR.
+
+    Args:
+        values (pd.Series): Raw year or season values
+
+    Returns:
+        pd.Series: Nullable integer years
+    """
+    parts = values.astype('string').str.extract(r'^\s*(\d{4})(?:\.0+)?(?:\s*[-/]\s*(\d{4}))?\s*$')
+    first = pd.to_numeric(parts[0], errors='coerce')
+    last = pd.to_numeric(parts[1], errors='coerce')
+    years = first.where(last.isna() | (last - first <= 1))
+    years = years.where(years.between(MIN_YEAR, MAX_YEAR))
+    return years.astype('Int64')
+
+def clean_numeric(values: pd.Series) -> pd.Series:
+    """
+    Clean catch and quota values to whole numbers
+
+    Strips thousands separators and other non-numeric characters; "n/a",
+    "No quota", "*No reported catches" and blanks become null.
+
+    Args:
+        values (pd.Series): Raw values
+
+    Returns:
+        pd.Series: Nullable integers
+    """
+    text = values.astype('string').str.strip()
+    cleaned = text.str.replace(r'[^\d.\-]', '', regex=True)
+    numbers = pd.to_numeric(cleaned.where(cleaned.str.contains(r'\d', na=False)), errors='coerce')
+    return numbers.round().astype('Int64')
+
+def clean_text(values: pd.Series) -> pd.Series:
+    """Trim and collapse whitespace; blanks become null"""
+    text = values.astype('string').str.replace(r'\s+', ' ', regex=True).str.strip()
+    return text.mask(text == '')
+
+def species_from_filename(csv_file: Path) -> Optional[str]:
+    """'Balaenoptera_musculus_catches_2025-06-11.csv' -> 'Balaenoptera musculus'"""
+    parts = Path(csv_file).stem.split('_catches')[0].split('_')
+    return ' '.join(parts) if len(parts) >= 2 else None
+
+def parse_catch_frame(df: pd.DataFrame, mapping: ColumnMapping = DEFAULT_MAPPING) -> pd.DataFrame:
+    """
+    Turn a raw NAMMCO CSV frame into catch rows keyed by country and area name
+
+    Rows without a usable year, or without both catch and quota, are dropped.
+
+    Args:
+        df (pd.DataFrame): Raw CSV frame
+        mapping (ColumnMapping): Column variants and country aliases
+
+    Returns:
+        pd.DataFrame: country, area, year, catch_total, quota_amount
+    """
+    country = clean_text(pick_column(df, mapping.country))
+    if mapping.country_aliases:
+        aliases = {normalize_name(k): v for k, v in mapping.country_aliases.items()}
+        country = country.str.casefold().map(aliases).fillna(country).astype('string')
+
+    frame = pd.DataFrame({
+        'country': country,
+        'area': clean_text(pick_column(df, mapping.area)),
+        'year': parse_years(pick_column(df, mapping.year)),
+        'catch_total': clean_numeric(pick_column(df, mapping.catch)),
+        'quota_amount': clean_numeric(pick_column(df, mapping.quota))
+    })
+    return frame[frame['year'].notna() & (frame['catch_total'].notna() | frame['quota_amount'].notna())]
+
+def parse_catch_file(csv_file: Path, mapping: ColumnMapping = DEFAULT_MAPPING) -> ParsedFile:
+    """
+    Read and parse one NAMMCO CSV (no database access, safe to run in a worker process)
+
+    Rows that repeat an earlier country/area/year are dropped, keeping the
+    first as listed: one upsert statement cannot touch the same key twice.
+
+    Args:
+        csv_file (Path): CSV file
+        mapping (ColumnMapping): Column variants and country aliases
+
+    Returns:
+        ParsedFile: Parsed rows and counts
+    """
+    start = time.perf_counter()
+    df = pd.read_csv(csv_file, encoding='utf-8', comment='#', skip_blank_lines=True)
+
+    species_values = clean_text(pick_column(df, mapping.species)).dropna()
+    species_name = species_values.iloc[0] if len(species_values) else species_from_filename(csv_file)
+
+    frame = parse_catch_frame(df, mapping)
+    keys = pd.DataFrame({
+        'country': frame['country'].str.casefold(),
+        'area': frame['area'].str.casefold(),
+        'year': frame['year']
+    })
+    duplicates = keys.duplicated(keep='first')
+
+    return ParsedFile(
+        csv_file=Path(csv_file),
+        species_name=species_name,
+        frame=frame[~duplicates],
+        rows_read=len(df),
+        rows_skipped=len(df) - len(frame),
+        duplicate_keys=int(duplicates.sum()),
+        parse_seconds=time.perf_counter() - start
+    )
+
+def ensure_references(frames: List[pd.DataFrame], cache) -> None:
+    """Create the countries and areas of all frames that are not in the cache yet (one insert per table)"""
+    countries = pd.concat([f['country'] for f in frames]).dropna().unique() if frames else []
+    cache.ensure_countries(countries)
+
+    pairs = set()
+    for frame in frames:
+        for country, area in frame.loc[frame['area'].notna(), ['country', 'area']].drop_duplicates().itertuples(index=False):
+            pairs.add((area, cache.country_id(country) if not pd.isna(country) else None))
+    cache.ensure_areas(pairs)
+
+def attach_reference_ids(frame: pd.DataFrame, species_id: Optional[str], cache) -> pd.DataFrame:
+    """
+    Resolve country and area names to IDs from the cache
+
+    Args:
+        frame (pd.DataFrame): Output of parse_catch_frame
+        species_id (str, optional): Species the rows belong to
+        cache: ReferenceDataCache
+
+    Returns:
+        pd.DataFrame: Rows in catch_records columns, plus 'resolved' (False
+        where a species, country or area is not in the database yet)
+    """
+    country_ids = {name: cache.country_id(name) for name in frame['country'].dropna().unique()}
+    out = pd.DataFrame(index=frame.index)
+    out['species_id'] = species_id
+    out['country_id'] = frame['country'].map(country_ids).astype('object')
+
+    area_ids = {}
+    management_area_ids = []
+    for area, country_id in zip(frame['area'], out['country_id']):
+        if pd.isna(area):
+            management_area_ids.append(None)
+            continue
+        country_id = None if pd.isna(country_id) else country_id
+        if (area, country_id) not in area_ids:
+            area_ids[(area, country_id)] = cache.area_id(area, country_id)
+        management_area_ids.append(area_ids[(area, country_id)])
+    out['management_area_id'] = pd.Series(management_area_ids, index=frame.index, dtype='object')
+
+    out['year'] = frame['year']
+    out['catch_total'] = frame['catch_total']
+    out['quota_amount'] = frame['quota_amount']
+    out['data_source'] = 'NAMMCO'
+    out['resolved'] = (
+        (species_id is not None)
+        & (frame['country'].isna() | out['country_id'].notna())
+        & (frame['area'].isna() | out['management_area_id'].notna())
+    )
+    return out
+
+def frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a catch frame to JSON-ready dicts (NA -> None, numpy ints -> int)"""
+    frame = frame.drop(columns=['resolved'], errors='ignore')
+    records = frame.astype('object').where(frame.notna(), None).to_dict('records')
+    for record in records:
+        for column in ('year', 'catch_total', 'quota_amount'):
+            if record[column] is not None:
+                record[column] = int(record[column])
+    return records
+
+def record_key(record: Dict[str, Any]) -> Tuple:
+    """Natural key of a catch record as comparable values"""
+    return tuple(None if record.get(c) is None else str(record[c]) for c in CATCH_RECORD_KEY)
+
+def upsert_catch_records(supabase, records: List[Dict[str, Any]],
+                         batch_size: int = UPSERT_BATCH_SIZE) -> int:
+    """
+    Upsert catch records in batches keyed on CATCH_RECORD_KEY
+
+    Args:
+        supabase: Supabase client
+        records (List[Dict[str, Any]]): Rows with unique keys
+        batch_size (int): Rows per request
+
+    Returns:
+        int: Number of batches sent
+    """
+    metrics = get_metrics()
+    batches = 0
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        with metrics.span('upsert_catch_records', source='nammco') as span:
+            supabase.table('catch_records').upsert(
+                batch, on_conflict=','.join(CATCH_RECORD_KEY), returning=ReturnMethod.minimal
+            ).execute()
+            span.set(rows=len(batch))
+        batches += 1
+    return batches
+
+def fetch_existing_catch_records(supabase, species_ids: List[str]) -> Dict[Tuple, Dict[str, Any]]:
+    """
+    Load the stored catch records of the given species, keyed on CATCH_RECORD_KEY
+
+    Args:
+        supabase: Supabase client
+        species_ids (List[str]): Species to load
+
+    Returns:
+        Dict[Tuple, Dict[str, Any]]: Natural key -> stored row
+    """
+    columns = ','.join(CATCH_RECORD_KEY + CATCH_RECORD_VALUES)
+    existing = {}
+    for start in range(0, len(species_ids), 50):
+        chunk = species_ids[start:start + 50]
+        offset = 0
+        while True:
+            response = supabase.table('catch_records').select(columns) \
+                .in_('species_id', chunk).order('id') \
+                .range(offset, offset + FETCH_PAGE_SIZE - 1).execute()
+            page = response.data or []
+            for row in page:
+                existing[record_key(row)] = row
+            if len(page) < FETCH_PAGE_SIZE:
+                break
+            offset += FETCH_PAGE_SIZE
+    return existing
+
+def diff_catch_records(records: List[Dict[str, Any]], existing: Dict[Tuple, Dict[str, Any]],
+                       max_samples: int = 10) -> CatchDiff:
+    """
+    Compare parsed records against stored rows
+
+    Args:
+        records (List[Dict[str, Any]]): Records the import would upsert
+        existing (Dict[Tuple, Dict[str, Any]]): Output of fetch_existing_catch_records
+        max_samples (int): Changed rows to describe
+
+    Returns:
+        CatchDiff: Insert/update/unchanged counts, plus stored rows the CSVs no longer contain
+    """
+    diff = CatchDiff()
+    seen = set()
+    for record in records:
+        key = record_key(record)
+        stored = existing.get(key)
+        if stored is None:
+            diff.inserts += 1
+            continue
+        seen.add(key)
+        changed = [c for c in CATCH_RECORD_VALUES if stored.get(c) != record.get(c)]
+        if not changed:
+            diff.unchanged += 1
+            continue
+        diff.updates += 1
+        if len(diff.samples) < max_samples:
+            details = ', '.join(f"{c}: {stored.get(c)} -> {record.get(c)}" for c in changed)
+            diff.samples.append(f"year {record['year']} (country {record.get('country_id')}, "
+                                f"area {record.get('management_area_id')}): {details}")
+    diff.stale = len(set(existing) - seen)
+    return diff
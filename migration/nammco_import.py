@@ -1,663 +1,321 @@
-import pandas as pd
-from pathlib import Path
-import sys
+#!/usr/bin/env python3
+"""
+NAMMCO Catch Data Import
+
+Single ingestion path for the NAMMCO catch CSVs (replaces simple_nammco_import.py
+and nammco_working.py). Files are parsed in parallel worker processes with a
+pluggable column mapping, species/countries/management areas are resolved
+through one shared reference cache (missing ones created in one insert per
+table), and catch records are upserted in batches on
+(species_id, country_id, management_area_id, year), so re-imports are
+idempotent. --dry-run writes nothing and prints what the import would insert,
+update or leave unchanged.
+
+Usage:
+    python nammco_import.py [--csv-dir DIR] [--species FILE_STEM ...] [--dry-run]
+                            [--workers N] [--batch-size 500] [--mapping mapping.json]
+"""
+
 import os
-from datetime import datetime
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 # Add config directory to path
 sys.path.append(str(Path(__file__).parent.parent / 'config'))
 
-# Import the working Supabase configuration
-try:
-    from supabase_config import get_supabase_client
-    supabase = get_supabase_client()
-    print("✅ Supabase client created successfully")
-except ImportError:
-    print("❌ Error: Could not import supabase_config. Please ensure config/supabase_config.py exists.")
-    sys.exit(1)
-except Exception as e:
-    print(f"❌ Error creating Supabase client: {e}")
-    sys.exit(1)
-
-# Set this to a species filename (without .csv) to filter, or None for all
-SINGLE_SPECIES = None  # Process all files
+from instrumentation import get_metrics
+from nammco_reference_cache import ReferenceDataCache
+from nammco_bulk import (
+    DEFAULT_MAPPING, UPSERT_BATCH_SIZE, CatchDiff, ColumnMapping, FileImportResult, ParsedFile,
+    attach_reference_ids, diff_catch_records, ensure_references, fetch_existing_catch_records,
+    frame_to_records, parse_catch_file, upsert_catch_records
+)
 
 # Directory containing all NAMMCO CSVs
-CSV_DIR = Path("/Users/magnussmari/Arctic-Tracker-API/species_data/nammco")
+CSV_DIR = Path(__file__).parent.parent / 'species_data' / 'nammco'
 
-def create_basic_species(scientific_name):
-    """Create a basic species entry if it doesn't exist"""
-    try:
-        # Parse scientific name into genus and species
-        name_parts = scientific_name.strip().split()
-        if len(name_parts) < 2:
-            print(f"  ❌ Invalid scientific name format: {scientific_name}")
-            return None
-            
-        genus = name_parts[0]
-        species_name = name_parts[1]
-        
-        # Create basic species record
-        new_species = {
-            'scientific_name': scientific_name,
-            'common_name': scientific_name,  # Use scientific name as fallback
-            'kingdom': 'ANIMALIA',  # Default for NAMMCO species
-            'phylum': 'CHORDATA',   # Default for marine mammals
-            'class': 'MAMMALIA',    # Default for NAMMCO species
-            'order_name': 'UNKNOWN',
-            'family': 'UNKNOWN',
-            'genus': genus,
-            'species_name': species_name,
-            'authority': 'NAMMCO Import'
-        }
-        
-        response = supabase.table('species').insert(new_species).execute()
-        
-        if response.data and len(response.data) > 0:
-            new_species_id = response.data[0]['id']
-            print(f"  ✅ Created new species: {scientific_name} (ID: {new_species_id})")
-            return new_species_id
-        else:
-            print(f"  ❌ Failed to create species '{scientific_name}': {response}")
-            return None
-            
-    except Exception as e:
-        print(f"  ❌ Error creating species '{scientific_name}': {e}")
-        return None
+# Map common NAMMCO genera to their taxonomic families
+FAMILY_MAPPINGS = {
+    'balaenoptera': {'family': 'BALAENOPTERIDAE', 'order': 'CETACEA'},  # Rorqual whales
+    'balaena': {'family': 'BALAENIDAE', 'order': 'CETACEA'},  # Right whales
+    'megaptera': {'family': 'BALAENOPTERIDAE', 'order': 'CETACEA'},  # Humpback whale
+    'physeter': {'family': 'PHYSETERIDAE', 'order': 'CETACEA'},  # Sperm whale
+    'monodon': {'family': 'MONODONTIDAE', 'order': 'CETACEA'},  # Narwhal
+    'delphinapterus': {'family': 'MONODONTIDAE', 'order': 'CETACEA'},  # Beluga
+    'orcinus': {'family': 'DELPHINIDAE', 'order': 'CETACEA'},  # Orca
+    'globicephala': {'family': 'DELPHINIDAE', 'order': 'CETACEA'},  # Pilot whales
+    'lagenorhynchus': {'family': 'DELPHINIDAE', 'order': 'CETACEA'},  # White-sided dolphins
+    'phocoena': {'family': 'PHOCOENIDAE', 'order': 'CETACEA'},  # Porpoises
+    'odobenus': {'family': 'ODOBENIDAE', 'order': 'CARNIVORA'},  # Walrus
+    'phoca': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Seals
+    'halichoerus': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Grey seal
+    'pagophilus': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Harp seal
+    'cystophora': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Hooded seal
+    'erignathus': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Bearded seal
+    'ursus': {'family': 'URSIDAE', 'order': 'CARNIVORA'},  # Bears
+}
 
-def extract_family_from_filename(filename):
+def extract_family_from_filename(filename: str) -> Dict[str, str]:
     """Extract taxonomic family information from CSV filename"""
     filename_lower = filename.lower()
-    
-    # Map common NAMMCO species to their taxonomic families
-    family_mappings = {
-        'balaenoptera': {'family': 'BALAENOPTERIDAE', 'order': 'CETACEA'},  # Rorqual whales
-        'balaena': {'family': 'BALAENIDAE', 'order': 'CETACEA'},  # Right whales
-        'megaptera': {'family': 'BALAENOPTERIDAE', 'order': 'CETACEA'},  # Humpback whale
-        'physeter': {'family': 'PHYSETERIDAE', 'order': 'CETACEA'},  # Sperm whale
-        'monodon': {'family': 'MONODONTIDAE', 'order': 'CETACEA'},  # Narwhal
-        'delphinapterus': {'family': 'MONODONTIDAE', 'order': 'CETACEA'},  # Beluga
-        'orcinus': {'family': 'DELPHINIDAE', 'order': 'CETACEA'},  # Orca
-        'globicephala': {'family': 'DELPHINIDAE', 'order': 'CETACEA'},  # Pilot whales
-        'lagenorhynchus': {'family': 'DELPHINIDAE', 'order': 'CETACEA'},  # White-sided dolphins
-        'phocoena': {'family': 'PHOCOENIDAE', 'order': 'CETACEA'},  # Porpoises
-        'odobenus': {'family': 'ODOBENIDAE', 'order': 'CARNIVORA'},  # Walrus
-        'phoca': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Seals
-        'halichoerus': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Grey seal
-        'pagophilus': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Harp seal
-        'cystophora': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Hooded seal
-        'erignathus': {'family': 'PHOCIDAE', 'order': 'CARNIVORA'},  # Bearded seal
-        'ursus': {'family': 'URSIDAE', 'order': 'CARNIVORA'},  # Bears
-    }
-    
-    # Check filename for genus matches
-    for genus, family_info in family_mappings.items():
+    for genus, family_info in FAMILY_MAPPINGS.items():
         if genus in filename_lower:
             return family_info
-    
-    # Default for unknown species
     return {'family': 'UNKNOWN', 'order': 'CETACEA'}
 
-def get_or_create_species(scientific_name, csv_filename=None):
-    """Get species ID by scientific name or create if doesn't exist"""
-    try:
-        # Clean the scientific name
-        scientific_name_clean = scientific_name.strip() if scientific_name else ''
-        if not scientific_name_clean:
-            print(f"  ❌ Empty scientific name provided")
-            return None
-            
-        # First, check if species exists
-        response = supabase.table('species').select('id', 'scientific_name').eq('scientific_name', scientific_name_clean).execute()
-        
-        if response.data and len(response.data) > 0:
-            species_id = response.data[0]['id']
-            print(f"  ✅ Found existing species: {scientific_name_clean} (ID: {species_id})")
-            return species_id
-        else:
-            # Species not found - try case-insensitive search first
-            print(f"  🔍 Exact match not found for '{scientific_name_clean}', trying case-insensitive search...")
-            
-            # Get all species for case-insensitive comparison
-            all_species_response = supabase.table('species').select('id', 'scientific_name').execute()
-            if all_species_response.data:
-                for species in all_species_response.data:
-                    if species['scientific_name'].lower() == scientific_name_clean.lower():
-                        species_id = species['id']
-                        print(f"  ✅ Found species with case difference: {species['scientific_name']} (ID: {species_id})")
-                        return species_id
-            
-            # Still not found - create new species
-            print(f"  🔧 Species '{scientific_name_clean}' not found in database, creating new entry...")
-            return create_species_from_csv_data(scientific_name_clean, csv_filename or 'unknown')
-            
-    except Exception as e:
-        print(f"  ❌ Error getting/creating species '{scientific_name}': {e}")
-        return None
+def species_record(scientific_name: str, csv_file_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Build a basic species row for a species that only appears in NAMMCO data
 
-def create_species_from_csv_data(scientific_name, csv_file_name):
-    """Create a basic species entry from NAMMCO CSV data"""
-    try:
-        # Parse scientific name into genus and species
-        name_parts = scientific_name.strip().split()
-        if len(name_parts) < 2:
-            print(f"  ❌ Invalid scientific name format: {scientific_name}")
-            return None
-            
-        genus = name_parts[0]
-        species_name = name_parts[1]
-        
-        # Determine taxonomic info based on NAMMCO context (marine mammals)
-        # Parse family info from CSV filename if available
-        family_info = extract_family_from_filename(csv_file_name)
-        
-        # Create basic species record with marine mammal defaults
-        new_species = {
-            'scientific_name': scientific_name,
-            'common_name': scientific_name,  # Use scientific name as fallback
-            'kingdom': 'ANIMALIA',
-            'phylum': 'CHORDATA',
-            'class': 'MAMMALIA',  # NAMMCO focuses on marine mammals
-            'order_name': family_info.get('order', 'CETACEA'),  # Default to whales/dolphins
-            'family': family_info.get('family', 'UNKNOWN'),
-            'genus': genus,
-            'species_name': species_name,
-            'authority': 'NAMMCO Import - Auto-created',
-            'description': f'Species auto-created during NAMMCO data import from {csv_file_name}',
-            'habitat_description': 'Marine environment - Arctic/North Atlantic waters'
-        }
-        
-        # Insert the new species
-        response = supabase.table('species').insert(new_species).execute()
-        
-        if response.data and len(response.data) > 0:
-            new_species_id = response.data[0]['id']
-            print(f"  ✅ Created new species: {scientific_name} (ID: {new_species_id})")
-            return new_species_id
-        else:
-            print(f"  ❌ Failed to create species '{scientific_name}': {response}")
-            return None
-            
-    except Exception as e:
-        print(f"  ❌ Error creating species '{scientific_name}': {e}")
-        return None
+    Args:
+        scientific_name (str): "Genus species"
+        csv_file_name (str): Source file (used for the family lookup)
 
-def get_or_create_country(country_name):
-    """Get country ID by name or create if doesn't exist"""
-    if not country_name or country_name.strip() == '':
-        return None
-        
-    try:
-        country_clean = country_name.strip()
-        
-        # Try exact match first
-        response = supabase.table('countries').select('id', 'country_name').eq('country_name', country_clean).execute()
-        
-        if response.data and len(response.data) > 0:
-            country_id = response.data[0]['id']
-            print(f"  ✅ Found country: {country_clean} (ID: {country_id})")
-            return country_id
-        else:
-            # Try case-insensitive search
-            all_countries_response = supabase.table('countries').select('id', 'country_name').execute()
-            if all_countries_response.data:
-                for country in all_countries_response.data:
-                    if country['country_name'].lower() == country_clean.lower():
-                        country_id = country['id']
-                        print(f"  ✅ Found country with case difference: {country['country_name']} (ID: {country_id})")
-                        return country_id
-            
-            # Create new country
-            print(f"  🔧 Creating new country: {country_clean}")
-            new_country = {
-                'country_name': country_clean,
-                'nammco_member': True  # Assume NAMMCO member if in NAMMCO data
-            }
-            
-            insert_response = supabase.table('countries').insert(new_country).execute()
-            
-            if insert_response.data and len(insert_response.data) > 0:
-                new_country_id = insert_response.data[0]['id']
-                print(f"  ✅ Created new country: {country_clean} (ID: {new_country_id})")
-                return new_country_id
-            else:
-                print(f"  ❌ Failed to create country '{country_clean}': {insert_response}")
-                return None
-                
-    except Exception as e:
-        print(f"  ❌ Error getting/creating country '{country_name}': {e}")
+    Returns:
+        Optional[Dict[str, Any]]: Species row, or None if the name is not binomial
+    """
+    name_parts = scientific_name.split()
+    if len(name_parts) < 2:
         return None
 
-def get_country_id(country_name):
-    """Get country ID by name"""
-    return get_or_create_country(country_name)
+    family_info = extract_family_from_filename(csv_file_name)
+    return {
+        'scientific_name': scientific_name,
+        'common_name': scientific_name,  # Use scientific name as fallback
+        'kingdom': 'ANIMALIA',
+        'phylum': 'CHORDATA',
+        'class': 'MAMMALIA',  # NAMMCO focuses on marine mammals
+        'order_name': family_info.get('order', 'CETACEA'),
+        'family': family_info.get('family', 'UNKNOWN'),
+        'genus': name_parts[0],
+        'species_name': name_parts[1],
+        'authority': 'NAMMCO Import - Auto-created',
+        'description': f'Species auto-created during NAMMCO data import from {csv_file_name}',
+        'habitat_description': 'Marine environment - Arctic/North Atlantic waters'
+    }
 
-def get_or_create_area(area_name, country_id=None):
-    """Get or create management area"""
-    if not area_name or area_name.strip() == '':
-        return None
-        
-    area_clean = area_name.strip()
-    
-    try:
-        # Check if area exists with the same name and country_id
-        if country_id:
-            response = supabase.table('management_areas').select('id').eq('area_name', area_clean).eq('country_id', country_id).execute()
-        else:
-            response = supabase.table('management_areas').select('id').eq('area_name', area_clean).is_('country_id', 'null').execute()
-        
-        if response.data and len(response.data) > 0:
-            area_id = response.data[0]['id']
-            print(f"  ✅ Found area: {area_clean} (ID: {area_id})")
-            return area_id
-        else:
-            # Create new area
-            new_area = {
-                'area_name': area_clean,
-                'area_type': 'NAMMCO'
-            }
-            
-            if country_id:
-                new_area['country_id'] = country_id
-            
-            insert_response = supabase.table('management_areas').insert(new_area).execute()
-            
-            if insert_response.data and len(insert_response.data) > 0:
-                new_area_id = insert_response.data[0]['id']
-                print(f"  ✅ Created new management area: {area_clean} (ID: {new_area_id})")
-                return new_area_id
-            else:
-                print(f"  ❌ Failed to create area '{area_clean}': {insert_response}")
-                return None
-    except Exception as e:
-        print(f"  ❌ Error with area '{area_clean}': {e}")
-        return None
+@dataclass
+class ImportSummary:
+    """Totals for one import run"""
+    files: int = 0
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_skipped: int = 0
+    duplicate_keys: int = 0
+    seconds: float = 0.0
+    results: List[FileImportResult] = field(default_factory=list)
+    created: Dict[str, int] = field(default_factory=dict)
+    would_create: Dict[str, int] = field(default_factory=dict)
+    diff: Optional[CatchDiff] = None
 
-def insert_catch_record(species_id, country_id, area_id, year, catch_total, quota_amount=None, quota_notes=None, notes=None):
-    """Insert catch record into database"""
-    try:
-        # Validate required fields
-        if not species_id:
-            print(f"  ❌ Missing species_id for catch record")
-            return False
-            
-        if not year:
-            print(f"  ❌ Missing year for catch record")
-            return False
-        
-        # Clean and validate data
-        try:
-            year_int = int(year)
-            
-            # Handle catch_total
-            if catch_total and str(catch_total).strip() != '' and str(catch_total).lower() != 'nan':
-                catch_total_int = int(float(catch_total))  # Convert via float first to handle decimals
-            else:
-                catch_total_int = None
-            
-            # Handle quota_amount with NaN check
-            if quota_amount and str(quota_amount).strip() != '' and str(quota_amount).lower() != 'nan':
-                quota_amount_int = int(float(quota_amount))  # Convert via float first to handle decimals
+class NammcoImporter:
+    """Parses NAMMCO CSVs in parallel and upserts their catch records"""
+
+    def __init__(self, supabase, mapping: ColumnMapping = DEFAULT_MAPPING, workers: Optional[int] = None,
+                 batch_size: int = UPSERT_BATCH_SIZE, dry_run: bool = False):
+        """
+        Initialize the importer
+
+        Args:
+            supabase: Supabase client
+            mapping (ColumnMapping): CSV column variants and country aliases
+            workers (int, optional): Parser processes (default: one per CPU)
+            batch_size (int): Rows per upsert request
+            dry_run (bool): Report changes without writing anything
+        """
+        self.supabase = supabase
+        self.mapping = mapping
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.cache = ReferenceDataCache(supabase, verbose=not dry_run)
+        self.metrics = get_metrics()
+
+    def parse_files(self, csv_files: List[Path]) -> List[ParsedFile]:
+        """Parse all files, in worker processes when there is more than one CPU to use"""
+        workers = min(self.workers, len(csv_files))
+        with self.metrics.span('parse_nammco_files', source='nammco') as span:
+            if workers <= 1:
+                parsed = [parse_catch_file(f, self.mapping) for f in csv_files]
             else:
-                quota_amount_int = None
-                
-        except (ValueError, TypeError) as ve:
-            print(f"  ❌ Invalid numeric data: year={year}, catch_total={catch_total}, quota={quota_amount}: {ve}")
-            return False
-        
-        catch_record = {
-            'species_id': species_id,
-            'year': year_int,
-            'data_source': 'NAMMCO'
-        }
-        
-        # Add optional fields only if they have values
-        if country_id:
-            catch_record['country_id'] = country_id
-        if area_id:
-            catch_record['management_area_id'] = area_id
-        if catch_total_int is not None:
-            catch_record['catch_total'] = catch_total_int
-        if quota_amount_int is not None:
-            catch_record['quota_amount'] = quota_amount_int
-        if quota_notes and str(quota_notes).strip():
-            catch_record['quota_notes'] = str(quota_notes).strip()
-        if notes and str(notes).strip():
-            catch_record['notes'] = str(notes).strip()
-        
-        response = supabase.table('catch_records').insert(catch_record).execute()
-        
-        if response.data and len(response.data) > 0:
-            record_id = response.data[0]['id']
-            print(f"  ✅ Inserted catch record (ID: {record_id}) - Year: {year_int}, Catch: {catch_total_int}")
-            return True
-        else:
-            print(f"  ❌ Failed to insert catch record: {response}")
-            return False
-    except Exception as e:
-        print(f"  ❌ Error inserting catch record: {e}")
-        return False
-
-def get_column_value(row, column_variants):
-    """Get value from row using multiple possible column names"""
-    for col_name in column_variants:
-        if col_name in row.index and pd.notna(row[col_name]):
-            return row[col_name]
-    return None
-
-def test_database_connection():
-    """Test database connection and basic operations"""
-    try:
-        print("🔧 Testing database connection...")
-        
-        # Test basic table access
-        response = supabase.table('species').select('id', 'scientific_name').limit(5).execute()
-        
-        if response.data:
-            print(f"  ✅ Database connection successful")
-            print(f"  📊 Found {len(response.data)} sample species:")
-            for species in response.data[:3]:
-                print(f"    - {species['scientific_name']} (ID: {species['id']})")
-            return True
-        else:
-            print("  ❌ Database connection failed - no data returned")
-            return False
-            
-    except Exception as e:
-        print(f"  ❌ Database connection test failed: {e}")
-        return False
-
-def validate_species_creation():
-    """Validate that species creation is working properly"""
-    print("🔧 Testing species creation functionality...")
-    
-    # Test creating a sample species
-    test_species_name = "Testus specieus"
-    
-    try:
-        # First check it doesn't exist
-        response = supabase.table('species').select('id').eq('scientific_name', test_species_name).execute()
-        
-        if response.data:
-            print(f"  🧹 Cleaning up existing test species...")
-            # Clean up if it exists
-            supabase.table('species').delete().eq('scientific_name', test_species_name).execute()
-        
-        # Now test creation
-        species_id = create_species_from_csv_data(test_species_name, "test_file.csv")
-        
-        if species_id:
-            print(f"  ✅ Species creation test successful (ID: {species_id})")
-            
-            # Clean up test species
-            supabase.table('species').delete().eq('id', species_id).execute()
-            print(f"  🧹 Cleaned up test species")
-            return True
-        else:
-            print(f"  ❌ Species creation test failed")
-            return False
-            
-    except Exception as e:
-        print(f"  ❌ Species creation test error: {e}")
-        return False
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    parsed = list(executor.map(parse_catch_file, csv_files, repeat(self.mapping)))
+            span.set(rows=sum(len(p.frame) for p in parsed), files=len(parsed))
+        return parsed
 
-def process_csv_file(csv_file):
-    """Process a single CSV file"""
-    print(f"\n📂 Processing: {csv_file.name}")
-    
-    try:
-        # Read CSV with better error handling
-        df = pd.read_csv(csv_file, encoding='utf-8')
-        print(f"  📊 Found {len(df)} records")
-        print(f"  📋 Columns: {list(df.columns)}")
-        
-        if len(df) == 0:
-            print(f"  ⚠️  Empty file, skipping")
-            return 0
-        
-        # Show sample data for debugging
-        print(f"  📄 Sample row:")
-        if len(df) > 0:
-            sample_row = df.iloc[0]
-            for col in df.columns:
-                print(f"    {col}: {sample_row[col]}")
-        
-        # Extract species name from CSV data
-        species_column_variants = ['SPECIES (SCIENTIFIC NAME)', 'Scientific Name', 'Species', 'Taxon']
-        species_name = None
-        
-        for col_variant in species_column_variants:
-            if col_variant in df.columns:
-                species_name = df[col_variant].iloc[0]
-                print(f"  🔍 Found species column '{col_variant}': {species_name}")
-                break
-        
-        if not species_name:
-            print(f"  ❌ Could not find species column. Available columns: {list(df.columns)}")
-            return 0
-            
-        print(f"  🎯 Target species: {species_name}")
-        
-        # Get or create species ID (now with auto-creation)
-        species_id = get_or_create_species(species_name, csv_file.stem)
-        if not species_id:
-            print(f"  ❌ Cannot process without species ID, skipping file")
-            return 0
-            
-        processed_count = 0
-        error_count = 0
-        
-        # Process each row with better error handling
-        for idx, row in df.iterrows():
-            try:
-                # Extract data from row using flexible column mapping
-                country = get_column_value(row, ['COUNTRY', 'Country', 'Nation'])
-                area = get_column_value(row, ['AREA OR STOCK', 'Area', 'Stock', 'Management Area'])
-                year = get_column_value(row, ['YEAR OR SEASON', 'Year', 'Season'])
-                catch_total = get_column_value(row, ['CATCH TOTAL', 'Catch', 'Total Catch', 'Harvest'])
-                quota = get_column_value(row, ['QUOTA (IF APPLICABLE)', 'Quota', 'Limit'])
-                
-                # Validate required data
-                if not year:
-                    print(f"    ⚠️  Row {idx}: Missing year, skipping")
-                    continue
-                    
-                if not catch_total and not quota:
-                    print(f"    ⚠️  Row {idx}: No catch or quota data, skipping")
-                    continue
-                
-                # Clean and validate year
-                try:
-                    year_clean = int(float(str(year).strip()))
-                    if year_clean < 1900 or year_clean > 2030:
-                        print(f"    ⚠️  Row {idx}: Invalid year {year_clean}, skipping")
-                        continue
-                except (ValueError, TypeError):
-                    print(f"    ⚠️  Row {idx}: Cannot parse year '{year}', skipping")
-                    continue
-                
-                # Get or create country ID (now with auto-creation)
-                country_id = get_or_create_country(country) if country else None
-                
-                # Get or create area ID
-                area_id = get_or_create_area(area, country_id) if area else None
-                
-                # Insert record
-                if insert_catch_record(species_id, country_id, area_id, year_clean, catch_total, quota):
-                    processed_count += 1
-                else:
-                    error_count += 1
-                    
-            except Exception as e:
-                print(f"  ⚠️  Error processing row {idx}: {e}")
-                error_count += 1
-                continue
-        
-        print(f"  ✅ Successfully processed {processed_count} records")
-        if error_count > 0:
-            print(f"  ⚠️  {error_count} records had errors")
-        return processed_count
-        
-    except Exception as e:
-        print(f"  ❌ Error processing file: {e}")
-        import traceback
-        traceback.print_exc()
-        return 0
-
-def process_csv_file_old(csv_file):
-    """Process a single CSV file - old incomplete version"""
-    print(f"\n📂 Processing: {csv_file.name}")
-    
-    # This is the incomplete function that was at the end
-    # It's been replaced with the complete version above
-    
-    try:
-        # Read CSV with better error handling
-        df = pd.read_csv(csv_file, encoding='utf-8')
-        print(f"  📊 Found {len(df)} records")
-        print(f"  📋 Columns: {list(df.columns)}")
-        
-        if len(df) == 0:
-            print(f"  ⚠️  Empty file, skipping")
-            return 0
-        
-        # Show sample data for debugging
-        print(f"  📄 Sample row:")
-        if len(df) > 0:
-            sample_row = df.iloc[0]
-            for col in df.columns:
-                print(f"    {col}: {sample_row[col]}")
-        
-        # Extract species name from CSV data
-        species_column_variants = ['SPECIES (SCIENTIFIC NAME)', 'Scientific Name', 'Species', 'Taxon']
-        species_name = None
-        
-        for col_variant in species_column_variants:
-            if col_variant in df.columns:
-                species_name = df[col_variant].iloc[0]
-                print(f"  🔍 Found species column '{col_variant}': {species_name}")
-                break
-        
-        if not species_name:
-            print(f"  ❌ Could not find species column. Available columns: {list(df.columns)}")
-            return 0
-            
-        print(f"  🎯 Target species: {species_name}")
-        
-        # Get or create species ID (now with auto-creation)
-        species_id = get_or_create_species(species_name, csv_file.stem)
-        if not species_id:
-            print(f"  ❌ Cannot process without species ID, skipping file")
-            return 0
-            
-        processed_count = 0
-        error_count = 0
-        
-        # Process each row with better error handling
-        for idx, row in df.iterrows():
-            try:
-                # Extract data from row using flexible column mapping
-                country = get_column_value(row, ['COUNTRY', 'Country', 'Nation'])
-                area = get_column_value(row, ['AREA OR STOCK', 'Area', 'Stock', 'Management Area'])
-                year = get_column_value(row, ['YEAR OR SEASON', 'Year', 'Season'])
-                catch_total = get_column_value(row, ['CATCH TOTAL', 'Catch', 'Total Catch', 'Harvest'])
-                quota = get_column_value(row, ['QUOTA (IF APPLICABLE)', 'Quota', 'Limit'])
-                
-                # Validate required data
-                if not year:
-                    print(f"    ⚠️  Row {idx}: Missing year, skipping")
-                    continue
-                    
-                if not catch_total and not quota:
-                    print(f"    ⚠️  Row {idx}: No catch or quota data, skipping")
-                    continue
-                
-                # Clean and validate year
-                try:
-                    year_clean = int(float(str(year).strip()))
-                    if year_clean < 1900 or year_clean > 2030:
-                        print(f"    ⚠️  Row {idx}: Invalid year {year_clean}, skipping")
-                        continue
-                except (ValueError, TypeError):
-                    print(f"    ⚠️  Row {idx}: Cannot parse year '{year}', skipping")
-                    continue
-                
-                # Get or create country ID (now with auto-creation)
-                country_id = get_or_create_country(country) if country else None
-                
-                # Get or create area ID
-                area_id = get_or_create_area(area, country_id) if area else None
-                
-                # Insert record
-                if insert_catch_record(species_id, country_id, area_id, year_clean, catch_total, quota):
-                    processed_count += 1
+    def resolve_species(self, parsed: List[ParsedFile]) -> Dict[str, Optional[str]]:
+        """
+        Map each file's species name to an ID, creating missing species in one insert
+
+        Returns:
+            Dict[str, Optional[str]]: Species name -> ID (None if unknown in a dry run)
+        """
+        new_species = []
+        for p in parsed:
+            if p.species_name and self.cache.species_id(p.species_name) is None:
+                record = species_record(p.species_name, p.csv_file.name)
+                if record:
+                    new_species.append(record)
                 else:
-                    error_count += 1
-                    
-            except Exception as e:
-                print(f"  ⚠️  Error processing row {idx}: {e}")
-                error_count += 1
+                    print(f"  ❌ Invalid scientific name format: {p.species_name} ({p.csv_file.name})")
+
+        if new_species and not self.dry_run:
+            self.cache.ensure_species(new_species)
+        return {p.species_name: self.cache.species_id(p.species_name) for p in parsed if p.species_name}
+
+    def run(self, csv_files: List[Path]) -> ImportSummary:
+        """
+        Import (or, in a dry run, diff) the given CSV files
+
+        Args:
+            csv_files (List[Path]): NAMMCO catch CSVs
+
+        Returns:
+            ImportSummary: Per-file results and totals
+        """
+        start = time.perf_counter()
+        summary = ImportSummary(files=len(csv_files))
+
+        parsed = self.parse_files(csv_files)
+        for p in parsed:
+            summary.rows_read += p.rows_read
+            summary.rows_skipped += p.rows_skipped
+            summary.duplicate_keys += p.duplicate_keys
+
+        # Files without catch rows need no species or reference data
+        parsed = [p for p in parsed if len(p.frame) > 0]
+        species_ids = self.resolve_species(parsed)
+        if not self.dry_run:
+            ensure_references([p.frame for p in parsed], self.cache)
+
+        planned = []
+        unresolved = 0
+        for p in parsed:
+            species_id = species_ids.get(p.species_name)
+            if species_id is None and not self.dry_run:
+                print(f"  ❌ {p.csv_file.name}: no species ID for '{p.species_name}', skipping file")
                 continue
-        
-        print(f"  ✅ Successfully processed {processed_count} records")
-        if error_count > 0:
-            print(f"  ⚠️  {error_count} records had errors")
-        return processed_count
-        
-    except Exception as e:
-        print(f"  ❌ Error processing file: {e}")
-        import traceback
-        traceback.print_exc()
-        return 0
 
-def import_nammco_data():
+            write_start = time.perf_counter()
+            frame = attach_reference_ids(p.frame, species_id, self.cache)
+            records = frame_to_records(frame[frame['resolved']])
+            unresolved += len(frame) - len(records)
+
+            result = FileImportResult(file_name=p.csv_file.name, rows_read=p.rows_read,
+                                      rows_skipped=p.rows_skipped, duplicate_keys=p.duplicate_keys)
+            if self.dry_run:
+                planned.extend(records)
+            else:
+                result.batches = upsert_catch_records(self.supabase, records, self.batch_size)
+                result.rows_written = len(records)
+                self.metrics.counter('records_loaded_total', source='nammco').inc(len(records))
+            result.seconds = p.parse_seconds + time.perf_counter() - write_start
+            summary.results.append(result)
+            summary.rows_written += result.rows_written
+
+            if not self.dry_run:
+                print(f"📂 {result.file_name}: {result.rows_written} records "
+                      f"({result.rows_per_second:,.0f} rows/s, {result.batches} batch(es))")
+                if result.duplicate_keys:
+                    print(f"  ⚠️  {result.duplicate_keys} rows repeat an earlier country/area/year and were ignored")
+
+        if self.dry_run:
+            species_with_rows = sorted({r['species_id'] for r in planned})
+            summary.diff = diff_catch_records(planned, fetch_existing_catch_records(self.supabase, species_with_rows))
+            # Rows of species, countries or areas that do not exist yet can only be inserts
+            summary.diff.inserts += unresolved
+            summary.would_create = self._would_create(parsed, species_ids)
+        summary.created = dict(self.cache.created)
+        summary.seconds = time.perf_counter() - start
+        return summary
+
+    def _would_create(self, parsed: List[ParsedFile], species_ids: Dict[str, Optional[str]]) -> Dict[str, int]:
+        countries = set()
+        areas = set()
+        for p in parsed:
+            for country, area in p.frame[['country', 'area']].drop_duplicates().itertuples(index=False):
+                known_country = isinstance(country, str) and self.cache.country_id(country) is not None
+                if isinstance(country, str) and not known_country:
+                    countries.add(country.casefold())
+                country_id = self.cache.country_id(country) if known_country else None
+                if isinstance(area, str):
+                    if (isinstance(country, str) and not known_country) or self.cache.area_id(area, country_id) is None:
+                        areas.add((area.casefold(), country.casefold() if isinstance(country, str) else None))
+        return {
+            'species': sum(1 for species_id in species_ids.values() if species_id is None),
+            'countries': len(countries),
+            'management_areas': len(areas)
+        }
+
+def print_summary(summary: ImportSummary, dry_run: bool) -> None:
+    """Print totals (and the diff for a dry run)"""
+    print(f"\n📊 Import Summary{' (dry run, nothing written)' if dry_run else ''}:")
+    print(f"  - Files: {summary.files}")
+    print(f"  - Rows read: {summary.rows_read:,}")
+    print(f"  - Rows skipped (no valid year, or no catch or quota): {summary.rows_skipped:,}")
+    print(f"  - Repeated keys ignored: {summary.duplicate_keys:,}")
+
+    if dry_run and summary.diff:
+        diff = summary.diff
+        print(f"  - Would insert: {diff.inserts:,}")
+        print(f"  - Would update: {diff.updates:,}")
+        print(f"  - Unchanged: {diff.unchanged:,}")
+        print(f"  - Stored rows not in the CSVs: {diff.stale:,}")
+        for table, count in summary.would_create.items():
+            if count:
+                print(f"  - Would create {count} {table}")
+        for sample in diff.samples:
+            print(f"    • {sample}")
+    else:
+        rate = summary.rows_written / summary.seconds if summary.seconds > 0 else 0
+        print(f"  - Catch records upserted: {summary.rows_written:,} in {summary.seconds:.1f}s ({rate:,.0f} rows/s)")
+        for table, count in summary.created.items():
+            if count:
+                print(f"  - Created {count} {table}")
+
+def main():
     """Main import function"""
-    print("🚀 Starting NAMMCO data import with auto-species creation...")
-    
-    # Test database connection first
-    if not test_database_connection():
-        print("❌ Database connection failed, aborting import")
-        return
-    
-    # Test species creation functionality
-    if not validate_species_creation():
-        print("❌ Species creation validation failed, aborting import")
-        return
-    
-    print(f"📁 CSV Directory: {CSV_DIR}")
-    
-    if not CSV_DIR.exists():
-        print(f"❌ CSV directory not found: {CSV_DIR}")
-        return
-    
-    total_processed = 0
-    
-    # Get list of CSV files
-    csv_files = list(CSV_DIR.glob("*.csv"))
-    print(f"📄 Found {len(csv_files)} CSV files")
-    
-    # Filter for single species if specified
-    if SINGLE_SPECIES:
-        csv_files = [f for f in csv_files if f.stem == SINGLE_SPECIES]
-        print(f"🎯 Filtering for single species: {SINGLE_SPECIES}")
-        print(f"📄 Processing {len(csv_files)} file(s)")
-    
+    parser = argparse.ArgumentParser(description='Import NAMMCO catch CSVs into catch_records')
+    parser.add_argument('--csv-dir', type=Path, default=CSV_DIR, help='Directory with NAMMCO CSVs')
+    parser.add_argument('--species', action='append', default=[],
+                        help='Only import this file stem (repeatable), e.g. Balaenoptera_acutorostrata_catches_2025-06-11')
+    parser.add_argument('--dry-run', action='store_true', help='Show inserts/updates without writing')
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=UPSERT_BATCH_SIZE, help='Rows per upsert request')
+    parser.add_argument('--mapping', type=Path, help='JSON column mapping overrides (see ColumnMapping)')
+    args = parser.parse_args()
+
+    print("🚀 Starting NAMMCO data import...")
+    if not args.csv_dir.exists():
+        print(f"❌ CSV directory not found: {args.csv_dir}")
+        sys.exit(1)
+
+    csv_files = sorted(args.csv_dir.glob('*.csv'))
+    if args.species:
+        csv_files = [f for f in csv_files if f.stem in args.species]
     if not csv_files:
         print("❌ No CSV files to process")
-        return
-    
-    # Process each CSV file
-    for csv_file in csv_files:
-        count = process_csv_file(csv_file)
-        total_processed += count
-    
-    print(f"\n🎉 Import complete! Total records processed: {total_processed}")
-    
-    # Show summary of created species
-    print(f"\n📊 Import Summary:")
-    print(f"  - Total catch records processed: {total_processed}")
-    print(f"  - Auto-creation enabled for missing species and countries")
-    print(f"  - All data should now be properly linked to species in the database")
+        sys.exit(1)
+    print(f"📄 Found {len(csv_files)} CSV files in {args.csv_dir}")
+
+    try:
+        from supabase_config import get_supabase_client
+        supabase = get_supabase_client()
+    except Exception as e:
+        print(f"❌ Error creating Supabase client: {e}")
+        sys.exit(1)
+
+    mapping = ColumnMapping.from_json(args.mapping) if args.mapping else DEFAULT_MAPPING
+    importer = NammcoImporter(supabase, mapping=mapping, workers=args.workers,
+                              batch_size=args.batch_size, dry_run=args.dry_run)
+    summary = importer.run(csv_files)
+    print_summary(summary, args.dry_run)
 
 if __name__ == "__main__":
-    import_nammco_data()
\ No newline at end of file
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+NAMMCO Reference Data Cache
+
+Preloads countries, management areas and species once and resolves names in
+memory, so importing the NAMMCO catch CSVs no longer costs a REST query per
+row. Names are matched exactly first, then on a normalized key (case and
+whitespace folded), which is what the per-row lookups did with a full-table
+download on every miss. Missing countries and areas are created in one bulk
+insert per call.
+
+Usage:
+    from nammco_reference_cache import ReferenceDataCache
+
+    cache = ReferenceDataCache(supabase)
+    cache.ensure_countries(['Greenland', 'Norway'])
+    country_id = cache.country_id('greenland')
+"""
+
+from typing import Dict, List, Optional, Tuple, Iterable, Any
+
+try:
+    from config.postgrest_queries import fetch_paginated, PAGE_SIZE
+except ImportError:
+    from postgrest_queries import fetch_paginated, PAGE_SIZE
+
+def normalize_name(name: Any) -> str:
+    """Case- and whitespace-insensitive lookup key"""
+    return ' '.join(str(name).split()).casefold() if name is not None else ''
+
+def clean_name(name: Any) -> str:
+    """Name as stored in the database (trimmed, inner whitespace collapsed)"""
+    return ' '.join(str(name).split()) if name is not None else ''
+
+class ReferenceDataCache:
+    """In-memory index of the reference tables used by the NAMMCO import"""
+
+    def __init__(self, supabase, verbose: bool = True):
+        """
+        Initialize the cache and preload all reference tables
+
+        Args:
+            supabase: Supabase client
+            verbose (bool): Print created entities
+        """
+        self.supabase = supabase
+        self.verbose = verbose
+        self.queries = 0
+
+        self.countries: Dict[str, str] = {}
+        self.countries_normalized: Dict[str, str] = {}
+        self.species: Dict[str, str] = {}
+        self.species_normalized: Dict[str, str] = {}
+        self.areas: Dict[Tuple[str, Optional[str]], Any] = {}
+
+        self.created = {'countries': 0, 'management_areas': 0, 'species': 0}
+        self.refresh()
+
+    def _fetch_all(self, table: str, columns: str) -> List[Dict[str, Any]]:
+        rows = fetch_paginated(lambda: self.supabase.table(table), columns)
+        # One request per full page plus the final short one
+        self.queries += len(rows) // PAGE_SIZE + 1
+        return rows
+
+    def refresh(self) -> None:
+        """Reload countries, management areas and species from the database"""
+        self.countries.clear()
+        self.countries_normalized.clear()
+        for country in self._fetch_all('countries', 'id,country_name'):
+            self._add_country(country)
+
+        self.areas.clear()
+        for area in self._fetch_all('management_areas', 'id,area_name,country_id'):
+            self._add_area(area)
+
+        self.species.clear()
+        self.species_normalized.clear()
+        for species in self._fetch_all('species', 'id,scientific_name'):
+            self.add_species(species['scientific_name'], species['id'])
+
+    # ------------------------------------------------------------------ countries
+
+    def _add_country(self, country: Dict[str, Any]) -> None:
+        name = country.get('country_name')
+        if not name:
+            return
+        self.countries.setdefault(name, country['id'])
+        self.countries_normalized.setdefault(normalize_name(name), country['id'])
+
+    def country_id(self, country_name: Any) -> Optional[str]:
+        """
+        Resolve a country name without querying the database
+
+        Args:
+            country_name: Name as found in the CSV
+
+        Returns:
+            Optional[str]: Country ID or None if unknown
+        """
+        if not clean_name(country_name):
+            return None
+        return self.countries.get(clean_name(country_name)) or \
+            self.countries_normalized.get(normalize_name(country_name))
+
+    def ensure_countries(self, country_names: Iterable[Any]) -> None:
+        """
+        Create every country that is not in the cache yet, in one insert
+
+        Args:
+            country_names: Names as found in the CSV
+        """
+        missing: Dict[str, str] = {}
+        for name in country_names:
+            if clean_name(name) and self.country_id(name) is None:
+                missing.setdefault(normalize_name(name), clean_name(name))
+
+        if missing:
+            new_countries = [{'country_name': name, 'nammco_member': True} for name in missing.values()]
+            response = self.supabase.table('countries').insert(new_countries).execute()
+            self.queries += 1
+            for country in response.data or []:
+                self._add_country(country)
+                self.created['countries'] += 1
+                if self.verbose:
+                    print(f"  ✅ Created new country: {country['country_name']} (ID: {country['id']})")
+
+    # ------------------------------------------------------------------ areas
+
+    def _add_area(self, area: Dict[str, Any]) -> None:
+        if area.get('area_name'):
+            self.areas.setdefault((normalize_name(area['area_name']), area.get('country_id')), area['id'])
+
+    def area_id(self, area_name: Any, country_id: Optional[str] = None) -> Optional[Any]:
+        """
+        Resolve a management area for a country (or for no country)
+
+        Args:
+            area_name: Area or stock name as found in the CSV
+            country_id (str, optional): Owning country
+
+        Returns:
+            Optional[Any]: Management area ID or None if unknown
+        """
+        if not clean_name(area_name):
+            return None
+        return self.areas.get((normalize_name(area_name), country_id))
+
+    def ensure_areas(self, areas: Iterable[Tuple[Any, Optional[str]]]) -> None:
+        """
+        Create every (area, country) pair that is not in the cache yet, in one insert
+
+        Args:
+            areas: (area name, country ID) pairs
+        """
+        missing: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        for area_name, country_id in areas:
+            if clean_name(area_name) and self.area_id(area_name, country_id) is None:
+                missing.setdefault((normalize_name(area_name), country_id), {
+                    'area_name': clean_name(area_name),
+                    'area_type': 'NAMMCO',
+                    'country_id': country_id
+                })
+
+        if missing:
+            response = self.supabase.table('management_areas').insert(list(missing.values())).execute()
+            self.queries += 1
+            for area in response.data or []:
+                self._add_area(area)
+                self.created['management_areas'] += 1
+                if self.verbose:
+                    print(f"  ✅ Created new management area: {area['area_name']} (ID: {area['id']})")
+
+    # ------------------------------------------------------------------ species
+
+    def add_species(self, scientific_name: str, species_id: str) -> None:
+        """Register a species (e.g. one created by the importer)"""
+        if scientific_name:
+            self.species.setdefault(scientific_name, species_id)
+            self.species_normalized.setdefault(normalize_name(scientific_name), species_id)
+
+    def ensure_species(self, new_species: Iterable[Dict[str, Any]]) -> None:
+        """
+        Create every species that is not in the cache yet, in one insert
+
+        Args:
+            new_species: Full species rows to insert (keyed by 'scientific_name')
+        """
+        missing: Dict[str, Dict[str, Any]] = {}
+        for species in new_species:
+            if self.species_id(species['scientific_name']) is None:
+                missing.setdefault(normalize_name(species['scientific_name']), species)
+
+        if missing:
+            response = self.supabase.table('species').insert(list(missing.values())).execute()
+            self.queries += 1
+            for species in response.data or []:
+                self.add_species(species['scientific_name'], species['id'])
+                self.created['species'] += 1
+                if self.verbose:
+                    print(f"  ✅ Created new species: {species['scientific_name']} (ID: {species['id']})")
+
+    def species_id(self, scientific_name: Any) -> Optional[str]:
+        """
+        Resolve a scientific name without querying the database
+
+        Args:
+            scientific_name: Name as found in the CSV
+
+        Returns:
+            Optional[str]: Species ID or None if unknown
+        """
+        if not clean_name(scientific_name):
+            return None
+        return self.species.get(clean_name(scientific_name)) or \
+            self.species_normalized.get(normalize_name(scientific_name))
@@ -17,6 +17,7 @@ from supabase import create_client, Client
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.supabase_config import get_supabase_client
+from config.country_dimension import get_country_dimension
 
 # Configure logging
 logging.basicConfig(
@@ -129,7 +130,7 @@ class ArcticSpeciesTradeAnalyzerFixed:
             "Stejneger's beaked whale": "Mesoplodon stejnegeri"
         }
         
-        self.arctic_states = ['CA', 'GL', 'US', 'RU', 'NO', 'IS', 'FI', 'SE', 'DK']
+        self.arctic_states = get_country_dimension(self.supabase).arctic_codes
         self.purpose_codes = {
             'T': 'Commercial',
             'Z': 'Zoo',
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Batched Reference Import for Species Profile JSONs
+
+Collects the references of every species profile JSON before touching the
+database, so a reference cited by several profiles is looked up and inserted
+once:
+
+1. Dedup locally by DOI (normalized, e.g. https://doi.org/ prefix dropped) or,
+   without a DOI, by normalized full citation.
+2. Resolve existing rows with bulk in-list lookups on doi, full_citation and
+   source_id instead of two SELECTs per reference. Citations are only looked
+   up for references their DOI did not resolve. Values are quoted and escaped
+   by config/postgrest_filters.py, since citations contain commas,
+   parentheses and double quotes.
+3. Insert the remaining references in batches.
+
+New references get a deterministic source_id (title, year and a hash of the
+dedup key), so re-running the import finds them again.
+
+Usage:
+    from reference_import import ReferenceImporter
+
+    importer = ReferenceImporter(supabase)
+    mappings = importer.import_profiles({'Monodon monoceros': profile_json['references']})
+    mappings['Monodon monoceros']     # full_citation -> references.id
+"""
+
+import re
+import hashlib
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from config.instrumentation import get_metrics
+    from config.postgrest_filters import in_list
+except ImportError:
+    from instrumentation import get_metrics
+    from postgrest_filters import in_list
+
+INSERT_BATCH_SIZE = 200
+# Values per in-list filter; citations are long, so keep the request URL short
+DOI_CHUNK_SIZE = 100
+CITATION_CHUNK_SIZE = 20
+
+ReferenceKey = Tuple[str, str]
+
+_DOI_PREFIX = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+def normalize_doi(doi: Any) -> str:
+    """Lowercase DOI without resolver prefix ('' if missing)"""
+    if not doi:
+        return ''
+    return _DOI_PREFIX.sub('', str(doi).strip()).strip().lower()
+
+def normalize_citation(citation: Any) -> str:
+    """Citation reduced to lowercase words, so spacing/punctuation variants compare equal"""
+    text = unicodedata.normalize('NFKC', str(citation or '')).lower()
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+def reference_key(ref: Dict[str, Any]) -> ReferenceKey:
+    """Dedup key of a reference: its DOI, or its normalized citation without one"""
+    doi = normalize_doi(ref.get('doi'))
+    if doi:
+        return ('doi', doi)
+    return ('citation', normalize_citation(ref.get('full_citation')))
+
+def make_source_id(ref: Dict[str, Any], key: ReferenceKey) -> str:
+    """Stable source_id: title prefix, year and a hash of the dedup key"""
+    digest = hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()[:10]
+    return f"{ref['title'][:50].replace(' ', '_')}_{ref.get('year', 'unknown')}_{digest}"
+
+def reference_record(ref: Dict[str, Any], source_id: str) -> Dict[str, Any]:
+    """references row for a profile JSON reference"""
+    return {
+        'source_id': source_id,
+        'title': ref['title'],
+        'authors': ', '.join(ref['authors']) if isinstance(ref.get('authors'), list) else ref.get('authors', ''),
+        'journal': ref.get('journal'),
+        'year': ref.get('year'),
+        'doi': ref.get('doi'),
+        'full_citation': ref['full_citation']
+    }
+
+def _chunks(values: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+@dataclass
+class ReferenceImportSummary:
+    """Counts from one reference import"""
+    references_seen: int = 0
+    unique_references: int = 0
+    skipped_incomplete: int = 0
+    existing: int = 0
+    inserted: int = 0
+    failed: int = 0
+    requests: int = 0
+    errors: List[str] = field(default_factory=list)
+
+class ReferenceImporter:
+    """Dedups profile references locally and writes them with bulk lookups and batched inserts"""
+
+    def __init__(self, supabase, batch_size: int = INSERT_BATCH_SIZE, dry_run: bool = False):
+        """
+        Args:
+            supabase: Supabase client
+            batch_size (int): References per insert request
+            dry_run (bool): Resolve existing references but insert nothing
+        """
+        self.supabase = supabase
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.metrics = get_metrics()
+        self.summary = ReferenceImportSummary()
+
+        # Dedup key -> first reference seen with that key
+        self.references: Dict[ReferenceKey, Dict[str, Any]] = {}
+        # Profile -> (full_citation, key) in file order
+        self.profile_citations: Dict[str, List[Tuple[str, ReferenceKey]]] = {}
+        # Dedup key -> references.id
+        self.reference_ids: Dict[ReferenceKey, str] = {}
+
+    def collect(self, profile: str, references_data: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add the references of one profile
+
+        Args:
+            profile (str): Profile name (e.g. the species scientific name)
+            references_data (Iterable[Dict[str, Any]]): 'references' list of the profile JSON
+        """
+        citations = self.profile_citations.setdefault(profile, [])
+        for ref in references_data or []:
+            self.summary.references_seen += 1
+            if not ref.get('title') or not ref.get('full_citation'):
+                print(f"  ⚠️  Skipping incomplete reference: {ref}")
+                self.summary.skipped_incomplete += 1
+                continue
+            key = reference_key(ref)
+            self.references.setdefault(key, ref)
+            citations.append((ref['full_citation'], key))
+        self.summary.unique_references = len(self.references)
+
+    def _select(self, column: str, values: List[str], chunk_size: int) -> List[Dict[str, Any]]:
+        rows = []
+        for chunk in _chunks(values, chunk_size):
+            response = self.supabase.table('references').select('id, source_id, doi, full_citation') \
+                .filter(column, 'in', in_list(chunk)).execute()
+            self.summary.requests += 1
+            rows.extend(response.data or [])
+        return rows
+
+    def resolve_existing(self) -> int:
+        """
+        Find stored references for the collected keys (by DOI, citation, then source_id)
+
+        Returns:
+            int: Number of collected references already in the database
+        """
+        with self.metrics.span('resolve_references', table='references') as span:
+            pending = {key: ref for key, ref in self.references.items() if key not in self.reference_ids}
+
+            doi_values = sorted({str(ref['doi']).strip() for key, ref in pending.items() if key[0] == 'doi'})
+            for row in self._select('doi', doi_values, DOI_CHUNK_SIZE):
+                key = ('doi', normalize_doi(row.get('doi')))
+                if key in pending:
+                    self.reference_ids.setdefault(key, row['id'])
+
+            # Only references the DOI lookup left unresolved
+            citation_values = sorted({ref['full_citation'] for key, ref in pending.items()
+                                      if key not in self.reference_ids})
+            for row in self._select('full_citation', citation_values, CITATION_CHUNK_SIZE):
+                for key in (('doi', normalize_doi(row.get('doi'))),
+                            ('citation', normalize_citation(row.get('full_citation')))):
+                    if key in pending:
+                        self.reference_ids.setdefault(key, row['id'])
+
+            source_ids = {make_source_id(ref, key): key for key, ref in pending.items()
+                          if key not in self.reference_ids}
+            for row in self._select('source_id', sorted(source_ids), DOI_CHUNK_SIZE):
+                self.reference_ids.setdefault(source_ids[row['source_id']], row['id'])
+
+            found = sum(1 for key in pending if key in self.reference_ids)
+            self.summary.existing += found
+            span.set(references=len(pending), existing=found)
+            return found
+
+    def insert_new(self) -> int:
+        """
+        Insert the collected references that were not found, in batches
+
+        Returns:
+            int: Number of references inserted
+        """
+        new_keys = [key for key in self.references if key not in self.reference_ids]
+        if self.dry_run:
+            print(f"  🔍 DRY RUN: Would insert {len(new_keys)} new references")
+            return 0
+
+        inserted = 0
+        for batch_keys in _chunks(new_keys, self.batch_size):
+            records = {make_source_id(self.references[key], key): key for key in batch_keys}
+            with self.metrics.span('insert_references', table='references') as span:
+                try:
+                    response = self.supabase.table('references').insert(
+                        [reference_record(self.references[key], source_id) for source_id, key in records.items()]
+                    ).execute()
+                except Exception as e:
+                    self.summary.failed += len(batch_keys)
+                    self.summary.errors.append(f"Insert of {len(batch_keys)} references failed: {e}")
+                    print(f"  ❌ Failed to insert {len(batch_keys)} references: {e}")
+                    continue
+                finally:
+                    self.summary.requests += 1
+                for row in response.data or []:
+                    self.reference_ids[records[row['source_id']]] = row['id']
+                    inserted += 1
+                span.set(rows=len(batch_keys))
+
+        self.summary.inserted += inserted
+        self.metrics.counter('records_written_total', table='references', action='insert').inc(inserted)
+        return inserted
+
+    def mapping_for(self, profile: str) -> Dict[str, str]:
+        """full_citation -> references.id for one collected profile"""
+        return {citation: self.reference_ids[key]
+                for citation, key in self.profile_citations.get(profile, [])
+                if key in self.reference_ids}
+
+    def import_profiles(self, profiles: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, str]]:
+        """
+        Import the references of many profiles at once
+
+        Args:
+            profiles (Dict[str, List[Dict[str, Any]]]): Profile name -> 'references' list
+
+        Returns:
+            Dict[str, Dict[str, str]]: Profile name -> (full_citation -> references.id)
+        """
+        for profile, references_data in profiles.items():
+            self.collect(profile, references_data)
+        self.resolve_existing()
+        self.insert_new()
+        return {profile: self.mapping_for(profile) for profile in profiles}
+
+    def print_summary(self) -> None:
+        s = self.summary
+        print(f"📚 References: {s.references_seen} cited, {s.unique_references} unique, "
+              f"{s.existing} existing, {s.inserted} inserted, {s.skipped_incomplete} skipped, "
+              f"{s.failed} failed ({s.requests} requests)")
@@ -0,0 +1,93 @@
+-- Schema Introspection Functions
+-- Catalog RPC used by config/schema_introspection.py when no direct connection is configured
+-- Returns tables, columns, keys and indexes of one schema in a single call instead of
+-- probing every table and sampling rows through the REST API.
+-- Keep the four sub-queries in step with CATALOG_QUERIES in config/schema_introspection.py.
+
+CREATE OR REPLACE FUNCTION "public"."schema_catalog"(p_schema text DEFAULT 'public')
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'tables', COALESCE((
+            SELECT jsonb_agg(to_jsonb(t) ORDER BY t.table_name)
+            FROM (
+                SELECT c.relname::text AS table_name,
+                       CASE c.relkind WHEN 'v' THEN 'view' WHEN 'm' THEN 'materialized view' ELSE 'table' END AS table_type,
+                       CASE WHEN c.relkind IN ('r', 'p', 'm') AND c.reltuples >= 0 THEN c.reltuples::bigint END AS approx_rows,
+                       pg_total_relation_size(c.oid) AS total_bytes
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = p_schema
+                  AND c.relkind IN ('r', 'p', 'v', 'm')
+            ) t
+        ), '[]'::jsonb),
+        'columns', COALESCE((
+            SELECT jsonb_agg(to_jsonb(t) ORDER BY t.table_name, t.position)
+            FROM (
+                SELECT col.table_name::text AS table_name,
+                       col.column_name::text AS column_name,
+                       col.ordinal_position::int AS position,
+                       col.data_type::text AS data_type,
+                       col.udt_name::text AS udt_name,
+                       col.is_nullable = 'YES' AS is_nullable,
+                       col.column_default::text AS column_default,
+                       s.null_frac::float8 AS null_frac,
+                       s.n_distinct::float8 AS n_distinct
+                FROM information_schema.columns col
+                LEFT JOIN pg_stats s
+                  ON s.schemaname = col.table_schema
+                 AND s.tablename = col.table_name
+                 AND s.attname = col.column_name
+                 AND NOT s.inherited
+                WHERE col.table_schema = p_schema
+            ) t
+        ), '[]'::jsonb),
+        'constraints', COALESCE((
+            SELECT jsonb_agg(to_jsonb(t) ORDER BY t.table_name, t.constraint_name)
+            FROM (
+                SELECT rel.relname::text AS table_name,
+                       con.conname::text AS constraint_name,
+                       con.contype::text AS constraint_type,
+                       array_agg(att.attname::text ORDER BY k.ord) AS columns,
+                       frel.relname::text AS references_table,
+                       array_remove(array_agg(fatt.attname::text ORDER BY k.ord), NULL) AS references_columns
+                FROM pg_constraint con
+                JOIN pg_class rel ON rel.oid = con.conrelid
+                JOIN pg_namespace n ON n.oid = rel.relnamespace
+                CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = k.attnum
+                LEFT JOIN pg_class frel ON frel.oid = con.confrelid
+                LEFT JOIN pg_attribute fatt ON fatt.attrelid = con.confrelid AND fatt.attnum = con.confkey[k.ord]
+                WHERE n.nspname = p_schema
+                  AND con.contype IN ('p', 'f', 'u')
+                GROUP BY rel.relname, con.conname, con.contype, frel.relname
+            ) t
+        ), '[]'::jsonb),
+        'indexes', COALESCE((
+            SELECT jsonb_agg(to_jsonb(t) ORDER BY t.table_name, t.index_name)
+            FROM (
+                SELECT tbl.relname::text AS table_name,
+                       idx.relname::text AS index_name,
+                       ix.indisunique AS is_unique,
+                       ix.indisprimary AS is_primary,
+                       array_remove(array_agg(a.attname::text ORDER BY k.ord), NULL) AS columns,
+                       pg_get_indexdef(ix.indexrelid) AS definition
+                FROM pg_index ix
+                JOIN pg_class tbl ON tbl.oid = ix.indrelid
+                JOIN pg_class idx ON idx.oid = ix.indexrelid
+                JOIN pg_namespace n ON n.oid = tbl.relnamespace
+                CROSS JOIN LATERAL unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                LEFT JOIN pg_attribute a ON a.attrelid = tbl.oid AND a.attnum = k.attnum
+                WHERE n.nspname = p_schema
+                GROUP BY tbl.relname, idx.relname, ix.indisunique, ix.indisprimary, ix.indexrelid
+            ) t
+        ), '[]'::jsonb)
+    );
+$$;
+
+COMMENT ON FUNCTION "public"."schema_catalog" IS 'Tables (reltuples row estimates), columns (pg_stats null_frac/n_distinct), keys and indexes of a schema as one JSON document';
+
+-- Make the function visible to PostgREST
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Country Cleanup Equivalence Test (local Postgres)
+
+Runs cleanup_country_references.py twice against the same seeded local
+database - once with the original row-by-row updates, once set-based - and
+checks that both leave identical countries and catch_records.country_id links.
+
+Needs a disposable local Postgres with PostgREST in front of it:
+
+    createdb arctic_test
+    postgrest  # db-uri = postgres://localhost/arctic_test, db-anon-role with table/function grants
+
+Usage:
+    TEST_DATABASE_URL=postgresql://localhost/arctic_test \\
+    TEST_SUPABASE_URL=http://localhost:3000 TEST_SUPABASE_KEY=<jwt> \\
+        python migration/test_country_cleanup.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import psycopg2
+
+REPO_ROOT = Path(__file__).parent.parent
+SCHEMA_FILES = [
+    REPO_ROOT / 'benchmarks' / 'local_schema.sql',
+    REPO_ROOT / 'migration' / 'country_cleanup_functions.sql'
+]
+
+# Raw catch_records.country values, including whitespace variants, ISO codes and unknown names
+CATCH_COUNTRIES = ['Norway', 'Norway ', 'Greenland', 'NO', 'CA', 'Atlantis', 'Canada', '  ', 'Faroe Islands']
+TRADE_CODES = [('US', 'CA', None), ('JP', 'NO', ''), ('XX', 'GL', 'CA'), ('NO', 'RU', 'RU')]
+
+def reset_and_seed(conn) -> None:
+    """Empty the touched tables and insert the fixture rows"""
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE catch_records, cites_trade_records, management_areas, countries, species CASCADE")
+        cur.execute("""
+            INSERT INTO countries (country_name, country_code) VALUES ('Norway', 'NO'), ('Greenland', NULL)
+        """)
+        cur.execute("""
+            INSERT INTO species (scientific_name, kingdom, phylum, class, order_name, family, genus, species_name)
+            VALUES ('Monodon monoceros', 'ANIMALIA', 'CHORDATA', 'MAMMALIA', 'CETACEA', 'MONODONTIDAE', 'Monodon', 'monoceros')
+            RETURNING id
+        """)
+        species_id = cur.fetchone()[0]
+        for i in range(60):
+            cur.execute("INSERT INTO catch_records (species_id, year, country) VALUES (%s, %s, %s)",
+                        (species_id, 1990 + i, CATCH_COUNTRIES[i % len(CATCH_COUNTRIES)]))
+        for importer, exporter, origin in TRADE_CODES:
+            cur.execute("INSERT INTO cites_trade_records (species_id, importer, exporter, origin) VALUES (%s, %s, %s, %s)",
+                        (species_id, importer, exporter, origin))
+    conn.commit()
+
+def snapshot(conn):
+    """Countries (without generated IDs) and the country each catch record links to"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT country_name, country_code, arctic_council, nammco_member
+            FROM countries ORDER BY country_name
+        """)
+        countries = cur.fetchall()
+        cur.execute("""
+            SELECT cr.year, cr.country, c.country_name
+            FROM catch_records cr LEFT JOIN countries c ON c.id = cr.country_id
+            ORDER BY cr.year
+        """)
+        catch_records = cur.fetchall()
+    return countries, catch_records
+
+def check_rpcs(conn, cleanup) -> bool:
+    """The aggregate RPCs must return what plain SQL DISTINCT returns"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT code, COUNT(*) FROM (
+                SELECT importer AS code FROM cites_trade_records UNION ALL
+                SELECT exporter FROM cites_trade_records UNION ALL
+                SELECT origin FROM cites_trade_records
+            ) c WHERE code <> '' GROUP BY code
+        """)
+        expected_codes = dict(cur.fetchall())
+        cur.execute("""
+            SELECT country, COUNT(*) FROM catch_records
+            WHERE country <> '' AND country_id IS NULL GROUP BY country
+        """)
+        expected_countries = dict(cur.fetchall())
+
+    ok = True
+    for name, actual, expected in [
+        ('trade_country_codes', cleanup.fetch_trade_country_codes(), expected_codes),
+        ('unlinked_catch_record_countries', cleanup.fetch_unlinked_catch_countries(), expected_countries)
+    ]:
+        if actual == expected:
+            print(f"  ✅ {name}() matches SQL ({len(actual)} values)")
+        else:
+            print(f"  ❌ {name}() returned {actual}, expected {expected}")
+            ok = False
+    return ok
+
+def main() -> int:
+    database_url = os.getenv('TEST_DATABASE_URL')
+    rest_url = os.getenv('TEST_SUPABASE_URL')
+    rest_key = os.getenv('TEST_SUPABASE_KEY')
+    if not (database_url and rest_url and rest_key):
+        print("⏭️  Skipped: set TEST_DATABASE_URL, TEST_SUPABASE_URL and TEST_SUPABASE_KEY (local Postgres + PostgREST)")
+        return 0
+
+    conn = psycopg2.connect(database_url)
+    with conn.cursor() as cur:
+        for schema_file in SCHEMA_FILES:
+            cur.execute(schema_file.read_text(encoding='utf-8'))
+    conn.commit()
+    time.sleep(1)  # let PostgREST reload its schema cache
+
+    # The cleanup module builds its client from the environment at import time
+    os.environ['SUPABASE_URL'] = rest_url
+    os.environ['SUPABASE_ANON_KEY'] = rest_key
+    import cleanup_country_references as cleanup
+
+    results = {}
+    ok = True
+    for mode in ('row-by-row', 'set-based'):
+        print(f"\n🧪 {mode}")
+        reset_and_seed(conn)
+        if mode == 'set-based':
+            ok = check_rpcs(conn, cleanup) and ok
+
+        countries_cache = cleanup.get_all_countries()
+        if mode == 'row-by-row':
+            ok = cleanup.cleanup_catch_records(countries_cache) and ok
+            ok = cleanup.cleanup_cites_trade_records(countries_cache) and ok
+        else:
+            ok = cleanup.cleanup_catch_records_set_based(countries_cache) and ok
+            ok = cleanup.cleanup_cites_trade_records_set_based(countries_cache) and ok
+        results[mode] = snapshot(conn)
+
+    row_countries, row_catch = results['row-by-row']
+    set_countries, set_catch = results['set-based']
+    unlinked = sum(1 for _, country, linked in set_catch if country and not linked)
+
+    print("\n📊 Results")
+    if row_countries == set_countries:
+        print(f"  ✅ Countries identical ({len(set_countries)} rows)")
+    else:
+        print(f"  ❌ Countries differ:\n     row-by-row: {row_countries}\n     set-based:  {set_countries}")
+        ok = False
+    if row_catch == set_catch:
+        print(f"  ✅ Catch record links identical ({len(set_catch)} rows, {unlinked} unlinked)")
+    else:
+        diff = [(a, b) for a, b in zip(row_catch, set_catch) if a != b]
+        print(f"  ❌ Catch record links differ in {len(diff)} rows, e.g. {diff[:3]}")
+        ok = False
+
+    conn.close()
+    print(f"\n{'✅ PASSED' if ok else '❌ FAILED'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Reference Import Filter Test
+
+Checks the in-list filters ReferenceImporter sends, without the PostgREST
+stand-in. The Asio flammeus profile cites
+
+    Meyer "Breeding of the Short-eared Owl in New Mexico" Western Birds (2016) doi:10.21199/wb47.2.4.
+
+whose quotes, parentheses and colon must reach PostgREST as one escaped
+element. Requests go to an httpx.MockTransport that records the query string
+and answers from a fixed set of stored rows, so no server is needed. A
+reference that its DOI already resolved must not be looked up again by
+citation.
+
+With TEST_SUPABASE_URL/TEST_SUPABASE_KEY set, the same citation filter is also
+sent to a real PostgREST as a read-only select, which must parse it.
+
+Usage:
+    python migration/test_reference_import.py
+
+    # Also check the filter against a real server
+    TEST_SUPABASE_URL=http://localhost:3000 TEST_SUPABASE_KEY=<jwt> \\
+        python migration/test_reference_import.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.postgrest_filters import in_list
+from reference_import import ReferenceImporter
+
+# From species_data/scite/processed/Asio_flammeus.json
+QUOTED_CITATION = 'Meyer "Breeding of the Short-eared Owl in New Mexico" Western Birds (2016) doi:10.21199/wb47.2.4.'
+# The element PostgREST expects: quotes and backslashes escaped inside a quoted value
+EXPECTED_ELEMENT = r'"Meyer \"Breeding of the Short-eared Owl in New Mexico\" Western Birds (2016) doi:10.21199/wb47.2.4."'
+KNOWN_CITATION = 'Known, A. (2020) "Owls": part 1'
+
+PROFILE_REFERENCES = [
+    {'title': 'Breeding of the Short-eared Owl in New Mexico', 'year': 2016,
+     'doi': '10.21199/wb47.2.4', 'full_citation': QUOTED_CITATION},
+    {'title': 'Owls', 'year': 2020, 'doi': '10.1000/known', 'full_citation': KNOWN_CITATION}
+]
+
+# Stored rows: the owl paper with its DOI in URL form (missed by the exact DOI
+# lookup, found by citation) and the known paper with a matching DOI
+STORED_ROWS = {
+    'doi': {
+        '10.1000/known': {'id': 'ref-known', 'source_id': 'known', 'doi': '10.1000/known',
+                           'full_citation': KNOWN_CITATION}
+    },
+    'full_citation': {
+        EXPECTED_ELEMENT: {'id': 'ref-owl', 'source_id': 'owl', 'doi': 'https://doi.org/10.21199/WB47.2.4',
+                           'full_citation': QUOTED_CITATION}
+    }
+}
+
+def recording_client(requests):
+    """PostgREST client whose requests are answered from STORED_ROWS"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        requests.append(params)
+        rows = []
+        for column, stored in STORED_ROWS.items():
+            criteria = params.get(column, '')
+            rows.extend(row for element, row in stored.items() if element in criteria)
+        return httpx.Response(200, json=rows)
+
+    return SyncPostgrestClient('http://test/rest/v1',
+                               http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+def check_importer() -> bool:
+    requests = []
+    importer = ReferenceImporter(recording_client(requests), dry_run=True)
+    mapping = importer.import_profiles({'Asio flammeus': PROFILE_REFERENCES})['Asio flammeus']
+
+    ok = True
+    citation_filters = [params['full_citation'] for params in requests if 'full_citation' in params]
+    if citation_filters == [f"in.({EXPECTED_ELEMENT})"]:
+        print("  ✅ Quoted citation sent as one escaped in-list element")
+    else:
+        print(f"  ❌ Citation filters: {citation_filters}")
+        ok = False
+
+    if not any(KNOWN_CITATION in criteria for criteria in citation_filters):
+        print("  ✅ DOI-resolved reference not looked up by citation")
+    else:
+        print("  ❌ DOI-resolved reference was looked up by citation again")
+        ok = False
+
+    expected_mapping = {QUOTED_CITATION: 'ref-owl', KNOWN_CITATION: 'ref-known'}
+    if mapping == expected_mapping:
+        print("  ✅ Both citations resolved to stored references")
+    else:
+        print(f"  ❌ Mapping {mapping} != {expected_mapping}")
+        ok = False
+    return ok
+
+def check_server(rest_url: str, rest_key: str) -> bool:
+    """A real PostgREST must accept the escaped filter"""
+    from supabase import create_client
+
+    try:
+        create_client(rest_url, rest_key).table('references').select('id') \
+            .filter('full_citation', 'in', in_list([QUOTED_CITATION, KNOWN_CITATION])).execute()
+    except Exception as e:
+        print(f"  ❌ PostgREST rejected the citation filter: {e}")
+        return False
+    print("  ✅ PostgREST parsed the citation filter")
+    return True
+
+def main() -> int:
+    print("\n🧪 Reference lookups")
+    ok = check_importer()
+
+    rest_url = os.getenv('TEST_SUPABASE_URL')
+    rest_key = os.getenv('TEST_SUPABASE_KEY')
+    if rest_url and rest_key:
+        print("\n🧪 PostgREST")
+        ok = check_server(rest_url, rest_key) and ok
+    else:
+        print("\n⏭️  Server check skipped: set TEST_SUPABASE_URL and TEST_SUPABASE_KEY")
+
+    print(f"\n{'✅ PASSED' if ok else '❌ FAILED'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Schema Introspection Test (local Postgres)
+
+Loads benchmarks/local_schema.sql into a disposable local database, seeds a
+few rows, runs ANALYZE and checks that config/schema_introspection.py reads
+back what the schema file declares: every table, its columns in order, NOT
+NULL flags, primary and foreign keys, reltuples row estimates and pg_stats
+null fractions. The disk cache must round-trip the catalog unchanged. With
+PostgREST in front of the database, the schema_catalog() RPC must return the
+same catalog as the direct connection.
+
+    createdb arctic_test
+    postgrest  # optional: db-uri = postgres://localhost/arctic_test
+
+Usage:
+    TEST_DATABASE_URL=postgresql://localhost/arctic_test \\
+        python migration/test_schema_introspection.py
+
+    # Also compare the RPC path
+    TEST_DATABASE_URL=postgresql://localhost/arctic_test \\
+    TEST_SUPABASE_URL=http://localhost:3000 TEST_SUPABASE_KEY=<jwt> \\
+        python migration/test_schema_introspection.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+import psycopg2
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.postgrest_standin import parse_schema
+from config.schema_introspection import SchemaCatalog
+
+SCHEMA_FILE = REPO_ROOT / 'benchmarks' / 'local_schema.sql'
+SCHEMA_FILES = [
+    SCHEMA_FILE,
+    REPO_ROOT / 'migration' / 'schema_introspection_functions.sql'
+]
+SPECIES_ROWS = 40  # every other species has a common name -> null_frac 0.5
+
+def reset_and_seed(conn) -> None:
+    """Empty the species tables, insert the fixture rows and refresh planner statistics"""
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE cites_trade_records, common_names, species CASCADE")
+        for i in range(SPECIES_ROWS):
+            cur.execute("""
+                INSERT INTO species (scientific_name, common_name, kingdom, phylum, class, order_name, family, genus, species_name)
+                VALUES (%s, %s, 'ANIMALIA', 'CHORDATA', 'MAMMALIA', 'CETACEA', 'MONODONTIDAE', 'Genus', %s)
+            """, (f"Genus species{i}", f"Name {i}" if i % 2 == 0 else None, f"species{i}"))
+    conn.commit()
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("ANALYZE")
+    conn.autocommit = False
+
+def check_against_schema_file(catalog: SchemaCatalog) -> bool:
+    """Tables, columns, NOT NULL flags and keys must match the CREATE TABLE statements"""
+    ok = True
+    expected = parse_schema(SCHEMA_FILE)
+    for name, table_def in expected.items():
+        table = catalog.tables.get(name)
+        if table is None:
+            print(f"  ❌ {name}: missing from catalog")
+            ok = False
+            continue
+        problems = []
+        if table.column_names() != list(table_def.columns):
+            problems.append(f"columns {table.column_names()} != {list(table_def.columns)}")
+        for column_name, column_def in table_def.columns.items():
+            column = table.column(column_name)
+            if column is not None and column.is_nullable == column_def.not_null:
+                problems.append(f"{column_name} nullable={column.is_nullable}")
+        if table_def.primary_key and table.primary_key != [table_def.primary_key]:
+            problems.append(f"primary key {table.primary_key} != {table_def.primary_key}")
+        expected_fks = sorted(f"{column} -> {ref_table}.{ref_column}"
+                              for column, (ref_table, ref_column) in table_def.foreign_keys().items())
+        if sorted(table.foreign_key_strings()) != expected_fks:
+            problems.append(f"foreign keys {table.foreign_key_strings()} != {expected_fks}")
+        if problems:
+            print(f"  ❌ {name}: {'; '.join(problems)}")
+            ok = False
+    if ok:
+        print(f"  ✅ {len(expected)} tables match {SCHEMA_FILE.name}")
+    return ok
+
+def check_statistics(catalog: SchemaCatalog) -> bool:
+    """reltuples and pg_stats must reflect the seeded rows after ANALYZE"""
+    ok = True
+    species = catalog.tables['species']
+    if species.approx_rows == SPECIES_ROWS:
+        print(f"  ✅ species approx_rows = {species.approx_rows}")
+    else:
+        print(f"  ❌ species approx_rows = {species.approx_rows}, expected {SPECIES_ROWS}")
+        ok = False
+    null_frac = species.column('common_name').null_frac
+    if null_frac is not None and abs(null_frac - 0.5) < 0.01:
+        print(f"  ✅ species.common_name null_frac = {null_frac}")
+    else:
+        print(f"  ❌ species.common_name null_frac = {null_frac}, expected 0.5")
+        ok = False
+    if 'scientific_name' in [index['columns'][0] for index in species.indexes if index['columns']]:
+        print("  ✅ species unique index on scientific_name found")
+    else:
+        print(f"  ❌ species indexes: {species.indexes}")
+        ok = False
+    return ok
+
+def check_cache_round_trip(catalog: SchemaCatalog) -> bool:
+    """save() followed by from_cache() must give the same tables"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'schema_catalog.json'
+        catalog.save(path)
+        cached = SchemaCatalog.from_cache(path, catalog.schema)
+    same = cached is not None and {name: asdict(table) for name, table in cached.tables.items()} == \
+        {name: asdict(table) for name, table in catalog.tables.items()}
+    print(f"  {'✅' if same else '❌'} Disk cache round trip")
+    return same
+
+def check_rpc(catalog: SchemaCatalog, rest_url: str, rest_key: str) -> bool:
+    """schema_catalog() over PostgREST must return the direct-connection catalog"""
+    from supabase import create_client
+
+    rpc_catalog = SchemaCatalog.load_rpc(create_client(rest_url, rest_key), catalog.schema)
+    # Compare structure; table sizes may move between the two reads
+    def shape(c):
+        return {name: {**asdict(table), 'total_bytes': None} for name, table in c.tables.items()}
+    same = shape(rpc_catalog) == shape(catalog)
+    if same:
+        print(f"  ✅ schema_catalog() RPC matches the direct connection ({len(rpc_catalog)} tables)")
+    else:
+        differing = [name for name in catalog.tables if shape(catalog).get(name) != shape(rpc_catalog).get(name)]
+        print(f"  ❌ schema_catalog() RPC differs in {differing[:5]}")
+    return same
+
+def main() -> int:
+    database_url = os.getenv('TEST_DATABASE_URL')
+    rest_url = os.getenv('TEST_SUPABASE_URL')
+    rest_key = os.getenv('TEST_SUPABASE_KEY')
+    if not database_url:
+        print("⏭️  Skipped: set TEST_DATABASE_URL (local Postgres; TEST_SUPABASE_URL/KEY to also test the RPC)")
+        return 0
+
+    conn = psycopg2.connect(database_url)
+    with conn.cursor() as cur:
+        for schema_file in SCHEMA_FILES:
+            cur.execute(schema_file.read_text(encoding='utf-8'))
+    conn.commit()
+    reset_and_seed(conn)
+    conn.close()
+
+    print("\n🧪 Direct connection")
+    started = time.perf_counter()
+    catalog = SchemaCatalog.load_postgres(database_url)
+    print(f"  📚 {len(catalog)} tables in {time.perf_counter() - started:.2f}s")
+
+    ok = check_against_schema_file(catalog)
+    ok = check_statistics(catalog) and ok
+    ok = check_cache_round_trip(catalog) and ok
+
+    if rest_url and rest_key:
+        print("\n🧪 RPC")
+        time.sleep(1)  # let PostgREST reload its schema cache
+        ok = check_rpc(catalog, rest_url, rest_key) and ok
+    else:
+        print("\n⏭️  RPC check skipped: set TEST_SUPABASE_URL and TEST_SUPABASE_KEY")
+
+    print(f"\n{'✅ PASSED' if ok else '❌ FAILED'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
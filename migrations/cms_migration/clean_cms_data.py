@@ -4,13 +4,26 @@ Clean CMS Data Script
 
 This script cleans the CMS data to handle species listed in both Appendix I and II.
 Best practice: Normalize the data to match database constraints.
+
+process_cms_species_data.py now writes cms_arctic_species_data_cleaned.json in
+the same pass as the consolidated data, so this is only needed to re-clean a
+cms_arctic_species_data.json produced before that. The normalization itself is
+clean_species_records() in core/cms_ingest.py.
+
+Usage:
+    python clean_cms_data.py
 """
 
+import sys
 import json
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+
+# Add API root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from core.cms_ingest import clean_species_records, OUTPUT_DIR, DATA_FILE, CLEANED_FILE, CLEANING_NOTES
 
 # Setup logging
 logging.basicConfig(
@@ -23,43 +36,24 @@ logger = logging.getLogger(__name__)
 def clean_cms_data():
     """Clean the CMS data to handle I/II appendix values"""
     
-    # Load the original data
-    base_dir = Path(__file__).parent.parent.parent
-    input_file = base_dir / "species_data" / "processed" / "cms_arctic_species_data.json"
-    output_file = base_dir / "species_data" / "processed" / "cms_arctic_species_data_cleaned.json"
+    input_file = OUTPUT_DIR / DATA_FILE
+    output_file = OUTPUT_DIR / CLEANED_FILE
     
     logger.info(f"Loading CMS data from: {input_file}")
     
     with open(input_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    # Track changes
-    species_modified = []
-    
-    # Clean the data
-    for species in data['species_data']:
-        if species['cms_listing'] == 'I/II':
-            # Log the species being modified
-            species_modified.append(species['species_name'])
-            
-            # For species listed in both appendices, we'll use the higher protection level (I)
-            # This is a common practice in conservation databases
-            logger.info(f"Converting {species['species_name']} from I/II to I (higher protection level)")
-            
-            # Update the listing
-            species['cms_listing'] = 'I'
-            
-            # Add a note about the dual listing if not already present
-            if species['notes']:
-                species['notes'] = f"Listed in both Appendix I and II. {species['notes']}"
-            else:
-                species['notes'] = "Listed in both Appendix I and II."
+    # For species listed in both appendices, use the higher protection level (I)
+    data['species_data'], species_modified = clean_species_records(data['species_data'])
+    for species in species_modified:
+        logger.info(f"Converting {species} from I/II to I (higher protection level)")
     
     # Update metadata
     data['metadata']['processed_date'] = datetime.now().isoformat()
     data['metadata']['data_cleaned'] = True
     data['metadata']['species_modified'] = len(species_modified)
-    data['metadata']['cleaning_notes'] = "Species listed as I/II converted to I (higher protection level)"
+    data['metadata']['cleaning_notes'] = CLEANING_NOTES
     
     # Save cleaned data
     with open(output_file, 'w', encoding='utf-8') as f:
@@ -78,37 +72,7 @@ def clean_cms_data():
     return output_file
 
 
-def create_update_script(cleaned_file: Path):
-    """Create an updated loading script that uses the cleaned data"""
-    
-    script_path = Path(__file__).parent / "load_cms_data_cleaned.py"
-    
-    # Read the original loading script
-    original_script = Path(__file__).parent / "load_cms_data_to_db.py"
-    with open(original_script, 'r') as f:
-        content = f.read()
-    
-    # Update the data file path
-    content = content.replace(
-        'self.cms_data_file = self.base_dir / "species_data" / "processed" / "cms_arctic_species_data.json"',
-        'self.cms_data_file = self.base_dir / "species_data" / "processed" / "cms_arctic_species_data_cleaned.json"'
-    )
-    
-    # Save the updated script
-    with open(script_path, 'w') as f:
-        f.write(content)
-    
-    logger.info(f"Created updated loading script: {script_path}")
-    return script_path
-
-
 if __name__ == "__main__":
-    # Clean the data
     cleaned_file = clean_cms_data()
     
-    # Create updated loading script
-    loading_script = create_update_script(cleaned_file)
-    
-    print(f"\nNext steps:")
-    print(f"1. Review the cleaned data: {cleaned_file}")
-    print(f"2. Run the updated loading script: python {loading_script.name}")
\ No newline at end of file
+    print(f"\nNext step: python load_cms_data_cleaned.py")